@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+Synthetic UE5-like documentation site for offline benchmarks
+
+Serves a deterministic documentation site from a local HTTP server so the
+scraper can be measured without touching docs.unrealengine.com:
+
+- /sitemap.xml is a sitemap index pointing at gzip-compressed sub-sitemaps
+  (with <lastmod>) that list every page
+- pages live under /5.3/en-US/<section>/<topic> and carry the same kind of
+  chrome the real site has (header, nav, sidebar, scripts, styles, footer)
+  around a main article of varying size with headings, paragraphs, tables,
+  code blocks and images
+- a configurable fraction of pages can be slow, or answer with a Cloudflare
+  style "Just a moment..." challenge
+- page requests above a configurable rate are answered with 429 and a
+  Retry-After header
+- pages send ETag and Last-Modified headers and honour conditional requests
+
+Pages are generated on request from their index, so thousands of pages cost
+no disk space and every run sees the same site for the same seed.
+"""
+
+import gzip
+import hashlib
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+
+SECTIONS = (
+    'understanding-the-basics-of-unreal-engine',
+    'blueprints-visual-scripting-in-unreal-engine',
+    'programming-with-cplusplus-in-unreal-engine',
+    'rendering-and-graphics-in-unreal-engine',
+    'animating-characters-and-objects-in-unreal-engine',
+    'gameplay-systems-in-unreal-engine',
+    'world-building-in-unreal-engine',
+    'audio-in-unreal-engine-5',
+)
+
+WORDS = (
+    'actor component blueprint material level sequence widget render pipeline '
+    'lighting shadow landscape foliage niagara physics collision animation '
+    'montage skeletal mesh static texture shader editor viewport project plugin '
+    'module gameplay ability replication network character controller pawn '
+    'camera input event graph function variable struct enum interface asset'
+).split()
+
+CHALLENGE_PAGE = b"""<!DOCTYPE html><html><head><title>Just a moment...</title></head>
+<body><div id="challenge-running">Checking your browser before accessing the site.</div>
+<script src="/cdn-cgi/challenge-platform/h/b/orchestrate/jsch/v1"></script></body></html>"""
+
+# 1x1 transparent PNG
+PIXEL_PNG = bytes.fromhex(
+    '89504e470d0a1a0a0000000d4948445200000001000000010806000000'
+    '1f15c4890000000d4944415478da63f8ffff3f0005fe02fea7d6a5e20000000049454e44ae426082'
+)
+
+LAST_MODIFIED = 'Mon, 01 Jan 2024 00:00:00 GMT'
+
+
+class FixtureDocsSite:
+    """
+    Local documentation site server.
+
+    Usage:
+        with FixtureDocsSite(page_count=2000) as site:
+            scraper = UE5DocsScraper(base_url=site.base_url, ...)
+    """
+
+    def __init__(self,
+                 page_count: int = 2000,
+                 urls_per_sitemap: int = 500,
+                 slow_fraction: float = 0.0,
+                 slow_delay: float = 0.5,
+                 challenge_fraction: float = 0.0,
+                 throttle_rate: float = 0.0,
+                 retry_after: int = 1,
+                 seed: int = 0,
+                 host: str = '127.0.0.1',
+                 port: int = 0):
+        """
+        Configure the site.
+
+        Args:
+            page_count: Number of documentation pages
+            urls_per_sitemap: Pages per gzip sub-sitemap of the index
+            slow_fraction: Share of pages answered after slow_delay seconds
+            slow_delay: Delay for slow pages in seconds
+            challenge_fraction: Share of pages answered with a bot challenge
+            throttle_rate: Page requests per second served before answering 429 (0 = unlimited)
+            retry_after: Retry-After seconds sent with 429 responses
+            seed: Seed for page sizes and slow/challenge selection
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+        """
+        self.page_count = max(1, page_count)
+        self.urls_per_sitemap = max(1, urls_per_sitemap)
+        self.slow_fraction = slow_fraction
+        self.slow_delay = slow_delay
+        self.challenge_fraction = challenge_fraction
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.seed = seed
+        self.host = host
+        self.port = port
+
+        rng = random.Random(seed)
+        self._slow = {i for i in range(self.page_count) if rng.random() < slow_fraction}
+        self._challenge = {i for i in range(self.page_count) if rng.random() < challenge_fraction}
+
+        self.requests_served = 0
+        self.requests_throttled = 0
+        self._counter_lock = threading.Lock()
+        # Token bucket of the page request throttle (one second of burst)
+        self._throttle_tokens = throttle_rate
+        self._throttle_refill = time.monotonic()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    # -- Site content -------------------------------------------------------
+
+    @property
+    def base_url(self) -> str:
+        if self._server is None:
+            raise RuntimeError("FixtureDocsSite is not running")
+        return f"http://{self.host}:{self._server.server_address[1]}"
+
+    def page_path(self, index: int) -> str:
+        section = SECTIONS[index % len(SECTIONS)]
+        return f"/5.3/en-US/{section}/topic-{index:05d}"
+
+    def page_index(self, path: str) -> Optional[int]:
+        """Index of the page served at path, or None."""
+        name = path.rstrip('/').rsplit('/', 1)[-1]
+        if not name.startswith('topic-'):
+            return None
+        try:
+            index = int(name[len('topic-'):])
+        except ValueError:
+            return None
+        return index if 0 <= index < self.page_count and self.page_path(index) == path.rstrip('/') else None
+
+    def is_slow(self, index: int) -> bool:
+        return index in self._slow
+
+    def is_challenge(self, index: int) -> bool:
+        return index in self._challenge
+
+    @property
+    def challenge_count(self) -> int:
+        return len(self._challenge)
+
+    def sitemap_index(self) -> bytes:
+        parts = (self.page_count + self.urls_per_sitemap - 1) // self.urls_per_sitemap
+        entries = ''.join(
+            f"<sitemap><loc>{self.base_url}/sitemaps/part-{part}.xml.gz</loc></sitemap>"
+            for part in range(parts)
+        )
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+            f'{entries}</sitemapindex>'
+        ).encode()
+
+    def sub_sitemap(self, part: int) -> Optional[bytes]:
+        start = part * self.urls_per_sitemap
+        if part < 0 or start >= self.page_count:
+            return None
+        end = min(start + self.urls_per_sitemap, self.page_count)
+        entries = ''.join(
+            f"<url><loc>{self.base_url}{self.page_path(i)}</loc><lastmod>2024-01-01</lastmod></url>"
+            for i in range(start, end)
+        )
+        xml = (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+            f'{entries}</urlset>'
+        ).encode()
+        return gzip.compress(xml)
+
+    def page_html(self, index: int) -> bytes:
+        """Full HTML of a page; size varies from a few KB to a few hundred KB."""
+        rng = random.Random(self.seed * 1000003 + index)
+        section = SECTIONS[index % len(SECTIONS)]
+        title = ' '.join(rng.choice(WORDS).capitalize() for _ in range(3)) + f" {index}"
+
+        def sentence():
+            return ' '.join(rng.choice(WORDS) for _ in range(rng.randint(8, 20))).capitalize() + '.'
+
+        body = []
+        for block in range(rng.choice((2, 4, 8, 16, 32))):
+            body.append(f"<h2 id=\"section-{block}\">{sentence()[:40]}</h2>")
+            for _ in range(rng.randint(2, 5)):
+                body.append(f"<p>{' '.join(sentence() for _ in range(rng.randint(2, 6)))}</p>")
+            kind = rng.random()
+            if kind < 0.3:
+                rows = ''.join(
+                    f"<tr><td><code>{rng.choice(WORDS)}</code></td><td>{sentence()}</td></tr>"
+                    for _ in range(rng.randint(3, 12))
+                )
+                body.append(f"<table><thead><tr><th>Property</th><th>Description</th></tr></thead>"
+                            f"<tbody>{rows}</tbody></table>")
+            elif kind < 0.6:
+                lines = '\n'.join(
+                    f"    U{rng.choice(WORDS).capitalize()}* {rng.choice(WORDS)}{i} = nullptr;"
+                    for i in range(rng.randint(4, 20))
+                )
+                body.append(f"<pre><code class=\"language-cpp\">UCLASS()\nclass A{index} : public AActor\n{{\n"
+                            f"{lines}\n}};</code></pre>")
+            elif kind < 0.8:
+                body.append(f"<figure><img src=\"/images/{section}/{index}-{block}.png\" "
+                            f"alt=\"{sentence()[:30]}\"><figcaption>{sentence()}</figcaption></figure>")
+
+        nav_links = ''.join(
+            f"<li><a href=\"/5.3/en-US/{s}\">{s.replace('-', ' ').title()}</a></li>" for s in SECTIONS
+        )
+        sidebar = ''.join(
+            f"<li><a href=\"{self.page_path((index + k) % self.page_count)}\">Related {k}</a></li>"
+            for k in range(1, 30)
+        )
+        html = f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title} | Unreal Engine 5.3 Documentation</title>
+<meta property="og:title" content="{title}">
+<link rel="stylesheet" href="/static/site.css">
+<style>.sidebar {{ width: 280px; }} .content {{ max-width: 960px; }} {'.x{color:red}' * 200}</style>
+<script>window.__DOCS_STATE__ = {{"page": {index}, "section": "{section}", "pad": "{'x' * 4000}"}};</script>
+</head>
+<body>
+<header class="header"><div class="menu"><a href="/">Epic Developer Community</a></div></header>
+<nav class="navigation"><ul>{nav_links}</ul></nav>
+<div class="breadcrumbs"><a href="/5.3/en-US">Docs</a> / <a href="/5.3/en-US/{section}">{section}</a></div>
+<aside class="sidebar"><ul>{sidebar}</ul></aside>
+<main class="main-content">
+<article class="documentation">
+<h1>{title}</h1>
+{''.join(body)}
+</article>
+</main>
+<div class="social-share">Share this page</div>
+<footer class="footer">&copy; Epic Games, Inc.</footer>
+<script src="/static/analytics.js"></script>
+<noscript>Enable JavaScript</noscript>
+</body>
+</html>"""
+        return html.encode('utf-8')
+
+    @staticmethod
+    def etag(payload: bytes) -> str:
+        return '"' + hashlib.md5(payload).hexdigest() + '"'
+
+    def _throttled(self) -> bool:
+        """Whether a page request exceeds throttle_rate (consumes a token otherwise)."""
+        if not self.throttle_rate:
+            return False
+        with self._counter_lock:
+            now = time.monotonic()
+            self._throttle_tokens = min(self.throttle_rate, self._throttle_tokens +
+                                        (now - self._throttle_refill) * self.throttle_rate)
+            self._throttle_refill = now
+            if self._throttle_tokens >= 1:
+                self._throttle_tokens -= 1
+                return False
+            self.requests_throttled += 1
+            return True
+
+    # -- Server lifecycle ---------------------------------------------------
+
+    def start(self) -> 'FixtureDocsSite':
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status, payload=b'', content_type='text/html; charset=utf-8', headers=None):
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(payload)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                if self.command != 'HEAD':
+                    self.wfile.write(payload)
+
+            def do_HEAD(self):
+                self.do_GET()
+
+            def do_GET(self):
+                with site._counter_lock:
+                    site.requests_served += 1
+                path = self.path.split('?', 1)[0]
+
+                if path == '/sitemap.xml':
+                    return self._send(200, site.sitemap_index(), 'application/xml')
+                if path.startswith('/sitemaps/part-') and path.endswith('.xml.gz'):
+                    try:
+                        part = int(path[len('/sitemaps/part-'):-len('.xml.gz')])
+                    except ValueError:
+                        part = -1
+                    payload = site.sub_sitemap(part)
+                    if payload is None:
+                        return self._send(404, b'Not Found', 'text/plain')
+                    return self._send(200, payload, 'application/gzip')
+                if path.startswith('/images/'):
+                    return self._send(200, PIXEL_PNG, 'image/png')
+                if path.startswith('/static/'):
+                    return self._send(200, b'/* static */', 'text/css')
+
+                index = site.page_index(path)
+                if index is None:
+                    return self._send(404, b'<html><body><h1>404 Not Found</h1></body></html>')
+                if site._throttled():
+                    return self._send(429, b'<html><body><h1>429 Too Many Requests</h1></body></html>',
+                                      headers={'Retry-After': str(site.retry_after)})
+                if site.is_slow(index):
+                    time.sleep(site.slow_delay)
+                if site.is_challenge(index):
+                    return self._send(503, CHALLENGE_PAGE, headers={'Server': 'cloudflare'})
+
+                payload = site.page_html(index)
+                etag = site.etag(payload)
+                validators = {'ETag': etag, 'Last-Modified': LAST_MODIFIED}
+                if self.headers.get('If-None-Match') == etag:
+                    return self._send(304, headers=validators)
+                return self._send(200, payload, headers=validators)
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fixture-site", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def __enter__(self) -> 'FixtureDocsSite':
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve the synthetic documentation site")
+    parser.add_argument('--pages', type=int, default=2000)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--slow-fraction', type=float, default=0.0)
+    parser.add_argument('--challenge-fraction', type=float, default=0.0)
+    parser.add_argument('--throttle-rate', type=float, default=0.0)
+    args = parser.parse_args()
+
+    with FixtureDocsSite(page_count=args.pages, port=args.port,
+                         slow_fraction=args.slow_fraction,
+                         challenge_fraction=args.challenge_fraction,
+                         throttle_rate=args.throttle_rate) as running_site:
+        print(f"Serving {args.pages} pages at {running_site.base_url}/sitemap.xml (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
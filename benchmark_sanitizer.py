@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for filename sanitizing
+
+Compares filename_sanitizer with the cleaner the scraper used before
+(kept here as ``legacy_clean_filename`` / ``legacy_clean_directory_name``)
+on a corpus shaped like a documentation crawl: page titles and URL path
+segments, most of which repeat across pages. It reports:
+
+- cold: every distinct input once, with an empty cache
+- crawl: the whole corpus with its repeats, as a crawl sees it
+- a check that both implementations return the same names
+
+Usage:
+    python benchmark_sanitizer.py
+    python benchmark_sanitizer.py --pages 20000 --rounds 5
+"""
+
+import argparse
+import html
+import random
+import re
+import sys
+import time
+import unicodedata
+from pathlib import Path
+from typing import Callable, Dict, List
+
+# Add the current directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from filename_sanitizer import sanitize_directory_name, sanitize_filename
+
+_LEGACY_RESERVED = {
+    'CON', 'PRN', 'AUX', 'NUL',
+    'COM1', 'COM2', 'COM3', 'COM4', 'COM5', 'COM6', 'COM7', 'COM8', 'COM9',
+    'LPT1', 'LPT2', 'LPT3', 'LPT4', 'LPT5', 'LPT6', 'LPT7', 'LPT8', 'LPT9'
+}
+
+
+def legacy_clean_filename(name, max_length=50):
+    """The scraper's clean_filename before filename_sanitizer (reference only)."""
+    if not name or not name.strip():
+        return "unnamed"
+    name = unicodedata.normalize('NFKD', name)
+    name = html.unescape(name)
+    forbidden_chars = '<>:"|?*\\/\r\n\t'
+    for char in forbidden_chars:
+        name = name.replace(char, '_')
+    name = ''.join(char for char in name if ord(char) >= 32)
+    name = re.sub(r'[_\s]+', '_', name)
+    name = name.strip('._\t\n\r ')
+    name = name.strip('._')
+    if name.upper() in _LEGACY_RESERVED:
+        name = f"_{name}"
+    if len(name) > max_length:
+        name = name[:max_length]
+    name = name.rstrip('.')
+    return name if name else "unnamed"
+
+
+def legacy_clean_directory_name(name, max_length=100):
+    """The scraper's directory cleaning before filename_sanitizer (reference only)."""
+    if not name or not name.strip():
+        return "unnamed_dir"
+    clean_name = legacy_clean_filename(name, max_length=100)
+    clean_name = clean_name.rstrip('.') or "unnamed_dir"
+    if len(clean_name) > max_length:
+        clean_name = clean_name[:max_length].rstrip(' .')
+    return clean_name or "dir"
+
+
+_WORDS = ['Actor', 'Blueprint', 'Lumen', 'Nanite', 'Niagara', 'Material', 'Landscape',
+          'Animation', 'Gameplay', 'Ability', 'System', 'Rendering', 'World', 'Partition']
+_EXTRAS = [' & ', ': ', ' | ', ' / ', '  ', ' (Beta)', ' – ', '&amp;', ' café', '?', '\t']
+
+
+def build_corpus(pages: int = 10000, seed: int = 0) -> List[Dict[str, str]]:
+    """Title and path segments of ``pages`` synthetic documentation pages."""
+    rng = random.Random(seed)
+    sections = [f"{rng.choice(_WORDS).lower()}-{rng.choice(_WORDS).lower()}" for _ in range(60)]
+    corpus = []
+    for index in range(pages):
+        words = rng.sample(_WORDS, rng.randint(2, 5))
+        if rng.random() < 0.4:
+            words.insert(1, rng.choice(_EXTRAS).strip() or '-')
+        title = f"{' '.join(words)} {index} in Unreal Engine | Unreal Engine 5.3 Documentation"
+        segments = ['5.3', 'en-US', rng.choice(sections[:8]), rng.choice(sections), f"page-{index}"]
+        corpus.append({'title': title, 'segments': segments})
+    return corpus
+
+
+def _time(function: Callable[[], None], rounds: int) -> float:
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_benchmark(pages: int = 10000, rounds: int = 3, seed: int = 0) -> Dict[str, float]:
+    """Time both implementations on the corpus; returns seconds and speedups."""
+    corpus = build_corpus(pages, seed)
+    titles = [page['title'] for page in corpus]
+    segments = [segment for page in corpus for segment in page['segments']]
+    distinct_titles = list(dict.fromkeys(titles))
+    distinct_segments = list(dict.fromkeys(segments))
+
+    mismatches = [
+        name for name in distinct_titles if legacy_clean_filename(name) != sanitize_filename(name)
+    ] + [
+        name for name in distinct_segments
+        if legacy_clean_directory_name(name) != sanitize_directory_name(name)
+    ]
+
+    def legacy(title_list, segment_list):
+        def run():
+            for title in title_list:
+                legacy_clean_filename(title)
+            for segment in segment_list:
+                legacy_clean_directory_name(segment)
+        return run
+
+    def compiled(title_list, segment_list, cold):
+        def run():
+            if cold:
+                sanitize_filename.cache_clear()
+            for title in title_list:
+                sanitize_filename(title)
+            for segment in segment_list:
+                sanitize_directory_name(segment)
+        return run
+
+    report = {
+        'pages': pages,
+        'inputs': len(titles) + len(segments),
+        'distinct_inputs': len(distinct_titles) + len(distinct_segments),
+        'mismatches': len(mismatches),
+        'legacy_cold': _time(legacy(distinct_titles, distinct_segments), rounds),
+        'compiled_cold': _time(compiled(distinct_titles, distinct_segments, True), rounds),
+        'legacy_crawl': _time(legacy(titles, segments), rounds),
+    }
+    sanitize_filename.cache_clear()
+    report['compiled_crawl'] = _time(compiled(titles, segments, False), rounds)
+    report['cold_speedup'] = report['legacy_cold'] / report['compiled_cold']
+    report['crawl_speedup'] = report['legacy_crawl'] / report['compiled_crawl']
+    return report
+
+
+def print_report(report: Dict[str, float]):
+    print(f"Sanitizer benchmark: {report['pages']} pages, {report['inputs']} inputs "
+          f"({report['distinct_inputs']} distinct)")
+    for label, key in (('cold', 'cold'), ('crawl', 'crawl')):
+        print(f"  {label:<6} legacy {report[f'legacy_{key}'] * 1000:8.1f} ms   "
+              f"compiled {report[f'compiled_{key}'] * 1000:8.1f} ms   "
+              f"speedup {report[f'{key}_speedup']:5.1f}x")
+    identical = 'yes' if not report['mismatches'] else f"NO ({report['mismatches']} differ)"
+    print(f"  identical output: {identical}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare filename sanitizing with the old implementation")
+    parser.add_argument('--pages', type=int, default=10000, help="Synthetic pages (default: %(default)s)")
+    parser.add_argument('--rounds', type=int, default=3, help="Timing rounds, best is reported (default: %(default)s)")
+    parser.add_argument('--seed', type=int, default=0, help="Corpus seed")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.pages, args.rounds, args.seed)
+    print_report(report)
+    return 0 if not report['mismatches'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
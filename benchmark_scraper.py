@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Offline end-to-end benchmark for the UE5 Documentation Scraper
+
+Starts the synthetic documentation site from benchmark_fixture_site.py,
+runs UE5DocsScraper against it and reports:
+
+- pages/sec over the whole crawl
+- p50/p95 per pipeline stage (from the scraper's CrawlMetrics)
+- peak RSS of the scraper process including render workers and browsers
+- fetch path, readiness and failure counters
+
+Usage:
+    python benchmark_scraper.py --pages 2000 --workers 4
+    python benchmark_scraper.py --pages 500 --slow-fraction 0.05 --challenge-fraction 0.02
+    python benchmark_scraper.py --fetch-mode auto --report bench.json   # needs Firefox
+
+The default fetch mode is 'http', so the benchmark runs without Firefox.
+"""
+
+import argparse
+import json
+import logging
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import psutil
+
+# Add the current directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from benchmark_fixture_site import FixtureDocsSite
+from html_backend import DEFAULT_PARSER_BACKEND, PARSER_BACKENDS
+from ue5_docs_scraper import FETCH_MODES, UE5DocsScraper
+
+
+class PeakRssSampler:
+    """Samples RSS of this process and its children on a background thread."""
+
+    def __init__(self, interval: float = 0.1):
+        self.interval = interval
+        self.peak_bytes = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._process = psutil.Process()
+
+    def _current_rss(self) -> int:
+        total = self._process.memory_info().rss
+        for child in self._process.children(recursive=True):
+            try:
+                total += child.memory_info().rss
+            except psutil.Error:
+                pass
+        return total
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.peak_bytes = max(self.peak_bytes, self._current_rss())
+            except psutil.Error:
+                pass
+            self._stop.wait(self.interval)
+
+    def __enter__(self) -> 'PeakRssSampler':
+        self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stop.set()
+        self._thread.join(timeout=5)
+
+    @property
+    def peak_mb(self) -> float:
+        return round(self.peak_bytes / (1024 ** 2), 1)
+
+
+def run_benchmark(pages: int = 2000,
+                  workers: int = 4,
+                  fetch_mode: str = 'http',
+                  render_workers: Optional[int] = None,
+                  parser_backend: str = DEFAULT_PARSER_BACKEND,
+                  slow_fraction: float = 0.0,
+                  slow_delay: float = 0.5,
+                  challenge_fraction: float = 0.0,
+                  throttle_rate: float = 0.0,
+                  initial_rate: float = 2.0,
+                  max_rate: float = 16.0,
+                  seed: int = 0,
+                  output_dir: Optional[str] = None,
+                  verbose: bool = False) -> Dict[str, Any]:
+    """
+    Crawl a freshly started fixture site and return the benchmark report.
+
+    Args:
+        pages: Number of pages on the fixture site
+        workers: Crawl workers
+        fetch_mode: Scraper fetch mode ('http' needs no browser)
+        render_workers: PDF render processes (None = scraper default)
+        parser_backend: HTML parser backend
+        slow_fraction: Share of pages answered slowly
+        slow_delay: Delay of slow pages in seconds
+        challenge_fraction: Share of pages answered with a bot challenge
+        throttle_rate: Page requests per second the site serves before answering 429 (0 = unlimited)
+        initial_rate: Starting request rate of the scraper
+        max_rate: Upper bound of the scraper's adaptive request rate
+        seed: Fixture site seed
+        output_dir: Where to write output (default: temporary, removed afterwards)
+        verbose: Show the scraper's console log
+    """
+    work_dir = Path(output_dir) if output_dir else Path(tempfile.mkdtemp(prefix="ue5_bench_"))
+    work_dir.mkdir(parents=True, exist_ok=True)
+
+    try:
+        with FixtureDocsSite(page_count=pages, slow_fraction=slow_fraction, slow_delay=slow_delay,
+                             challenge_fraction=challenge_fraction, throttle_rate=throttle_rate,
+                             seed=seed) as site:
+            with PeakRssSampler() as rss:
+                scraper = UE5DocsScraper(
+                    base_url=site.base_url,
+                    output_dir=str(work_dir / "docs"),
+                    workers=workers,
+                    fetch_mode=fetch_mode,
+                    render_workers=render_workers,
+                    parser_backend=parser_backend,
+                    resume=False,
+                    log_file=str(work_dir / "benchmark_log.txt"),
+                    initial_rate=initial_rate,
+                    max_rate=max_rate
+                )
+                if not verbose:
+                    scraper.logger.set_console_level(logging.WARNING)
+
+                try:
+                    start = time.monotonic()
+                    scraper.scrape_all_docs()
+                    elapsed = time.monotonic() - start
+                    snapshot = scraper.metrics.snapshot()
+                    request_rates = scraper.rate_limiter.snapshot()
+                    succeeded = len(scraper.scraped_urls)
+                    failed = len(scraper.failed_urls)
+                finally:
+                    scraper.close()
+
+            return {
+                'config': {
+                    'pages': pages,
+                    'workers': workers,
+                    'fetch_mode': fetch_mode,
+                    'render_workers': scraper.render_workers,
+                    'parser_backend': scraper.html_backend.name,
+                    'slow_fraction': slow_fraction,
+                    'slow_delay': slow_delay,
+                    'challenge_fraction': challenge_fraction,
+                    'throttle_rate': throttle_rate,
+                    'initial_rate': initial_rate,
+                    'max_rate': max_rate,
+                    'seed': seed,
+                },
+                'elapsed_seconds': round(elapsed, 2),
+                'pages_processed': snapshot['pages'],
+                'pages_succeeded': succeeded,
+                'pages_failed': failed,
+                'challenge_pages': site.challenge_count,
+                'requests_throttled': site.requests_throttled,
+                'request_rates': request_rates,
+                'pages_per_second': round(snapshot['pages'] / elapsed, 2) if elapsed > 0 else 0.0,
+                'peak_rss_mb': rss.peak_mb,
+                'stages': {
+                    stage: {'count': stats['count'], 'p50': stats['p50'], 'p95': stats['p95'],
+                            'seconds_per_1000_pages': stats.get('seconds_per_1000_pages')}
+                    for stage, stats in snapshot['stages'].items()
+                },
+                'counters': snapshot['counters'],
+            }
+    finally:
+        if not output_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def print_report(report: Dict[str, Any]):
+    """Print a benchmark report as a readable table."""
+    config = report['config']
+    print("=" * 72)
+    print("UE5 Docs Scraper Benchmark")
+    print("=" * 72)
+    print(f"Pages: {config['pages']}  Workers: {config['workers']}  Fetch mode: {config['fetch_mode']}  "
+          f"Render workers: {config['render_workers']}  Parser: {config['parser_backend']}")
+    print(f"Slow pages: {config['slow_fraction']:.0%} ({config['slow_delay']}s)  "
+          f"Challenge pages: {config['challenge_fraction']:.0%}  "
+          f"Site throttle: {config['throttle_rate'] or '-'} req/s  Max rate: {config['max_rate']} req/s")
+    print("-" * 72)
+    print(f"Processed: {report['pages_processed']}  Succeeded: {report['pages_succeeded']}  "
+          f"Failed: {report['pages_failed']}")
+    print(f"Elapsed: {report['elapsed_seconds']:.2f}s  Throughput: {report['pages_per_second']:.2f} pages/sec  "
+          f"Peak RSS: {report['peak_rss_mb']:.1f} MB")
+    print("-" * 72)
+    print(f"{'stage':<16}{'count':>8}{'p50 (s)':>11}{'p95 (s)':>11}{'s / 1k pages':>15}")
+    for stage, stats in report['stages'].items():
+        per_1000 = stats['seconds_per_1000_pages']
+        print(f"{stage:<16}{stats['count']:>8}{stats['p50']:>11.4f}{stats['p95']:>11.4f}"
+              f"{(f'{per_1000:.1f}' if per_1000 is not None else '-'):>15}")
+    print("-" * 72)
+    print(f"Requests throttled by the site: {report['requests_throttled']}  "
+          f"Final request rates: {report['request_rates']}")
+    print(f"Counters: {report['counters']}")
+    print("=" * 72)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the scraper against a local fixture docs site")
+    parser.add_argument('--pages', type=int, default=2000, help="Pages on the fixture site (default: %(default)s)")
+    parser.add_argument('--workers', type=int, default=4, help="Crawl workers (default: %(default)s)")
+    parser.add_argument('--fetch-mode', choices=FETCH_MODES, default='http',
+                        help="Scraper fetch mode; 'auto'/'browser' need Firefox (default: %(default)s)")
+    parser.add_argument('--render-workers', type=int, default=None,
+                        help="PDF render processes (default: scraper default)")
+    parser.add_argument('--parser', choices=PARSER_BACKENDS, default=DEFAULT_PARSER_BACKEND,
+                        help="HTML parser backend (default: %(default)s)")
+    parser.add_argument('--slow-fraction', type=float, default=0.0, help="Share of slow pages")
+    parser.add_argument('--slow-delay', type=float, default=0.5, help="Delay of slow pages in seconds")
+    parser.add_argument('--challenge-fraction', type=float, default=0.0,
+                        help="Share of pages answered with a bot challenge")
+    parser.add_argument('--throttle-rate', type=float, default=0.0,
+                        help="Page requests per second the site serves before answering 429 (0 = unlimited)")
+    parser.add_argument('--initial-rate', type=float, default=2.0,
+                        help="Starting request rate of the scraper (default: %(default)s)")
+    parser.add_argument('--max-rate', type=float, default=16.0,
+                        help="Upper bound of the scraper's adaptive request rate (default: %(default)s)")
+    parser.add_argument('--seed', type=int, default=0, help="Fixture site seed")
+    parser.add_argument('--output-dir', default=None, help="Keep scraper output here instead of a temp dir")
+    parser.add_argument('--report', default=None, help="Also write the report as JSON to this file")
+    parser.add_argument('--verbose', action='store_true', help="Show the scraper's console log")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(
+        pages=args.pages,
+        workers=args.workers,
+        fetch_mode=args.fetch_mode,
+        render_workers=args.render_workers,
+        parser_backend=args.parser,
+        slow_fraction=args.slow_fraction,
+        slow_delay=args.slow_delay,
+        challenge_fraction=args.challenge_fraction,
+        throttle_rate=args.throttle_rate,
+        initial_rate=args.initial_rate,
+        max_rate=args.max_rate,
+        seed=args.seed,
+        output_dir=args.output_dir,
+        verbose=args.verbose
+    )
+    print_report(report)
+
+    if args.report:
+        Path(args.report).write_text(json.dumps(report, indent=2), encoding='utf-8')
+        print(f"Report written to {args.report}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Lean Firefox profile for the UE5 Documentation Scraper
+
+The crawl only needs each page's DOM text and structure. Images are
+re-resolved later by the PDF renderer. This module provides Firefox
+preferences that stop the crawl browser from downloading anything else.
+It is opt-in (``--browser-profile lean``); the default ``standard`` profile
+loads pages the way a normal Firefox does, so nothing a page needs is blocked
+by surprise:
+
+- images, web fonts, audio/video and WebRTC are disabled through prefs
+- analytics and other third-party hosts are blocked through a PAC script:
+  requests to hosts outside the allow-list go to a closed local port and
+  fail immediately, so no BiDi/devtools session is needed
+- prefetching, speculative connections, the back/forward cache and the disk
+  cache are turned off, and content processes are limited, to keep memory low
+
+The allow-list always contains the documentation host itself (e.g.
+``docs.unrealengine.com``, with its subdomains). It also contains the Epic
+domains that documentation pages load scripts and styles from. Sibling hosts
+are not guessed from the host name (``docs.example.co.uk`` does not allow all
+of ``co.uk``); add them with ``--allow-host``.
+"""
+
+import base64
+import json
+from typing import Dict, Iterable, Tuple
+from urllib.parse import urlparse
+
+
+BROWSER_PROFILES = ('standard', 'lean')
+DEFAULT_BROWSER_PROFILE = 'standard'
+
+# Domains (and their subdomains) documentation pages need to render content
+DEFAULT_ALLOWED_HOSTS = (
+    'unrealengine.com',
+    'epicgames.com',
+    'epicgames.net',
+    'akamaized.net',
+)
+
+# Analytics and tracking hosts; blocked even when they fall under an allowed domain
+TRACKER_HOSTS = (
+    'google-analytics.com', 'googletagmanager.com', 'doubleclick.net', 'googlesyndication.com',
+    'facebook.net', 'connect.facebook.net', 'hotjar.com', 'segment.io', 'segment.com',
+    'cookielaw.org', 'onetrust.com', 'optimizely.com', 'newrelic.com', 'nr-data.net',
+    'sentry.io', 'tracking.epicgames.com', 'tracking.unrealengine.com',
+)
+
+# Requests for blocked hosts are "proxied" here; nothing listens, so they fail immediately
+BLACKHOLE_PROXY = 'PROXY 127.0.0.1:9'
+
+# Preferences for the lean profile, independent of the allow-list
+LEAN_PREFS = {
+    # Web fonts, audio/video and WebRTC
+    'gfx.downloadable_fonts.enabled': False,
+    'browser.display.use_document_fonts': 0,
+    'media.autoplay.default': 5,
+    'media.autoplay.blocking_policy': 2,
+    'media.preload.default': 0,
+    'media.preload.auto': 0,
+    'media.mediasource.enabled': False,
+    'media.peerconnection.enabled': False,
+    'media.navigator.enabled': False,
+    # Built-in tracking protection as a second line behind the host allow-list
+    'privacy.trackingprotection.enabled': True,
+    'privacy.trackingprotection.socialtracking.enabled': True,
+    'privacy.trackingprotection.cryptomining.enabled': True,
+    'privacy.trackingprotection.fingerprinting.enabled': True,
+    # No speculative or background network traffic
+    'network.prefetch-next': False,
+    'network.dns.disablePrefetch': True,
+    'network.http.speculative-parallel-limit': 0,
+    'network.predictor.enabled': False,
+    'browser.safebrowsing.malware.enabled': False,
+    'browser.safebrowsing.phishing.enabled': False,
+    'app.update.auto': False,
+    'datareporting.healthreport.uploadEnabled': False,
+    'toolkit.telemetry.enabled': False,
+    # Memory: no back/forward cache, short history, memory-only cache, fewer processes
+    'browser.sessionhistory.max_total_viewers': 0,
+    'browser.sessionhistory.max_entries': 2,
+    'browser.cache.disk.enable': False,
+    'browser.cache.memory.capacity': 65536,
+    'dom.ipc.processCount': 1,
+    'fission.autostart': False,
+}
+
+# Images are only blocked when the session is not also used to print PDFs
+BLOCK_IMAGE_PREFS = {
+    'permissions.default.image': 2,
+}
+
+_PAC_TEMPLATE = """function FindProxyForURL(url, host) {
+    var blocked = %(blocked)s, allowed = %(allowed)s;
+    host = host.toLowerCase();
+    function under(domain) { return host === domain || dnsDomainIs(host, '.' + domain); }
+    for (var i = 0; i < blocked.length; i++) { if (under(blocked[i])) { return '%(blackhole)s'; } }
+    if (isPlainHostName(host) || host === '127.0.0.1' || host === '[::1]') { return 'DIRECT'; }
+    for (var j = 0; j < allowed.length; j++) { if (under(allowed[j])) { return 'DIRECT'; } }
+    return '%(blackhole)s';
+}
+"""
+
+
+def site_host(base_url: str) -> str:
+    """Host name of a URL, lower-cased (an IP address is returned as it is)."""
+    return (urlparse(base_url).hostname or '').lower()
+
+
+def allowed_hosts_for(base_url: str, extra_hosts: Iterable[str] = ()) -> Tuple[str, ...]:
+    """Allow-list for a crawl: the site's host, the default asset domains and any extras."""
+    hosts = [site_host(base_url)] + list(DEFAULT_ALLOWED_HOSTS) + [h.strip().lower() for h in extra_hosts]
+    return tuple(dict.fromkeys(host.lstrip('.') for host in hosts if host))
+
+
+def build_pac_script(allowed_hosts: Iterable[str], blocked_hosts: Iterable[str] = TRACKER_HOSTS) -> str:
+    """PAC script sending allowed hosts direct and everything else to a dead proxy."""
+    return _PAC_TEMPLATE % {
+        'allowed': json.dumps(list(allowed_hosts)),
+        'blocked': json.dumps(list(blocked_hosts)),
+        'blackhole': BLACKHOLE_PROXY,
+    }
+
+
+def lean_profile_prefs(base_url: str, extra_allowed_hosts: Iterable[str] = (),
+                       block_images: bool = True) -> Dict[str, object]:
+    """All Firefox preferences of the lean profile for crawling ``base_url``."""
+    prefs = dict(LEAN_PREFS)
+    if block_images:
+        prefs.update(BLOCK_IMAGE_PREFS)
+    else:
+        # The session also prints PDFs, which need the page's fonts
+        prefs.pop('gfx.downloadable_fonts.enabled')
+        prefs.pop('browser.display.use_document_fonts')
+    pac = build_pac_script(allowed_hosts_for(base_url, extra_allowed_hosts))
+    prefs.update({
+        'network.proxy.type': 2,
+        'network.proxy.autoconfig_url':
+            'data:application/x-ns-proxy-autoconfig;base64,' + base64.b64encode(pac.encode()).decode('ascii'),
+        'network.proxy.failover_direct': False,
+        'network.proxy.allow_hijacking_localhost': False,
+    })
+    return prefs
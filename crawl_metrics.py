@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Per-stage crawl metrics for the UE5 Documentation Scraper
+
+Records a latency histogram for every stage of the page pipeline (sitemap
+fetch, rate limiter wait, browser startup and wait, navigation, readiness
+wait, page_source transfer, in-browser extraction, parsing, cleaning,
+extraction, mkdir, PDF render and write) plus free-form counters. All
+methods are thread-safe so crawl workers and render callbacks can record
+into the same instance.
+
+Histograms use logarithmic buckets, so memory stays constant however many
+pages are crawled while percentiles stay within a few percent. A snapshot
+can be logged in the completion summary and written to a JSON file.
+"""
+
+import json
+import math
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+
+# Pipeline stages in the order they are reported
+STAGES = (
+    'sitemap_fetch',
+    'rate_limit_wait',
+    'http_fetch',
+    'driver_start',
+    'driver_wait',
+    'navigation',
+    'readiness_wait',
+    'page_source',
+    'browser_extract',
+    'parse',
+    'clean',
+    'extract',
+    'mkdir',
+    'pdf_render',
+    'write',
+    'page_total',
+)
+
+# Counter incremented once per processed page; used for per-1,000-page costs
+PAGES_COUNTER = 'pages_processed'
+
+_MIN_SECONDS = 0.0001
+_BUCKET_GROWTH = 1.1
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram (bucket width 10%, constant memory)."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max = 0.0
+        self._buckets: Dict[int, int] = {}
+
+    @staticmethod
+    def _bucket_index(seconds: float) -> int:
+        if seconds <= _MIN_SECONDS:
+            return 0
+        return int(math.log(seconds / _MIN_SECONDS, _BUCKET_GROWTH)) + 1
+
+    @staticmethod
+    def _bucket_value(index: int) -> float:
+        """Geometric midpoint of a bucket."""
+        if index == 0:
+            return _MIN_SECONDS
+        return _MIN_SECONDS * _BUCKET_GROWTH ** (index - 0.5)
+
+    def record(self, seconds: float):
+        seconds = max(0.0, seconds)
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = max(self.max, seconds)
+        index = self._bucket_index(seconds)
+        self._buckets[index] = self._buckets.get(index, 0) + 1
+
+    def percentile(self, percent: float) -> float:
+        """Approximate percentile (0-100), clamped to the observed min/max."""
+        if not self.count:
+            return 0.0
+        rank = percent / 100.0 * self.count
+        seen = 0
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if seen >= rank:
+                return min(max(self._bucket_value(index), self.min), self.max)
+        return self.max
+
+    def as_dict(self, pages: int = 0) -> Dict[str, Any]:
+        result = {
+            'count': self.count,
+            'total_seconds': round(self.total, 4),
+            'mean': round(self.total / self.count, 4) if self.count else 0.0,
+            'min': round(self.min or 0.0, 4),
+            'max': round(self.max, 4),
+            'p50': round(self.percentile(50), 4),
+            'p90': round(self.percentile(90), 4),
+            'p95': round(self.percentile(95), 4),
+            'p99': round(self.percentile(99), 4),
+        }
+        if pages:
+            result['seconds_per_1000_pages'] = round(self.total / pages * 1000, 2)
+        return result
+
+
+class CrawlMetrics:
+    """Thread-safe registry of stage histograms and counters for one crawl."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._counters: Dict[str, int] = {}
+        self.started_at = time.time()
+        self._started = time.monotonic()
+
+    def observe(self, stage: str, seconds: float):
+        """Record one duration for a stage."""
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = LatencyHistogram()
+            histogram.record(seconds)
+
+    @contextmanager
+    def time_stage(self, stage: str) -> Iterator[None]:
+        """Time the enclosed block as one sample of ``stage`` (also when it raises)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def increment(self, name: str, amount: int = 1):
+        """Add to a counter."""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def counter(self, name: str) -> int:
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Percentiles per stage, counters and per-1,000-page stage costs."""
+        with self._lock:
+            pages = self._counters.get(PAGES_COUNTER, 0)
+            ordered = [stage for stage in STAGES if stage in self._histograms]
+            ordered += sorted(stage for stage in self._histograms if stage not in STAGES)
+            return {
+                'started_at': self.started_at,
+                'elapsed_seconds': round(time.monotonic() - self._started, 3),
+                'pages': pages,
+                'stages': {stage: self._histograms[stage].as_dict(pages) for stage in ordered},
+                'counters': dict(sorted(self._counters.items())),
+            }
+
+    def write_json(self, path) -> Path:
+        """Write a snapshot to ``path`` atomically and return the path."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_suffix(path.suffix + '.tmp')
+        temp_path.write_text(json.dumps(self.snapshot(), indent=2), encoding='utf-8')
+        temp_path.replace(path)
+        return path
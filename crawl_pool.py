@@ -0,0 +1,527 @@
+#!/usr/bin/env python3
+"""
+Multi-driver crawl engine for the UE5 Documentation Scraper
+
+This module provides a worker pool that owns several Selenium sessions and
+dispatches URLs to them from a shared queue. Each worker runs the scraper's
+normal per-URL pipeline (scrape_page_content -> create_directory_structure ->
+save_as_pdf) against its own browser, so throughput scales with the number of
+drivers instead of being bound to a single session.
+
+Each worker's session is owned by a DriverSupervisor, which recycles it
+after a number of pages or once its memory grows past a limit. When a page
+fails and the session no longer answers, the session is restarted and the
+URL is put back on the queue. Replacement sessions come from a standby
+pool that launches them in the background ahead of time. Scrapers that
+support it get each worker's first session launched when a page first
+needs the browser, so a crawl served entirely over HTTP starts no browser.
+
+A page attempt that fails with DeferredRetry is held in a delayed retry
+queue until its backoff expires, while the worker moves on to other URLs.
+Workers that have run out of new URLs keep serving due retries until none
+are left.
+
+A page whose outcome is only known later (its PDF is still rendering in a
+background process) is counted in the worker's stats when that job finishes,
+and run() waits for these outcomes before reporting throughput.
+"""
+
+import collections
+import queue
+import threading
+import time
+from concurrent.futures import Future, wait as wait_futures
+from typing import Any, Dict, Iterable, List, Optional
+
+from driver_supervisor import DriverSupervisor, StandbyDriverPool
+from retry_queue import DeferredRetry, DelayedRetryQueue
+
+
+class WorkerStats:
+    """Throughput counters for a single crawl worker."""
+
+    def __init__(self, worker_id: int):
+        self.worker_id = worker_id
+        self.pages_ok = 0
+        self.pages_failed = 0
+        self.retries_deferred = 0
+        self.busy_seconds = 0.0
+        self.started_at = time.monotonic()
+        self.finished_at: Optional[float] = None
+
+    @property
+    def pages_total(self) -> int:
+        return self.pages_ok + self.pages_failed
+
+    @property
+    def wall_seconds(self) -> float:
+        end = self.finished_at if self.finished_at is not None else time.monotonic()
+        return max(end - self.started_at, 0.0)
+
+    @property
+    def pages_per_minute(self) -> float:
+        wall = self.wall_seconds
+        return (self.pages_total / wall * 60.0) if wall > 0 else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'worker_id': self.worker_id,
+            'pages_ok': self.pages_ok,
+            'pages_failed': self.pages_failed,
+            'retries_deferred': self.retries_deferred,
+            'busy_seconds': round(self.busy_seconds, 2),
+            'wall_seconds': round(self.wall_seconds, 2),
+            'pages_per_minute': round(self.pages_per_minute, 2),
+        }
+
+
+class CrawlWorkerPool:
+    """
+    Pool of crawl workers, each bound to its own WebDriver session.
+
+    The pool is driven by a scraper object that provides:
+    - ``driver``: the primary session, reused by worker 0
+    - ``primary_driver`` and ``_bind_driver_source(source)`` (optional): the
+      primary session without launching it, and a hook making
+      ``scraper.driver`` call ``source()`` to launch the calling thread's
+      session on first use; with these, sessions start on demand
+    - ``_create_driver()``: returns a new, fully configured session (health
+      checks call its ``execute_script``)
+    - ``_bind_worker_driver(driver)``: makes ``scraper.driver`` resolve to
+      ``driver`` on the calling thread
+    - ``_bind_worker_identity(worker_id)`` (optional): tells the scraper
+      which worker the calling thread is (None to unbind), e.g. to pick the
+      worker's user agent before its session is created; standby sessions
+      are then launched for a given worker with ``_create_driver(worker_id)``
+    - ``_process_url(url, index, total)``: runs the per-URL pipeline and
+      returns True on success (or a Future resolving to it when the outcome
+      is decided later), or raises DeferredRetry to have the URL retried
+      after a delay
+    - ``logger``: a CrossPlatformLogger
+    - ``uses_browser`` (optional): False when pages are fetched without
+      Selenium, in which case no sessions are created
+    - ``driver_max_pages`` / ``driver_max_rss_mb`` (optional): recycle a
+      session after that many pages / above that much browser memory
+    - ``driver_standby`` (optional): number of replacement sessions to keep
+      launched in the background, per worker when sessions are per-worker
+      (default 0)
+    - ``metrics`` (optional): CrawlMetrics receiving recycle counters
+
+    URLs are consumed lazily from any iterable, so a streaming producer can
+    start feeding workers before the full URL list is known.
+    """
+
+    def __init__(self, scraper, worker_count: int = 1, queue_size: int = 0):
+        """
+        Initialize the pool.
+
+        Args:
+            scraper: UE5DocsScraper (or compatible) instance
+            worker_count: Number of concurrent browser sessions
+            queue_size: Maximum number of pending URLs (0 = 4 per worker)
+        """
+        self.scraper = scraper
+        self.logger = scraper.logger
+        self.worker_count = max(1, int(worker_count))
+        self.queue_size = queue_size or self.worker_count * 4
+        self.stats: List[WorkerStats] = []
+        self._queue: "queue.Queue" = queue.Queue(maxsize=self.queue_size)
+        self._stop_event = threading.Event()
+        self._supervisors: Dict[int, DriverSupervisor] = {}
+        self._standby: Optional[StandbyDriverPool] = None
+        # URLs whose session died under them, retried before new queue items
+        self.max_requeues = 1
+        self._retry: "collections.deque" = collections.deque()
+        self._requeue_counts: Dict[str, int] = {}
+        self._requeue_lock = threading.Lock()
+        # URLs waiting out a retry backoff
+        self._deferred = DelayedRetryQueue()
+        # Outcomes still to be counted, e.g. of pages whose PDF is rendering
+        self._pending: set = set()
+        self._stats_lock = threading.Lock()
+
+    def stop(self):
+        """Ask workers to finish their current URL and exit."""
+        self._stop_event.set()
+
+    def run(self, urls: Iterable[str], total: Optional[int] = None) -> List[WorkerStats]:
+        """
+        Crawl all URLs with the configured number of workers.
+
+        Args:
+            urls: Iterable of URLs to process
+            total: Number of URLs if known (used for progress messages)
+
+        Returns:
+            Per-worker statistics
+        """
+        if total is None and hasattr(urls, '__len__'):
+            total = len(urls)
+
+        self.stats = [WorkerStats(worker_id) for worker_id in range(self.worker_count)]
+        workers = [
+            threading.Thread(
+                target=self._worker_loop,
+                args=(stats,),
+                name=f"crawl-worker-{stats.worker_id}",
+                daemon=True
+            )
+            for stats in self.stats
+        ]
+
+        self.logger.log_info(
+            f"Starting crawl worker pool with {self.worker_count} worker(s)",
+            context={'queue_size': self.queue_size, 'total_urls': total}
+        )
+
+        standby_size = getattr(self.scraper, 'driver_standby', 0)
+        if getattr(self.scraper, 'uses_browser', True) and standby_size:
+            self._standby = StandbyDriverPool(
+                self.scraper._create_driver,
+                self.logger,
+                size=standby_size,
+                metrics=getattr(self.scraper, 'metrics', None)
+            )
+            # On demand, standby sessions start with the first worker session
+            if not self._on_demand:
+                self._start_standby()
+
+        for worker in workers:
+            worker.start()
+
+        try:
+            self._produce(urls, total)
+            for worker in workers:
+                while worker.is_alive():
+                    worker.join(timeout=0.5)
+            with self._stats_lock:
+                pending = list(self._pending)
+            wait_futures(pending)
+        except KeyboardInterrupt:
+            self.logger.log_warning("Crawl interrupted, waiting for workers to finish their current page")
+            self.stop()
+            self._drain_queue()
+            for worker in workers:
+                worker.join(timeout=60)
+            raise
+        finally:
+            if self._standby is not None:
+                self._standby.close()
+                self._standby = None
+            self._log_throughput()
+            if self._retry:
+                self.logger.log_warning(
+                    f"{len(self._retry)} re-queued URL(s) were not retried because no worker was left",
+                    context={'urls': [item[1] for item in list(self._retry)[:10]]}
+                )
+            pending = self._deferred.clear()
+            if pending:
+                self.logger.log_warning(
+                    f"{len(pending)} deferred retry URL(s) were not retried because the crawl stopped",
+                    context={'urls': [item[1] for item in pending[:10]]}
+                )
+
+        return self.stats
+
+    def _produce(self, urls: Iterable[str], total: Optional[int]):
+        """Feed URLs into the shared queue, then one sentinel per worker."""
+        for index, url in enumerate(urls, 1):
+            if self._stop_event.is_set():
+                break
+            self._put((index, url, total))
+        for _ in range(self.worker_count):
+            self._put(None)
+
+    def _put(self, item):
+        """Blocking put that stays responsive to stop requests."""
+        while True:
+            try:
+                self._queue.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                if self._stop_event.is_set() and item is not None:
+                    return
+                if not any(stats.finished_at is None for stats in self.stats):
+                    # Every worker has exited (e.g. all drivers failed to start)
+                    return
+
+    def _drain_queue(self):
+        """Discard pending URLs so workers see their sentinels promptly."""
+        self._deferred.clear()
+        try:
+            while True:
+                self._queue.get_nowait()
+        except queue.Empty:
+            pass
+        for _ in range(self.worker_count):
+            try:
+                self._queue.put_nowait(None)
+            except queue.Full:
+                break
+
+    def _next_item(self, draining: bool = False):
+        """
+        Next URL to crawl: re-queued URLs first, then deferred retries that are
+        due, then the shared queue. A draining worker (one that has received its
+        sentinel) only waits for deferred retries and gets None once there are none.
+        """
+        while True:
+            try:
+                return self._retry.popleft()
+            except IndexError:
+                pass
+            item, wait = self._deferred.pop_due()
+            if item is not None:
+                return item
+            if draining:
+                if wait is None or self._stop_event.is_set():
+                    return None
+                time.sleep(min(wait, 0.5))
+                continue
+            try:
+                return self._queue.get(timeout=min(wait, 0.5) if wait is not None else 0.5)
+            except queue.Empty:
+                continue
+
+    def _defer(self, item, retry: DeferredRetry):
+        """Hold a URL until its retry backoff has expired."""
+        self._deferred.push(item, retry.delay)
+        self.logger.log_info(
+            f"Deferred retry of URL in {retry.delay:.1f}s ({retry.error_class})",
+            context={'url': item[1], 'pending_retries': len(self._deferred)}
+        )
+
+    def _requeue(self, item) -> bool:
+        """Put a URL back for another attempt unless it has been re-queued too often."""
+        url = item[1]
+        with self._requeue_lock:
+            count = self._requeue_counts.get(url, 0)
+            if count >= self.max_requeues:
+                return False
+            self._requeue_counts[url] = count + 1
+        self._retry.append(item)
+        metrics = getattr(self.scraper, 'metrics', None)
+        if metrics is not None:
+            metrics.increment('urls_requeued')
+        return True
+
+    @property
+    def _on_demand(self) -> bool:
+        """Whether the scraper launches worker sessions on first use."""
+        return hasattr(self.scraper, '_bind_driver_source')
+
+    def _bind_identity(self, worker_id: Optional[int]):
+        """Bind the calling thread's worker id in the scraper, if it wants one."""
+        bind = getattr(self.scraper, '_bind_worker_identity', None)
+        if bind is not None:
+            bind(worker_id)
+
+    @property
+    def _per_worker_sessions(self) -> bool:
+        """Whether sessions belong to one worker (launched with its identity)."""
+        return hasattr(self.scraper, '_bind_worker_identity')
+
+    def _start_standby(self):
+        # Per-worker sessions: each worker gets its own standby sessions
+        keys = range(self.worker_count) if self._per_worker_sessions else None
+        self._standby.start(keys)
+
+    def _primary_driver(self):
+        return self.scraper.primary_driver if self._on_demand else self.scraper.driver
+
+    def _launch(self, supervisor: DriverSupervisor):
+        """Start a worker's first session (called by the scraper when a page needs it)."""
+        if self._standby is not None:
+            self._start_standby()
+        return supervisor.driver
+
+    def _acquire_driver(self, worker_id: int):
+        """
+        Return the WebDriver session for a worker, creating it if needed. With an
+        on-demand scraper, returns None and binds a source that launches it later.
+        """
+        if not getattr(self.scraper, 'uses_browser', True):
+            return None
+        supervisor = DriverSupervisor(
+            self.scraper._create_driver,
+            self.logger,
+            # Worker 0 adopts the scraper's primary session
+            driver=self._primary_driver() if worker_id == 0 else None,
+            max_pages=getattr(self.scraper, 'driver_max_pages', 0),
+            max_rss_mb=getattr(self.scraper, 'driver_max_rss_mb', 0),
+            metrics=getattr(self.scraper, 'metrics', None),
+            name=f"worker {worker_id}",
+            standby=self._standby,
+            standby_key=worker_id if self._per_worker_sessions else None
+        )
+        self._supervisors[worker_id] = supervisor
+        if self._on_demand and not supervisor.sessions_started:
+            self.scraper._bind_driver_source(lambda: self._launch(supervisor))
+            return None
+        return supervisor.driver
+
+    def _release_driver(self, worker_id: int):
+        """Quit a worker-owned driver (the primary session is handed back to the scraper)."""
+        supervisor = self._supervisors.pop(worker_id, None)
+        if supervisor is None:
+            return
+        if worker_id == 0:
+            driver = supervisor.detach()
+            if driver is not None and driver is not self._primary_driver():
+                self.scraper.driver = driver
+            return
+        try:
+            supervisor.close()
+        except Exception as e:
+            self.logger.log_warning(f"Error closing driver for worker {worker_id}: {e}")
+
+    def _restart_unhealthy(self, worker_id: int, item, requeue: bool = True) -> bool:
+        """
+        After a failed page, restart the worker's session if it is dead or hung
+        and re-queue the URL (unless a deferred retry is already pending for it).
+        Returns False when no new session could be started.
+        """
+        supervisor = self._supervisors.get(worker_id)
+        if supervisor is None or supervisor.is_healthy():
+            return True
+        try:
+            driver = supervisor.restart('unhealthy')
+        except Exception as e:
+            self.logger.log_error(
+                f"Worker {worker_id} could not restart its browser session and will stop",
+                exception=e,
+                operation="crawl_worker_restart",
+                context={'worker_id': worker_id}
+            )
+            return False
+        self.scraper._bind_worker_driver(driver)
+        if requeue and self._requeue(item):
+            self.logger.log_info(
+                f"Re-queued URL after browser restart on worker {worker_id}",
+                context={'url': item[1]}
+            )
+        return True
+
+    def _worker_loop(self, stats: WorkerStats):
+        """Main loop for a single worker thread."""
+        worker_id = stats.worker_id
+        self._bind_identity(worker_id)
+        try:
+            driver = self._acquire_driver(worker_id)
+        except Exception as e:
+            self.logger.log_error(
+                f"Worker {worker_id} could not start a browser session and will not take URLs",
+                exception=e,
+                operation="crawl_worker_start",
+                context={'worker_id': worker_id}
+            )
+            stats.finished_at = time.monotonic()
+            self._bind_identity(None)
+            return
+
+        self.scraper._bind_worker_driver(driver)
+        stats.started_at = time.monotonic()
+
+        try:
+            draining = False
+            while True:
+                item = self._next_item(draining)
+                if item is None:
+                    if draining:
+                        break
+                    # Out of new URLs; stay to serve deferred retries
+                    draining = True
+                    continue
+                if self._stop_event.is_set():
+                    continue
+
+                supervisor = self._supervisors.get(worker_id)
+                if supervisor is not None:
+                    try:
+                        if supervisor.maintain():
+                            self.scraper._bind_worker_driver(supervisor.driver)
+                    except Exception as e:
+                        self.logger.log_error(
+                            f"Worker {worker_id} could not recycle its browser session and will stop",
+                            exception=e,
+                            operation="crawl_worker_recycle",
+                            context={'worker_id': worker_id}
+                        )
+                        self._retry.append(item)
+                        break
+
+                index, url, total = item
+                page_start = time.monotonic()
+                deferred = None
+                try:
+                    ok = self.scraper._process_url(url, index, total)
+                except DeferredRetry as retry:
+                    ok = False
+                    deferred = retry
+                except KeyboardInterrupt:
+                    self._stop_event.set()
+                    break
+                except Exception as e:
+                    ok = False
+                    self.logger.log_error(
+                        f"Worker {worker_id} failed to process URL",
+                        exception=e,
+                        operation="crawl_worker",
+                        url=url,
+                        context={'worker_id': worker_id}
+                    )
+                stats.busy_seconds += time.monotonic() - page_start
+                if deferred is not None:
+                    stats.retries_deferred += 1
+                    self._defer(item, deferred)
+                elif isinstance(ok, Future):
+                    self._count_later(stats, ok)
+                else:
+                    self._count_page(stats, ok)
+                if supervisor is not None:
+                    supervisor.page_done()
+                    if not ok and not self._restart_unhealthy(worker_id, item, requeue=deferred is None):
+                        break
+        finally:
+            stats.finished_at = time.monotonic()
+            self.scraper._bind_worker_driver(None)
+            if self._on_demand:
+                self.scraper._bind_driver_source(None)
+            self._release_driver(worker_id)
+            self._bind_identity(None)
+
+    def _count_page(self, stats: WorkerStats, ok: bool):
+        with self._stats_lock:
+            if ok:
+                stats.pages_ok += 1
+            else:
+                stats.pages_failed += 1
+
+    def _count_later(self, stats: WorkerStats, outcome: Future):
+        """Count a page in the worker's stats once its outcome is known."""
+        def on_done(future):
+            ok = not future.cancelled() and future.exception() is None and bool(future.result())
+            self._count_page(stats, ok)
+            with self._stats_lock:
+                self._pending.discard(future)
+
+        with self._stats_lock:
+            self._pending.add(outcome)
+        outcome.add_done_callback(on_done)
+
+    def _log_throughput(self):
+        """Log per-worker and aggregate throughput."""
+        if not self.stats:
+            return
+        for stats in self.stats:
+            self.logger.log_info(
+                f"Worker {stats.worker_id} throughput: {stats.pages_per_minute:.1f} pages/min",
+                context=stats.as_dict()
+            )
+        total_pages = sum(stats.pages_total for stats in self.stats)
+        wall = max(stats.wall_seconds for stats in self.stats)
+        aggregate = (total_pages / wall * 60.0) if wall > 0 else 0.0
+        self.logger.log_info(
+            f"Crawl pool throughput: {aggregate:.1f} pages/min across {self.worker_count} worker(s)",
+            context={'pages': total_pages, 'wall_seconds': round(wall, 2)}
+        )
@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+Persistent crawl state for the UE5 Documentation Scraper
+
+Stores the status of every URL (attempts, output path, content hash and
+timings) in a SQLite database so an interrupted crawl can resume where it
+stopped. Writes are buffered and flushed in batches inside one transaction,
+with the database in WAL mode, so recording state costs almost nothing per
+page. The full table is mirrored in memory, so lookups such as
+``is_completed()`` are O(1) dictionary hits that never touch the disk.
+
+For incremental re-crawls each record also keeps the sitemap ``<lastmod>``
+and the HTTP validators (ETag, Last-Modified) seen when the page was saved.
+
+A URL whose page duplicates another one is stored as done with
+``canonical_url`` pointing at the URL that owns the output; ``manifest()``
+maps every saved URL to its canonical output.
+"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+
+STATUS_PENDING = 'pending'
+STATUS_IN_PROGRESS = 'in_progress'
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+STATUS_REMOVED = 'removed'
+
+_COLUMNS = (
+    'url', 'status', 'attempts', 'output_path', 'content_hash',
+    'started_at', 'finished_at', 'duration_seconds', 'error', 'updated_at',
+    'lastmod', 'etag', 'last_modified', 'canonical_url'
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS urls (
+    url TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    output_path TEXT,
+    content_hash TEXT,
+    started_at REAL,
+    finished_at REAL,
+    duration_seconds REAL,
+    error TEXT,
+    updated_at REAL,
+    lastmod TEXT,
+    etag TEXT,
+    last_modified TEXT,
+    canonical_url TEXT
+)
+"""
+
+# Columns added after the first schema version, created on open if missing
+_ADDED_COLUMNS = {
+    'lastmod': 'TEXT',
+    'etag': 'TEXT',
+    'last_modified': 'TEXT',
+    'canonical_url': 'TEXT'
+}
+
+
+def read_status(db_path) -> Optional[Dict[str, Any]]:
+    """
+    Summarize a crawl state database without loading it or writing to it.
+
+    Returns None when the database does not exist, else a dict with
+    'counts' (URLs per status; URLs left in progress count as pending, as
+    they are retried on resume), 'aliases' (done URLs recorded as duplicates
+    of another URL) and 'updated_at' (time of the last change, or None).
+    """
+    path = Path(db_path)
+    if not path.exists():
+        return None
+    conn = sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True)
+    try:
+        counts: Dict[str, int] = {}
+        for status, count in conn.execute("SELECT status, COUNT(*) FROM urls GROUP BY status"):
+            if status == STATUS_IN_PROGRESS:
+                status = STATUS_PENDING
+            counts[status] = counts.get(status, 0) + count
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(urls)")}
+        aliases = 0
+        if 'canonical_url' in columns:
+            aliases = conn.execute(
+                "SELECT COUNT(*) FROM urls WHERE canonical_url IS NOT NULL"
+            ).fetchone()[0]
+        updated_at = conn.execute("SELECT MAX(updated_at) FROM urls").fetchone()[0]
+    finally:
+        conn.close()
+    return {'counts': counts, 'aliases': aliases, 'updated_at': updated_at}
+
+
+class CrawlStateStore:
+    """
+    SQLite-backed record of per-URL crawl state.
+
+    All methods are thread-safe. Changes are kept in memory immediately and
+    written to disk when ``batch_size`` changes have accumulated, when
+    ``flush_interval`` seconds have passed since the last write, or when
+    ``flush()``/``close()`` is called.
+    """
+
+    def __init__(self,
+                 db_path,
+                 batch_size: int = 50,
+                 flush_interval: float = 2.0,
+                 read_only: bool = False):
+        """
+        Open (or create) a crawl state database.
+
+        Args:
+            db_path: Path to the SQLite file
+            batch_size: Number of buffered changes that triggers a flush
+            flush_interval: Maximum seconds between flushes while recording
+            read_only: Load an existing database without ever writing to it; a
+                missing one is not created. Recorded changes stay in memory
+        """
+        self.db_path = Path(db_path)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.read_only = read_only
+
+        self._lock = threading.RLock()
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._dirty: Dict[str, Dict[str, Any]] = {}
+        self._last_flush = time.monotonic()
+
+        if read_only:
+            self._conn = None
+            if self.db_path.exists():
+                self._conn = sqlite3.connect(f"{self.db_path.resolve().as_uri()}?mode=ro",
+                                             uri=True, check_same_thread=False)
+                self._load()
+            return
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_SCHEMA)
+        self._migrate()
+        self._conn.commit()
+        self._load()
+
+    def _migrate(self):
+        """Add columns missing from databases created by older versions."""
+        existing = {row[1] for row in self._conn.execute("PRAGMA table_info(urls)")}
+        for column, column_type in _ADDED_COLUMNS.items():
+            if column not in existing:
+                self._conn.execute(f"ALTER TABLE urls ADD COLUMN {column} {column_type}")
+
+    def _load(self):
+        """Mirror the database into memory."""
+        # A read-only store cannot migrate, so columns of newer versions may be missing
+        existing = {row[1] for row in self._conn.execute("PRAGMA table_info(urls)")}
+        columns = [column for column in _COLUMNS if column in existing]
+        cursor = self._conn.execute(f"SELECT {', '.join(columns)} FROM urls")
+        for row in cursor:
+            record = dict.fromkeys(_COLUMNS)
+            record.update(zip(columns, row))
+            # A URL that was mid-flight when the previous run died gets retried
+            if record['status'] == STATUS_IN_PROGRESS:
+                record['status'] = STATUS_PENDING
+            self._records[record['url']] = record
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the record for a URL, or None."""
+        with self._lock:
+            record = self._records.get(url)
+            return dict(record) if record else None
+
+    def is_completed(self, url: str) -> bool:
+        """O(1) check whether a URL was already saved successfully."""
+        record = self._records.get(url)
+        return record is not None and record['status'] == STATUS_DONE
+
+    def completed_urls(self) -> Iterable[str]:
+        """URLs recorded as done."""
+        with self._lock:
+            return [url for url, record in self._records.items() if record['status'] == STATUS_DONE]
+
+    def completed_records(self) -> Iterable[Dict[str, Any]]:
+        """Copies of the records of URLs recorded as done."""
+        with self._lock:
+            return [dict(record) for record in self._records.values() if record['status'] == STATUS_DONE]
+
+    def status_counts(self) -> Dict[str, int]:
+        """Number of URLs per status."""
+        counts: Dict[str, int] = {}
+        with self._lock:
+            for record in self._records.values():
+                counts[record['status']] = counts.get(record['status'], 0) + 1
+        return counts
+
+    def _update(self, url: str, **fields):
+        """Apply changes to a record and schedule it for the next flush."""
+        with self._lock:
+            record = self._records.get(url)
+            if record is None:
+                record = {column: None for column in _COLUMNS}
+                record.update(url=url, status=STATUS_PENDING, attempts=0)
+                self._records[url] = record
+            record.update(fields)
+            record['updated_at'] = time.time()
+            self._dirty[url] = record
+
+            if (len(self._dirty) >= self.batch_size or
+                    time.monotonic() - self._last_flush >= self.flush_interval):
+                self.flush()
+
+    def record_start(self, url: str):
+        """Mark a URL as being processed and count the attempt."""
+        with self._lock:
+            attempts = (self._records.get(url) or {}).get('attempts') or 0
+            self._update(
+                url,
+                status=STATUS_IN_PROGRESS,
+                attempts=attempts + 1,
+                started_at=time.time(),
+                finished_at=None,
+                error=None
+            )
+
+    def record_success(self,
+                       url: str,
+                       output_path: Optional[str] = None,
+                       content_hash: Optional[str] = None,
+                       duration_seconds: Optional[float] = None,
+                       lastmod: Optional[str] = None,
+                       etag: Optional[str] = None,
+                       last_modified: Optional[str] = None):
+        """Mark a URL as done, along with the validators it was saved under."""
+        self._update(
+            url,
+            status=STATUS_DONE,
+            output_path=output_path,
+            content_hash=content_hash,
+            finished_at=time.time(),
+            duration_seconds=duration_seconds,
+            error=None,
+            lastmod=lastmod,
+            etag=etag,
+            last_modified=last_modified,
+            canonical_url=None
+        )
+
+    def record_alias(self,
+                     url: str,
+                     canonical_url: str,
+                     output_path: Optional[str] = None,
+                     content_hash: Optional[str] = None,
+                     duration_seconds: Optional[float] = None,
+                     lastmod: Optional[str] = None,
+                     etag: Optional[str] = None,
+                     last_modified: Optional[str] = None):
+        """Mark a URL as done because its page is saved under ``canonical_url``."""
+        self._update(
+            url,
+            status=STATUS_DONE,
+            canonical_url=canonical_url,
+            output_path=output_path,
+            content_hash=content_hash,
+            finished_at=time.time(),
+            duration_seconds=duration_seconds,
+            error=None,
+            lastmod=lastmod,
+            etag=etag,
+            last_modified=last_modified
+        )
+
+    def manifest(self) -> Dict[str, Dict[str, Optional[str]]]:
+        """
+        Map every done URL to the URL owning its output and that output's path.
+        Alias chains are followed; an alias whose owner is not done has no path.
+        """
+        with self._lock:
+            entries = {}
+            for url, record in self._records.items():
+                if record['status'] != STATUS_DONE:
+                    continue
+                canonical, owner, seen = url, record, {url}
+                while owner is not None and owner.get('canonical_url') and owner['canonical_url'] not in seen:
+                    canonical = owner['canonical_url']
+                    seen.add(canonical)
+                    owner = self._records.get(canonical)
+                done = owner is not None and owner['status'] == STATUS_DONE
+                entries[url] = {
+                    'canonical_url': canonical,
+                    'output_path': owner['output_path'] if done else None
+                }
+            return entries
+
+    def record_unchanged(self,
+                         url: str,
+                         lastmod: Optional[str] = None,
+                         etag: Optional[str] = None,
+                         last_modified: Optional[str] = None):
+        """Keep a done URL as-is after a re-crawl found it unchanged, refreshing its validators."""
+        with self._lock:
+            record = self._records.get(url) or {}
+            self._update(
+                url,
+                status=STATUS_DONE,
+                finished_at=time.time(),
+                error=None,
+                lastmod=lastmod or record.get('lastmod'),
+                etag=etag or record.get('etag'),
+                last_modified=last_modified or record.get('last_modified')
+            )
+
+    def mark_removed(self, urls: Iterable[str]) -> int:
+        """Mark URLs that have disappeared from the site; returns how many changed."""
+        removed = 0
+        with self._lock:
+            for url in urls:
+                record = self._records.get(url)
+                if record is not None and record['status'] != STATUS_REMOVED:
+                    self._update(url, status=STATUS_REMOVED)
+                    removed += 1
+        return removed
+
+    def record_failure(self,
+                       url: str,
+                       error: Optional[str] = None,
+                       duration_seconds: Optional[float] = None):
+        """Mark a URL as failed."""
+        self._update(
+            url,
+            status=STATUS_FAILED,
+            finished_at=time.time(),
+            duration_seconds=duration_seconds,
+            error=error
+        )
+
+    def flush(self):
+        """Write all buffered changes in a single transaction."""
+        with self._lock:
+            self._last_flush = time.monotonic()
+            if not self._dirty or self._conn is None or self.read_only:
+                return
+            rows = [tuple(record[column] for column in _COLUMNS) for record in self._dirty.values()]
+            placeholders = ', '.join('?' for _ in _COLUMNS)
+            updates = ', '.join(f"{column}=excluded.{column}" for column in _COLUMNS[1:])
+            with self._conn:
+                self._conn.executemany(
+                    f"INSERT INTO urls ({', '.join(_COLUMNS)}) VALUES ({placeholders}) "
+                    f"ON CONFLICT(url) DO UPDATE SET {updates}",
+                    rows
+                )
+            self._dirty.clear()
+
+    def reset(self):
+        """Forget all recorded state (used for a fresh, non-resumed crawl)."""
+        with self._lock:
+            self._records.clear()
+            self._dirty.clear()
+            if self._conn is None or self.read_only:
+                return
+            with self._conn:
+                self._conn.execute("DELETE FROM urls")
+
+    def close(self):
+        """Flush pending changes and close the database."""
+        with self._lock:
+            if self._conn is None:
+                return
+            self.flush()
+            self._conn.close()
+            self._conn = None
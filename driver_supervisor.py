@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""
+WebDriver session supervision for the UE5 Documentation Scraper
+
+A Firefox session that lives for a multi-hour crawl keeps growing until
+page loads start timing out. ``DriverSupervisor`` owns one worker's session
+and replaces it:
+
+- after a configurable number of pages
+- when the browser's resident memory (geckodriver plus all Firefox
+  processes) crosses a threshold
+- when the session is dead or hung, i.e. a trivial ``execute_script`` raises
+  or does not answer within a few seconds
+
+A hung browser cannot be relied on to honour ``quit()``, so sessions are
+shut down with a deadline, and the process tree is killed if the deadline
+passes.
+
+Starting Firefox takes several seconds. ``StandbyDriverPool`` launches
+replacement sessions on a background thread ahead of time, so a recycle or
+crash swaps in a ready session instead of stalling the worker. Launch time
+is recorded as the ``driver_start`` stage. The time workers actually wait
+for a session is recorded as ``driver_wait``. When sessions are not
+interchangeable (each worker presents its own user agent), the pool keeps
+sessions ready for every worker and launches each replacement for the worker
+that will take it.
+"""
+
+import collections
+import threading
+import time
+from typing import Any, Callable, Iterable, Optional, Tuple
+
+
+def _call_with_timeout(func: Callable[[], Any], timeout: float) -> Tuple[bool, Any]:
+    """
+    Run ``func`` on a daemon thread and wait at most ``timeout`` seconds.
+
+    Returns (finished, result_or_exception). A call that is still running
+    after the deadline is abandoned; its thread ends when the call finally
+    returns or the session is killed.
+    """
+    outcome = {}
+    done = threading.Event()
+
+    def target():
+        try:
+            outcome['result'] = func()
+        except BaseException as e:  # reported to the caller, never raised on this thread
+            outcome['error'] = e
+        finally:
+            done.set()
+
+    threading.Thread(target=target, name="driver-call", daemon=True).start()
+    if not done.wait(timeout):
+        return False, None
+    if 'error' in outcome:
+        return True, outcome['error']
+    return True, outcome.get('result')
+
+
+def driver_processes(driver) -> list:
+    """geckodriver and every browser process it started (empty if unknown)."""
+    try:
+        pid = driver.service.process.pid
+    except AttributeError:
+        return []
+    import psutil
+    try:
+        root = psutil.Process(pid)
+        return [root] + root.children(recursive=True)
+    except psutil.Error:
+        return []
+
+
+def driver_rss_mb(driver) -> float:
+    """Combined resident memory of a session's processes in MB."""
+    import psutil
+    total = 0
+    for process in driver_processes(driver):
+        try:
+            total += process.memory_info().rss
+        except psutil.Error:
+            pass
+    return total / (1024 ** 2)
+
+
+def quit_driver(driver, logger, timeout: float = 15.0, name: str = "worker"):
+    """Quit a session within ``timeout`` seconds, killing its processes if it does not."""
+    processes = driver_processes(driver)
+    finished, result = _call_with_timeout(driver.quit, timeout)
+    if finished and not isinstance(result, BaseException):
+        return
+    import psutil
+    for process in processes:
+        try:
+            process.kill()
+        except psutil.Error:
+            pass
+    logger.log_warning(
+        f"Browser session of {name} did not quit cleanly, killed {len(processes)} process(es)",
+        context={'quit_finished': finished}
+    )
+
+
+class StandbyDriverPool:
+    """
+    Keeps ``size`` sessions launched in the background, ready to replace a recycled one.
+
+    Sessions can be launched for a particular worker (a key) when sessions are
+    not interchangeable, e.g. because each worker presents its own user agent.
+    Keyed pools keep ``size`` sessions ready for each of the ``keys`` given to
+    start(), and launch a replacement for every session a worker takes.
+    """
+
+    def __init__(self, create_driver: Callable[..., Any], logger, size: int = 1,
+                 metrics=None, quit_timeout: float = 15.0):
+        """
+        Initialize the pool (no session is launched before start()).
+
+        Args:
+            create_driver: Factory returning a new, fully configured session; keyed
+                pools call it with the key of the worker the session is for
+            logger: CrossPlatformLogger
+            size: Number of standby sessions to keep ready, per key in a keyed pool
+                (0 = launch on demand)
+            metrics: Optional CrawlMetrics for driver_start and hit/miss counters
+            quit_timeout: Seconds quit() may take when unused sessions are closed
+        """
+        self._create_driver = create_driver
+        self.logger = logger
+        self.size = max(0, int(size))
+        self.metrics = metrics
+        self.quit_timeout = quit_timeout
+        # (key, session) pairs; the key is None in an unkeyed pool
+        self._ready: "collections.deque" = collections.deque()
+        self._building: list = []
+        # Keyed pools: one entry per session still to launch, naming its worker, oldest first
+        self._wanted: "collections.deque" = collections.deque()
+        self._keyed = False
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, keys: Optional[Iterable[Any]] = None):
+        """
+        Start launching standby sessions in the background (only the first call does).
+
+        Args:
+            keys: Workers to prepare sessions for, in order (makes the pool keyed)
+        """
+        with self._condition:
+            if self.size == 0 or self._thread is not None:
+                return
+            if keys is not None:
+                # Every worker's first standby session before anyone's second
+                keys = list(keys)
+                self._keyed = True
+                self._wanted.extend(key for _ in range(self.size) for key in keys)
+            self._thread = threading.Thread(target=self._fill, name="driver-standby", daemon=True)
+        self._thread.start()
+
+    def _launch(self, key=None):
+        start = time.monotonic()
+        driver = self._create_driver() if key is None else self._create_driver(key)
+        if self.metrics is not None:
+            self.metrics.observe('driver_start', time.monotonic() - start)
+        return driver
+
+    def _count(self, name: str):
+        if self.metrics is not None:
+            self.metrics.increment(name)
+
+    def _needs_launch(self) -> bool:
+        if self._keyed:
+            return bool(self._wanted)
+        return len(self._ready) + len(self._building) < self.size
+
+    def _fill(self):
+        """Background loop topping the standby queue up to ``size`` (per key when keyed)."""
+        while True:
+            with self._condition:
+                while not self._closed and not self._needs_launch():
+                    self._condition.wait()
+                if self._closed:
+                    return
+                key = self._wanted.popleft() if self._keyed else None
+                self._building.append(key)
+            try:
+                driver = self._launch(key)
+            except Exception as e:
+                # Replacements are launched on demand from now on
+                self.logger.log_warning(
+                    "Could not launch a standby browser session, replacements will start on demand",
+                    context={'error_type': type(e).__name__, 'error': str(e).splitlines()[0] if str(e) else ''}
+                )
+                self._count('standby_failures')
+                with self._condition:
+                    self._building.remove(key)
+                    self._condition.notify_all()
+                return
+            with self._condition:
+                self._building.remove(key)
+                keep = not self._closed
+                if keep:
+                    self._ready.append((key, driver))
+                self._condition.notify_all()
+            if not keep:
+                quit_driver(driver, self.logger, self.quit_timeout, name="standby")
+                return
+
+    def _take_ready(self, key):
+        for entry in self._ready:
+            if entry[0] == key:
+                self._ready.remove(entry)
+                return entry[1]
+        return None
+
+    def acquire(self, key=None):
+        """
+        A ready session: a standby one if available, else the one being
+        launched, else a new session started on the calling thread.
+
+        Args:
+            key: Worker the session is for (keyed pools only hand out its own sessions)
+        """
+        if not self._keyed:
+            key = None
+        with self._condition:
+            while (not self._closed and key not in (entry[0] for entry in self._ready)
+                   and key in self._building):
+                self._condition.wait()
+            driver = self._take_ready(key)
+            if self._keyed and driver is not None:
+                # Prepare a replacement for the session this worker took; after a miss
+                # the worker's missing session is already queued
+                self._wanted.append(key)
+            # Wake the filler to launch a replacement
+            self._condition.notify_all()
+        if driver is not None:
+            self._count('standby_hits')
+            return driver
+        self._count('standby_misses')
+        return self._launch(key)
+
+    @property
+    def ready_count(self) -> int:
+        """Sessions currently waiting in standby."""
+        with self._condition:
+            return len(self._ready)
+
+    def close(self):
+        """Stop launching sessions and quit the unused standby ones."""
+        with self._condition:
+            self._closed = True
+            drivers = [driver for _, driver in self._ready]
+            self._ready.clear()
+            self._condition.notify_all()
+        for driver in drivers:
+            quit_driver(driver, self.logger, self.quit_timeout, name="standby")
+
+
+class DriverSupervisor:
+    """Owns one worker's WebDriver session and replaces it when it ages, bloats or dies."""
+
+    def __init__(self,
+                 create_driver: Callable[[], Any],
+                 logger,
+                 driver=None,
+                 max_pages: int = 0,
+                 max_rss_mb: float = 0,
+                 rss_check_interval: int = 10,
+                 health_timeout: float = 10.0,
+                 quit_timeout: float = 15.0,
+                 metrics=None,
+                 name: str = "worker",
+                 standby: Optional[StandbyDriverPool] = None,
+                 standby_key=None):
+        """
+        Initialize the supervisor.
+
+        Args:
+            create_driver: Factory returning a new, fully configured session
+            logger: CrossPlatformLogger
+            driver: Existing session to adopt (created lazily when None)
+            max_pages: Recycle after this many pages (0 = never)
+            max_rss_mb: Recycle once the browser's RSS exceeds this (0 = never)
+            rss_check_interval: Pages between RSS measurements
+            health_timeout: Seconds a health probe may take before the session counts as hung
+            quit_timeout: Seconds quit() may take before the process tree is killed
+            metrics: Optional CrawlMetrics for recycle/restart counters
+            name: Label used in log messages
+            standby: Optional StandbyDriverPool supplying replacement sessions
+            standby_key: Key of this worker in a keyed standby pool
+        """
+        self._create_driver = create_driver
+        self.logger = logger
+        self._driver = driver
+        self.max_pages = max(0, int(max_pages or 0))
+        self.max_rss_mb = max(0.0, float(max_rss_mb or 0))
+        self.rss_check_interval = max(1, int(rss_check_interval))
+        self.health_timeout = health_timeout
+        self.quit_timeout = quit_timeout
+        self.metrics = metrics
+        self.name = name
+        self.standby = standby
+        self.standby_key = standby_key
+        self.pages_on_session = 0
+        self.sessions_started = 1 if driver is not None else 0
+        self.last_rss_mb = 0.0
+
+    @property
+    def driver(self):
+        """The current session, started on first use."""
+        if self._driver is None:
+            self._start()
+        return self._driver
+
+    def _start(self):
+        start = time.monotonic()
+        if self.standby is not None and self.sessions_started:
+            # Replacement: take a pre-launched session
+            self._driver = self.standby.acquire(self.standby_key)
+        else:
+            self._driver = self._create_driver()
+            if self.metrics is not None:
+                self.metrics.observe('driver_start', time.monotonic() - start)
+        self.pages_on_session = 0
+        self.sessions_started += 1
+        if self.metrics is not None:
+            self.metrics.observe('driver_wait', time.monotonic() - start)
+
+    def _count(self, name: str):
+        if self.metrics is not None:
+            self.metrics.increment(name)
+
+    def page_done(self):
+        """Record that the current session processed one more page."""
+        self.pages_on_session += 1
+
+    def recycle_reason(self) -> Optional[str]:
+        """Why the session should be replaced before the next page, or None."""
+        if self._driver is None or not self.pages_on_session:
+            return None
+        if self.max_pages and self.pages_on_session >= self.max_pages:
+            return 'max_pages'
+        if self.max_rss_mb and self.pages_on_session % self.rss_check_interval == 0:
+            self.last_rss_mb = driver_rss_mb(self._driver)
+            if self.last_rss_mb > self.max_rss_mb:
+                return 'max_rss'
+        return None
+
+    def maintain(self) -> bool:
+        """Recycle the session if it is due; returns True when a new session was started."""
+        reason = self.recycle_reason()
+        if reason is None:
+            return False
+        self.restart(reason)
+        return True
+
+    def is_healthy(self) -> bool:
+        """True when the session answers a trivial script within health_timeout."""
+        if self._driver is None:
+            return True
+        driver = self._driver
+        finished, result = _call_with_timeout(
+            lambda: driver.execute_script("return document.readyState"), self.health_timeout
+        )
+        if not finished:
+            self.logger.log_warning(
+                f"Browser session of {self.name} is not responding",
+                context={'health_timeout': self.health_timeout}
+            )
+            return False
+        if isinstance(result, BaseException):
+            self.logger.log_warning(
+                f"Browser session of {self.name} failed its health check",
+                context={'error_type': type(result).__name__, 'error': str(result).splitlines()[0] if str(result) else ''}
+            )
+            return False
+        return True
+
+    def restart(self, reason: str):
+        """Shut down the current session and start a new one; returns the new session."""
+        old_pages = self.pages_on_session
+        self._shutdown()
+        self._count('driver_recycles')
+        self._count(f'driver_recycle_{reason}')
+        self.logger.log_info(
+            f"Recycling browser session of {self.name} ({reason})",
+            context={'pages_on_session': old_pages, 'rss_mb': round(self.last_rss_mb, 1) or None}
+        )
+        self._start()
+        return self._driver
+
+    def _shutdown(self):
+        """Quit the current session within quit_timeout, killing its processes if needed."""
+        driver, self._driver = self._driver, None
+        if driver is not None:
+            quit_driver(driver, self.logger, self.quit_timeout, self.name)
+
+    def detach(self):
+        """Hand the current session back to the caller without quitting it."""
+        driver, self._driver = self._driver, None
+        return driver
+
+    def close(self):
+        """Quit the current session."""
+        self._shutdown()
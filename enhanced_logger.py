@@ -4,18 +4,30 @@ Enhanced Cross-Platform Logging Module for UE5 Documentation Scraper
 
 This module provides comprehensive error logging with cross-platform support,
 detailed error information, and structured logging to log.txt file.
+
+With ``async_logging=True`` records are handed to a bounded queue and
+formatted and written by a background thread (QueueHandler/QueueListener),
+so logging never waits on disk or console I/O. Queued records are flushed on
+``close()`` and at interpreter exit.
+
+Memory, CPU and disk figures for the startup banner come from psutil, which
+is imported on first use. Sampling CPU load takes a second, so with
+``background_system_info=True`` these figures are gathered and logged by a
+daemon thread instead of delaying startup.
 """
 
 import os
 import sys
+import atexit
 import logging
 import logging.handlers
 import platform
+import queue
 import traceback
 import json
 import datetime
-import psutil
 import socket
+import threading
 from pathlib import Path
 from typing import Optional, Dict, Any
 from functools import wraps
@@ -33,6 +45,7 @@ class CrossPlatformLogger:
     - Detailed stack traces
     - Error categorization
     - Log rotation
+    - Optional background (queue-based) writing
     """
     
     def __init__(self, 
@@ -41,7 +54,10 @@ class CrossPlatformLogger:
                  max_bytes: int = 10 * 1024 * 1024,  # 10MB
                  backup_count: int = 5,
                  enable_console: bool = True,
-                 enable_json: bool = False):
+                 enable_json: bool = False,
+                 async_logging: bool = False,
+                 queue_size: int = 10000,
+                 background_system_info: bool = False):
         """
         Initialize the enhanced logger.
         
@@ -52,11 +68,21 @@ class CrossPlatformLogger:
             backup_count: Number of backup files to keep
             enable_console: Whether to also log to console
             enable_json: Whether to use JSON format for structured logging
+            async_logging: Whether to format and write records on a background thread
+            queue_size: Maximum queued records in async mode; when full, INFO and
+                DEBUG records are dropped (and counted) instead of blocking
+            background_system_info: Whether memory, CPU and disk figures are
+                gathered on a background thread instead of during __init__
         """
         self.log_file = Path(log_file).resolve()
         self.log_level = log_level
         self.enable_json = enable_json
         self.start_time = datetime.datetime.now()
+        self._process = None
+        self._handlers = []
+        self._queue_handler = None
+        self._listener = None
+        self._system_info_thread = None
         
         # Ensure log directory exists
         self.log_file.parent.mkdir(parents=True, exist_ok=True)
@@ -78,8 +104,12 @@ class CrossPlatformLogger:
         if enable_console:
             self._setup_console_handler()
         
+        # Move the sinks behind a queue so callers never wait on I/O
+        if async_logging:
+            self._start_async_pipeline(queue_size)
+        
         # Log system information at startup
-        self._log_system_info()
+        self._log_system_info(background=background_system_info)
         
         # Setup error categorization
         self.error_categories = {
@@ -122,7 +152,7 @@ class CrossPlatformLogger:
             )
             file_handler.setLevel(self.log_level)
             file_handler.setFormatter(self.file_formatter)
-            self.logger.addHandler(file_handler)
+            self._add_handler(file_handler)
             
         except Exception as e:
             # Fallback to basic file handler if rotation fails
@@ -132,7 +162,7 @@ class CrossPlatformLogger:
             )
             fallback_handler.setLevel(self.log_level)
             fallback_handler.setFormatter(self.file_formatter)
-            self.logger.addHandler(fallback_handler)
+            self._add_handler(fallback_handler)
             print(f"Warning: Could not setup rotating file handler, using basic handler: {e}")
     
     def _setup_console_handler(self):
@@ -140,24 +170,108 @@ class CrossPlatformLogger:
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(self.log_level)
         console_handler.setFormatter(self.console_formatter)
-        self.logger.addHandler(console_handler)
+        self._add_handler(console_handler)
     
-    def _log_system_info(self):
-        """Log comprehensive system information at startup."""
-        system_info = self._gather_system_info()
+    def _add_handler(self, handler: logging.Handler):
+        """Attach an output handler (sink) to the logger."""
+        self._handlers.append(handler)
+        self.logger.addHandler(handler)
+    
+    def _start_async_pipeline(self, queue_size: int):
+        """Route records through a bounded queue to a background listener thread."""
+        log_queue = queue.Queue(maxsize=max(1, queue_size))
+        for handler in self._handlers:
+            self.logger.removeHandler(handler)
+        
+        self._queue_handler = BoundedQueueHandler(log_queue)
+        self._listener = logging.handlers.QueueListener(
+            log_queue, *self._handlers, respect_handler_level=True
+        )
+        self._listener.start()
+        self.logger.addHandler(self._queue_handler)
+        atexit.register(self.close)
+    
+    def set_console_level(self, level: int):
+        """Change the level of console output only (the log file is unaffected)."""
+        for handler in self._handlers:
+            if isinstance(handler, logging.StreamHandler) and not isinstance(handler, logging.FileHandler):
+                handler.setLevel(level)
+    
+    @property
+    def dropped_records(self) -> int:
+        """Number of records dropped because the async queue was full."""
+        return self._queue_handler.dropped if self._queue_handler else 0
+    
+    def flush(self):
+        """Wait until every queued record has been written, then flush the sinks."""
+        if self._listener is not None:
+            self._queue_handler.queue.join()
+        for handler in self._handlers:
+            handler.flush()
+    
+    def close(self):
+        """
+        Flush queued records and stop the background writer.
         
+        The logger stays usable: later records are written synchronously.
+        """
+        if self._listener is None:
+            return
+        listener, self._listener = self._listener, None
+        listener.stop()
+        
+        self.logger.removeHandler(self._queue_handler)
+        for handler in self._handlers:
+            self.logger.addHandler(handler)
+        
+        if self._queue_handler.dropped:
+            self.logger.warning(
+                f"{self._queue_handler.dropped} log records were dropped because the log queue was full"
+            )
+        for handler in self._handlers:
+            try:
+                handler.flush()
+            except (OSError, ValueError):
+                # Stream already closed (e.g. captured stdout at interpreter exit)
+                pass
+    
+    def _log_system_info(self, background: bool = False):
+        """
+        Log comprehensive system information at startup.
+        
+        Args:
+            background: Log the psutil figures from a daemon thread once gathered
+        """
         self.logger.info("=" * 80)
         self.logger.info("UE5 Documentation Scraper - Enhanced Logging Started")
         self.logger.info("=" * 80)
         
-        for key, value in system_info.items():
+        for key, value in self._gather_platform_info().items():
             self.logger.info(f"System {key}: {value}")
         
+        if background:
+            self._system_info_thread = threading.Thread(
+                target=self._log_resource_info, name="system-info", daemon=True
+            )
+            self._system_info_thread.start()
+        else:
+            self._log_resource_info()
+        
         self.logger.info("=" * 80)
     
+    def _log_resource_info(self):
+        for key, value in self._gather_resource_info().items():
+            self.logger.info(f"System {key}: {value}")
+    
     def _gather_system_info(self) -> Dict[str, Any]:
         """Gather comprehensive system information."""
-        info = {
+        info = self._gather_platform_info()
+        info.update(self._gather_resource_info())
+        return info
+    
+    def _gather_platform_info(self) -> Dict[str, Any]:
+        """Platform and interpreter details (cheap, no psutil)."""
+        return {
             'platform': platform.platform(),
             'system': platform.system(),
             'release': platform.release(),
@@ -168,9 +282,12 @@ class CrossPlatformLogger:
             'python_implementation': platform.python_implementation(),
             'hostname': socket.gethostname(),
         }
-        
-        # Add memory information if psutil is available
+    
+    def _gather_resource_info(self) -> Dict[str, Any]:
+        """Memory, CPU and disk figures from psutil (samples CPU load for a second)."""
+        info = {}
         try:
+            import psutil
             memory = psutil.virtual_memory()
             info.update({
                 'total_memory_gb': round(memory.total / (1024**3), 2),
@@ -211,7 +328,11 @@ class CrossPlatformLogger:
     def _get_performance_info(self) -> Dict[str, Any]:
         """Get current performance metrics."""
         try:
-            current_process = psutil.Process()
+            # Reused so cpu_percent() measures the interval since the previous call
+            if self._process is None:
+                import psutil
+                self._process = psutil.Process()
+            current_process = self._process
             
             return {
                 'memory_usage_mb': round(current_process.memory_info().rss / (1024**2), 2),
@@ -238,43 +359,50 @@ class CrossPlatformLogger:
             url: URL being processed when error occurred
             operation: Operation being performed when error occurred
         """
-        error_data = {
-            'message': message,
-            'timestamp': datetime.datetime.now().isoformat(),
-            'level': 'ERROR'
-        }
+        category = self._categorize_error(str(exception) if exception else message)
+        # Only formatted by a sink that writes it, and then only once
+        tb = _LazyTraceback(exception) if exception and exception.__traceback__ else None
         
-        if exception:
-            error_data.update({
-                'exception_type': type(exception).__name__,
-                'exception_message': str(exception),
-                'traceback': traceback.format_exc(),
-                'category': self._categorize_error(str(exception))
-            })
-        else:
-            error_data['category'] = self._categorize_error(message)
-        
-        if url:
-            error_data['url'] = url
+        if self.enable_json:
+            timestamp = datetime.datetime.now().isoformat()
             
-        if operation:
-            error_data['operation'] = operation
+            # psutil snapshot and serialisation are deferred to the writing thread
+            def build_error_json():
+                error_data = {
+                    'message': message,
+                    'timestamp': timestamp,
+                    'level': 'ERROR',
+                    'category': category
+                }
+                
+                if exception:
+                    error_data.update({
+                        'exception_type': type(exception).__name__,
+                        'exception_message': str(exception),
+                        'traceback': str(tb) if tb else None
+                    })
+                
+                if url:
+                    error_data['url'] = url
+                    
+                if operation:
+                    error_data['operation'] = operation
+                    
+                if context:
+                    error_data['context'] = context
+                
+                # Add performance info
+                error_data['performance'] = self._get_performance_info()
+                
+                # Add platform-specific information
+                error_data['platform_info'] = {
+                    'system': platform.system(),
+                    'python_version': platform.python_version(),
+                    'working_directory': str(Path.cwd())
+                }
+                return json.dumps(error_data, indent=2, default=str)
             
-        if context:
-            error_data['context'] = context
-        
-        # Add performance info
-        error_data['performance'] = self._get_performance_info()
-        
-        # Add platform-specific information
-        error_data['platform_info'] = {
-            'system': platform.system(),
-            'python_version': platform.python_version(),
-            'working_directory': str(Path.cwd())
-        }
-        
-        if self.enable_json:
-            self.logger.error(json.dumps(error_data, indent=2))
+            self.logger.error("%s", _LazyMessage(build_error_json))
         else:
             # Format for readable text output
             formatted_msg = f"{message}"
@@ -284,13 +412,13 @@ class CrossPlatformLogger:
                 formatted_msg += f" | Operation: {operation}"
             if exception:
                 formatted_msg += f" | Exception: {type(exception).__name__}: {exception}"
-                formatted_msg += f" | Category: {error_data['category']}"
+                formatted_msg += f" | Category: {category}"
             
             self.logger.error(formatted_msg)
             
             # Log traceback separately if available
-            if exception and traceback.format_exc() != "NoneType: None\n":
-                self.logger.error(f"Traceback:\n{traceback.format_exc()}")
+            if tb:
+                self.logger.error("Traceback:\n%s", tb)
     
     def log_warning(self, 
                     message: str, 
@@ -320,7 +448,8 @@ class CrossPlatformLogger:
                     message: str, 
                     url: Optional[str] = None,
                     file_path: Optional[str] = None,
-                    file_size: Optional[int] = None):
+                    file_size: Optional[int] = None,
+                    context: Optional[Dict[str, Any]] = None):
         """Log a successful operation with details."""
         formatted_msg = f"SUCCESS: {message}"
         
@@ -330,6 +459,8 @@ class CrossPlatformLogger:
             formatted_msg += f" | File: {file_path}"
         if file_size:
             formatted_msg += f" | Size: {file_size} bytes"
+        if context:
+            formatted_msg += f" | Context: {context}"
             
         self.logger.info(formatted_msg)
     
@@ -338,16 +469,22 @@ class CrossPlatformLogger:
                        duration: float,
                        context: Optional[Dict[str, Any]] = None):
         """Log performance metrics for operations."""
-        perf_info = self._get_performance_info()
-        formatted_msg = f"PERFORMANCE: {operation} completed in {duration:.2f}s"
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         
-        if context:
-            formatted_msg += f" | Context: {context}"
+        def build_message():
+            # The process snapshot is taken by the writing thread
+            perf_info = self._get_performance_info()
+            formatted_msg = f"PERFORMANCE: {operation} completed in {duration:.2f}s"
             
-        formatted_msg += f" | Memory: {perf_info.get('memory_usage_mb', 'N/A')}MB"
-        formatted_msg += f" | CPU: {perf_info.get('cpu_percent', 'N/A')}%"
+            if context:
+                formatted_msg += f" | Context: {context}"
+                
+            formatted_msg += f" | Memory: {perf_info.get('memory_usage_mb', 'N/A')}MB"
+            formatted_msg += f" | CPU: {perf_info.get('cpu_percent', 'N/A')}%"
+            return formatted_msg
         
-        self.logger.info(formatted_msg)
+        self.logger.info("%s", _LazyMessage(build_message))
     
     def log_startup_summary(self, config: Dict[str, Any]):
         """Log startup configuration summary."""
@@ -359,8 +496,14 @@ class CrossPlatformLogger:
                               total_processed: int,
                               successful: int,
                               failed: int,
-                              duration: float):
-        """Log completion summary with statistics."""
+                              duration: float,
+                              stage_metrics: Optional[Dict[str, Any]] = None):
+        """
+        Log completion summary with statistics.
+        
+        Args:
+            stage_metrics: Optional CrawlMetrics snapshot; adds per-stage percentiles
+        """
         success_rate = (successful / total_processed * 100) if total_processed > 0 else 0
         
         self.logger.info("=" * 80)
@@ -373,11 +516,86 @@ class CrossPlatformLogger:
         self.logger.info(f"Total duration: {duration:.2f} seconds")
         self.logger.info(f"Average time per URL: {duration/total_processed:.2f}s" if total_processed > 0 else "N/A")
         
+        if stage_metrics and stage_metrics.get('stages'):
+            self._log_stage_metrics(stage_metrics)
+        
         # Final performance summary
         final_perf = self._get_performance_info()
         self.logger.info(f"Final memory usage: {final_perf.get('memory_usage_mb', 'N/A')}MB")
         self.logger.info("=" * 80)
 
+    def _log_stage_metrics(self, stage_metrics: Dict[str, Any]):
+        """Log a per-stage latency table from a CrawlMetrics snapshot."""
+        self.logger.info("-" * 80)
+        self.logger.info("STAGE TIMINGS (seconds)")
+        self.logger.info(
+            f"{'stage':<16}{'count':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}{'per 1k pages':>14}"
+        )
+        for stage, stats in stage_metrics['stages'].items():
+            per_1000 = stats.get('seconds_per_1000_pages')
+            self.logger.info(
+                f"{stage:<16}{stats['count']:>8}{stats['p50']:>9.3f}{stats['p95']:>9.3f}"
+                f"{stats['p99']:>9.3f}{stats['max']:>9.3f}"
+                f"{(f'{per_1000:.1f}' if per_1000 is not None else '-'):>14}"
+            )
+        if stage_metrics.get('counters'):
+            self.logger.info(f"Counters: {stage_metrics['counters']}")
+
+
+class _LazyMessage:
+    """Log argument built on first use and cached, so each sink shares one result."""
+    
+    def __init__(self, build):
+        self._build = build
+        self._text = None
+    
+    def __str__(self):
+        if self._text is None:
+            self._text = self._build()
+        return self._text
+
+
+class _LazyTraceback(_LazyMessage):
+    """Traceback of an exception, formatted only when a record is written."""
+    
+    def __init__(self, exception: BaseException):
+        super().__init__(lambda: ''.join(traceback.format_exception(
+            type(exception), exception, exception.__traceback__
+        )))
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler for a bounded queue that does not format on the caller's thread.
+    
+    Records are queued as-is and formatted by the listener's handlers. When
+    the queue is full, WARNING and above wait briefly for space; anything
+    still not queued is dropped and counted in ``dropped``.
+    """
+    
+    def __init__(self, log_queue: queue.Queue, block_timeout: float = 1.0):
+        super().__init__(log_queue)
+        self.block_timeout = block_timeout
+        self.dropped = 0
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Listener and sinks run in this process, so the record needs no flattening
+        return record
+    
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+        if record.levelno >= logging.WARNING:
+            try:
+                self.queue.put(record, timeout=self.block_timeout)
+                return
+            except queue.Full:
+                pass
+        self.dropped += 1
+
 
 class JsonFormatter(logging.Formatter):
     """Custom JSON formatter for structured logging."""
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Filename sanitizing for the UE5 Documentation Scraper
+
+Every page title and every URL path segment is turned into a file or
+directory name. The old cleaner normalized Unicode, unescaped HTML, ran one
+``str.replace`` per forbidden character, rebuilt the string character by
+character to drop control characters and stripped it twice. Directory names
+then went through a second, Windows-specific pass that repeated most of it.
+``sanitize_filename()`` gives the same names with less work:
+
+- forbidden and control characters are handled by one ``str.translate``
+  table, and runs of underscores and whitespace by a single ``split()``
+- plain ASCII input without ``&`` skips Unicode normalization and HTML
+  unescaping, which cannot change it
+- results are cached by input, so titles and segments shared by many pages
+  (``en-US``, ``5.3``, section names) are cleaned once
+
+The scraper and filesystem_fixes.py both use these functions, so file names
+are the same whichever path creates them. benchmark_sanitizer.py measures
+the speedup over the old implementation.
+"""
+
+import html
+import unicodedata
+from functools import lru_cache
+
+# Characters Windows forbids in names; tabs and newlines become separators too
+FORBIDDEN_CHARS = '<>:"|?*\\/\r\n\t'
+
+WINDOWS_RESERVED_NAMES = frozenset({
+    'CON', 'PRN', 'AUX', 'NUL',
+    'COM1', 'COM2', 'COM3', 'COM4', 'COM5', 'COM6', 'COM7', 'COM8', 'COM9',
+    'LPT1', 'LPT2', 'LPT3', 'LPT4', 'LPT5', 'LPT6', 'LPT7', 'LPT8', 'LPT9',
+})
+
+# ASCII translation table: forbidden characters and underscores become spaces,
+# so that one split() collapses every run of separators; the other control
+# characters are dropped. Non-ASCII characters are past the end of the table
+# and stay as they are.
+_TRANSLATION = [
+    ' ' if chr(code) in FORBIDDEN_CHARS or chr(code) == '_' else (None if code < 32 else chr(code))
+    for code in range(128)
+]
+
+# Enough for every title and segment of a full documentation crawl
+CACHE_SIZE = 65536
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def sanitize_filename(name: str, max_length: int = 50) -> str:
+    """
+    Clean a string to be safe for use as a file name on Windows, macOS and Linux.
+
+    Args:
+        name: Page title or URL path segment (already URL-decoded)
+        max_length: Longest name to return
+
+    Returns:
+        The cleaned name, or "unnamed" when nothing usable is left
+    """
+    if not name or name.isspace():
+        return "unnamed"
+
+    if not name.isascii() or '&' in name:
+        # Normalize unicode and decode HTML entities
+        name = html.unescape(unicodedata.normalize('NFKD', name))
+
+    # Runs of separators become one underscore; leading and trailing ones go
+    name = '_'.join(name.translate(_TRANSLATION).split()).strip('._')
+
+    if name.upper() in WINDOWS_RESERVED_NAMES:
+        name = f"_{name}"
+
+    # Windows does not allow names ending with a dot
+    name = name[:max_length].rstrip('.')
+    return name or "unnamed"
+
+
+def sanitize_directory_name(name: str, max_length: int = 100) -> str:
+    """
+    Clean a string to be safe for use as a directory name.
+
+    Args:
+        name: URL path segment (already URL-decoded)
+        max_length: Longest name to return
+
+    Returns:
+        The cleaned name, or "unnamed_dir" for an empty segment
+    """
+    if not name or name.isspace():
+        return "unnamed_dir"
+    return sanitize_filename(name, max_length)
+
+
+def cache_info():
+    """Hit/miss statistics of the sanitizer cache."""
+    return sanitize_filename.cache_info()
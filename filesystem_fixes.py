@@ -4,11 +4,11 @@ Improved filesystem handling functions for the UE5 scraper
 """
 
 import os
-import re
-import string
 from pathlib import Path
 from urllib.parse import urlparse, unquote
 
+from filename_sanitizer import sanitize_directory_name, sanitize_filename
+
 def clean_filename(name, max_length=50):
     """
     Clean a string to be safe for use as a filename
@@ -19,72 +19,16 @@ def clean_filename(name, max_length=50):
     - Leading/trailing dots and spaces
     - Empty strings
     - Unicode normalization
-    """
-    if not name or not name.strip():
-        return "unnamed"
-    
-    # Normalize unicode
-    import unicodedata
-    name = unicodedata.normalize('NFKD', name)
-    
-    # Remove HTML entities if any
-    import html
-    name = html.unescape(name)
-    
-    # Replace problematic characters
-    # Windows forbidden: < > : " | ? * \ /
-    # Also remove control characters
-    forbidden_chars = '<>:"|?*\\/\r\n\t'
-    for char in forbidden_chars:
-        name = name.replace(char, '_')
-    
-    # Remove control characters (ASCII 0-31)
-    name = ''.join(char for char in name if ord(char) >= 32)
-    
-    # Collapse multiple spaces/underscores
-    name = re.sub(r'[_\s]+', '_', name)
-    
-    # Remove leading/trailing dots, spaces, underscores
-    name = name.strip('._\s')
-    
-    # Handle Windows reserved names
-    windows_reserved = {
-        'CON', 'PRN', 'AUX', 'NUL',
-        'COM1', 'COM2', 'COM3', 'COM4', 'COM5', 'COM6', 'COM7', 'COM8', 'COM9',
-        'LPT1', 'LPT2', 'LPT3', 'LPT4', 'LPT5', 'LPT6', 'LPT7', 'LPT8', 'LPT9'
-    }
     
-    if name.upper() in windows_reserved:
-        name = f"_{name}"
-    
-    # Limit length but preserve extension if any
-    if len(name) > max_length:
-        name = name[:max_length]
-    
-    # Ensure we don't end with a dot (Windows issue)
-    name = name.rstrip('.')
-    
-    # Final fallback
-    if not name:
-        return "unnamed"
-    
-    return name
+    Uses the shared, cached sanitizer so names match the scraper's.
+    """
+    return sanitize_filename(name, max_length)
 
 def clean_directory_name(name):
     """
     Clean a string to be safe for use as a directory name
     """
-    if not name or not name.strip():
-        return "unnamed_dir"
-    
-    # Apply same cleaning as filename but allow longer names
-    clean_name = clean_filename(name, max_length=100)
-    
-    # Additional directory-specific cleaning
-    # Remove trailing dots (Windows doesn't allow directories ending with dots)
-    clean_name = clean_name.rstrip('.')
-    
-    return clean_name or "unnamed_dir"
+    return sanitize_directory_name(name)
 
 def safe_create_directory_structure(base_dir, url):
     """
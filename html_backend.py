@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+HTML parser backends for the UE5 Documentation Scraper
+
+The scraper parses every page, strips navigation and scripts, picks the main
+content node, serializes it and looks up the page title. This module puts
+those operations behind one small interface so the tree builder can be
+chosen by configuration:
+
+- ``lxml``: BeautifulSoup with the lxml tree builder (default)
+- ``html.parser``: BeautifulSoup with Python's pure-Python parser
+- ``lxml-direct``: lxml.html without BeautifulSoup; selectors are compiled to
+  XPath once and the tree is never wrapped in soup objects
+
+All backends produce equivalent main-content HTML for the same page (see
+test_html_backend.py). The only differences are serialization details,
+such as ``<br/>`` versus ``<br>``.
+
+Cleaning uses ``CleaningRules``, which compiles the removal selectors (tags,
+classes, ids and attribute patterns) once. Each page is then stripped in a
+single traversal, and the removals are counted per rule.
+"""
+
+import itertools
+import re
+from collections import Counter, namedtuple
+from typing import Any, Dict, Iterable, List, Optional
+
+
+PARSER_BACKENDS = ('lxml', 'html.parser', 'lxml-direct')
+DEFAULT_PARSER_BACKEND = 'lxml'
+
+# Elements stripped from every page before the main content is picked
+REMOVAL_SELECTORS = (
+    'nav', 'header', 'footer', '.navigation', '.sidebar', '.nav',
+    '.header', '.footer', '.menu', '.breadcrumb', '.breadcrumbs',
+    '.social-share', '.comments', '.related-posts', '.ads',
+    '.advertisement', '.banner', '.popup', '.modal',
+    'script', 'style', 'noscript',
+    '#comments', '[role="navigation"]', '[role="banner"]', '[role="contentinfo"]'
+)
+
+# Main content candidates in order of preference; the first with enough text wins
+CONTENT_SELECTORS = (
+    'main',
+    '.main-content',
+    '.content',
+    '#content',
+    '.documentation',
+    '.docs',
+    '.page-content',
+    'article',
+    '.entry-content',
+    '.post-content',
+    '[role="main"]',
+    'body'  # Fallback
+)
+MIN_CONTENT_TEXT_LENGTH = 50
+
+# Simple selectors: tag, .class, #id, [attr], [attr="value"] with =, ~=, ^=, $= or *=
+_SIMPLE_SELECTOR = re.compile(
+    r'^(?:(?P<tag>[a-zA-Z][\w-]*)'
+    r'|\.(?P<cls>[\w-]+)'
+    r'|#(?P<id>[\w-]+)'
+    r'|\[(?P<attr>[\w-]+)(?:(?P<op>[~^$*]?=)["\']?(?P<value>[^"\'\]]*)["\']?)?\])$'
+)
+
+SimpleSelector = namedtuple('SimpleSelector', 'kind name op value')
+
+
+def parse_selector(selector: str) -> SimpleSelector:
+    """Parse a simple CSS selector; raises ValueError for anything more complex."""
+    match = _SIMPLE_SELECTOR.match(selector.strip())
+    if not match:
+        raise ValueError(f"Unsupported selector: {selector!r}")
+    if match.group('tag'):
+        return SimpleSelector('tag', match.group('tag').lower(), None, None)
+    if match.group('cls'):
+        return SimpleSelector('class', match.group('cls'), None, None)
+    if match.group('id'):
+        return SimpleSelector('id', match.group('id'), None, None)
+    return SimpleSelector('attr', match.group('attr').lower(), match.group('op'), match.group('value'))
+
+
+def _xpath_condition(parsed: SimpleSelector) -> str:
+    """XPath predicate matching an element against a parsed selector."""
+    if parsed.kind == 'tag':
+        return f"self::{parsed.name}"
+    if parsed.kind == 'class':
+        return f"contains(concat(' ', normalize-space(@class), ' '), ' {parsed.name} ')"
+    if parsed.kind == 'id':
+        return f"@id='{parsed.name}'"
+    attr, value = f"@{parsed.name}", parsed.value
+    if parsed.op is None:
+        return attr
+    if parsed.op == '=':
+        return f"{attr}='{value}'"
+    if parsed.op == '~=':
+        return f"contains(concat(' ', normalize-space({attr}), ' '), ' {value} ')"
+    if parsed.op == '^=':
+        return f"starts-with({attr}, '{value}')"
+    if parsed.op == '$=':
+        return f"substring({attr}, string-length({attr}) - {len(value) - 1}) = '{value}'"
+    return f"contains({attr}, '{value}')"
+
+
+def selector_to_xpath(selector: str) -> str:
+    """Translate a simple CSS selector into an XPath that returns the first match."""
+    return f"(descendant-or-self::*[{_xpath_condition(parse_selector(selector))}])[1]"
+
+
+class CleaningRules:
+    """
+    Removal selectors compiled for single-pass cleaning.
+
+    Tag, class and id rules become dictionary lookups. Attribute rules
+    become predicates. Backends walk the tree once and prune each matching
+    subtree without descending into it. ``match`` names the first rule an
+    element hits, in the order the selectors were given, so every removal
+    is counted against exactly one rule.
+    """
+
+    _ATTR_TESTS = {
+        None: lambda actual, expected: True,
+        '=': lambda actual, expected: actual == expected,
+        '~=': lambda actual, expected: expected in actual.split(),
+        '^=': lambda actual, expected: bool(expected) and actual.startswith(expected),
+        '$=': lambda actual, expected: bool(expected) and actual.endswith(expected),
+        '*=': lambda actual, expected: bool(expected) and expected in actual,
+    }
+
+    def __init__(self, selectors: Iterable[str] = REMOVAL_SELECTORS):
+        self.selectors = tuple(selectors)
+        self._order = {selector: index for index, selector in enumerate(self.selectors)}
+        self._tags: Dict[str, str] = {}
+        self._classes: Dict[str, str] = {}
+        self._ids: Dict[str, str] = {}
+        self._attrs: List[Any] = []
+        for selector in self.selectors:
+            parsed = parse_selector(selector)
+            if parsed.kind == 'tag':
+                self._tags.setdefault(parsed.name, selector)
+            elif parsed.kind == 'class':
+                self._classes.setdefault(parsed.name, selector)
+            elif parsed.kind == 'id':
+                self._ids.setdefault(parsed.name, selector)
+            else:
+                self._attrs.append((parsed.name, self._ATTR_TESTS[parsed.op], parsed.value, selector))
+
+    def match(self, tag: str, attrs) -> Optional[str]:
+        """Selector of the first rule matching an element, or None."""
+        hits = []
+        if tag in self._tags:
+            hits.append(self._tags[tag])
+        classes = attrs.get('class')
+        if classes:
+            if isinstance(classes, str):
+                classes = classes.split()
+            hits.extend(self._classes[cls] for cls in classes if cls in self._classes)
+        element_id = attrs.get('id')
+        if element_id in self._ids:
+            hits.append(self._ids[element_id])
+        for name, test, expected, selector in self._attrs:
+            actual = attrs.get(name)
+            if actual is None:
+                continue
+            if not isinstance(actual, str):
+                actual = ' '.join(actual)
+            if test(actual, expected):
+                hits.append(selector)
+        if not hits:
+            return None
+        return min(hits, key=self._order.__getitem__)
+
+
+class SoupBackend:
+    """BeautifulSoup with a configurable tree builder."""
+
+    def __init__(self, features: str = 'lxml'):
+        from bs4 import BeautifulSoup, Tag
+        if features == 'lxml':
+            import lxml  # noqa: F401 - fail early instead of on the first page
+        self._soup = BeautifulSoup
+        self._tag = Tag
+        self.features = features
+        self.name = features
+
+    def parse(self, page_source: str):
+        return self._soup(page_source, self.features)
+
+    def clean(self, document, rules: CleaningRules) -> Counter:
+        """Remove every element matching a rule in one walk; returns removals per rule."""
+        removed = Counter()
+        stack = [document]
+        while stack:
+            for child in [node for node in stack.pop().contents if isinstance(node, self._tag)]:
+                rule = rules.match(child.name, child.attrs)
+                if rule is None:
+                    stack.append(child)
+                else:
+                    child.decompose()
+                    removed[rule] += 1
+        return removed
+
+    def select_one(self, document, selector: str):
+        return document.select_one(selector)
+
+    def text_length(self, element) -> int:
+        return len(element.get_text(strip=True))
+
+    def to_html(self, element) -> str:
+        return str(element)
+
+    def title(self, document) -> Optional[str]:
+        title_elem = (
+            document.find('title') or
+            document.find('h1') or
+            document.find('h2') or
+            document.find('meta', {'property': 'og:title'})
+        )
+        if title_elem is None:
+            return None
+        if title_elem.name == 'meta':
+            return title_elem.get('content', '')
+        return title_elem.get_text()
+
+    def describe(self, document) -> Dict[str, List[str]]:
+        return {
+            'available_tags': [tag.name for tag in document.find_all(limit=10)],
+            'available_ids': [tag.get('id') for tag in document.find_all(id=True, limit=10)],
+            'available_classes': list(itertools.islice(
+                (cls for tag in document.find_all(class_=True) for cls in tag.get('class')), 20
+            )),
+        }
+
+
+class LxmlBackend:
+    """lxml.html directly, with selectors compiled to XPath on first use."""
+
+    name = 'lxml-direct'
+
+    def __init__(self):
+        import lxml.html
+        from lxml import etree
+        self._html = lxml.html
+        self._etree = etree
+        self._xpaths: Dict[str, Any] = {}
+
+    def parse(self, page_source):
+        try:
+            return self._html.document_fromstring(page_source)
+        except ValueError:
+            # Unicode strings with an XML encoding declaration must be parsed as bytes
+            return self._html.document_fromstring(page_source.encode('utf-8'))
+
+    def clean(self, document, rules: CleaningRules) -> Counter:
+        """Remove every element matching a rule in one walk; returns removals per rule."""
+        removed = Counter()
+        stack = [document]
+        while stack:
+            for child in list(stack.pop()):
+                if not isinstance(child.tag, str):
+                    continue  # comments and processing instructions
+                rule = rules.match(child.tag, child.attrib)
+                if rule is None:
+                    stack.append(child)
+                else:
+                    # drop_tree keeps the element's tail text, like BeautifulSoup's decompose
+                    child.drop_tree()
+                    removed[rule] += 1
+        return removed
+
+    def select_one(self, document, selector: str):
+        xpath = self._xpaths.get(selector)
+        if xpath is None:
+            xpath = self._xpaths[selector] = self._etree.XPath(selector_to_xpath(selector))
+        matches = xpath(document)
+        return matches[0] if matches else None
+
+    def text_length(self, element) -> int:
+        return sum(len(text.strip()) for text in element.itertext())
+
+    def to_html(self, element) -> str:
+        return self._html.tostring(element, encoding='unicode', with_tail=False)
+
+    def title(self, document) -> Optional[str]:
+        for tag in ('title', 'h1', 'h2'):
+            element = next(document.iter(tag), None)
+            if element is not None:
+                return element.text_content()
+        meta = document.find('.//meta[@property="og:title"]')
+        if meta is not None:
+            return meta.get('content', '')
+        return None
+
+    def describe(self, document) -> Dict[str, List[str]]:
+        elements = [el for el in document.iter() if isinstance(el.tag, str)]
+        return {
+            'available_tags': [el.tag for el in elements[:10]],
+            'available_ids': [el.get('id') for el in elements if el.get('id')][:10],
+            'available_classes': list(itertools.islice(
+                (cls for el in elements for cls in (el.get('class') or '').split()), 20
+            )),
+        }
+
+
+def create_html_backend(name: str = DEFAULT_PARSER_BACKEND):
+    """
+    Create the parser backend called ``name``.
+
+    Raises ValueError for unknown names and ImportError when lxml is needed
+    but not installed.
+    """
+    if name not in PARSER_BACKENDS:
+        raise ValueError(f"parser backend must be one of {PARSER_BACKENDS}, got {name!r}")
+    if name == 'lxml-direct':
+        return LxmlBackend()
+    return SoupBackend(name)
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Pooled asynchronous HTTP client for the UE5 Documentation Scraper
+
+The scraper itself is thread based (one thread per crawl worker), so this
+module runs a single aiohttp ClientSession on a background event loop and
+exposes a blocking ``fetch()`` that any thread can call. All workers share
+the same connection pool, keep-alive connections and DNS cache. aiohttp and
+asyncio are imported when the session is first started, not when this
+module is.
+"""
+
+import threading
+import time
+from typing import Dict, Optional
+
+from user_agents import DEFAULT_USER_AGENT
+
+
+DEFAULT_HEADERS = {
+    'User-Agent': DEFAULT_USER_AGENT,
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate',
+    'Upgrade-Insecure-Requests': '1'
+}
+
+
+class HttpFetchResult:
+    """Outcome of a single HTTP fetch."""
+
+    def __init__(self,
+                 url: str,
+                 status: Optional[int] = None,
+                 headers: Optional[Dict[str, str]] = None,
+                 text: str = "",
+                 final_url: Optional[str] = None,
+                 elapsed: float = 0.0,
+                 error: Optional[str] = None):
+        self.url = url
+        self.status = status
+        # Header names are stored lower-cased for case-insensitive lookup
+        self.headers = {k.lower(): v for k, v in (headers or {}).items()}
+        self.text = text
+        self.final_url = final_url or url
+        self.elapsed = elapsed
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.status is not None and 200 <= self.status < 300
+
+    def header(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        return self.headers.get(name.lower(), default)
+
+
+class AsyncHttpFetcher:
+    """
+    Thread-safe facade over a pooled aiohttp session.
+
+    The event loop thread and session are created on first use, so building
+    a fetcher is free if the HTTP path is never taken.
+    """
+
+    def __init__(self,
+                 headers: Optional[Dict[str, str]] = None,
+                 max_connections: int = 32,
+                 max_connections_per_host: int = 16,
+                 timeout: float = 30):
+        """
+        Initialize the fetcher.
+
+        Args:
+            headers: Default request headers (merged over DEFAULT_HEADERS)
+            max_connections: Total connection pool size
+            max_connections_per_host: Connection limit per host
+            timeout: Total per-request timeout in seconds
+        """
+        self.headers = dict(DEFAULT_HEADERS)
+        if headers:
+            self.headers.update(headers)
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.timeout = timeout
+
+        self._lock = threading.Lock()
+        self._loop: Optional["asyncio.AbstractEventLoop"] = None
+        self._thread: Optional[threading.Thread] = None
+        self._session: Optional["aiohttp.ClientSession"] = None
+        self._client_errors = ()
+
+    def _ensure_started(self):
+        """Start the background event loop and session if not running yet."""
+        with self._lock:
+            if self._loop is not None:
+                return
+            import asyncio
+            import aiohttp
+            self._client_errors = (aiohttp.ClientError, asyncio.TimeoutError)
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="http-fetcher", daemon=True)
+            thread.start()
+            self._session = asyncio.run_coroutine_threadsafe(self._create_session(), loop).result()
+            self._loop = loop
+            self._thread = thread
+
+    async def _create_session(self) -> "aiohttp.ClientSession":
+        import aiohttp
+        connector = aiohttp.TCPConnector(
+            limit=self.max_connections,
+            limit_per_host=self.max_connections_per_host,
+            ttl_dns_cache=300
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            headers=self.headers,
+            timeout=aiohttp.ClientTimeout(total=self.timeout)
+        )
+
+    async def _fetch(self, url: str, headers: Optional[Dict[str, str]]) -> HttpFetchResult:
+        start = time.monotonic()
+        try:
+            async with self._session.get(url, headers=headers, allow_redirects=True) as response:
+                text = await response.text(errors='replace')
+                return HttpFetchResult(
+                    url=url,
+                    status=response.status,
+                    headers=dict(response.headers),
+                    text=text,
+                    final_url=str(response.url),
+                    elapsed=time.monotonic() - start
+                )
+        except self._client_errors as e:
+            return HttpFetchResult(
+                url=url,
+                elapsed=time.monotonic() - start,
+                error=f"{type(e).__name__}: {e}"
+            )
+
+    def fetch(self, url: str, headers: Optional[Dict[str, str]] = None) -> HttpFetchResult:
+        """
+        Fetch a URL, blocking the calling thread until the response is read.
+
+        Network errors are reported through ``HttpFetchResult.error`` rather
+        than raised.
+        """
+        import asyncio
+        self._ensure_started()
+        future = asyncio.run_coroutine_threadsafe(self._fetch(url, headers), self._loop)
+        try:
+            return future.result(timeout=self.timeout + 5)
+        except Exception as e:
+            future.cancel()
+            return HttpFetchResult(url=url, error=f"{type(e).__name__}: {e}")
+
+    def close(self):
+        """Close the session and stop the event loop thread."""
+        with self._lock:
+            loop, session, thread = self._loop, self._session, self._thread
+            self._loop = self._session = self._thread = None
+        if loop is None:
+            return
+        import asyncio
+        try:
+            asyncio.run_coroutine_threadsafe(session.close(), loop).result(timeout=10)
+        except Exception:
+            pass
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join(timeout=10)
+        loop.close()
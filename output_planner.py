@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Output directory planning for the UE5 Documentation Scraper
+
+Thousands of pages share a few hundred output directories. Before, every
+page re-ran URL decoding, name cleaning, the path length checks and
+``mkdir(parents=True)``, and then logged a SUCCESS line. ``OutputPathPlanner``
+does this work once:
+
+- cleaned path segments are memoized, so each distinct segment is decoded
+  and cleaned once
+- the directory of every URL is computed when the URL is queued (or for a
+  whole URL list with ``plan()``), before a worker picks it up
+- each unique directory is created exactly once, when the first page is
+  saved into it
+- two URL paths that clean to the same directory name (including names that
+  differ only in case, which collide on Windows and macOS) are told apart
+  in memory by a short hash suffix instead of sharing a directory
+
+``FilenameRegistry`` hands out the file names inside those directories. It
+replaces probing ``exists()`` for ``name_1.pdf``, ``name_2.pdf``, ... with a
+per-directory set of taken names, filled from the crawl state and a single
+``os.scandir`` per directory:
+
+- a URL saved before gets the same file again, so reruns overwrite their
+  own output instead of adding ``_1`` copies
+- a title already taken by another URL gets a suffix derived from the URL,
+  so the name does not depend on which worker got there first
+"""
+
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Tuple
+from urllib.parse import unquote, urlparse
+
+
+class OutputPathPlanner:
+    """Thread-safe, memoized mapping from page URLs to output directories."""
+
+    def __init__(self,
+                 output_dir,
+                 clean_segment: Callable[[str, int], str],
+                 max_path_length: int = 240,
+                 max_part_length: int = 100,
+                 logger=None):
+        """
+        Initialize the planner.
+
+        Args:
+            output_dir: Root of the output tree
+            clean_segment: Function (decoded_segment, max_length) -> safe directory name
+            max_path_length: Longest directory path; deeper segments are truncated or dropped
+            max_part_length: Longest single directory name
+            logger: Optional CrossPlatformLogger for sanitizing and truncation warnings
+        """
+        self.output_dir = Path(output_dir)
+        self.clean_segment = clean_segment
+        self.max_path_length = max_path_length
+        self.max_part_length = max_part_length
+        self.logger = logger
+        self._segments: Dict[str, str] = {}
+        self._directories: Dict[Tuple[str, ...], Path] = {}
+        # (parent directory, case-folded name) -> decoded segment that owns the name
+        self._names: Dict[Tuple[Path, str], str] = {}
+        self._created = set()
+        self._lock = threading.Lock()
+        self._mkdir_lock = threading.Lock()
+
+    def _warn(self, message: str, **context):
+        if self.logger is not None:
+            self.logger.log_warning(message, context=context)
+
+    @staticmethod
+    def url_segments(url: str) -> Tuple[str, ...]:
+        """Directory segments of a URL path (a last segment with an extension is the file)."""
+        parts = [part for part in urlparse(url).path.split('/') if part]
+        if parts and '.' in parts[-1]:
+            parts = parts[:-1]
+        return tuple(parts)
+
+    def _clean(self, segment: str) -> str:
+        """Decode and clean one segment (memoized)."""
+        cleaned = self._segments.get(segment)
+        if cleaned is None:
+            decoded = unquote(segment)
+            cleaned = self.clean_segment(decoded, self.max_part_length)
+            # Prevent path traversal
+            if '..' in cleaned or cleaned.startswith('.'):
+                sanitized = cleaned.replace('..', '_').lstrip('.') or "dir"
+                self._warn("Path traversal attempt detected and sanitized",
+                           original=cleaned, sanitized=sanitized)
+                cleaned = sanitized
+            self._segments[segment] = cleaned
+        return cleaned
+
+    def _unique_name(self, parent: Path, name: str, segment: str) -> str:
+        """Name for ``segment`` under ``parent`` that no other segment has claimed."""
+        key = (parent, name.casefold())
+        owner = self._names.setdefault(key, segment)
+        if owner == segment:
+            return name
+        suffix = hashlib.md5(segment.encode('utf-8')).hexdigest()[:6]
+        unique = f"{name[:max(1, self.max_part_length - 7)]}_{suffix}"
+        self._names.setdefault((parent, unique.casefold()), segment)
+        self._warn("Different URL paths map to the same directory name, added a suffix",
+                   directory=str(parent / name), segment=segment, renamed=unique)
+        return unique
+
+    def directory_for(self, url: str) -> Path:
+        """Output directory for a page URL (computed once per distinct URL path)."""
+        segments = self.url_segments(url)
+        with self._lock:
+            directory = self._directories.get(segments)
+            if directory is not None:
+                return directory
+
+            current = self.output_dir
+            for depth, segment in enumerate(segments, 1):
+                known = self._directories.get(segments[:depth])
+                if known is not None:
+                    current = known
+                    continue
+                name = self._unique_name(current, self._clean(segment), segment)
+                proposed = current / name
+                if len(str(proposed)) > self.max_path_length:
+                    remaining = self.max_path_length - len(str(current)) - 1  # -1 for separator
+                    if remaining <= 10:  # Minimum meaningful length
+                        self._warn("Path too long, stopping directory creation at current level",
+                                   current_path=str(current), url=url)
+                        break
+                    truncated = name[:remaining].rstrip('.') or "dir"
+                    self._warn("Path length exceeded, truncated directory name",
+                               original=name, truncated=truncated, url=url)
+                    proposed = current / truncated
+                current = proposed
+                self._directories[segments[:depth]] = current
+            self._directories[segments] = current
+            return current
+
+    def plan(self, urls: Iterable[str]) -> int:
+        """Compute the directories of all URLs up front; returns the number of unique directories."""
+        return len({self.directory_for(url) for url in urls})
+
+    def ensure_directory(self, path: Path, create: Optional[Callable[[Path], None]] = None) -> bool:
+        """
+        Create ``path`` unless this planner already did; returns True when it was created now.
+        ``create`` replaces the default ``mkdir(parents=True, exist_ok=True)``.
+        """
+        path = Path(path)
+        if path in self._created:
+            return False
+        with self._mkdir_lock:
+            if path in self._created:
+                return False
+            if create is not None:
+                create(path)
+            else:
+                path.mkdir(parents=True, exist_ok=True)
+            # Parents now exist as well
+            for directory in (path, *path.parents):
+                self._created.add(directory)
+                if directory == self.output_dir:
+                    break
+        return True
+
+
+class FilenameRegistry:
+    """Thread-safe registry of the file names taken in each output directory."""
+
+    def __init__(self, output_dir):
+        """
+        Initialize the registry.
+
+        Args:
+            output_dir: Root of the output tree (relative seed paths are resolved against it)
+        """
+        self.output_dir = Path(output_dir)
+        # directory -> case-folded file name -> URL owning it (None for files not from this crawl)
+        self._taken: Dict[Path, Dict[str, Optional[str]]] = {}
+        self._by_url: Dict[str, Path] = {}
+        self._scanned = set()
+        # URLs whose file exists from an earlier run; their names are never released
+        self._saved = set()
+        self._lock = threading.Lock()
+
+    def seed(self, records: Iterable[Dict]):
+        """Register the output files of saved pages from crawl state records (aliases are skipped)."""
+        with self._lock:
+            for record in records:
+                output_path = record.get('output_path')
+                if not output_path or record.get('canonical_url'):
+                    continue
+                path = Path(output_path)
+                if not path.is_absolute():
+                    path = self.output_dir / path
+                self._by_url[record['url']] = path
+                self._saved.add(record['url'])
+                self._taken.setdefault(path.parent, {})[path.name.casefold()] = record['url']
+
+    def _names_in(self, directory: Path) -> Dict[str, Optional[str]]:
+        """Taken names of a directory; files already on disk are added on first use."""
+        taken = self._taken.setdefault(directory, {})
+        if directory not in self._scanned:
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        taken.setdefault(entry.name.casefold(), None)
+            except (FileNotFoundError, NotADirectoryError):
+                pass
+            self._scanned.add(directory)
+        return taken
+
+    def assign(self, directory: Path, filename: str, url: str) -> Path:
+        """
+        Unique output path for ``url`` in ``directory``. A URL keeps the file it
+        was given before; a name owned by another URL or file gets a URL-derived suffix
+        (a file on disk with that suffixed name is taken to be this URL's own output).
+        """
+        directory = Path(directory)
+        with self._lock:
+            previous = self._by_url.get(url)
+            if previous is not None and previous.parent == directory:
+                return previous
+
+            taken = self._names_in(directory)
+            stem, dot, extension = filename.rpartition('.')
+            if not dot:
+                stem, extension = filename, ''
+            suffix = f".{extension}" if extension else ''
+            hashed = f"{stem}_{hashlib.sha1(url.encode('utf-8')).hexdigest()[:8]}"
+            if taken.get(filename.casefold(), url) == url:
+                name = filename
+            elif taken.get(f"{hashed}{suffix}".casefold()) in (None, url):
+                name = f"{hashed}{suffix}"
+            else:
+                # Two URLs with the same title and hash prefix: practically never happens
+                counter = 1
+                while taken.get(f"{hashed}_{counter}{suffix}".casefold(), url) != url:
+                    counter += 1
+                name = f"{hashed}_{counter}{suffix}"
+
+            if previous is not None and url not in self._saved:
+                self._release(url)
+            taken[name.casefold()] = url
+            path = directory / name
+            self._by_url[url] = path
+            return path
+
+    def _release(self, url: str):
+        path = self._by_url.pop(url, None)
+        if path is not None:
+            taken = self._taken.get(path.parent, {})
+            if taken.get(path.name.casefold()) == url:
+                del taken[path.name.casefold()]
+
+    def release(self, url: str):
+        """Free the name given to ``url`` in this run, e.g. because its output could not be saved."""
+        with self._lock:
+            if url not in self._saved:
+                self._release(url)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Duplicate page detection for the UE5 Documentation Scraper
+
+Docs sites serve the same page under several URLs: with and without a
+trailing slash, with tracking query strings, behind redirects, or under
+locale aliases such as ``/en/`` and ``/en-us/``. Two layers keep each page
+from being rendered more than once:
+
+- ``canonical_url()`` normalizes a URL. Sitemap URLs with the same
+  canonical form are crawled once; the others become aliases of the first
+- ``ContentIndex`` maps the SHA-256 of a page's extracted main HTML to the
+  URL that owns its output. A page whose content is already owned by
+  another URL (e.g. after a redirect) is recorded as an alias instead of
+  being rendered again
+"""
+
+import posixpath
+import re
+import threading
+from typing import Dict, Iterable, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+
+# Tracking query parameters that never change the content of a page (plus utm_*)
+IGNORED_QUERY_PARAMS = frozenset({'fbclid', 'gclid', 'mc_cid', 'mc_eid'})
+
+# Path segments that name the same locale, mapped to the form the site uses
+LOCALE_ALIASES = {
+    'en': 'en-US',
+    'en-us': 'en-US',
+    'en_us': 'en-US',
+}
+
+_DEFAULT_PORTS = {'http': 80, 'https': 443}
+_INDEX_DOCUMENT = re.compile(r'/index\.html?$', re.IGNORECASE)
+_REPEATED_SLASHES = re.compile(r'/{2,}')
+
+
+def canonical_url(url: str) -> str:
+    """
+    Normalized form of a URL used to detect variants of the same page.
+
+    Lower-cases scheme and host, drops default ports, fragments, trailing
+    slashes, repeated slashes, ``index.html`` and tracking query parameters,
+    and maps locale aliases; remaining query parameters are sorted.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+
+    path = _INDEX_DOCUMENT.sub('/', _REPEATED_SLASHES.sub('/', parts.path or '/'))
+    path = posixpath.normpath(path) if path not in ('', '/') else '/'
+    segments = [LOCALE_ALIASES.get(segment.lower(), segment) for segment in path.split('/')]
+    path = '/'.join(segments) or '/'
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in IGNORED_QUERY_PARAMS and not key.lower().startswith('utm_')
+    )
+    return urlunsplit((scheme, host, path, urlencode(query), ''))
+
+
+class ContentIndex:
+    """Thread-safe map from content hash to the URL that owns the rendered output."""
+
+    def __init__(self):
+        self._owners: Dict[str, str] = {}
+        self._hashes: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._owners)
+
+    def seed(self, records: Iterable[Dict]):
+        """Register saved pages from crawl state records (aliases are skipped)."""
+        with self._lock:
+            for record in records:
+                content_hash = record.get('content_hash')
+                if content_hash and not record.get('canonical_url'):
+                    self._owners.setdefault(content_hash, record['url'])
+                    self._hashes[record['url']] = content_hash
+
+    def claim(self, content_hash: str, url: str) -> Optional[str]:
+        """
+        Claim ``content_hash`` for ``url``. Returns the URL that already owns
+        it, or None when ``url`` now owns it and should render the output.
+        """
+        with self._lock:
+            owner = self._owners.get(content_hash)
+            if owner is not None and owner != url:
+                return owner
+            previous = self._hashes.get(url)
+            if previous is not None and previous != content_hash and self._owners.get(previous) == url:
+                # The page changed since it was saved; its old content has no owner now
+                del self._owners[previous]
+            self._owners[content_hash] = url
+            self._hashes[url] = content_hash
+            return None
+
+    def release(self, url: str):
+        """Give up ``url``'s claim, e.g. because its output could not be saved."""
+        with self._lock:
+            content_hash = self._hashes.pop(url, None)
+            if content_hash is not None and self._owners.get(content_hash) == url:
+                del self._owners[content_hash]
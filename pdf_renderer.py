@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Out-of-process PDF rendering for the UE5 Documentation Scraper
+
+WeasyPrint rendering is CPU bound and often slower than fetching a page, so
+running it on the crawl thread leaves the browser idle. This module renders
+``(html_content, output_path)`` jobs in a pool of worker processes instead,
+spreading the work across cores. Each job writes to a ``.tmp`` file that is
+renamed into place only once the PDF is complete.
+
+The number of jobs in flight is bounded: ``submit()`` blocks while the pool
+is saturated, so extracted HTML cannot pile up in memory when rendering
+falls behind the crawl.
+
+Whether WeasyPrint works at all (import, system libraries, font discovery
+and a test render) is probed once per process by
+``get_weasyprint_capability()``; render workers run the probe when they
+start, so a page render costs only the render itself.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import Future
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+
+PDF_STYLESHEET = """
+                    body { font-family: Arial, sans-serif; margin: 20px; line-height: 1.6; }
+                    img { max-width: 100%; height: auto; }
+                    pre { background: #f5f5f5; padding: 10px; border-radius: 5px; }
+                    code { background: #f5f5f5; padding: 2px 4px; border-radius: 3px; }
+                    table { border-collapse: collapse; width: 100%; }
+                    th, td { border: 1px solid #ddd; padding: 8px; text-align: left; }
+                    th { background-color: #f2f2f2; }
+                    @page { margin: 1in; }
+"""
+
+
+def build_pdf_document(html_content: str) -> str:
+    """Wrap extracted page content in the full HTML document rendered to PDF."""
+    return f"""
+            <!DOCTYPE html>
+            <html>
+            <head>
+                <meta charset="UTF-8">
+                <style>{PDF_STYLESHEET}                </style>
+            </head>
+            <body>
+                {html_content}
+            </body>
+            </html>
+            """
+
+
+class WeasyPrintCapability:
+    """Result of probing WeasyPrint in the current process."""
+
+    def __init__(self,
+                 available: bool,
+                 module=None,
+                 version: Optional[str] = None,
+                 font_config=None,
+                 test_pdf_bytes: int = 0,
+                 probe_seconds: float = 0.0,
+                 error: Optional[str] = None,
+                 error_type: Optional[str] = None):
+        self.available = available
+        self.module = module
+        self.version = version
+        # Shared FontConfiguration, so system fonts are discovered only once
+        self.font_config = font_config
+        self.test_pdf_bytes = test_pdf_bytes
+        self.probe_seconds = probe_seconds
+        self.error = error
+        self.error_type = error_type
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'available': self.available,
+            'version': self.version,
+            'test_pdf_bytes': self.test_pdf_bytes,
+            'probe_seconds': round(self.probe_seconds, 3),
+            'error': self.error,
+            'error_type': self.error_type,
+            'pid': os.getpid()
+        }
+
+
+_capability: Optional[WeasyPrintCapability] = None
+_capability_lock = threading.Lock()
+
+
+def probe_weasyprint() -> WeasyPrintCapability:
+    """
+    Import WeasyPrint, discover fonts and render a test PDF.
+
+    Never raises; failures are described by the returned capability. The
+    ``error_type`` is 'ImportError' when WeasyPrint is not installed.
+    """
+    start = time.monotonic()
+    try:
+        import weasyprint
+        try:
+            from weasyprint.text.fonts import FontConfiguration
+        except ImportError:  # WeasyPrint < 53
+            from weasyprint.fonts import FontConfiguration
+    except ImportError as e:
+        return WeasyPrintCapability(
+            available=False,
+            probe_seconds=time.monotonic() - start,
+            error=str(e),
+            error_type='ImportError'
+        )
+    except Exception as e:
+        # Installed, but its system libraries (Pango, HarfBuzz, GTK+) failed to load
+        return WeasyPrintCapability(
+            available=False,
+            probe_seconds=time.monotonic() - start,
+            error=str(e),
+            error_type=type(e).__name__
+        )
+
+    try:
+        font_config = FontConfiguration()
+        pdf_bytes = weasyprint.HTML(
+            string="<html><body><p>Dependency test</p></body></html>"
+        ).write_pdf(font_config=font_config)
+        if not pdf_bytes:
+            raise RuntimeError("WeasyPrint produced an empty PDF")
+    except Exception as e:
+        return WeasyPrintCapability(
+            available=False,
+            module=weasyprint,
+            version=getattr(weasyprint, '__version__', None),
+            probe_seconds=time.monotonic() - start,
+            error=str(e),
+            error_type=type(e).__name__
+        )
+
+    return WeasyPrintCapability(
+        available=True,
+        module=weasyprint,
+        version=getattr(weasyprint, '__version__', None),
+        font_config=font_config,
+        test_pdf_bytes=len(pdf_bytes),
+        probe_seconds=time.monotonic() - start
+    )
+
+
+def get_weasyprint_capability(refresh: bool = False) -> WeasyPrintCapability:
+    """Return this process's WeasyPrint capability, probing on first call only."""
+    global _capability
+    with _capability_lock:
+        if _capability is None or refresh:
+            _capability = probe_weasyprint()
+        return _capability
+
+
+def init_render_worker():
+    """Render pool initializer: probe WeasyPrint once when the worker starts."""
+    get_weasyprint_capability()
+
+
+def render_pdf(html_content: str, output_path) -> Dict[str, Any]:
+    """
+    Render page content to a PDF with WeasyPrint.
+
+    The PDF is rendered in memory, written to ``<output_path>.tmp`` and
+    renamed into place, so a crash never leaves a truncated file under the
+    final name.
+    Safe to run in a worker process.
+
+    Returns:
+        Dictionary with output_path, file_size, render_seconds (layout and
+        PDF generation), write_seconds (disk write and rename) and
+        duration_seconds
+
+    Raises:
+        RuntimeError if WeasyPrint is unusable in this process, or any
+        WeasyPrint or filesystem error; the temporary file is removed first
+    """
+    capability = get_weasyprint_capability()
+    if not capability.available:
+        raise RuntimeError(f"WeasyPrint is not available: {capability.error}")
+
+    start = time.monotonic()
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = output_path.with_suffix(output_path.suffix + '.tmp')
+
+    pdf_bytes = capability.module.HTML(string=build_pdf_document(html_content)).write_pdf(
+        font_config=capability.font_config
+    )
+    rendered = time.monotonic()
+
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(pdf_bytes)
+        temp_path.replace(output_path)
+    except BaseException:
+        if temp_path.exists():
+            temp_path.unlink()
+        raise
+    finished = time.monotonic()
+
+    return {
+        'output_path': str(output_path),
+        'file_size': len(pdf_bytes),
+        'render_seconds': rendered - start,
+        'write_seconds': finished - rendered,
+        'duration_seconds': finished - start
+    }
+
+
+class PdfRenderPool:
+    """
+    Bounded pool of PDF rendering processes.
+
+    Worker processes are started with the ``spawn`` method on first use, so
+    they never inherit the crawler's threads, browser sessions or open
+    sockets. Completion callbacks run in the parent process.
+    """
+
+    def __init__(self,
+                 max_workers: Optional[int] = None,
+                 max_pending: Optional[int] = None,
+                 logger=None,
+                 render_func: Callable[[str, str], Dict[str, Any]] = render_pdf,
+                 initializer: Optional[Callable] = init_render_worker):
+        """
+        Initialize the pool.
+
+        Args:
+            max_workers: Number of rendering processes (default: CPU count)
+            max_pending: Maximum queued plus running jobs before ``submit()``
+                blocks (default: twice the number of workers)
+            logger: Optional CrossPlatformLogger
+            render_func: Picklable function called as ``render_func(html, path)``
+            initializer: Optional picklable function run once in each worker
+        """
+        self.max_workers = max(1, max_workers or os.cpu_count() or 1)
+        self.max_pending = max(1, max_pending or self.max_workers * 2)
+        self.logger = logger
+        self.render_func = render_func
+        self.initializer = initializer
+
+        self._executor: Optional["ProcessPoolExecutor"] = None
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._in_flight = 0
+        self._futures = set()
+        self.stats = {'submitted': 0, 'completed': 0, 'failed': 0, 'blocked_seconds': 0.0}
+
+    def _ensure_executor(self) -> "ProcessPoolExecutor":
+        with self._lock:
+            if self._executor is None:
+                # Imported here so that loading this module stays cheap
+                import multiprocessing
+                from concurrent.futures import ProcessPoolExecutor
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=self.initializer
+                )
+            return self._executor
+
+    @property
+    def in_flight(self) -> int:
+        with self._lock:
+            return self._in_flight
+
+    def submit(self,
+               html_content: str,
+               output_path,
+               callback: Optional[Callable[[Future], None]] = None) -> Future:
+        """
+        Queue a render job, blocking while ``max_pending`` jobs are in flight.
+
+        Args:
+            html_content: Extracted page content
+            output_path: Final PDF path
+            callback: Called with the finished Future (in the parent process)
+
+        Returns:
+            Future resolving to the render_func result
+        """
+        wait_start = time.monotonic()
+        self._slots.acquire()
+        blocked = time.monotonic() - wait_start
+
+        try:
+            future = self._ensure_executor().submit(self.render_func, html_content, str(output_path))
+        except BaseException:
+            self._slots.release()
+            raise
+
+        # The callback is attached after counting, so _on_done always sees the job
+        with self._lock:
+            self._in_flight += 1
+            self._futures.add(future)
+            self.stats['submitted'] += 1
+            self.stats['blocked_seconds'] += blocked
+        future.add_done_callback(partial(self._on_done, callback))
+        return future
+
+    def _on_done(self, callback, future: Future):
+        """Run the caller's callback, then free the job's slot."""
+        try:
+            if callback is not None:
+                callback(future)
+        except Exception as e:
+            if self.logger:
+                self.logger.log_error(
+                    "PDF render completion callback failed",
+                    exception=e,
+                    operation="pdf_render_pool"
+                )
+        finally:
+            failed = future.cancelled() or future.exception() is not None
+            with self._lock:
+                self._futures.discard(future)
+                self._in_flight -= 1
+                self.stats['failed' if failed else 'completed'] += 1
+                self._idle.notify_all()
+            self._slots.release()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until every submitted job and its callback have finished."""
+        with self._lock:
+            return self._idle.wait_for(lambda: self._in_flight == 0, timeout=timeout)
+
+    def close(self, cancel_pending: bool = False):
+        """Shut the worker processes down, optionally dropping queued jobs."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            pending = list(self._futures) if cancel_pending else []
+        if executor is None:
+            return
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
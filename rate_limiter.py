@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Adaptive request pacing for the UE5 Documentation Scraper
+
+Replaces the fixed one-second pause between pages. ``AdaptiveRateLimiter``
+keeps separate state for every host it sees:
+
+- a token bucket limits the request rate
+- a concurrency limit caps the requests in flight
+- both adapt AIMD-style. They grow additively while responses are fast and
+  clean (exponentially until the first backoff, like TCP slow start). They
+  are cut multiplicatively on 429/503, bot challenges, network errors, or
+  latency well above the host's baseline. Latency is tracked per fetch
+  path (``kind``), so a multi-second browser navigation is compared with
+  other navigations, not with sub-100 ms HTTP fetches.
+- a ``Retry-After`` header pauses every request to that host until it
+  expires
+
+Fetch paths wrap each request in ``limiter.request(url, kind)`` and record
+the outcome on the yielded permit. Retry loops call ``backoff()`` instead of
+sleeping on their own.
+"""
+
+import datetime
+import random
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Iterator, Optional
+from urllib.parse import urlparse
+
+
+# Responses telling the client to slow down
+THROTTLE_STATUSES = (429, 503)
+
+# Latency below this is never treated as congestion, however small the baseline
+MIN_CONGESTION_LATENCY = 0.05
+
+# Fetch paths with their own latency baseline
+REQUEST_KINDS = ('http', 'browser')
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date), None if absent/invalid."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=datetime.timezone.utc)
+    return max(0.0, (when - datetime.datetime.now(datetime.timezone.utc)).total_seconds())
+
+
+class RequestPermit:
+    """Permission for one request; record the response on it before the ``with`` block ends."""
+
+    def __init__(self, host: str, kind: str = 'http'):
+        self.host = host
+        self.kind = kind
+        self.started = time.monotonic()
+        self.status: Optional[int] = None
+        self.error = False
+        self.throttled = False
+        self.retry_after: Optional[float] = None
+
+    def record(self, status: Optional[int] = None, error: bool = False, throttled: bool = False,
+               retry_after: Optional[str] = None):
+        """Store the outcome: HTTP status, network error, challenge page, Retry-After header value."""
+        self.status = status
+        self.error = error
+        self.throttled = throttled or status in THROTTLE_STATUSES
+        self.retry_after = parse_retry_after(retry_after)
+
+
+class _LatencyTracker:
+    """Latency EWMA and baseline of one fetch path to one host."""
+
+    def __init__(self):
+        self.ewma: Optional[float] = None
+        self.baseline: Optional[float] = None
+
+    def observe(self, latency: float) -> float:
+        """Update the latency EWMA and the (slowly rising) baseline; returns the EWMA."""
+        if self.ewma is None:
+            self.ewma = latency
+        else:
+            self.ewma = 0.8 * self.ewma + 0.2 * latency
+        # The baseline follows improvements at once and drifts up 1% per sample, so a
+        # permanently slower server stops counting as congestion after a while
+        if self.baseline is None:
+            self.baseline = self.ewma
+        else:
+            self.baseline = min(self.ewma, self.baseline * 1.01)
+        return self.ewma
+
+
+class _HostState:
+    def __init__(self, rate: float, concurrency: float):
+        self.rate = rate
+        self.concurrency = concurrency
+        self.tokens = 1.0
+        self.last_refill = time.monotonic()
+        self.in_flight = 0
+        self.blocked_until = 0.0
+        self.latency: Dict[str, _LatencyTracker] = {}
+        self.last_decrease = 0.0
+        self.slow_start = True
+
+    def refill(self, now: float, burst: float):
+        self.tokens = min(burst, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+
+    def tracker(self, kind: str) -> _LatencyTracker:
+        tracker = self.latency.get(kind)
+        if tracker is None:
+            tracker = self.latency[kind] = _LatencyTracker()
+        return tracker
+
+
+class AdaptiveRateLimiter:
+    """Per-host token bucket with AIMD-adapted rate and concurrency."""
+
+    def __init__(self,
+                 initial_rate: float = 2.0,
+                 min_rate: float = 0.2,
+                 max_rate: float = 16.0,
+                 max_concurrency: int = 4,
+                 burst: float = 2.0,
+                 rate_step: float = 0.25,
+                 decrease_factor: float = 0.5,
+                 latency_tolerance: float = 2.0,
+                 decrease_cooldown: float = 2.0,
+                 max_retry_after: float = 300.0,
+                 max_backoff: float = 30.0,
+                 metrics=None,
+                 logger=None):
+        """
+        Initialize the limiter.
+
+        Args:
+            initial_rate: Requests per second per host at the start
+            min_rate: Lowest rate backoff can reach
+            max_rate: Highest rate additive increase can reach
+            max_concurrency: Most requests in flight per host (normally the worker count)
+            burst: Token bucket capacity
+            rate_step: Rate increase per second of clean responses
+            decrease_factor: Multiplier applied to rate and concurrency on backoff
+            latency_tolerance: Latency EWMA above baseline times this counts as congestion
+            decrease_cooldown: Seconds after a backoff during which further signals are ignored
+            max_retry_after: Longest Retry-After pause honored, in seconds
+            max_backoff: Longest retry delay from backoff(), in seconds
+            metrics: Optional CrawlMetrics for the rate_limit_wait stage and backoff counters
+            logger: Optional CrossPlatformLogger
+        """
+        self.initial_rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max(max_rate, min_rate)
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.burst = max(1.0, burst)
+        self.rate_step = rate_step
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.decrease_cooldown = decrease_cooldown
+        self.max_retry_after = max_retry_after
+        self.max_backoff = max_backoff
+        self.metrics = metrics
+        self.logger = logger
+        self._hosts: Dict[str, _HostState] = {}
+        self._condition = threading.Condition()
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        return urlparse(url).netloc.lower()
+
+    def _state(self, host: str) -> _HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            state = _HostState(min(self.max_rate, max(self.min_rate, self.initial_rate)), 1.0)
+            self._hosts[host] = state
+        return state
+
+    def _count(self, name: str):
+        if self.metrics is not None:
+            self.metrics.increment(name)
+
+    def acquire(self, url: str, kind: str = 'http') -> RequestPermit:
+        """
+        Block until a request to ``url``'s host is allowed; pair with release().
+        ``kind`` is the fetch path ('http' or 'browser') whose latency baseline applies.
+        """
+        host = self.host_of(url)
+        start = time.monotonic()
+        with self._condition:
+            state = self._state(host)
+            while True:
+                now = time.monotonic()
+                state.refill(now, self.burst)
+                if state.blocked_until > now:
+                    timeout = state.blocked_until - now
+                elif state.in_flight >= max(1, int(state.concurrency)):
+                    timeout = None  # until a request finishes
+                elif state.tokens < 1:
+                    timeout = (1 - state.tokens) / state.rate
+                else:
+                    state.tokens -= 1
+                    state.in_flight += 1
+                    break
+                self._condition.wait(timeout)
+        if self.metrics is not None:
+            self.metrics.observe('rate_limit_wait', time.monotonic() - start)
+        return RequestPermit(host, kind)
+
+    def release(self, permit: RequestPermit):
+        """Finish a request and adapt the host's rate to its recorded outcome."""
+        now = time.monotonic()
+        with self._condition:
+            state = self._state(permit.host)
+            state.in_flight = max(0, state.in_flight - 1)
+            if permit.retry_after:
+                pause = min(permit.retry_after, self.max_retry_after)
+                state.blocked_until = max(state.blocked_until, now + pause)
+                self._count('rate_limit_retry_after')
+            if permit.throttled:
+                self._decrease(permit.host, state, 'throttled', now)
+            elif permit.error:
+                self._decrease(permit.host, state, 'error', now)
+            else:
+                tracker = state.tracker(permit.kind)
+                latency = tracker.observe(now - permit.started)
+                congested = latency > max(MIN_CONGESTION_LATENCY, tracker.baseline * self.latency_tolerance)
+                if congested:
+                    self._decrease(permit.host, state, 'latency', now)
+                else:
+                    self._increase(state)
+            self._condition.notify_all()
+
+    @contextmanager
+    def request(self, url: str, kind: str = 'http') -> Iterator[RequestPermit]:
+        """Acquire a permit for the enclosed request; an exception counts as an error."""
+        permit = self.acquire(url, kind)
+        try:
+            yield permit
+        except BaseException:
+            permit.error = True
+            raise
+        finally:
+            self.release(permit)
+
+    def _increase(self, state: _HostState):
+        # Slow start grows the rate by half a request per second per response (about
+        # x1.6 per second) until the first backoff; afterwards additive increase adds
+        # about rate_step req/s, plus one concurrent request per round of clean responses
+        step = 0.5 if state.slow_start else self.rate_step / max(1.0, state.rate)
+        state.rate = min(self.max_rate, state.rate + step)
+        state.concurrency = min(float(self.max_concurrency), state.concurrency + 1.0 / state.concurrency)
+
+    def _decrease(self, host: str, state: _HostState, reason: str, now: float):
+        self._count(f'rate_limit_{reason}')
+        if now - state.last_decrease < self.decrease_cooldown:
+            return
+        previous = state.rate
+        state.rate = max(self.min_rate, state.rate * self.decrease_factor)
+        state.concurrency = max(1.0, state.concurrency * self.decrease_factor)
+        state.tokens = min(state.tokens, 0.0)
+        state.last_decrease = now
+        state.slow_start = False
+        self._count('rate_limit_backoffs')
+        if self.logger is not None:
+            self.logger.log_info(
+                f"Slowing down requests to {host} ({reason}): {previous:.2f} -> {state.rate:.2f} req/s",
+                context={'concurrency': int(state.concurrency),
+                         'paused_seconds': round(max(0.0, state.blocked_until - now), 1) or None}
+            )
+
+    def report_failure(self, url: str, reason: str = 'error'):
+        """Back off a host after a failure noticed outside a request (e.g. an error page)."""
+        now = time.monotonic()
+        with self._condition:
+            host = self.host_of(url)
+            self._decrease(host, self._state(host), reason, now)
+
+    def backoff(self, url: str, attempt: int, reason: Optional[str] = 'error'):
+        """
+        Wait before retrying a failed request: report the failure (unless reason
+        is None, e.g. when a permit already recorded it), then sleep an
+        exponentially growing, jittered delay (attempt 0 waits about 1-2 seconds).
+        Retry-After pauses are enforced by the next acquire().
+        """
+        if reason is not None:
+            self.report_failure(url, reason)
+        delay = min(self.max_backoff, 2.0 ** attempt)
+        time.sleep(delay * random.uniform(1.0, 2.0))
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Current rate, concurrency, latency EWMA per fetch path and pause per host."""
+        now = time.monotonic()
+        with self._condition:
+            return {
+                host: {
+                    'rate': round(state.rate, 2),
+                    'concurrency': int(state.concurrency),
+                    'in_flight': state.in_flight,
+                    'latency_ewma': {kind: round(tracker.ewma, 3) for kind, tracker in state.latency.items()},
+                    'paused_seconds': round(max(0.0, state.blocked_until - now), 1),
+                }
+                for host, state in self._hosts.items()
+            }
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Deferred page retries for the UE5 Documentation Scraper
+
+A failed page attempt used to be retried inline: the worker slept 5, 7.5
+and then 11 seconds, and did nothing else in the meantime. Now the failure
+is classified and handed back to the crawl pool:
+
+- ``RetryPolicy`` sets the number of attempts and the backoff for one error
+  class (timeout, challenge page, error page, empty content, parse error,
+  network or server error)
+- ``RetryLedger`` counts attempts per URL. It decides whether another attempt
+  is allowed and keeps the per-class retried / recovered / exhausted counts
+  for the end-of-run summary
+- ``DeferredRetry`` is raised by the page pipeline when a retry is due. The
+  worker then moves on to other URLs
+- ``DelayedRetryQueue`` holds deferred URLs until their backoff has expired
+"""
+
+import heapq
+import itertools
+import random
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+
+class RetryPolicy:
+    """Attempt limit and exponential backoff for one error class."""
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 5.0, multiplier: float = 1.5,
+                 max_delay: float = 120.0, jitter: float = 0.1):
+        """
+        Initialize the policy.
+
+        Args:
+            max_attempts: Total attempts per URL, including the first
+            base_delay: Delay before the first retry, in seconds
+            multiplier: Growth of the delay per further retry
+            max_delay: Longest delay, in seconds
+            jitter: Random extra delay as a fraction of the delay
+        """
+        self.max_attempts = max(1, int(max_attempts))
+        self.base_delay = base_delay
+        self.multiplier = multiplier
+        self.max_delay = max_delay
+        self.jitter = jitter
+
+    def delay(self, retry: int) -> float:
+        """Backoff before retry number ``retry`` (0 for the first retry)."""
+        delay = min(self.max_delay, self.base_delay * self.multiplier ** retry)
+        return delay * (1.0 + random.uniform(0.0, self.jitter))
+
+
+# Error classes in the order they are reported
+RETRY_CLASSES = (
+    'timeout',
+    'challenge',
+    'error_page',
+    'empty_content',
+    'parse_error',
+    'network',
+    'server_error',
+    'error',
+)
+
+# Bot challenges rarely clear within seconds, so they wait longer; parse errors
+# mostly come from a page caught mid-update and are retried quickly once
+DEFAULT_RETRY_POLICIES = {
+    'timeout': RetryPolicy(max_attempts=3, base_delay=5.0),
+    'challenge': RetryPolicy(max_attempts=2, base_delay=30.0),
+    'error_page': RetryPolicy(max_attempts=3, base_delay=5.0),
+    'empty_content': RetryPolicy(max_attempts=3, base_delay=5.0),
+    'parse_error': RetryPolicy(max_attempts=2, base_delay=1.0),
+    'network': RetryPolicy(max_attempts=3, base_delay=5.0),
+    'server_error': RetryPolicy(max_attempts=3, base_delay=10.0),
+    'error': RetryPolicy(max_attempts=3, base_delay=5.0),
+}
+
+
+class DeferredRetry(Exception):
+    """Raised by the page pipeline to have the crawl pool retry ``url`` after ``delay`` seconds."""
+
+    def __init__(self, url: str, error_class: str, delay: float):
+        super().__init__(f"{error_class}: retry {url} in {delay:.1f}s")
+        self.url = url
+        self.error_class = error_class
+        self.delay = delay
+
+
+class RetryLedger:
+    """Thread-safe per-URL attempt counts and per-class retry statistics."""
+
+    def __init__(self, policies: Optional[Dict[str, RetryPolicy]] = None, metrics=None):
+        """
+        Initialize the ledger.
+
+        Args:
+            policies: Policy per error class (defaults to DEFAULT_RETRY_POLICIES);
+                unknown classes use the 'error' policy
+            metrics: Optional CrawlMetrics receiving 'retry_<class>' counters
+        """
+        self.policies = dict(DEFAULT_RETRY_POLICIES)
+        self.policies.update(policies or {})
+        self.metrics = metrics
+        self._attempts: Dict[str, int] = {}
+        self._last_class: Dict[str, str] = {}
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def policy(self, error_class: str) -> RetryPolicy:
+        return self.policies.get(error_class) or self.policies['error']
+
+    def attempt(self, url: str) -> int:
+        """Number of failed attempts recorded for ``url`` (0 on its first attempt)."""
+        with self._lock:
+            return self._attempts.get(url, 0)
+
+    def _count(self, error_class: str, outcome: str):
+        counts = self._counts.setdefault(error_class, {'retried': 0, 'recovered': 0, 'exhausted': 0})
+        counts[outcome] += 1
+
+    def schedule(self, url: str, error_class: str, min_delay: float = 0.0) -> Optional[float]:
+        """
+        Record a failed attempt. Returns the backoff before the next attempt
+        (at least ``min_delay``, e.g. a server's Retry-After), or None when the
+        class's attempts are used up.
+        """
+        policy = self.policy(error_class)
+        with self._lock:
+            failed = self._attempts.get(url, 0) + 1
+            self._attempts[url] = failed
+            self._last_class[url] = error_class
+            if failed >= policy.max_attempts:
+                self._count(error_class, 'exhausted')
+                return None
+            self._count(error_class, 'retried')
+        if self.metrics is not None:
+            self.metrics.increment(f'retry_{error_class}')
+        return max(min_delay, policy.delay(failed - 1))
+
+    def resolve(self, url: str, success: bool):
+        """Forget ``url`` once it has succeeded or failed for good."""
+        with self._lock:
+            self._attempts.pop(url, None)
+            error_class = self._last_class.pop(url, None)
+            if success and error_class is not None:
+                self._count(error_class, 'recovered')
+
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        """Retried / recovered / exhausted counts per error class, in RETRY_CLASSES order."""
+        with self._lock:
+            order = {name: position for position, name in enumerate(RETRY_CLASSES)}
+            return {
+                error_class: dict(self._counts[error_class])
+                for error_class in sorted(self._counts, key=lambda name: order.get(name, len(order)))
+            }
+
+
+class DelayedRetryQueue:
+    """Thread-safe queue of items that become available after a delay."""
+
+    def __init__(self):
+        self._heap: list = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._heap)
+
+    def push(self, item: Any, delay: float):
+        """Make ``item`` available ``delay`` seconds from now."""
+        due = time.monotonic() + max(0.0, delay)
+        with self._lock:
+            heapq.heappush(self._heap, (due, next(self._sequence), item))
+
+    def pop_due(self) -> Tuple[Optional[Any], Optional[float]]:
+        """
+        Return (item, None) for the earliest item whose delay has expired, else
+        (None, seconds until the next one is due), or (None, None) when empty.
+        """
+        with self._lock:
+            if not self._heap:
+                return None, None
+            due = self._heap[0][0]
+            wait = due - time.monotonic()
+            if wait > 0:
+                return None, wait
+            return heapq.heappop(self._heap)[2], None
+
+    def clear(self) -> list:
+        """Remove and return all pending items."""
+        with self._lock:
+            items = [entry[2] for entry in sorted(self._heap)]
+            self._heap.clear()
+            return items
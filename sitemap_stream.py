@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Streaming sitemap ingestion for the UE5 Documentation Scraper
+
+Sitemaps (and sitemap indexes) are fetched over a single pooled
+requests.Session and parsed incrementally with ``iterparse``, clearing each
+element once it has been handled, so memory stays flat no matter how large
+the sitemap is. Sub-sitemaps of an index are fetched concurrently and their
+URLs are yielded as soon as they are parsed, which lets crawling start
+before the whole index has been resolved. Gzip-compressed sitemaps
+(``.xml.gz``) are detected and decompressed transparently. requests is
+imported when the first sitemap is fetched.
+"""
+
+import gzip
+import io
+import queue
+import threading
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, Optional, Tuple
+
+from user_agents import DEFAULT_USER_AGENT
+
+
+SITEMAP_HEADERS = {
+    'User-Agent': DEFAULT_USER_AGENT,
+    'Accept': 'application/xml,text/xml,*/*',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate',
+    'Connection': 'keep-alive'
+}
+
+_GZIP_MAGIC = b'\x1f\x8b'
+
+
+def _local_name(tag: str) -> str:
+    """Strip the XML namespace from a tag name."""
+    return tag.rsplit('}', 1)[-1]
+
+
+def iter_sitemap_entries(stream) -> Iterator[Tuple[str, str, Optional[str]]]:
+    """
+    Incrementally parse a sitemap or sitemap index.
+
+    Args:
+        stream: Binary file-like object with the (possibly gzipped) XML
+
+    Yields:
+        (kind, loc, lastmod) where kind is 'url' for pages and 'sitemap' for
+        sub-sitemaps of an index
+    """
+    buffered = stream if hasattr(stream, 'peek') else io.BufferedReader(stream)
+    if buffered.peek(2)[:2] == _GZIP_MAGIC:
+        buffered = gzip.GzipFile(fileobj=buffered)
+
+    root = None
+    loc = lastmod = None
+    for event, elem in ET.iterparse(buffered, events=('start', 'end')):
+        if event == 'start':
+            if root is None:
+                root = elem
+            continue
+
+        name = _local_name(elem.tag)
+        if name == 'loc':
+            loc = (elem.text or '').strip() or None
+        elif name == 'lastmod':
+            lastmod = (elem.text or '').strip() or None
+        elif name in ('url', 'sitemap'):
+            if loc:
+                yield ('url' if name == 'url' else 'sitemap', loc, lastmod)
+            loc = lastmod = None
+            # Drop everything parsed so far; only the current entry was needed
+            root.clear()
+
+
+class SitemapStreamer:
+    """
+    Fetches sitemaps over one pooled session and streams their URLs.
+
+    Sub-sitemaps found in an index are fetched in parallel on a thread pool;
+    nested indexes are followed. Failures of individual sub-sitemaps are
+    logged and skipped, while a failure of a top-level sitemap is raised so
+    the caller can fall back to another discovery strategy.
+    """
+
+    def __init__(self,
+                 logger=None,
+                 max_workers: int = 8,
+                 timeout: float = 30,
+                 headers: Optional[Dict[str, str]] = None,
+                 metrics=None,
+                 rate_limiter=None):
+        """
+        Initialize the streamer.
+
+        Args:
+            logger: Optional CrossPlatformLogger for progress and warnings
+            max_workers: Number of sub-sitemaps fetched concurrently
+            timeout: Per-request timeout in seconds
+            headers: Request headers (defaults to SITEMAP_HEADERS)
+            metrics: Optional CrawlMetrics; each sitemap document is timed as
+                'sitemap_fetch'
+            rate_limiter: Optional AdaptiveRateLimiter pacing sitemap requests
+        """
+        self.logger = logger
+        self.metrics = metrics
+        self.rate_limiter = rate_limiter
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self.headers = headers or SITEMAP_HEADERS
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self):
+        """The pooled requests.Session, created on first use."""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self._create_session()
+        return self._session
+
+    def _create_session(self):
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        session = requests.Session()
+        session.headers.update(self.headers)
+        retry_strategy = Retry(
+            total=3,
+            backoff_factor=2,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["HEAD", "GET", "OPTIONS"]
+        )
+        adapter = HTTPAdapter(
+            max_retries=retry_strategy,
+            pool_connections=self.max_workers,
+            pool_maxsize=self.max_workers
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+
+    def _fetch_entries(self, sitemap_url: str) -> Iterator[Tuple[str, str, Optional[str]]]:
+        """Fetch one sitemap and yield its entries while the body streams in."""
+        if self.rate_limiter is None:
+            response = self.session.get(sitemap_url, timeout=self.timeout, stream=True)
+        else:
+            with self.rate_limiter.request(sitemap_url) as permit:
+                response = self.session.get(sitemap_url, timeout=self.timeout, stream=True)
+                permit.record(status=response.status_code, error=response.status_code >= 500,
+                              retry_after=response.headers.get('Retry-After'))
+        try:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            # Keep the stream readable at EOF; the buffered/gzip readers read past the end
+            response.raw.auto_close = False
+            yield from iter_sitemap_entries(response.raw)
+        finally:
+            response.close()
+
+    def iter_urls(self, *sitemap_urls: str) -> Iterator[Tuple[str, Optional[str]]]:
+        """
+        Stream (loc, lastmod) pairs from one or more sitemaps or indexes.
+
+        Top-level sitemaps are fetched concurrently like sub-sitemaps. If a
+        top-level sitemap cannot be fetched or parsed the exception is raised
+        to the consumer (after URLs already found have been yielded).
+        """
+        results: "queue.Queue" = queue.Queue(maxsize=10000)
+        pending = [0]
+        pending_lock = threading.Lock()
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="sitemap")
+        closed = threading.Event()
+
+        def submit(url: str, top_level: bool):
+            with pending_lock:
+                pending[0] += 1
+            executor.submit(worker, url, top_level)
+
+        def put(item):
+            # Stop producing once the consumer has gone away
+            while not closed.is_set():
+                try:
+                    results.put(item, timeout=0.5)
+                    return
+                except queue.Full:
+                    continue
+
+        def worker(url: str, top_level: bool):
+            count = 0
+            if closed.is_set():
+                return
+            start = time.perf_counter()
+            try:
+                if self.logger and not top_level:
+                    self.logger.log_info(f"Processing sub-sitemap: {url}")
+                for kind, loc, lastmod in self._fetch_entries(url):
+                    if closed.is_set():
+                        break
+                    if kind == 'sitemap':
+                        submit(loc, False)
+                    else:
+                        count += 1
+                        put(('url', loc, lastmod))
+                if self.metrics is not None:
+                    self.metrics.observe('sitemap_fetch', time.perf_counter() - start)
+                if self.logger and not top_level:
+                    self.logger.log_info(f"Sub-sitemap processed: {count} URLs found")
+                put(('done', url, None))
+            except Exception as e:
+                put(('error', url, e) if top_level else ('done', url, None))
+                if self.logger and not top_level:
+                    self.logger.log_warning(f"Failed to process sub-sitemap {url}: {e}")
+
+        try:
+            for url in sitemap_urls:
+                submit(url, True)
+
+            error = None
+            while True:
+                with pending_lock:
+                    if pending[0] == 0:
+                        break
+                kind, value, extra = results.get()
+                if kind == 'url':
+                    yield value, extra
+                    continue
+                with pending_lock:
+                    pending[0] -= 1
+                if kind == 'error' and error is None:
+                    error = extra
+            if error is not None:
+                raise error
+        finally:
+            closed.set()
+            executor.shutdown(wait=False)
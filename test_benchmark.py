@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test script for the offline benchmark harness and its fixture docs site.
+"""
+
+import gzip
+import sys
+from pathlib import Path
+
+import requests
+
+# Add the current directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from benchmark_fixture_site import FixtureDocsSite
+from benchmark_scraper import run_benchmark
+
+
+def test_fixture_site_routes():
+    """The fixture serves a sitemap index, gzip sub-sitemaps, pages and challenges."""
+    print("Testing fixture site routes...")
+    with FixtureDocsSite(page_count=30, urls_per_sitemap=10, challenge_fraction=0.3, seed=1) as site:
+        index = requests.get(f"{site.base_url}/sitemap.xml", timeout=10)
+        assert index.status_code == 200
+        assert index.text.count("<sitemap>") == 3
+
+        sub = requests.get(f"{site.base_url}/sitemaps/part-0.xml.gz", timeout=10)
+        xml = gzip.decompress(sub.content).decode()
+        assert xml.count("<url>") == 10
+        assert site.page_path(0) in xml
+
+        normal = next(i for i in range(30) if not site.is_challenge(i))
+        page = requests.get(site.base_url + site.page_path(normal), timeout=10)
+        assert page.status_code == 200
+        assert 'class="main-content"' in page.text
+
+        cached = requests.get(site.base_url + site.page_path(normal), timeout=10,
+                              headers={'If-None-Match': page.headers['ETag']})
+        assert cached.status_code == 304 and not cached.content
+
+        challenged = next(i for i in range(30) if site.is_challenge(i))
+        blocked = requests.get(site.base_url + site.page_path(challenged), timeout=10)
+        assert blocked.status_code == 503
+        assert "Just a moment" in blocked.text
+
+        assert requests.get(f"{site.base_url}/5.3/en-US/missing", timeout=10).status_code == 404
+    print("✓ Sitemaps, pages, 304s and challenge pages served")
+    return True
+
+
+def test_benchmark_end_to_end():
+    """A small HTTP-mode run reports throughput and per-stage timings."""
+    print("Testing benchmark run...")
+    report = run_benchmark(pages=12, workers=4, fetch_mode='http', render_workers=0)
+
+    assert report['pages_processed'] == 12
+    assert report['pages_succeeded'] == 12 and report['pages_failed'] == 0
+    assert report['pages_per_second'] > 0
+    assert report['peak_rss_mb'] > 0
+    for stage in ('sitemap_fetch', 'http_fetch', 'parse', 'extract', 'page_total'):
+        assert stage in report['stages'], f"missing stage {stage}"
+    assert report['stages']['page_total']['count'] == 12
+    assert report['counters']['fetch_http'] == 12
+    print(f"✓ {report['pages_processed']} pages at {report['pages_per_second']:.1f} pages/sec")
+    return True
+
+
+def main():
+    """Run all benchmark harness tests."""
+    tests = [
+        test_fixture_site_routes,
+        test_benchmark_end_to_end,
+    ]
+
+    passed = 0
+    for test_func in tests:
+        try:
+            if test_func():
+                passed += 1
+        except AssertionError as e:
+            print(f"✗ {test_func.__name__} failed: {e}")
+        print()
+
+    print(f"Test Results: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Test script for in-browser content extraction.
+
+Firefox is not needed: a fake driver answers the extraction script by running
+the same cleaning rules and selector priority in Python. The tests then
+check that browser-mode extraction matches the Python path and falls back
+to page_source when the script fails. If node is installed, the injected
+script is also syntax-checked.
+"""
+
+import logging
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from selenium.common.exceptions import JavascriptException, WebDriverException
+
+# Add the current directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from benchmark_fixture_site import FixtureDocsSite
+from html_backend import CleaningRules, create_html_backend
+from retry_queue import RetryLedger, RetryPolicy
+import ue5_docs_scraper
+from ue5_docs_scraper import PAGE_EXTRACT_SCRIPT, UE5DocsScraper
+
+
+class FakeTimeouts:
+    page_load = 30
+
+
+class FakeBrowser:
+    """Driver stand-in serving one page; emulates PAGE_EXTRACT_SCRIPT in Python."""
+
+    def __init__(self, page_source, script_error=False):
+        self._page_source = page_source
+        self.script_error = script_error
+        self.page_source_reads = 0
+        self.timeouts = FakeTimeouts()
+
+    @property
+    def page_source(self):
+        self.page_source_reads += 1
+        return self._page_source
+
+    def get(self, url):
+        pass
+
+    def execute_async_script(self, script, *args):
+        return {'status': 'settled', 'matched': True, 'elapsed_ms': 1, 'ready_state': 'complete'}
+
+    def execute_script(self, script, content_selectors, min_text_length, removal_selectors,
+                       error_indicators, content_indicators):
+        assert script == PAGE_EXTRACT_SCRIPT
+        if self.script_error:
+            raise JavascriptException("javascript error: querySelectorAll is not a function")
+        source = self._page_source
+        result = {
+            'source_length': len(source),
+            'error_indicator': next((i for i in error_indicators if i in source), None),
+            'has_content': any(i in source for i in content_indicators),
+            'html': None, 'selector': None, 'text_length': 0, 'title': None, 'removed': {},
+        }
+        backend = create_html_backend('lxml-direct')
+        document = backend.parse(source)
+        result['removed'] = dict(backend.clean(document, CleaningRules(removal_selectors)))
+        for selector in content_selectors:
+            candidate = backend.select_one(document, selector)
+            if candidate is not None and backend.text_length(candidate) > min_text_length:
+                result.update(html=backend.to_html(candidate), selector=selector,
+                              text_length=backend.text_length(candidate))
+                break
+        result['title'] = backend.title(document)
+        return result
+
+    def quit(self):
+        pass
+
+
+def make_scraper(out_dir, extraction_mode):
+    scraper = UE5DocsScraper(
+        output_dir=str(Path(out_dir) / extraction_mode),
+        fetch_mode='http',
+        render_workers=0,
+        resume=False,
+        log_file=str(Path(out_dir) / "log.txt"),
+        parser_backend='lxml-direct',
+        extraction_mode=extraction_mode
+    )
+    scraper.logger.set_console_level(logging.ERROR)
+    # Use the browser path with a fake driver
+    scraper.fetch_mode = 'browser'
+    return scraper
+
+
+def test_browser_extraction_matches_python_path():
+    """Browser-mode extraction yields the same content and title without page_source."""
+    print("Testing in-browser extraction...")
+    page = FixtureDocsSite(page_count=5, seed=4).page_html(2).decode('utf-8')
+    url = "https://example.com/5.3/en-US/topic-00002"
+    with tempfile.TemporaryDirectory() as out_dir:
+        results = {}
+        for mode in ('python', 'browser'):
+            scraper = make_scraper(out_dir, mode)
+            browser = FakeBrowser(page)
+            scraper._bind_worker_driver(browser)
+            try:
+                html_content, soup = scraper.scrape_page_content(url)
+                results[mode] = (html_content, scraper.get_page_title(soup, url), browser.page_source_reads,
+                                 scraper.metrics.snapshot())
+            finally:
+                scraper._bind_worker_driver(None)
+                scraper.close()
+
+    python_html, python_title, python_reads, _ = results['python']
+    browser_html, browser_title, browser_reads, snapshot = results['browser']
+    assert python_html and browser_html == python_html
+    assert browser_title == python_title
+    assert python_reads == 1 and browser_reads == 0, "browser mode must not transfer page_source"
+    assert snapshot['stages']['browser_extract']['count'] == 1
+    assert 'parse' not in snapshot['stages']
+    assert snapshot['counters'].get('clean script', 0) > 0
+    print(f"✓ Same content ({len(browser_html)} of {len(page)} chars transferred), title {browser_title!r}")
+    return True
+
+
+def test_browser_extraction_falls_back_to_page_source():
+    """A failing extraction script falls back to the page_source path."""
+    print("Testing in-browser extraction fallback...")
+    page = FixtureDocsSite(page_count=5, seed=4).page_html(3).decode('utf-8')
+    with tempfile.TemporaryDirectory() as out_dir:
+        scraper = make_scraper(out_dir, 'browser')
+        browser = FakeBrowser(page, script_error=True)
+        scraper._bind_worker_driver(browser)
+        try:
+            html_content, soup = scraper.scrape_page_content("https://example.com/topic-00003")
+            snapshot = scraper.metrics.snapshot()
+        finally:
+            scraper._bind_worker_driver(None)
+            scraper.close()
+
+    assert html_content and browser.page_source_reads == 1
+    assert snapshot['counters']['browser_extract_fallback'] == 1
+    print("✓ Fell back to page_source")
+    return True
+
+
+def test_adopted_driver_errors_are_caught():
+    """Errors from a session that did not come from _create_driver are still Selenium's."""
+    print("Testing exceptions of an adopted session...")
+    assert ue5_docs_scraper.WebDriverException is WebDriverException
+    page = FixtureDocsSite(page_count=5, seed=4).page_html(1).decode('utf-8')
+    with tempfile.TemporaryDirectory() as out_dir:
+        scraper = make_scraper(out_dir, 'browser')
+        # Bound directly, as the crawl pool and tests do; no session is launched
+        scraper._bind_worker_driver(FakeBrowser(page, script_error=True))
+        try:
+            assert scraper._extract_in_browser("https://example.com/topic-00001") is None
+            snapshot = scraper.metrics.snapshot()
+        finally:
+            scraper._bind_worker_driver(None)
+            scraper.close()
+    assert snapshot['counters']['browser_extract_fallback'] == 1
+    print("✓ JavascriptException caught as WebDriverException")
+    return True
+
+
+def test_invalid_page_failure_is_logged():
+    """A page that fails validation in every attempt is logged as failed, like other failures."""
+    print("Testing final failure of an invalid page...")
+    with tempfile.TemporaryDirectory() as out_dir:
+        scraper = make_scraper(out_dir, 'python')
+        scraper.retry_ledger = RetryLedger({'error_page': RetryPolicy(max_attempts=1)})
+        errors = []
+        log_error = scraper.logger.log_error
+        scraper.logger.log_error = lambda message, **kwargs: (errors.append(message),
+                                                              log_error(message, **kwargs))
+        scraper._bind_worker_driver(FakeBrowser("<html></html>"))
+        try:
+            assert scraper.scrape_page_content("https://example.com/topic-00004") == (None, None)
+        finally:
+            scraper._bind_worker_driver(None)
+            scraper.close()
+    assert errors == ["All page scraping attempts failed"], errors
+    print("✓ Final failure logged")
+    return True
+
+
+def test_extract_script_syntax():
+    """The injected script is valid JavaScript (checked with node when available)."""
+    print("Testing extraction script syntax...")
+    node = shutil.which('node') or shutil.which('nodejs')
+    if not node:
+        print("⚠ node not installed, skipping syntax check")
+        return True
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        script_path = Path(tmp_dir) / "extract.js"
+        script_path.write_text("function extract() {" + PAGE_EXTRACT_SCRIPT + "}\n", encoding='utf-8')
+        result = subprocess.run([node, '--check', str(script_path)], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    print("✓ Script parses")
+    return True
+
+
+def main():
+    """Run all in-browser extraction tests."""
+    tests = [
+        test_browser_extraction_matches_python_path,
+        test_browser_extraction_falls_back_to_page_source,
+        test_adopted_driver_errors_are_caught,
+        test_invalid_page_failure_is_logged,
+        test_extract_script_syntax,
+    ]
+
+    passed = 0
+    for test_func in tests:
+        try:
+            if test_func():
+                passed += 1
+        except AssertionError as e:
+            print(f"✗ {test_func.__name__} failed: {e}")
+        print()
+
+    print(f"Test Results: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
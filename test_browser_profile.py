@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Test script for the lean Firefox crawl profile.
+"""
+
+import base64
+import json
+import logging
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# Add the current directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from browser_profile import (BLACKHOLE_PROXY, DEFAULT_BROWSER_PROFILE, allowed_hosts_for,
+                             build_pac_script, lean_profile_prefs, site_host)
+from ue5_docs_scraper import UE5DocsScraper
+
+# Minimal implementations of the PAC helper functions Firefox provides
+PAC_SHIMS = """
+function dnsDomainIs(host, domain) { return host.length >= domain.length && host.slice(-domain.length) === domain; }
+function isPlainHostName(host) { return host.indexOf('.') === -1; }
+"""
+
+
+def test_allow_list():
+    """The documentation host and default asset domains are allowed."""
+    print("Testing allow-list...")
+    assert site_host("https://Docs.UnrealEngine.com/5.3/en-US/") == "docs.unrealengine.com"
+    assert site_host("http://127.0.0.1:8765") == "127.0.0.1"
+    # Multi-label public suffixes are not mistaken for the site's domain
+    assert allowed_hosts_for("https://docs.example.co.uk/guide")[0] == "docs.example.co.uk"
+    assert "co.uk" not in allowed_hosts_for("https://docs.example.co.uk/guide")
+    hosts = allowed_hosts_for("https://dev.epicgames.com/documentation", ["CDN.Example.org", ".epicgames.com"])
+    assert hosts[0] == "dev.epicgames.com"
+    assert "cdn.example.org" in hosts and "unrealengine.com" in hosts and "epicgames.com" in hosts
+    assert len(hosts) == len(set(hosts))
+    print(f"✓ Allow-list: {', '.join(hosts)}")
+    return True
+
+
+def test_pac_blocks_third_party_hosts():
+    """The PAC script sends allowed hosts direct and everything else to the dead proxy."""
+    print("Testing PAC host blocking...")
+    node = shutil.which('node') or shutil.which('nodejs')
+    if not node:
+        print("⚠ node not installed, skipping PAC evaluation")
+        return True
+
+    pac = build_pac_script(allowed_hosts_for("https://docs.unrealengine.com"))
+    cases = {
+        'docs.unrealengine.com': 'DIRECT',
+        'unrealengine.com': 'DIRECT',
+        'static-assets-prod.epicgames.com': 'DIRECT',
+        'localhost': 'DIRECT',
+        '127.0.0.1': 'DIRECT',
+        'tracking.unrealengine.com': BLACKHOLE_PROXY,
+        'www.google-analytics.com': BLACKHOLE_PROXY,
+        'fonts.googleapis.com': BLACKHOLE_PROXY,
+        'evilunrealengine.com': BLACKHOLE_PROXY,
+    }
+    program = PAC_SHIMS + pac + (
+        "var hosts = %s; var out = {};"
+        "hosts.forEach(function (h) { out[h] = FindProxyForURL('https://' + h + '/', h); });"
+        "console.log(JSON.stringify(out));" % json.dumps(list(cases))
+    )
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        script_path = Path(tmp_dir) / "pac.js"
+        script_path.write_text(program, encoding='utf-8')
+        result = subprocess.run([node, str(script_path)], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    decisions = json.loads(result.stdout)
+    for host, expected in cases.items():
+        assert decisions[host] == expected, f"{host}: {decisions[host]}"
+    print(f"✓ {len(cases)} hosts routed as expected")
+    return True
+
+
+def test_lean_prefs():
+    """Lean prefs block images only when the session is not used to print PDFs."""
+    print("Testing lean profile preferences...")
+    prefs = lean_profile_prefs("https://docs.unrealengine.com", block_images=True)
+    assert prefs['permissions.default.image'] == 2
+    assert prefs['gfx.downloadable_fonts.enabled'] is False
+    assert prefs['network.proxy.type'] == 2
+    pac = base64.b64decode(prefs['network.proxy.autoconfig_url'].split(',', 1)[1]).decode()
+    assert 'FindProxyForURL' in pac and 'unrealengine.com' in pac
+
+    printing = lean_profile_prefs("https://docs.unrealengine.com", block_images=False)
+    assert 'permissions.default.image' not in printing
+    assert 'gfx.downloadable_fonts.enabled' not in printing
+    assert printing['media.autoplay.default'] == 5
+    print(f"✓ {len(prefs)} preferences")
+    return True
+
+
+def test_scraper_firefox_options():
+    """The scraper uses normal page loads by default and applies the lean profile when chosen."""
+    print("Testing scraper Firefox options...")
+    with tempfile.TemporaryDirectory() as out_dir:
+        options = {}
+        for profile in ('lean', 'standard'):
+            scraper = UE5DocsScraper(
+                output_dir=str(Path(out_dir) / profile),
+                fetch_mode='http',
+                render_workers=0,
+                resume=False,
+                log_file=str(Path(out_dir) / "log.txt"),
+                browser_profile=profile,
+                allowed_hosts=['cdn.example.org']
+            )
+            scraper.logger.set_console_level(logging.ERROR)
+            try:
+                options[profile] = scraper._firefox_options()
+            finally:
+                scraper.close()
+
+    lean, standard = options['lean'], options['standard']
+    assert lean.page_load_strategy == 'eager'
+    assert DEFAULT_BROWSER_PROFILE == 'standard'
+    assert standard.page_load_strategy == 'normal'
+    assert lean.preferences['network.proxy.type'] == 2
+    assert lean.preferences['dom.webdriver.enabled'] is False
+    pac = base64.b64decode(lean.preferences['network.proxy.autoconfig_url'].split(',', 1)[1]).decode()
+    assert 'cdn.example.org' in pac
+    assert 'network.proxy.type' not in standard.preferences
+    print("✓ Lean profile applied")
+    return True
+
+
+def main():
+    """Run all browser profile tests."""
+    tests = [
+        test_allow_list,
+        test_pac_blocks_third_party_hosts,
+        test_lean_prefs,
+        test_scraper_firefox_options,
+    ]
+
+    passed = 0
+    for test_func in tests:
+        try:
+            if test_func():
+                passed += 1
+        except AssertionError as e:
+            print(f"✗ {test_func.__name__} failed: {e}")
+        print()
+
+    print(f"Test Results: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
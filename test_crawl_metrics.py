@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test script for per-stage crawl metrics.
+"""
+
+import json
+import random
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+# Add the current directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from crawl_metrics import CrawlMetrics, LatencyHistogram, PAGES_COUNTER
+from enhanced_logger import CrossPlatformLogger
+
+
+def test_histogram_percentiles():
+    """Bucketed percentiles stay close to the exact values."""
+    print("Testing histogram percentiles...")
+    rng = random.Random(42)
+    samples = [rng.lognormvariate(-2, 1) for _ in range(20000)]
+    histogram = LatencyHistogram()
+    for sample in samples:
+        histogram.record(sample)
+
+    ordered = sorted(samples)
+    for percent in (50, 90, 95, 99):
+        exact = ordered[int(percent / 100 * len(ordered)) - 1]
+        approx = histogram.percentile(percent)
+        assert abs(approx - exact) / exact < 0.1, f"p{percent}: {approx:.4f} vs {exact:.4f}"
+    assert histogram.count == len(samples)
+    assert histogram.max == max(samples)
+    print(f"✓ p50={histogram.percentile(50):.4f}s p99={histogram.percentile(99):.4f}s within 10%")
+    return True
+
+
+def test_time_stage_and_counters():
+    """Stages are timed even when the block raises; counters are thread-safe."""
+    print("Testing stage timing and counters...")
+    metrics = CrawlMetrics()
+
+    with metrics.time_stage('parse'):
+        pass
+    try:
+        with metrics.time_stage('parse'):
+            raise ValueError("boom")
+    except ValueError:
+        pass
+
+    def worker():
+        for _ in range(1000):
+            metrics.increment(PAGES_COUNTER)
+            metrics.observe('extract', 0.01)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    snapshot = metrics.snapshot()
+    assert snapshot['stages']['parse']['count'] == 2
+    assert snapshot['stages']['extract']['count'] == 4000
+    assert snapshot['pages'] == 4000
+    assert snapshot['stages']['extract']['seconds_per_1000_pages'] == 10.0
+    assert list(snapshot['stages']) == ['parse', 'extract']
+    print("✓ Stages and counters recorded")
+    return True
+
+
+def test_metrics_file_and_summary():
+    """Snapshots are written as JSON and printed in the completion summary."""
+    print("Testing metrics output...")
+    metrics = CrawlMetrics()
+    metrics.increment(PAGES_COUNTER, 2)
+    metrics.observe('pdf_render', 1.5)
+    metrics.observe('pdf_render', 0.5)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = metrics.write_json(Path(tmp_dir) / "metrics" / "crawl_metrics.json")
+        data = json.loads(path.read_text(encoding='utf-8'))
+        assert data['stages']['pdf_render']['count'] == 2
+        assert data['stages']['pdf_render']['max'] == 1.5
+
+        log_file = Path(tmp_dir) / "log.txt"
+        logger = CrossPlatformLogger(log_file=str(log_file), enable_console=False)
+        logger.log_completion_summary(2, 2, 0, 3.0, stage_metrics=metrics.snapshot())
+        content = log_file.read_text(encoding='utf-8')
+        assert "STAGE TIMINGS" in content
+        assert "pdf_render" in content
+    print("✓ JSON file and summary table written")
+    return True
+
+
+def main():
+    """Run all crawl metrics tests."""
+    tests = [
+        test_histogram_percentiles,
+        test_time_stage_and_counters,
+        test_metrics_file_and_summary,
+    ]
+
+    passed = 0
+    for test_func in tests:
+        try:
+            if test_func():
+                passed += 1
+        except AssertionError as e:
+            print(f"✗ {test_func.__name__} failed: {e}")
+        print()
+
+    print(f"Test Results: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
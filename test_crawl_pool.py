@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Test script for the multi-driver crawl worker pool.
+
+Uses a fake scraper with fake drivers so the pool can be exercised without
+Firefox or network access.
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+
+# Add the current directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from crawl_metrics import CrawlMetrics
+from crawl_pool import CrawlWorkerPool
+from enhanced_logger import CrossPlatformLogger
+from user_agents import user_agent_for
+
+
+class FakeDriver:
+    def __init__(self, name):
+        self.name = name
+        self.quit_called = False
+
+    def execute_script(self, script):
+        return "complete"
+
+    def quit(self):
+        self.quit_called = True
+
+
+class FakeScraper:
+    """Minimal object implementing the interface CrawlWorkerPool expects."""
+
+    def __init__(self, logger, page_delay=0.0, fail_urls=()):
+        self.logger = logger
+        self.driver_primary = FakeDriver("primary")
+        self.created_drivers = []
+        self.page_delay = page_delay
+        self.fail_urls = set(fail_urls)
+        self.processed = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @property
+    def driver(self):
+        return getattr(self._local, 'driver', None) or self.driver_primary
+
+    @driver.setter
+    def driver(self, value):
+        self.driver_primary = value
+
+    def _create_driver(self):
+        driver = FakeDriver(f"worker-{len(self.created_drivers) + 1}")
+        with self._lock:
+            self.created_drivers.append(driver)
+        return driver
+
+    def _bind_worker_driver(self, driver):
+        self._local.driver = driver
+
+    def _process_url(self, url, index, total):
+        time.sleep(self.page_delay)
+        with self._lock:
+            self.processed.append((url, self.driver.name))
+        return url not in self.fail_urls
+
+
+class OnDemandScraper(FakeScraper):
+    """Fake scraper that launches worker sessions when a page first uses the driver."""
+
+    uses_browser = True
+
+    def __init__(self, logger, browser_urls=()):
+        super().__init__(logger)
+        self.driver_primary = None
+        self.browser_urls = set(browser_urls)
+
+    @property
+    def primary_driver(self):
+        return self.driver_primary
+
+    @property
+    def driver(self):
+        driver = getattr(self._local, 'driver', None)
+        if driver is None and getattr(self._local, 'driver_source', None) is not None:
+            driver = self._local.driver = self._local.driver_source()
+        return driver
+
+    @driver.setter
+    def driver(self, value):
+        self.driver_primary = value
+
+    def _bind_driver_source(self, source):
+        self._local.driver_source = source
+
+    def _process_url(self, url, index, total):
+        # Only some pages need the browser; the others are served over HTTP
+        name = self.driver.name if url in self.browser_urls else "http"
+        with self._lock:
+            self.processed.append((url, name))
+        return True
+
+
+class IdentityScraper(FakeScraper):
+    """Fake scraper recording which worker identity each page ran under."""
+
+    def _bind_worker_identity(self, worker_id):
+        self._local.worker_id = worker_id
+
+    def _process_url(self, url, index, total):
+        with self._lock:
+            self.processed.append((url, self._local.worker_id))
+        return True
+
+
+class AgentScraper(IdentityScraper):
+    """Fake scraper whose sessions carry the user agent of the worker they were launched for."""
+
+    driver_standby = 1
+    driver_max_pages = 3
+
+    def __init__(self, logger, page_delay=0.0):
+        super().__init__(logger, page_delay=page_delay)
+        self.driver_primary = FakeDriver(user_agent_for(0))
+        self.launches = []
+
+    def _create_driver(self, worker_id=None):
+        if worker_id is None:
+            worker_id = getattr(self._local, 'worker_id', None) or 0
+        driver = FakeDriver(user_agent_for(worker_id))
+        with self._lock:
+            self.created_drivers.append(driver)
+            self.launches.append((worker_id, threading.current_thread().name))
+        return driver
+
+    def _process_url(self, url, index, total):
+        time.sleep(self.page_delay)
+        with self._lock:
+            self.processed.append((url, self._local.worker_id, self.driver.name))
+        return True
+
+
+class RenderingScraper(FakeScraper):
+    """Fake scraper whose page outcomes are decided later, like a queued PDF render."""
+
+    uses_browser = False
+
+    def _process_url(self, url, index, total):
+        outcome = Future()
+        timer = threading.Timer(0.05, outcome.set_result, args=(url not in self.fail_urls,))
+        timer.start()
+        return outcome
+
+
+def _make_logger():
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as tmp_file:
+        log_file = tmp_file.name
+    return CrossPlatformLogger(log_file=log_file, enable_console=False), log_file
+
+
+def test_pool_processes_every_url_once():
+    """Every URL is processed exactly once and stats add up."""
+    print("Testing crawl pool URL dispatch...")
+    logger, log_file = _make_logger()
+    try:
+        urls = [f"https://example.com/page/{i}" for i in range(40)]
+        scraper = FakeScraper(logger, fail_urls=urls[:3])
+
+        stats = CrawlWorkerPool(scraper, worker_count=4).run(urls)
+
+        processed_urls = sorted(url for url, _ in scraper.processed)
+        assert processed_urls == sorted(urls)
+        assert sum(s.pages_ok for s in stats) == 37
+        assert sum(s.pages_failed for s in stats) == 3
+        print("✓ All URLs processed exactly once")
+        return True
+    finally:
+        os.unlink(log_file)
+
+
+def test_pool_uses_one_driver_per_worker():
+    """Worker 0 reuses the primary driver; other workers own and quit theirs."""
+    print("Testing per-worker driver ownership...")
+    logger, log_file = _make_logger()
+    try:
+        urls = [f"https://example.com/page/{i}" for i in range(20)]
+        scraper = FakeScraper(logger, page_delay=0.01)
+
+        CrawlWorkerPool(scraper, worker_count=3).run(urls)
+
+        assert len(scraper.created_drivers) == 2
+        assert all(driver.quit_called for driver in scraper.created_drivers)
+        assert not scraper.driver_primary.quit_called
+        used = {name for _, name in scraper.processed}
+        assert "primary" in used
+        print("✓ Drivers bound per worker")
+        return True
+    finally:
+        os.unlink(log_file)
+
+
+def test_pool_scales_with_workers():
+    """Wall time drops roughly linearly with the number of workers."""
+    print("Testing crawl pool scaling...")
+    logger, log_file = _make_logger()
+    try:
+        urls = [f"https://example.com/page/{i}" for i in range(24)]
+
+        start = time.monotonic()
+        CrawlWorkerPool(FakeScraper(logger, page_delay=0.02), worker_count=1).run(urls)
+        serial = time.monotonic() - start
+
+        start = time.monotonic()
+        CrawlWorkerPool(FakeScraper(logger, page_delay=0.02), worker_count=4).run(urls)
+        parallel = time.monotonic() - start
+
+        assert parallel < serial / 2, f"serial={serial:.2f}s parallel={parallel:.2f}s"
+        print(f"✓ 1 worker: {serial:.2f}s, 4 workers: {parallel:.2f}s")
+        return True
+    finally:
+        os.unlink(log_file)
+
+
+def test_pool_accepts_streaming_input():
+    """URLs can come from a generator of unknown length."""
+    print("Testing streaming URL input...")
+    logger, log_file = _make_logger()
+    try:
+        scraper = FakeScraper(logger)
+        urls = (f"https://example.com/stream/{i}" for i in range(15))
+
+        CrawlWorkerPool(scraper, worker_count=2, queue_size=2).run(urls)
+
+        assert len(scraper.processed) == 15
+        print("✓ Streaming input processed")
+        return True
+    finally:
+        os.unlink(log_file)
+
+
+def test_sessions_start_on_demand():
+    """No session is launched unless a page needs the browser."""
+    print("Testing on-demand worker sessions...")
+    logger, log_file = _make_logger()
+    try:
+        urls = [f"https://example.com/page/{i}" for i in range(12)]
+        scraper = OnDemandScraper(logger)
+        CrawlWorkerPool(scraper, worker_count=3).run(urls)
+        assert len(scraper.processed) == 12
+        assert scraper.created_drivers == []
+        assert scraper.driver_primary is None
+
+        scraper = OnDemandScraper(logger, browser_urls=urls[:1])
+        CrawlWorkerPool(scraper, worker_count=3).run(urls)
+        assert len(scraper.created_drivers) == 1
+        print("✓ Sessions launched only for pages that use the browser")
+        return True
+    finally:
+        os.unlink(log_file)
+
+
+def test_workers_bind_their_identity():
+    """Each worker thread is told its worker id before it processes pages."""
+    print("Testing worker identity binding...")
+    logger, log_file = _make_logger()
+    try:
+        urls = [f"https://example.com/page/{i}" for i in range(30)]
+        scraper = IdentityScraper(logger, page_delay=0.005)
+
+        stats = CrawlWorkerPool(scraper, worker_count=3).run(urls)
+
+        assert {worker_id for _, worker_id in scraper.processed} <= {0, 1, 2}
+        per_worker = {s.worker_id: s.pages_ok for s in stats}
+        for worker_id, count in per_worker.items():
+            assert sum(1 for _, bound in scraper.processed if bound == worker_id) == count
+        print("✓ Pages ran under their worker's identity")
+        return True
+    finally:
+        os.unlink(log_file)
+
+
+def test_recycled_sessions_keep_worker_user_agent():
+    """Standby replacements are launched with the user agent of the worker taking them."""
+    print("Testing user agents of recycled sessions...")
+    logger, log_file = _make_logger()
+    try:
+        urls = [f"https://example.com/page/{i}" for i in range(36)]
+        scraper = AgentScraper(logger, page_delay=0.01)
+
+        CrawlWorkerPool(scraper, worker_count=3).run(urls)
+
+        assert len(scraper.processed) == 36
+        for url, worker_id, agent in scraper.processed:
+            assert agent == user_agent_for(worker_id), (url, worker_id, agent)
+        assert (1, "driver-standby") in scraper.launches, scraper.launches
+        print(f"✓ {len(scraper.created_drivers)} sessions, each with its worker's user agent")
+        return True
+    finally:
+        os.unlink(log_file)
+
+
+def test_every_worker_gets_standby_sessions():
+    """With several workers, each one's recycles are served by a session prepared for it."""
+    print("Testing standby sessions for every worker...")
+    logger, log_file = _make_logger()
+    try:
+        urls = [f"https://example.com/page/{i}" for i in range(48)]
+        scraper = AgentScraper(logger, page_delay=0.01)
+        scraper.metrics = CrawlMetrics()
+
+        stats = CrawlWorkerPool(scraper, worker_count=4).run(urls)
+
+        assert sum(s.pages_ok for s in stats) == 48
+        for url, worker_id, agent in scraper.processed:
+            assert agent == user_agent_for(worker_id), (url, worker_id, agent)
+        counters = scraper.metrics.snapshot()['counters']
+        assert counters.get('standby_misses', 0) == 0, counters
+        assert counters['standby_hits'] == counters['driver_recycles'], counters
+        # Only the first sessions of workers 1-3 (worker 0 has the primary session) were
+        # launched on the worker's own thread
+        on_worker_threads = [launch for launch in scraper.launches if launch[1] != "driver-standby"]
+        assert sorted(on_worker_threads) == [(i, f"crawl-worker-{i}") for i in (1, 2, 3)], scraper.launches
+        standby_workers = {worker_id for worker_id, thread in scraper.launches if thread == "driver-standby"}
+        assert standby_workers == {0, 1, 2, 3}, scraper.launches
+        print(f"✓ {counters['standby_hits']} recycles served from standby across 4 workers")
+        return True
+    finally:
+        os.unlink(log_file)
+
+
+def test_pending_outcomes_counted_when_known():
+    """Pages whose outcome is decided later are counted by that outcome, before run() returns."""
+    print("Testing deferred page outcomes...")
+    logger, log_file = _make_logger()
+    try:
+        urls = [f"https://example.com/page/{i}" for i in range(12)]
+        scraper = RenderingScraper(logger, fail_urls=urls[:3])
+
+        stats = CrawlWorkerPool(scraper, worker_count=2).run(urls)
+
+        assert sum(s.pages_ok for s in stats) == 9, [s.as_dict() for s in stats]
+        assert sum(s.pages_failed for s in stats) == 3, [s.as_dict() for s in stats]
+        print("✓ 9 rendered and 3 failed pages counted after their jobs finished")
+        return True
+    finally:
+        os.unlink(log_file)
+
+
+def main():
+    """Run all crawl pool tests."""
+    tests = [
+        test_pool_processes_every_url_once,
+        test_pool_uses_one_driver_per_worker,
+        test_pool_scales_with_workers,
+        test_pool_accepts_streaming_input,
+        test_sessions_start_on_demand,
+        test_workers_bind_their_identity,
+        test_recycled_sessions_keep_worker_user_agent,
+        test_every_worker_gets_standby_sessions,
+        test_pending_outcomes_counted_when_known,
+    ]
+
+    passed = 0
+    for test_func in tests:
+        try:
+            if test_func():
+                passed += 1
+        except AssertionError as e:
+            print(f"✗ {test_func.__name__} failed: {e}")
+        print()
+
+    print(f"Test Results: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
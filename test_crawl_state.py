@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Test script for the persistent crawl state store.
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+# Add the current directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from crawl_state import (CrawlStateStore, STATUS_DONE, STATUS_FAILED, STATUS_PENDING, STATUS_REMOVED,
+                         read_status)
+
+
+def test_state_survives_reopen():
+    """Completed URLs are still completed after the store is reopened."""
+    print("Testing crawl state persistence...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "state.sqlite")
+
+        store = CrawlStateStore(db_path)
+        store.record_start("https://example.com/a")
+        store.record_success("https://example.com/a", output_path="a/A.pdf",
+                             content_hash="abc", duration_seconds=1.5)
+        store.record_start("https://example.com/b")
+        store.record_failure("https://example.com/b", error="timeout")
+        store.close()
+
+        reopened = CrawlStateStore(db_path)
+        try:
+            assert reopened.is_completed("https://example.com/a")
+            assert not reopened.is_completed("https://example.com/b")
+            record = reopened.get("https://example.com/a")
+            assert record['output_path'] == "a/A.pdf"
+            assert record['content_hash'] == "abc"
+            assert record['attempts'] == 1
+            assert reopened.get("https://example.com/b")['status'] == STATUS_FAILED
+        finally:
+            reopened.close()
+        print("✓ State persisted across reopen")
+        return True
+
+
+def test_in_flight_url_is_retried():
+    """A URL interrupted mid-flight comes back as pending."""
+    print("Testing interrupted URL recovery...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "state.sqlite")
+
+        store = CrawlStateStore(db_path, batch_size=1)
+        store.record_start("https://example.com/crash")
+        # Simulate a crash: the connection goes away without close()
+        store._conn.close()
+        store._conn = None
+
+        reopened = CrawlStateStore(db_path)
+        try:
+            record = reopened.get("https://example.com/crash")
+            assert record['status'] == STATUS_PENDING
+            assert record['attempts'] == 1
+        finally:
+            reopened.close()
+        print("✓ In-flight URL reset to pending")
+        return True
+
+
+def test_writes_are_batched():
+    """Nothing reaches disk until the batch fills or flush() is called."""
+    print("Testing batched writes...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "state.sqlite")
+
+        store = CrawlStateStore(db_path, batch_size=10, flush_interval=3600)
+        try:
+            for i in range(5):
+                store.record_success(f"https://example.com/{i}")
+
+            def rows_on_disk():
+                conn = sqlite3.connect(db_path)
+                try:
+                    return conn.execute("SELECT COUNT(*) FROM urls").fetchone()[0]
+                finally:
+                    conn.close()
+
+            assert rows_on_disk() == 0
+            assert store.status_counts() == {STATUS_DONE: 5}
+
+            for i in range(5, 10):
+                store.record_success(f"https://example.com/{i}")
+            assert rows_on_disk() == 10
+
+            mode = store._conn.execute("PRAGMA journal_mode").fetchone()[0]
+            assert mode.lower() == "wal"
+        finally:
+            store.close()
+        print("✓ Writes batched in WAL mode")
+        return True
+
+
+def test_validators_and_removal():
+    """Validators survive unchanged checks; vanished URLs are marked removed."""
+    print("Testing incremental validators...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "state.sqlite")
+
+        store = CrawlStateStore(db_path)
+        store.record_success("https://example.com/a", content_hash="h1", lastmod="2024-01-01",
+                             etag='"v1"', last_modified="Mon, 01 Jan 2024 00:00:00 GMT")
+        store.record_success("https://example.com/gone", content_hash="h2")
+        store.record_unchanged("https://example.com/a", lastmod="2024-02-01")
+        assert store.mark_removed(["https://example.com/gone"]) == 1
+        store.close()
+
+        reopened = CrawlStateStore(db_path)
+        try:
+            record = reopened.get("https://example.com/a")
+            assert record['status'] == STATUS_DONE
+            assert record['lastmod'] == "2024-02-01"
+            assert record['etag'] == '"v1"'
+            assert record['content_hash'] == "h1"
+            assert reopened.get("https://example.com/gone")['status'] == STATUS_REMOVED
+        finally:
+            reopened.close()
+        print("✓ Validators kept and removals recorded")
+        return True
+
+
+def test_old_database_is_migrated():
+    """Databases without the validator columns gain them on open."""
+    print("Testing schema migration...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "state.sqlite")
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE TABLE urls (url TEXT PRIMARY KEY, status TEXT NOT NULL, "
+                     "attempts INTEGER NOT NULL DEFAULT 0, output_path TEXT, content_hash TEXT, "
+                     "started_at REAL, finished_at REAL, duration_seconds REAL, error TEXT, "
+                     "updated_at REAL)")
+        conn.execute("INSERT INTO urls (url, status, attempts) VALUES ('https://example.com/old', 'done', 1)")
+        conn.commit()
+        conn.close()
+
+        store = CrawlStateStore(db_path)
+        try:
+            assert store.is_completed("https://example.com/old")
+            assert store.get("https://example.com/old")['etag'] is None
+        finally:
+            store.close()
+        print("✓ Old database migrated")
+        return True
+
+
+def test_aliases_and_manifest():
+    """Alias records count as done and the manifest maps them to the owner's output."""
+    print("Testing alias records and manifest...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = CrawlStateStore(os.path.join(tmp_dir, "state.sqlite"))
+        try:
+            store.record_success("https://example.com/a", output_path="a/A.pdf", content_hash="h1")
+            store.record_alias("https://example.com/a/", "https://example.com/a", output_path="a/A.pdf")
+            store.record_alias("https://example.com/b", "https://example.com/a/", content_hash="h1")
+            store.record_alias("https://example.com/c", "https://example.com/missing")
+            store.record_start("https://example.com/d")
+            store.record_failure("https://example.com/d")
+
+            assert store.is_completed("https://example.com/b")
+            manifest = store.manifest()
+            assert manifest["https://example.com/a"] == {
+                'canonical_url': "https://example.com/a", 'output_path': "a/A.pdf"}
+            assert manifest["https://example.com/b"] == {
+                'canonical_url': "https://example.com/a", 'output_path': "a/A.pdf"}
+            assert manifest["https://example.com/c"] == {
+                'canonical_url': "https://example.com/missing", 'output_path': None}
+            assert "https://example.com/d" not in manifest
+
+            # A former alias that is saved on its own owns its output again
+            store.record_success("https://example.com/b", output_path="b/B.pdf", content_hash="h2")
+            assert store.manifest()["https://example.com/b"]['canonical_url'] == "https://example.com/b"
+        finally:
+            store.close()
+        print("✓ Aliases resolved in the manifest")
+        return True
+
+
+def test_read_status_is_read_only():
+    """read_status summarizes a database without creating or changing it."""
+    print("Testing read-only status summary...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "state.sqlite")
+        assert read_status(db_path) is None
+        assert not os.path.exists(db_path)
+
+        store = CrawlStateStore(db_path)
+        try:
+            store.record_success("https://example.com/a", output_path="a/A.pdf")
+            store.record_alias("https://example.com/a/", "https://example.com/a")
+            store.record_start("https://example.com/b")
+            store.record_start("https://example.com/c")
+            store.record_failure("https://example.com/c", error="timeout")
+            store.flush()
+
+            status = read_status(db_path)
+            assert status['counts'] == {STATUS_DONE: 2, STATUS_PENDING: 1, STATUS_FAILED: 1}, status
+            assert status['aliases'] == 1
+            assert status['updated_at'] is not None
+            # The running store still owns the data
+            assert store.get("https://example.com/b") is not None
+        finally:
+            store.close()
+        print("✓ Status read without touching the database")
+        return True
+
+
+def test_read_only_store():
+    """A read-only store loads an existing database but never creates or changes one."""
+    print("Testing read-only store...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "state", "state.sqlite")
+        store = CrawlStateStore(db_path, read_only=True)
+        store.record_success("https://example.com/a", output_path="a/A.pdf")
+        store.close()
+        assert not os.path.exists(os.path.dirname(db_path)), "missing database was created"
+
+        store = CrawlStateStore(db_path)
+        store.record_success("https://example.com/a", output_path="a/A.pdf")
+        store.close()
+
+        store = CrawlStateStore(db_path, read_only=True, batch_size=1)
+        try:
+            assert store.is_completed("https://example.com/a")
+            store.record_failure("https://example.com/a", error="timeout")
+            store.reset()
+            assert store.get("https://example.com/a") is None
+        finally:
+            store.close()
+        assert read_status(db_path)['counts'] == {STATUS_DONE: 1}
+        print("✓ Read-only store left the database unchanged")
+        return True
+
+
+def main():
+    """Run all crawl state tests."""
+    tests = [
+        test_state_survives_reopen,
+        test_in_flight_url_is_retried,
+        test_writes_are_batched,
+        test_validators_and_removal,
+        test_old_database_is_migrated,
+        test_aliases_and_manifest,
+        test_read_status_is_read_only,
+        test_read_only_store,
+    ]
+
+    passed = 0
+    for test_func in tests:
+        try:
+            if test_func():
+                passed += 1
+        except AssertionError as e:
+            print(f"✗ {test_func.__name__} failed: {e}")
+        print()
+
+    print(f"Test Results: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Test script for browser session supervision.
+
+Fake drivers stand in for Firefox. The hung-quit test points a fake session
+at a real ``sleep`` process so the kill path can be checked.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from selenium.common.exceptions import WebDriverException
+
+# Add the current directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from crawl_metrics import CrawlMetrics
+from crawl_pool import CrawlWorkerPool
+from driver_supervisor import DriverSupervisor, StandbyDriverPool
+from enhanced_logger import CrossPlatformLogger
+
+
+class FakeProcess:
+    def __init__(self, pid):
+        self.pid = pid
+
+
+class FakeService:
+    def __init__(self, pid):
+        self.process = FakeProcess(pid)
+
+
+class FakeDriver:
+    """Session stand-in that can be made dead, hung or slow to quit."""
+
+    def __init__(self, name, pid=None, quit_delay=0.0):
+        self.name = name
+        self.dead = False
+        self.hang = False
+        self.quit_delay = quit_delay
+        self.quit_called = False
+        if pid is not None:
+            self.service = FakeService(pid)
+
+    def execute_script(self, script):
+        if self.hang:
+            time.sleep(5)
+        if self.dead:
+            raise WebDriverException("Failed to decode response from marionette")
+        return "complete"
+
+    def quit(self):
+        self.quit_called = True
+        time.sleep(self.quit_delay)
+
+
+class DriverFactory:
+    def __init__(self, launch_delay=0.0):
+        self.created = []
+        self.launch_delay = launch_delay
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        time.sleep(self.launch_delay)
+        with self._lock:
+            driver = FakeDriver(f"session-{len(self.created) + 1}")
+            self.created.append(driver)
+        return driver
+
+
+def _make_logger():
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as tmp_file:
+        log_file = tmp_file.name
+    return CrossPlatformLogger(log_file=log_file, enable_console=False), log_file
+
+
+def test_recycle_after_page_limit():
+    """A session is replaced once it has served max_pages pages."""
+    print("Testing recycling by page count...")
+    logger, log_file = _make_logger()
+    try:
+        factory = DriverFactory()
+        metrics = CrawlMetrics()
+        supervisor = DriverSupervisor(factory, logger, max_pages=3, metrics=metrics)
+        first = supervisor.driver
+        recycled = []
+        for _ in range(7):
+            recycled.append(supervisor.maintain())
+            supervisor.page_done()
+
+        assert recycled == [False, False, False, True, False, False, True], recycled
+        assert len(factory.created) == 3 and supervisor.driver is factory.created[-1]
+        assert first.quit_called and not supervisor.driver.quit_called
+        snapshot = metrics.snapshot()
+        assert snapshot['counters']['driver_recycles'] == 2
+        assert snapshot['counters']['driver_recycle_max_pages'] == 2
+        assert snapshot['stages']['driver_start']['count'] == 3
+        print("✓ Recycled every 3 pages")
+        return True
+    finally:
+        logger.close()
+        os.unlink(log_file)
+
+
+def test_recycle_above_memory_limit():
+    """A session whose processes exceed max_rss_mb is replaced."""
+    print("Testing recycling by memory...")
+    logger, log_file = _make_logger()
+    try:
+        # The fake session "owns" this test process, which uses well over 1 MB
+        supervisor = DriverSupervisor(DriverFactory(), logger, driver=FakeDriver("primary", pid=os.getpid()),
+                                      max_rss_mb=1, rss_check_interval=2)
+        supervisor.page_done()
+        assert supervisor.recycle_reason() is None, "RSS is only sampled every rss_check_interval pages"
+        supervisor.page_done()
+        assert supervisor.recycle_reason() == 'max_rss'
+        assert supervisor.last_rss_mb > 1
+        print(f"✓ Recycled at {supervisor.last_rss_mb:.0f} MB")
+        return True
+    finally:
+        logger.close()
+        os.unlink(log_file)
+
+
+def test_health_check_and_quit_timeout():
+    """Dead and hung sessions fail the health check; a hung quit is killed."""
+    print("Testing health checks and quit timeout...")
+    logger, log_file = _make_logger()
+    sleeper = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])
+    try:
+        driver = FakeDriver("primary", pid=sleeper.pid, quit_delay=5)
+        supervisor = DriverSupervisor(DriverFactory(), logger, driver=driver,
+                                      health_timeout=0.2, quit_timeout=0.2)
+        assert supervisor.is_healthy()
+        driver.dead = True
+        assert not supervisor.is_healthy()
+        driver.dead, driver.hang = False, True
+        start = time.monotonic()
+        assert not supervisor.is_healthy()
+        assert time.monotonic() - start < 2, "health check must not wait for a hung session"
+
+        start = time.monotonic()
+        supervisor.close()
+        assert time.monotonic() - start < 2, "quit must not wait for a hung session"
+        assert driver.quit_called and sleeper.wait(timeout=5) is not None
+        print("✓ Hung session detected and its process killed")
+        return True
+    finally:
+        if sleeper.poll() is None:
+            sleeper.kill()
+        logger.close()
+        os.unlink(log_file)
+
+
+def test_standby_pool_swaps_in_ready_session():
+    """A recycle takes a pre-launched session instead of waiting for a launch."""
+    print("Testing standby session pool...")
+    logger, log_file = _make_logger()
+    try:
+        factory = DriverFactory(launch_delay=0.5)
+        metrics = CrawlMetrics()
+        standby = StandbyDriverPool(factory, logger, size=1, metrics=metrics)
+        supervisor = DriverSupervisor(factory, logger, driver=FakeDriver("primary"), max_pages=1,
+                                      metrics=metrics, standby=standby)
+        standby.start()
+        deadline = time.monotonic() + 5
+        while standby.ready_count < 1 and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert standby.ready_count == 1
+
+        supervisor.page_done()
+        start = time.monotonic()
+        assert supervisor.maintain()
+        swap_seconds = time.monotonic() - start
+        assert swap_seconds < 0.25, f"swap took {swap_seconds:.2f}s"
+        assert supervisor.driver is factory.created[0]
+
+        # The pool launches the next standby session, which close() quits unused
+        deadline = time.monotonic() + 5
+        while standby.ready_count < 1 and time.monotonic() < deadline:
+            time.sleep(0.02)
+        standby.close()
+        assert len(factory.created) == 2 and factory.created[1].quit_called
+
+        # Without standby sessions, replacements launch on the calling thread
+        on_demand = StandbyDriverPool(factory, logger, size=0, metrics=metrics)
+        assert on_demand.acquire() is factory.created[2]
+
+        snapshot = metrics.snapshot()
+        assert snapshot['counters']['standby_hits'] == 1 and snapshot['counters']['standby_misses'] == 1
+        assert snapshot['stages']['driver_start']['count'] == 3
+        assert snapshot['stages']['driver_wait']['count'] == 1
+        print(f"✓ Session swapped in {swap_seconds * 1000:.0f}ms (launch takes 500ms)")
+        return True
+    finally:
+        logger.close()
+        os.unlink(log_file)
+
+
+class CrashingScraper:
+    """Scraper stand-in whose primary session dies while loading one URL."""
+
+    def __init__(self, logger, crash_url):
+        self.logger = logger
+        self.metrics = CrawlMetrics()
+        self.uses_browser = True
+        self.driver_max_pages = 0
+        self.driver_max_rss_mb = 0
+        self.factory = DriverFactory()
+        self.primary = FakeDriver("primary")
+        self.crash_url = crash_url
+        self.attempts = []
+        self.saved = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @property
+    def driver(self):
+        return getattr(self._local, 'driver', None) or self.primary
+
+    @driver.setter
+    def driver(self, value):
+        self.primary = value
+
+    def _create_driver(self):
+        return self.factory()
+
+    def _bind_worker_driver(self, driver):
+        self._local.driver = driver
+
+    def _process_url(self, url, index, total):
+        driver = self.driver
+        with self._lock:
+            self.attempts.append(url)
+        if url == self.crash_url and driver.name == "primary":
+            driver.dead = True
+        if driver.dead:
+            return False
+        with self._lock:
+            self.saved.append(url)
+        return True
+
+
+def test_pool_restarts_dead_session_and_requeues():
+    """The pool restarts a session that died mid-page and retries its URL once."""
+    print("Testing pool restart and re-queue...")
+    logger, log_file = _make_logger()
+    try:
+        urls = [f"https://example.com/page/{i}" for i in range(12)]
+        scraper = CrashingScraper(logger, crash_url=urls[4])
+        stats = CrawlWorkerPool(scraper, worker_count=1).run(urls)
+
+        assert sorted(scraper.saved) == sorted(urls), "every URL must eventually be saved"
+        assert scraper.attempts.count(urls[4]) == 2
+        assert len(scraper.attempts) == len(urls) + 1
+        assert stats[0].pages_ok == len(urls) and stats[0].pages_failed == 1
+        counters = scraper.metrics.snapshot()['counters']
+        assert counters['driver_recycle_unhealthy'] == 1 and counters['urls_requeued'] == 1
+        # The replacement session is handed back to the scraper for close()
+        assert scraper.driver is scraper.factory.created[0] and not scraper.driver.quit_called
+        print(f"✓ Session restarted and {urls[4]} retried")
+        return True
+    finally:
+        logger.close()
+        os.unlink(log_file)
+
+
+def main():
+    """Run all driver supervision tests."""
+    tests = [
+        test_recycle_after_page_limit,
+        test_recycle_above_memory_limit,
+        test_health_check_and_quit_timeout,
+        test_standby_pool_swaps_in_ready_session,
+        test_pool_restarts_dead_session_and_requeues,
+    ]
+
+    passed = 0
+    for test_func in tests:
+        try:
+            if test_func():
+                passed += 1
+        except AssertionError as e:
+            print(f"✗ {test_func.__name__} failed: {e}")
+        print()
+
+    print(f"Test Results: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
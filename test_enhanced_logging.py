@@ -6,7 +6,9 @@ This script tests the enhanced logging system to ensure it works correctly
 across different platforms and scenarios.
 """
 
+import logging
 import os
+import queue
 import sys
 import platform
 import tempfile
@@ -16,7 +18,8 @@ from pathlib import Path
 # Add the current directory to the Python path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from enhanced_logger import CrossPlatformLogger, create_logger, error_handler
+import enhanced_logger
+from enhanced_logger import CrossPlatformLogger, BoundedQueueHandler, create_logger, error_handler
 
 
 def test_basic_logging():
@@ -254,6 +257,113 @@ def test_log_rotation():
             pass
 
 
+def test_async_logging():
+    """Test that queued records reach the log file on flush and close."""
+    print("Testing asynchronous logging pipeline...")
+    
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as tmp_file:
+        log_file = tmp_file.name
+    
+    try:
+        logger = CrossPlatformLogger(
+            log_file=log_file,
+            enable_console=False,
+            async_logging=True
+        )
+        
+        for i in range(200):
+            logger.log_info(f"Queued message {i}")
+        try:
+            raise ValueError("Async test error")
+        except ValueError as e:
+            logger.log_error("Async error test", exception=e, operation="test_async")
+        logger.log_performance("async_operation", 0.5)
+        logger.flush()
+        
+        content = Path(log_file).read_text(encoding='utf-8')
+        assert "Queued message 199" in content
+        assert "Traceback:" in content and "Async test error" in content
+        assert "PERFORMANCE: async_operation" in content
+        
+        # After close the logger keeps working synchronously
+        logger.close()
+        logger.log_info("Message after close")
+        assert "Message after close" in Path(log_file).read_text(encoding='utf-8')
+        assert logger.dropped_records == 0
+        
+        print("✓ Async logging test completed")
+        return True
+    finally:
+        try:
+            os.unlink(log_file)
+        except:
+            pass
+
+
+def test_bounded_queue_drops_low_priority_records():
+    """Test that a full log queue drops records instead of blocking the caller."""
+    print("Testing bounded log queue...")
+    
+    handler = BoundedQueueHandler(queue.Queue(maxsize=2), block_timeout=0.01)
+    test_logger = logging.getLogger("UE5DocsScraper.test_bounded_queue")
+    test_logger.propagate = False
+    test_logger.addHandler(handler)
+    try:
+        start = time.monotonic()
+        for i in range(4):
+            test_logger.info("record %d", i)
+        test_logger.warning("record 4")
+        elapsed = time.monotonic() - start
+    finally:
+        test_logger.removeHandler(handler)
+    
+    assert handler.queue.qsize() == 2
+    assert handler.dropped == 3
+    assert elapsed < 1.0
+    print(f"✓ {handler.dropped} records dropped without blocking")
+    return True
+
+
+def test_traceback_formatted_lazily():
+    """Test that tracebacks are only formatted when a record is written, and only once."""
+    print("Testing lazy traceback formatting...")
+    
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as tmp_file:
+        log_file = tmp_file.name
+    
+    calls = []
+    original = enhanced_logger.traceback.format_exception
+    
+    def counting_format_exception(*args, **kwargs):
+        calls.append(1)
+        return original(*args, **kwargs)
+    
+    enhanced_logger.traceback.format_exception = counting_format_exception
+    try:
+        logger = CrossPlatformLogger(log_file=log_file, enable_console=True)
+        try:
+            raise KeyError("lazy")
+        except KeyError as e:
+            logger.log_error("Written error", exception=e)
+        assert len(calls) == 1, f"traceback formatted {len(calls)} times for two sinks"
+        
+        logger.logger.setLevel(logging.CRITICAL)
+        try:
+            raise KeyError("filtered")
+        except KeyError as e:
+            logger.log_error("Filtered error", exception=e)
+        assert len(calls) == 1, "traceback formatted for a filtered record"
+        
+        print("✓ Traceback formatted once, and not at all when filtered")
+        return True
+    finally:
+        enhanced_logger.traceback.format_exception = original
+        try:
+            os.unlink(log_file)
+        except:
+            pass
+
+
 def main():
     """Run all logging tests."""
     print("=" * 60)
@@ -268,7 +378,10 @@ def main():
         test_json_logging,
         test_error_decorator,
         test_platform_compatibility,
-        test_log_rotation
+        test_log_rotation,
+        test_async_logging,
+        test_bounded_queue_drops_low_priority_records,
+        test_traceback_formatted_lazily
     ]
     
     passed = 0
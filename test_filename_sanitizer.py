@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared filename sanitizer.
+
+Checks that it returns the same names as the previous implementation,
+that repeated inputs are served from the cache, and that the
+microbenchmark shows the speedup.
+"""
+
+import random
+import sys
+from pathlib import Path
+
+# Add the current directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from benchmark_sanitizer import legacy_clean_directory_name, legacy_clean_filename, run_benchmark
+from filename_sanitizer import cache_info, sanitize_directory_name, sanitize_filename
+
+
+def test_known_names():
+    """Forbidden characters, reserved names, entities and Unicode are handled."""
+    print("Testing known names...")
+    cases = {
+        "Normal Title": "Normal_Title",
+        "Title with <illegal> characters": "Title_with_illegal_characters",
+        "CON": "_CON",
+        "lpt1": "_lpt1",
+        "Title with / slashes \\ and : colons": "Title_with_slashes_and_colons",
+        "..\\..\\dangerous": "dangerous",
+        "Lumen &amp; Nanite": "Lumen_&_Nanite",
+        "Tabs\tand\nnew\x01lines": "Tabs_and_newlines",
+        "  __ ..  ": "unnamed",
+        "": "unnamed",
+        "ﬁle name": "file_name",
+    }
+    for name, expected in cases.items():
+        assert sanitize_filename(name) == expected, (name, sanitize_filename(name))
+    assert sanitize_filename("a" * 80) == "a" * 50
+    assert sanitize_filename("abc." + "d" * 60, max_length=4) == "abc"
+    assert sanitize_directory_name("   ") == "unnamed_dir"
+    assert len(sanitize_directory_name("x" * 150)) == 100
+    print(f"✓ {len(cases)} names cleaned as expected")
+    return True
+
+
+def test_matches_previous_implementation():
+    """Random inputs give the same names as the old cleaner."""
+    print("Testing equivalence with the previous implementation...")
+    alphabet = list('ab. _-&;#<>:"|?*\\/\r\n\t\x01\x1f\x0b\xa0é ﬁ') + ['&amp;', '&#1;', '&lt;', 'CON']
+    rng = random.Random(7)
+    for _ in range(20000):
+        name = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 12)))
+        max_length = rng.choice([10, 50, 100])
+        assert sanitize_filename(name, max_length) == legacy_clean_filename(name, max_length), repr(name)
+        assert sanitize_directory_name(name, max_length) == legacy_clean_directory_name(name, max_length), repr(name)
+    print("✓ 20000 random names match")
+    return True
+
+
+def test_repeated_inputs_hit_cache():
+    """A segment seen before is not cleaned again."""
+    print("Testing sanitizer cache...")
+    sanitize_filename.cache_clear()
+    for _ in range(100):
+        sanitize_directory_name("en-US")
+    info = cache_info()
+    assert info.misses == 1 and info.hits == 99, info
+    print(f"✓ {info.hits} hits, {info.misses} miss")
+    return True
+
+
+def test_benchmark_shows_speedup():
+    """The microbenchmark reports identical output and a faster crawl."""
+    print("Testing sanitizer benchmark...")
+    report = run_benchmark(pages=2000, rounds=3)
+    assert report['mismatches'] == 0
+    assert report['crawl_speedup'] > 2.0, report
+    print(f"✓ Cold {report['cold_speedup']:.1f}x, crawl {report['crawl_speedup']:.1f}x faster")
+    return True
+
+
+def main():
+    """Run all filename sanitizer tests."""
+    tests = [
+        test_known_names,
+        test_matches_previous_implementation,
+        test_repeated_inputs_hit_cache,
+        test_benchmark_shows_speedup,
+    ]
+
+    passed = 0
+    for test_func in tests:
+        try:
+            if test_func():
+                passed += 1
+        except AssertionError as e:
+            print(f"✗ {test_func.__name__} failed: {e}")
+        print()
+
+    print(f"Test Results: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Parity tests for the HTML parser backends.
+
+Every backend must select the same main content, produce equivalent HTML and
+find the same title. Serialization details such as ``<br/>`` versus ``<br>``
+are ignored.
+"""
+
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import lxml.html
+
+# Add the current directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from benchmark_fixture_site import FixtureDocsSite
+from html_backend import PARSER_BACKENDS, CleaningRules, create_html_backend, selector_to_xpath
+from ue5_docs_scraper import UE5DocsScraper
+
+SAMPLE_PAGES = {
+    'entities_and_voids': """<!DOCTYPE html><html><head><title>Lights &amp; Shadows</title>
+        <meta property="og:title" content="ignored"></head><body>
+        <header><h1>Site header</h1></header>
+        <nav><a href="/">Home</a></nav>
+        <main id="content" class="main-content docs">
+          <h1>Lights &amp; Shadows&nbsp;in UE5</h1>
+          <p>Line one<br>line two &lt;tag&gt; &#169; café <img src="/a.png" alt="A"></p>
+          <!-- editor comment -->
+          <ul><li>Lumen</li><li>Nanite <code>r.Nanite 1</code></li></ul>
+          <script>var tracking = 1;</script>
+        </main>
+        <footer>Copyright</footer></body></html>""",
+    'article_fallback': """<html><head><title> Blueprint  Basics </title></head><body>
+        <div class="layout"><article role="article"><h2>Blueprints</h2>
+        <p>Blueprints are a visual scripting system used throughout Unreal Engine for gameplay.</p>
+        <table><tr><th>Node</th><td>Event BeginPlay</td></tr></table>
+        <style>.x { color: red; }</style></article></div></body></html>""",
+    'role_main_without_title': """<html><body><noscript>Enable JavaScript</noscript>
+        <div role="main"><h2>Materials</h2><p>Materials define the surface properties of objects in
+        your level, such as color, roughness and emissive light.</p></div></body></html>""",
+    'body_only': """<html><body><p>Short page body with just enough text to be picked as content
+        by the fallback selector of every backend.</p></body></html>""",
+}
+
+# Malformed markup; only the two lxml-based backends are expected to agree on these
+MALFORMED_PAGES = {
+    'unclosed_tags': """<html><body><main><p>Unclosed paragraph <b>bold <i>both</b> text
+        <p>Second paragraph with enough content to pass the minimum length check.<div>nested</div>
+        </main></body>""",
+    'stray_end_tags': """<main></span><h1>Title</h1></div><p>Stray end tags should not
+        break extraction of this main element at all, it still has plenty of text.</p></main>""",
+}
+
+
+def normalize(html_content):
+    """Structure of an HTML fragment: tags, attributes and whitespace-normalized text."""
+    root = lxml.html.fragment_fromstring(html_content, create_parent='div')
+    shape = []
+    for element in root.iter():
+        if not isinstance(element.tag, str):
+            continue
+        shape.append((
+            element.tag,
+            tuple(sorted((k, ' '.join(v.split())) for k, v in element.attrib.items())),
+            ' '.join((element.text or '').split()),
+            ' '.join((element.tail or '').split()),
+        ))
+    return shape
+
+
+def make_scrapers(out_dir, backends=PARSER_BACKENDS):
+    scrapers = {}
+    for name in backends:
+        scraper = UE5DocsScraper(
+            output_dir=str(Path(out_dir) / name),
+            fetch_mode='http',
+            render_workers=0,
+            resume=False,
+            log_file=str(Path(out_dir) / "log.txt"),
+            parser_backend=name
+        )
+        scraper.logger.set_console_level(logging.WARNING)
+        scrapers[name] = scraper
+    return scrapers
+
+
+def run_pipeline(scraper, page_source):
+    """Parse, clean, extract and title a page the way the scraper does."""
+    document = scraper.html_backend.parse(page_source)
+    removed = scraper._clean_page_content(document)
+    content = scraper._extract_main_content(document, "https://example.com/page")
+    html_content = scraper.html_backend.to_html(content) if content is not None else None
+    return removed, html_content, scraper.get_page_title(document)
+
+
+def check_parity(scrapers, pages):
+    for page_name, page_source in pages.items():
+        results = {name: run_pipeline(scraper, page_source) for name, scraper in scrapers.items()}
+        reference_name, (removed, html_content, title) = next(iter(results.items()))
+        assert html_content is not None, f"{page_name}: no content from {reference_name}"
+        for name, (other_removed, other_html, other_title) in results.items():
+            assert other_removed == removed, f"{page_name}: {name} removed {other_removed}, expected {removed}"
+            assert other_title == title, f"{page_name}: {name} title {other_title!r} != {title!r}"
+            assert normalize(other_html) == normalize(html_content), f"{page_name}: {name} HTML differs"
+
+
+def test_selector_translation():
+    """Simple CSS selectors compile to equivalent XPath; others are rejected."""
+    print("Testing selector translation...")
+    document = lxml.html.document_fromstring(
+        '<html><body><div class="a main-content b" id="content" role="main"><main>x</main></div></body></html>'
+    )
+    for selector, expected in (('main', 'main'), ('.main-content', 'div'), ('#content', 'div'),
+                               ('[role="main"]', 'div'), ('.missing', None)):
+        matches = document.xpath(selector_to_xpath(selector))
+        assert (matches[0].tag if matches else None) == expected, selector
+    try:
+        selector_to_xpath('div > p')
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError for a combinator selector")
+    print("✓ Selectors translated")
+    return True
+
+
+def test_backend_parity_on_samples():
+    """All backends extract equivalent content and the same title."""
+    print("Testing backend parity on sample pages...")
+    with tempfile.TemporaryDirectory() as out_dir:
+        scrapers = make_scrapers(out_dir)
+        try:
+            check_parity(scrapers, SAMPLE_PAGES)
+            check_parity({name: scrapers[name] for name in ('lxml', 'lxml-direct')}, MALFORMED_PAGES)
+        finally:
+            for scraper in scrapers.values():
+                scraper.close()
+    print(f"✓ {len(PARSER_BACKENDS)} backends agree on {len(SAMPLE_PAGES)} pages "
+          f"(lxml backends on {len(MALFORMED_PAGES)} malformed pages)")
+    return True
+
+
+def test_backend_parity_on_fixture_site():
+    """Backends agree on realistic documentation pages and lxml-direct parses fastest."""
+    print("Testing backend parity on fixture site pages...")
+    site = FixtureDocsSite(page_count=40, seed=3)
+    pages = {f"topic-{i}": site.page_html(i).decode('utf-8') for i in range(40)}
+    timings = {}
+    with tempfile.TemporaryDirectory() as out_dir:
+        scrapers = make_scrapers(out_dir)
+        try:
+            check_parity(scrapers, pages)
+            for name, scraper in scrapers.items():
+                start = time.perf_counter()
+                for page_source in pages.values():
+                    run_pipeline(scraper, page_source)
+                timings[name] = time.perf_counter() - start
+        finally:
+            for scraper in scrapers.values():
+                scraper.close()
+
+    assert timings['lxml-direct'] < timings['html.parser'], timings
+    print("✓ Backends agree; pipeline time: " +
+          ", ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in timings.items()))
+    return True
+
+
+def test_cleaning_rules_single_pass():
+    """Class, id and attribute rules remove their elements, counted once per rule."""
+    print("Testing cleaning rules...")
+    page = """<html><body><main>
+        <div class="sidebar left"><nav>inner nav</nav><div class="menu">inner menu</div></div>
+        <div id="comments">Comments</div>
+        <div role="navigation">Landmark</div>
+        <div data-widget="share-buttons">Share</div>
+        <p class="sidebar-note">Keep: class token differs</p>
+        <p>Keep<script>x()</script> tail text</p>
+        </main></body></html>"""
+    rules = CleaningRules(CleaningRules().selectors + ('[data-widget^="share"]',))
+    assert rules.match('div', {'class': ['ads', 'sidebar']}) == '.sidebar'  # first rule in order wins
+    assert rules.match('p', {'class': 'sidebar-note'}) is None
+
+    for name in PARSER_BACKENDS:
+        backend = create_html_backend(name)
+        document = backend.parse(page)
+        removed = backend.clean(document, rules)
+        assert dict(removed) == {'.sidebar': 1, '#comments': 1, '[role="navigation"]': 1,
+                                 '[data-widget^="share"]': 1, 'script': 1}, (name, removed)
+        html_content = backend.to_html(backend.select_one(document, 'main'))
+        for gone in ('inner nav', 'inner menu', 'Comments', 'Landmark', 'Share', 'x()'):
+            assert gone not in html_content, (name, gone)
+        assert 'sidebar-note' in html_content and 'tail text' in html_content, name
+    print(f"✓ Rules applied identically by {len(PARSER_BACKENDS)} backends")
+    return True
+
+
+def test_unknown_backend_rejected():
+    """Unknown backend names fail fast."""
+    print("Testing unknown backend...")
+    try:
+        create_html_backend('html5lib')
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError")
+    print("✓ Unknown backend rejected")
+    return True
+
+
+def main():
+    """Run all parser backend tests."""
+    tests = [
+        test_selector_translation,
+        test_backend_parity_on_samples,
+        test_backend_parity_on_fixture_site,
+        test_cleaning_rules_single_pass,
+        test_unknown_backend_rejected,
+    ]
+
+    passed = 0
+    for test_func in tests:
+        try:
+            if test_func():
+                passed += 1
+        except AssertionError as e:
+            print(f"✗ {test_func.__name__} failed: {e}")
+        print()
+
+    print(f"Test Results: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
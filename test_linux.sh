@@ -168,7 +168,7 @@ test_python_scripts() {
 test_dependencies() {
     log_info "[3/4] Testing Python dependencies..."
     
-    local packages=("requests" "beautifulsoup4" "selenium" "lxml" "aiohttp" "fake_useragent")
+    local packages=("requests" "beautifulsoup4" "selenium" "lxml" "aiohttp")
     local failed_packages=()
     local optional_packages=("weasyprint")  # Optional packages that might not be in all environments
     
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Test script for the output directory planner.
+"""
+
+import re
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+# Add the current directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from output_planner import FilenameRegistry, OutputPathPlanner
+
+BASE = "https://docs.unrealengine.com"
+
+
+class CountingCleaner:
+    """Directory name cleaner that counts how often it is called."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, name, max_length):
+        self.calls += 1
+        return re.sub(r'[\s_]+', '_', name)[:max_length]
+
+
+def test_directories_are_memoized():
+    """Each distinct segment is cleaned once however many URLs share it."""
+    print("Testing directory memoization...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cleaner = CountingCleaner()
+        planner = OutputPathPlanner(tmp_dir, cleaner)
+        urls = [f"{BASE}/5.3/en-US/Lighting%20Basics/page-{i}" for i in range(500)]
+
+        assert planner.plan(urls) == 500
+        assert cleaner.calls == 503, cleaner.calls  # 5.3, en-US, Lighting Basics and 500 pages
+        assert planner.directory_for(urls[7]) == Path(tmp_dir) / "5.3" / "en-US" / "Lighting_Basics" / "page-7"
+        assert planner.directory_for(f"{BASE}/5.3/en-US/guide/manual.pdf") == Path(tmp_dir) / "5.3" / "en-US" / "guide"
+        assert cleaner.calls == 504
+        print(f"✓ 500 URLs planned with {cleaner.calls} cleaning calls")
+        return True
+
+
+def test_each_directory_created_once():
+    """ensure_directory creates a directory (and its parents) only the first time."""
+    print("Testing one mkdir per directory...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        planner = OutputPathPlanner(tmp_dir, CountingCleaner())
+        created = []
+        lock = threading.Lock()
+
+        def create(path):
+            with lock:
+                created.append(path)
+            path.mkdir(parents=True, exist_ok=True)
+
+        target = planner.directory_for(f"{BASE}/5.3/en-US/a/b/page")
+        threads = [threading.Thread(target=planner.ensure_directory, args=(target, create)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert created == [target] and target.is_dir()
+        assert not planner.ensure_directory(target.parent, create), "parents are known to exist"
+        assert planner.ensure_directory(target.parent / "sibling")
+        print("✓ Directory created exactly once")
+        return True
+
+
+def test_collisions_resolved_in_memory():
+    """URL paths cleaning to the same (case-insensitive) name get distinct directories."""
+    print("Testing directory name collisions...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        planner = OutputPathPlanner(tmp_dir, CountingCleaner())
+        first = planner.directory_for(f"{BASE}/docs/Blueprint Basics/x")
+        second = planner.directory_for(f"{BASE}/docs/Blueprint_Basics/x")
+        third = planner.directory_for(f"{BASE}/docs/blueprint_basics/x")
+
+        assert first.parent.name == "Blueprint_Basics"
+        assert len({first.parent.name.casefold(), second.parent.name.casefold(),
+                    third.parent.name.casefold()}) == 3
+        assert second.parent.name.startswith("Blueprint_Basics_")
+        # The same URL path always maps to the same directory
+        assert planner.directory_for(f"{BASE}/docs/Blueprint_Basics/y").parent == second.parent
+        print(f"✓ Collisions resolved: {first.parent.name}, {second.parent.name}, {third.parent.name}")
+        return True
+
+
+def test_traversal_and_length_limits():
+    """Traversal segments are sanitized and over-long paths truncated."""
+    print("Testing traversal and path length limits...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        planner = OutputPathPlanner(tmp_dir, CountingCleaner(), max_path_length=len(tmp_dir) + 40)
+        path = planner.directory_for(f"{BASE}/..hidden/{'x' * 60}/{'y' * 30}")
+        relative = path.relative_to(tmp_dir)
+        assert not any(part.startswith('.') for part in relative.parts), relative
+        assert len(str(path)) <= len(tmp_dir) + 40
+        print(f"✓ Planned {relative}")
+        return True
+
+
+def test_filename_registry_is_unique_and_stable():
+    """Duplicate titles get URL-derived names; reruns map each URL to the same file."""
+    print("Testing filename registry...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        directory = Path(tmp_dir) / "5.3" / "en-US" / "guide"
+        directory.mkdir(parents=True)
+        (directory / "Overview.pdf").write_bytes(b"from another tool")
+
+        registry = FilenameRegistry(tmp_dir)
+        first = registry.assign(directory, "Setup.pdf", f"{BASE}/guide/a")
+        second = registry.assign(directory, "Setup.pdf", f"{BASE}/guide/b")
+        third = registry.assign(directory, "setup.pdf", f"{BASE}/guide/c")
+        foreign = registry.assign(directory, "Overview.pdf", f"{BASE}/guide/d")
+
+        assert first.name == "Setup.pdf"
+        assert len({first.name.casefold(), second.name.casefold(), third.name.casefold()}) == 3
+        assert second.name.startswith("Setup_") and foreign.name.startswith("Overview_"), foreign
+        assert registry.assign(directory, "Setup.pdf", f"{BASE}/guide/b") == second
+
+        # A failed page gives its name back
+        registry.release(f"{BASE}/guide/a")
+        assert registry.assign(directory, "Setup.pdf", f"{BASE}/guide/e").name == "Setup.pdf"
+
+        # The next run, seeded from the crawl state, maps every URL to the same file
+        records = [
+            {'url': f"{BASE}/guide/b", 'output_path': str(second.relative_to(tmp_dir)), 'canonical_url': None},
+            {'url': f"{BASE}/guide/c", 'output_path': str(third), 'canonical_url': None},
+        ]
+        for path in (first, second, third):
+            path.write_bytes(b"%PDF")
+        rerun = FilenameRegistry(tmp_dir)
+        rerun.seed(records)
+        assert rerun.assign(directory, "Setup.pdf", f"{BASE}/guide/c") == third
+        assert rerun.assign(directory, "Renamed Title.pdf", f"{BASE}/guide/b") == second
+        assert rerun.assign(directory, "Setup.pdf", f"{BASE}/guide/a").name != "Setup.pdf", "file on disk"
+        # Without state, a URL's own hash-suffixed file is still recognized
+        fresh = FilenameRegistry(tmp_dir)
+        assert fresh.assign(directory, "Setup.pdf", f"{BASE}/guide/b") == second
+        print(f"✓ Names: {first.name}, {second.name}, {third.name}, {foreign.name}")
+        return True
+
+
+def main():
+    """Run all output planner tests."""
+    tests = [
+        test_directories_are_memoized,
+        test_each_directory_created_once,
+        test_collisions_resolved_in_memory,
+        test_traversal_and_length_limits,
+        test_filename_registry_is_unique_and_stable,
+    ]
+
+    passed = 0
+    for test_func in tests:
+        try:
+            if test_func():
+                passed += 1
+        except AssertionError as e:
+            print(f"✗ {test_func.__name__} failed: {e}")
+        print()
+
+    print(f"Test Results: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Test script for URL canonicalization and the content-hash index.
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+# Add the current directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from page_dedup import ContentIndex, canonical_url
+
+CANONICAL = "https://docs.unrealengine.com/5.3/en-US/lighting"
+
+
+def test_url_variants_share_canonical_form():
+    """Slash, case, port, fragment, tracking query, index.html and locale variants collapse."""
+    print("Testing URL canonicalization...")
+    variants = [
+        "https://docs.unrealengine.com/5.3/en-US/lighting",
+        "https://docs.unrealengine.com/5.3/en-US/lighting/",
+        "HTTPS://Docs.UnrealEngine.com:443/5.3/en-US/lighting",
+        "https://docs.unrealengine.com/5.3/en-US/lighting#shadows",
+        "https://docs.unrealengine.com/5.3/en-US/lighting?utm_source=news&fbclid=x",
+        "https://docs.unrealengine.com/5.3/en-US/lighting/index.html",
+        "https://docs.unrealengine.com//5.3/en-US//lighting",
+        "https://docs.unrealengine.com/5.3/en/lighting",
+        "https://docs.unrealengine.com/5.3/en-us/lighting",
+    ]
+    for variant in variants:
+        assert canonical_url(variant) == CANONICAL, (variant, canonical_url(variant))
+
+    # Different pages stay different
+    assert canonical_url("https://docs.unrealengine.com/5.3/en-US/Lighting") != CANONICAL
+    assert canonical_url("https://docs.unrealengine.com/5.2/en-US/lighting") != CANONICAL
+    assert canonical_url("http://docs.unrealengine.com:8080/x") == "http://docs.unrealengine.com:8080/x"
+    assert canonical_url("https://example.com/search?q=1&a=2") == "https://example.com/search?a=2&q=1"
+    assert canonical_url("https://example.com") == "https://example.com/"
+    print(f"✓ {len(variants)} variants map to {CANONICAL}")
+    return True
+
+
+def test_content_index_claims():
+    """The first URL with a content hash owns it; others are told who owns it."""
+    print("Testing content index claims...")
+    index = ContentIndex()
+    index.seed([
+        {'url': "https://example.com/a", 'content_hash': "h1", 'canonical_url': None},
+        {'url': "https://example.com/alias", 'content_hash': "h1", 'canonical_url': "https://example.com/a"},
+        {'url': "https://example.com/empty", 'content_hash': None, 'canonical_url': None},
+    ])
+    assert len(index) == 1
+    assert index.claim("h1", "https://example.com/b") == "https://example.com/a"
+    assert index.claim("h1", "https://example.com/a") is None, "an owner can re-claim its own content"
+
+    assert index.claim("h2", "https://example.com/c") is None
+    index.release("https://example.com/c")
+    assert index.claim("h2", "https://example.com/d") is None, "released content can be claimed again"
+
+    # A changed page gives up its old hash
+    assert index.claim("h3", "https://example.com/a") is None
+    assert index.claim("h1", "https://example.com/b") is None
+    print("✓ Claims, releases and changed pages handled")
+    return True
+
+
+def test_concurrent_claims_have_one_owner():
+    """Under concurrent claims exactly one URL owns a hash."""
+    print("Testing concurrent content claims...")
+    index = ContentIndex()
+    winners = []
+    lock = threading.Lock()
+
+    def claim(number):
+        if index.claim("same", f"https://example.com/{number}") is None:
+            with lock:
+                winners.append(number)
+
+    threads = [threading.Thread(target=claim, args=(number,)) for number in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(winners) == 1, winners
+    print("✓ One owner among 16 concurrent claims")
+    return True
+
+
+def main():
+    """Run all deduplication tests."""
+    tests = [
+        test_url_variants_share_canonical_form,
+        test_content_index_claims,
+        test_concurrent_claims_have_one_owner,
+    ]
+
+    passed = 0
+    for test_func in tests:
+        try:
+            if test_func():
+                passed += 1
+        except AssertionError as e:
+            print(f"✗ {test_func.__name__} failed: {e}")
+        print()
+
+    print(f"Test Results: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
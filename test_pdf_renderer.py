@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Test script for the out-of-process PDF render pool.
+
+The pool is exercised with a lightweight render function so the tests do not
+depend on WeasyPrint's system libraries.
+"""
+
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Add the current directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import pdf_renderer
+from benchmark_fixture_site import FixtureDocsSite
+from http_fetcher import HttpFetchResult
+from pdf_renderer import (PdfRenderPool, WeasyPrintCapability, build_pdf_document,
+                          get_weasyprint_capability, render_pdf)
+from ue5_docs_scraper import UE5DocsScraper
+
+
+class PageFetcher:
+    """Stands in for AsyncHttpFetcher and serves the same page for every URL."""
+
+    def __init__(self, page):
+        self.page = page
+
+    def fetch(self, url, headers=None):
+        return HttpFetchResult(url=url, status=200, text=self.page)
+
+    def close(self):
+        pass
+
+
+def fake_render(html_content, output_path):
+    """Stand-in for render_pdf: writes the content via a .tmp rename."""
+    if "FAIL" in html_content:
+        raise ValueError("render failed")
+    time.sleep(0.2)
+    output_path = Path(output_path)
+    temp_path = output_path.with_suffix(output_path.suffix + '.tmp')
+    temp_path.write_text(html_content, encoding='utf-8')
+    temp_path.replace(output_path)
+    return {'output_path': str(output_path), 'file_size': output_path.stat().st_size,
+            'duration_seconds': 0.2, 'pid': os.getpid()}
+
+
+def capability_identity(html_content, output_path):
+    """Render function reporting which capability object the worker uses."""
+    return {'pid': os.getpid(), 'capability': id(get_weasyprint_capability())}
+
+
+def test_build_pdf_document():
+    """Page content is wrapped in a complete, styled document."""
+    print("Testing PDF document template...")
+    document = build_pdf_document("<h1>Hello</h1>")
+    assert "<!DOCTYPE html>" in document
+    assert "<h1>Hello</h1>" in document
+    assert "@page { margin: 1in; }" in document
+    print("✓ Document template built")
+    return True
+
+
+def test_pool_renders_in_parallel_processes():
+    """Jobs run in worker processes and callbacks see every result."""
+    print("Testing parallel PDF rendering...")
+    with tempfile.TemporaryDirectory() as out_dir:
+        results = []
+        lock = threading.Lock()
+
+        def on_done(future):
+            with lock:
+                results.append(future.result())
+
+        pool = PdfRenderPool(max_workers=2, render_func=fake_render)
+        try:
+            for i in range(6):
+                pool.submit(f"<p>page {i}</p>", Path(out_dir) / f"page_{i}.pdf", callback=on_done)
+            assert pool.wait(timeout=60)
+        finally:
+            pool.close()
+
+        assert len(results) == 6
+        assert {r['pid'] for r in results} - {os.getpid()}, "rendering ran in the parent process"
+        assert sorted(p.name for p in Path(out_dir).iterdir()) == [f"page_{i}.pdf" for i in range(6)]
+        assert pool.stats['completed'] == 6 and pool.stats['failed'] == 0
+        print(f"✓ 6 pages rendered by {len({r['pid'] for r in results})} process(es)")
+        return True
+
+
+def test_pool_applies_backpressure():
+    """submit() blocks once max_pending jobs are in flight."""
+    print("Testing render queue backpressure...")
+    with tempfile.TemporaryDirectory() as out_dir:
+        peak = [0]
+        pool = PdfRenderPool(max_workers=1, max_pending=2, render_func=fake_render)
+        try:
+            for i in range(5):
+                pool.submit(f"<p>page {i}</p>", Path(out_dir) / f"page_{i}.pdf")
+                peak[0] = max(peak[0], pool.in_flight)
+            pool.wait(timeout=60)
+        finally:
+            pool.close()
+
+        assert peak[0] <= 2, f"in flight peaked at {peak[0]}"
+        assert pool.stats['blocked_seconds'] > 0
+        print(f"✓ Producer blocked for {pool.stats['blocked_seconds']:.2f}s with at most 2 jobs in flight")
+        return True
+
+
+def test_pool_reports_failures():
+    """A failing render reaches the callback as an exception and frees its slot."""
+    print("Testing render failure handling...")
+    with tempfile.TemporaryDirectory() as out_dir:
+        errors = []
+        pool = PdfRenderPool(max_workers=1, max_pending=1, render_func=fake_render)
+        try:
+            pool.submit("FAIL", Path(out_dir) / "bad.pdf",
+                        callback=lambda future: errors.append(future.exception()))
+            pool.submit("<p>ok</p>", Path(out_dir) / "good.pdf")
+            pool.wait(timeout=60)
+        finally:
+            pool.close()
+
+        assert len(errors) == 1 and isinstance(errors[0], ValueError)
+        assert pool.stats['failed'] == 1 and pool.stats['completed'] == 1
+        assert not (Path(out_dir) / "bad.pdf").exists()
+        print("✓ Failure reported and pool kept running")
+        return True
+
+
+def test_capability_probed_once_per_process():
+    """The WeasyPrint probe is memoized, and render workers probe once at startup."""
+    print("Testing WeasyPrint capability memoization...")
+    first = get_weasyprint_capability()
+    assert get_weasyprint_capability() is first
+    assert isinstance(first.available, bool)
+
+    results = []
+    pool = PdfRenderPool(max_workers=1, render_func=capability_identity)
+    try:
+        for i in range(4):
+            pool.submit("<p>x</p>", f"unused_{i}.pdf", callback=lambda f: results.append(f.result()))
+        pool.wait(timeout=60)
+    finally:
+        pool.close()
+
+    assert len({(r['pid'], r['capability']) for r in results}) == 1
+    print(f"✓ Probe cached (available={first.available}, {first.probe_seconds:.2f}s)")
+    return True
+
+
+def test_render_refuses_without_weasyprint():
+    """render_pdf fails fast, without leaving files, when WeasyPrint is unusable."""
+    print("Testing render without WeasyPrint...")
+    saved = pdf_renderer._capability
+    pdf_renderer._capability = WeasyPrintCapability(available=False, error="missing libpango")
+    try:
+        with tempfile.TemporaryDirectory() as out_dir:
+            output_path = Path(out_dir) / "page.pdf"
+            try:
+                render_pdf("<p>x</p>", output_path)
+            except RuntimeError as e:
+                assert "missing libpango" in str(e)
+            else:
+                raise AssertionError("expected RuntimeError")
+            assert not list(Path(out_dir).iterdir())
+    finally:
+        pdf_renderer._capability = saved
+    print("✓ Unavailable capability reported")
+    return True
+
+
+def test_html_fallback_recorded_in_manifest():
+    """A page saved by the HTML fallback is recorded (and aliased) under its .html file."""
+    print("Testing HTML fallback output records...")
+    page = FixtureDocsSite(page_count=5, seed=4).page_html(2).decode('utf-8')
+    urls = ["https://example.com/5.3/en-US/topic-00002", "https://example.com/5.3/en-US/copy"]
+    with tempfile.TemporaryDirectory() as out_dir:
+        def make_scraper():
+            scraper = UE5DocsScraper(
+                output_dir=str(Path(out_dir) / "out"),
+                fetch_mode='http',
+                render_workers=0,
+                log_file=str(Path(out_dir) / "log.txt")
+            )
+            scraper.logger.set_console_level(logging.ERROR)
+            return scraper
+
+        scraper = make_scraper()
+        try:
+            scraper._pdf_capability = WeasyPrintCapability(available=False, error="forced for test")
+            scraper.http_fetcher.close()
+            scraper.http_fetcher = PageFetcher(page)
+            for index, url in enumerate(urls, 1):
+                assert scraper._process_url(url, index, len(urls))
+            scraper._write_manifest()
+            manifest = json.loads(scraper.manifest_file.read_text(encoding='utf-8'))['pages']
+        finally:
+            scraper.close()
+
+        owner, alias = manifest[urls[0]], manifest[urls[1]]
+        assert owner['output_path'].endswith('.html'), owner
+        assert (Path(out_dir) / "out" / owner['output_path']).is_file()
+        assert alias == {'canonical_url': urls[0], 'output_path': owner['output_path']}, alias
+
+        # A rerun with PDF rendering writes the PDF under the page's planned name
+        scraper = make_scraper()
+        try:
+            planned = scraper.filename_registry.assign(
+                (Path(out_dir) / "out" / owner['output_path']).parent, "Other title.pdf", urls[0])
+        finally:
+            scraper.close()
+        assert planned.name == Path(owner['output_path']).with_suffix('.pdf').name, planned
+    print(f"✓ Manifest names {owner['output_path']}")
+    return True
+
+
+def main():
+    """Run all PDF render pool tests."""
+    tests = [
+        test_build_pdf_document,
+        test_pool_renders_in_parallel_processes,
+        test_pool_applies_backpressure,
+        test_pool_reports_failures,
+        test_capability_probed_once_per_process,
+        test_render_refuses_without_weasyprint,
+        test_html_fallback_recorded_in_manifest,
+    ]
+
+    passed = 0
+    for test_func in tests:
+        try:
+            if test_func():
+                passed += 1
+        except AssertionError as e:
+            print(f"✗ {test_func.__name__} failed: {e}")
+        print()
+
+    print(f"Test Results: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
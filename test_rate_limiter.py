@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Test script for the adaptive request rate limiter.
+"""
+
+import email.utils
+import sys
+import time
+from pathlib import Path
+
+# Add the current directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from benchmark_scraper import run_benchmark
+from crawl_metrics import CrawlMetrics
+from rate_limiter import AdaptiveRateLimiter, parse_retry_after
+
+URL = "https://docs.example.com/5.3/en-US/page"
+
+
+def _respond(limiter, status=200, latency=0.01, retry_after=None, error=False, kind='http'):
+    """One request through the limiter with a simulated response."""
+    with limiter.request(URL, kind) as permit:
+        permit.started = time.monotonic() - latency
+        permit.record(status=status, error=error, retry_after=retry_after)
+
+
+def test_retry_after_parsing():
+    """Retry-After accepts delta-seconds and HTTP-dates and ignores junk."""
+    print("Testing Retry-After parsing...")
+    assert parse_retry_after("7") == 7.0
+    assert parse_retry_after(" 0 ") == 0.0
+    assert parse_retry_after(None) is None and parse_retry_after("soon") is None
+    http_date = email.utils.formatdate(time.time() + 30, usegmt=True)
+    assert 25 <= parse_retry_after(http_date) <= 31
+    assert parse_retry_after(email.utils.formatdate(time.time() - 60, usegmt=True)) == 0.0
+    print("✓ Retry-After values parsed")
+    return True
+
+
+def test_aimd_increase_and_backoff():
+    """Clean responses raise rate and concurrency; 429 halves them and Retry-After pauses the host."""
+    print("Testing AIMD rate adaptation...")
+    metrics = CrawlMetrics()
+    limiter = AdaptiveRateLimiter(initial_rate=20, max_rate=50, max_concurrency=4, rate_step=10,
+                                  decrease_cooldown=0, burst=50, metrics=metrics)
+    for _ in range(30):
+        _respond(limiter)
+    grown = limiter.snapshot()['docs.example.com']
+    assert grown['rate'] > 20 and grown['concurrency'] == 4, grown
+
+    _respond(limiter, status=429, retry_after="0.3")
+    backed_off = limiter.snapshot()['docs.example.com']
+    assert backed_off['rate'] == round(grown['rate'] / 2, 2) and backed_off['concurrency'] == 2, backed_off
+    start = time.monotonic()
+    _respond(limiter)
+    assert time.monotonic() - start >= 0.25, "Retry-After pause not honored"
+
+    # Other hosts are unaffected
+    other = AdaptiveRateLimiter.host_of("https://cdn.example.org/x")
+    assert other not in limiter.snapshot()
+    counters = metrics.snapshot()['counters']
+    assert counters['rate_limit_throttled'] == 1 and counters['rate_limit_retry_after'] == 1
+    print(f"✓ Rate grew to {grown['rate']} req/s, backed off to {backed_off['rate']} req/s")
+    return True
+
+
+def test_latency_and_error_backoff():
+    """Latency far above the baseline and network errors reduce the rate; the cooldown limits cuts."""
+    print("Testing latency and error backoff...")
+    limiter = AdaptiveRateLimiter(initial_rate=8, max_rate=8, burst=50, decrease_cooldown=60)
+    for _ in range(10):
+        _respond(limiter, latency=0.1)
+    assert limiter.snapshot()['docs.example.com']['rate'] == 8
+    for _ in range(5):
+        _respond(limiter, latency=1.0)
+    assert limiter.snapshot()['docs.example.com']['rate'] == 4, "one cut per cooldown period"
+
+    limiter = AdaptiveRateLimiter(initial_rate=8, burst=50, decrease_cooldown=0)
+    _respond(limiter, error=True)
+    limiter.report_failure(URL, 'error_page')
+    assert limiter.snapshot()['docs.example.com']['rate'] == 2
+    print("✓ Slow responses and errors back off")
+    return True
+
+
+def test_browser_latency_has_its_own_baseline():
+    """Slow browser navigations between fast HTTP fetches are not taken for congestion."""
+    print("Testing mixed HTTP and browser latency...")
+    limiter = AdaptiveRateLimiter(initial_rate=8, max_rate=8, burst=50, decrease_cooldown=0)
+    for _ in range(10):
+        _respond(limiter, latency=0.01)
+    # Pages escalated to the browser take seconds, as navigations always do
+    for _ in range(5):
+        _respond(limiter, latency=3.0, kind='browser')
+        _respond(limiter, latency=0.01)
+    host = limiter.snapshot()['docs.example.com']
+    assert host['rate'] == 8, host
+    assert host['latency_ewma']['browser'] == 3.0 and host['latency_ewma']['http'] < 0.05, host
+
+    # Congestion on either path still backs off
+    for _ in range(5):
+        _respond(limiter, latency=12.0, kind='browser')
+    assert limiter.snapshot()['docs.example.com']['rate'] < 8
+    print("✓ Browser navigations compared with their own baseline")
+    return True
+
+
+def test_crawl_adapts_to_throttling_site():
+    """A crawl starting above a site's 429 threshold backs off and still saves every page."""
+    print("Testing crawl against a throttling site...")
+    report = run_benchmark(pages=40, workers=4, fetch_mode='http', render_workers=0, throttle_rate=10,
+                           initial_rate=30, max_rate=40)
+    assert report['pages_succeeded'] == 40 and report['pages_failed'] == 0, report['pages_failed']
+    assert report['requests_throttled'] > 0
+    counters = report['counters']
+    assert counters['rate_limit_throttled'] >= 1 and counters['rate_limit_retry_after'] >= 1
+    assert list(report['request_rates'].values())[0]['rate'] < 30
+    assert 'rate_limit_wait' in report['stages']
+    print(f"✓ 40 pages saved, {report['requests_throttled']} requests throttled, "
+          f"final rates {report['request_rates']}")
+    return True
+
+
+def main():
+    """Run all rate limiter tests."""
+    tests = [
+        test_retry_after_parsing,
+        test_aimd_increase_and_backoff,
+        test_latency_and_error_backoff,
+        test_browser_latency_has_its_own_baseline,
+        test_crawl_adapts_to_throttling_site,
+    ]
+
+    passed = 0
+    for test_func in tests:
+        try:
+            if test_func():
+                passed += 1
+        except AssertionError as e:
+            print(f"✗ {test_func.__name__} failed: {e}")
+        print()
+
+    print(f"Test Results: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Test script for deferred page retries.
+
+Covers the retry ledger and delayed queue, and checks with a fake scraper
+that the crawl pool keeps workers busy while failed URLs wait out their
+backoff.
+"""
+
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Add the current directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from crawl_metrics import CrawlMetrics
+from crawl_pool import CrawlWorkerPool
+from enhanced_logger import CrossPlatformLogger
+from http_fetcher import HttpFetchResult
+from retry_queue import DeferredRetry, DelayedRetryQueue, RetryLedger, RetryPolicy
+from ue5_docs_scraper import UE5DocsScraper
+
+URL = "https://docs.example.com/5.3/en-US/page"
+
+
+class FlakyScraper:
+    """Fake scraper whose URLs fail a given number of times before succeeding."""
+
+    uses_browser = False
+
+    def __init__(self, logger, failures, delay=0.2, page_delay=0.0):
+        self.logger = logger
+        self.driver = None
+        self.failures = dict(failures)
+        self.page_delay = page_delay
+        self.retry_ledger = RetryLedger({'timeout': RetryPolicy(max_attempts=3, base_delay=delay, jitter=0)})
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def _bind_worker_driver(self, driver):
+        pass
+
+    def _process_url(self, url, index, total):
+        time.sleep(self.page_delay)
+        with self._lock:
+            self.calls.append((url, time.monotonic()))
+            failing = self.failures.get(url, 0) > 0
+            if failing:
+                self.failures[url] -= 1
+        if failing:
+            delay = self.retry_ledger.schedule(url, 'timeout')
+            if delay is not None:
+                raise DeferredRetry(url, 'timeout', delay)
+            self.retry_ledger.resolve(url, False)
+            return False
+        self.retry_ledger.resolve(url, True)
+        return True
+
+
+class StatusFetcher:
+    """Stands in for AsyncHttpFetcher and answers every request with the same status."""
+
+    def __init__(self, status, headers=None):
+        self.status = status
+        self.headers = headers
+        self.requests = 0
+
+    def fetch(self, url, headers=None):
+        self.requests += 1
+        return HttpFetchResult(url=url, status=self.status, headers=self.headers)
+
+    def close(self):
+        pass
+
+
+def _make_logger():
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as tmp_file:
+        log_file = tmp_file.name
+    return CrossPlatformLogger(log_file=log_file, enable_console=False), log_file
+
+
+def test_ledger_policies_and_summary():
+    """Each error class gets its own attempt limit; the summary counts outcomes per class."""
+    print("Testing retry ledger...")
+    metrics = CrawlMetrics()
+    ledger = RetryLedger({
+        'timeout': RetryPolicy(max_attempts=3, base_delay=2.0, multiplier=2.0, jitter=0),
+        'parse_error': RetryPolicy(max_attempts=1),
+    }, metrics=metrics)
+
+    assert ledger.schedule(URL, 'timeout') == 2.0
+    assert ledger.attempt(URL) == 1
+    assert ledger.schedule(URL, 'timeout') == 4.0
+    assert ledger.schedule(URL, 'timeout') is None, "third failure exhausts the timeout policy"
+    ledger.resolve(URL, False)
+    assert ledger.attempt(URL) == 0
+
+    assert ledger.schedule(URL + "/a", 'parse_error') is None
+    ledger.resolve(URL + "/a", False)
+    assert ledger.schedule(URL + "/b", 'something_new') is not None, "unknown classes use the 'error' policy"
+    ledger.resolve(URL + "/b", True)
+
+    summary = ledger.summary()
+    assert list(summary) == ['timeout', 'parse_error', 'something_new'], summary
+    assert summary['timeout'] == {'retried': 2, 'recovered': 0, 'exhausted': 1}
+    assert summary['something_new']['recovered'] == 1
+    assert metrics.snapshot()['counters']['retry_timeout'] == 2
+    print(f"✓ Retry summary: {summary}")
+    return True
+
+
+def _make_http_scraper(out_dir):
+    scraper = UE5DocsScraper(
+        output_dir=str(Path(out_dir) / "out"),
+        fetch_mode='http',
+        render_workers=0,
+        resume=False,
+        log_file=str(Path(out_dir) / "log.txt")
+    )
+    scraper.logger.set_console_level(logging.ERROR)
+    return scraper
+
+
+def test_throttled_fetch_is_deferred():
+    """A 429 is not retried in place: the page is deferred for at least its Retry-After."""
+    print("Testing throttled HTTP fetches...")
+    assert RetryLedger().schedule(URL, 'server_error', min_delay=30.0) == 30.0
+    with tempfile.TemporaryDirectory() as out_dir:
+        scraper = _make_http_scraper(out_dir)
+        try:
+            scraper.http_fetcher.close()
+            scraper.http_fetcher = fetcher = StatusFetcher(429, {'Retry-After': '20'})
+            try:
+                scraper.scrape_page_content(URL, defer_retries=True)
+                assert False, "throttled page was not deferred"
+            except DeferredRetry as retry:
+                assert retry.error_class == 'server_error'
+                assert retry.delay >= 20.0, retry.delay
+            assert fetcher.requests == 1, "the worker retried the throttled fetch itself"
+            assert scraper.fetch_decisions[URL] == {'path': 'failed', 'reason': 'http_429'}
+        finally:
+            scraper.close()
+    print("✓ Throttled page deferred for its Retry-After")
+    return True
+
+
+def test_http_only_failure_is_logged():
+    """Without a browser, a page that cannot be retried is logged as failed."""
+    print("Testing final failure on the HTTP-only path...")
+    with tempfile.TemporaryDirectory() as out_dir:
+        scraper = _make_http_scraper(out_dir)
+        errors = []
+        log_error = scraper.logger.log_error
+        scraper.logger.log_error = lambda message, **kwargs: (errors.append(message),
+                                                              log_error(message, **kwargs))
+        try:
+            scraper.http_fetcher.close()
+            scraper.http_fetcher = StatusFetcher(404)
+            assert scraper.scrape_page_content(URL, defer_retries=True) == (None, None)
+        finally:
+            scraper.close()
+    assert errors == ["All page scraping attempts failed"], errors
+    print("✓ Final failure logged")
+    return True
+
+
+def test_delayed_queue_orders_by_due_time():
+    """Items come out once their delay has expired, earliest first."""
+    print("Testing delayed retry queue...")
+    retries = DelayedRetryQueue()
+    assert retries.pop_due() == (None, None)
+    retries.push('late', 0.2)
+    retries.push('now', 0)
+    assert retries.pop_due() == ('now', None)
+    item, wait = retries.pop_due()
+    assert item is None and 0 < wait <= 0.2
+    time.sleep(wait)
+    assert retries.pop_due() == ('late', None)
+    assert len(retries) == 0
+    print("✓ Items released in due order")
+    return True
+
+
+def test_pool_keeps_working_during_backoff():
+    """A failing URL waits out its backoff while the worker crawls other URLs, then succeeds."""
+    print("Testing deferred retries in the crawl pool...")
+    logger, log_file = _make_logger()
+    try:
+        urls = [f"https://example.com/page/{i}" for i in range(10)]
+        scraper = FlakyScraper(logger, {urls[0]: 2, urls[1]: 5}, delay=0.2, page_delay=0.01)
+
+        stats = CrawlWorkerPool(scraper, worker_count=1).run(urls)
+
+        attempts = [moment for url, moment in scraper.calls if url == urls[0]]
+        assert len(attempts) == 3
+        assert attempts[1] - attempts[0] >= 0.2, "retry ran before its backoff expired"
+        # The other URLs were crawled between the first attempt and its retry
+        between = [url for url, moment in scraper.calls if attempts[0] < moment < attempts[1]]
+        assert len(set(between) - {urls[1]}) == 8, between
+
+        assert stats[0].pages_ok == 9 and stats[0].pages_failed == 1
+        assert stats[0].retries_deferred == 4
+        summary = scraper.retry_ledger.summary()['timeout']
+        assert summary == {'retried': 4, 'recovered': 1, 'exhausted': 1}, summary
+        print(f"✓ 10 URLs crawled with {stats[0].retries_deferred} deferred retries")
+        return True
+    finally:
+        os.unlink(log_file)
+
+
+def test_pool_waits_for_retries_after_last_url():
+    """Workers that run out of new URLs stay until deferred retries are done."""
+    print("Testing deferred retries at the end of the crawl...")
+    logger, log_file = _make_logger()
+    try:
+        urls = [f"https://example.com/page/{i}" for i in range(4)]
+        scraper = FlakyScraper(logger, {urls[-1]: 1}, delay=0.3)
+
+        stats = CrawlWorkerPool(scraper, worker_count=3).run(urls)
+
+        assert sum(s.pages_ok for s in stats) == 4
+        assert [url for url, _ in scraper.calls].count(urls[-1]) == 2
+        print("✓ Final retry processed before the pool exited")
+        return True
+    finally:
+        os.unlink(log_file)
+
+
+def main():
+    """Run all retry queue tests."""
+    tests = [
+        test_ledger_policies_and_summary,
+        test_throttled_fetch_is_deferred,
+        test_http_only_failure_is_logged,
+        test_delayed_queue_orders_by_due_time,
+        test_pool_keeps_working_during_backoff,
+        test_pool_waits_for_retries_after_last_url,
+    ]
+
+    passed = 0
+    for test_func in tests:
+        try:
+            if test_func():
+                passed += 1
+        except AssertionError as e:
+            print(f"✗ {test_func.__name__} failed: {e}")
+        print()
+
+    print(f"Test Results: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
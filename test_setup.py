@@ -12,7 +12,6 @@ def test_imports():
         import requests
         import bs4
         import selenium
-        import fake_useragent
         import platform
         print("✓ Core Python modules imported successfully")
         
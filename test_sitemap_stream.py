@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Test script for streaming sitemap ingestion.
+
+Serves a small sitemap index (with a gzipped and a nested sub-sitemap) from a
+local HTTP server so no network access is needed.
+"""
+
+import gzip
+import io
+import os
+import sys
+import tempfile
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add the current directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from sitemap_stream import SitemapStreamer, iter_sitemap_entries
+
+
+NS = 'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+
+
+def _urlset(urls):
+    entries = ''.join(
+        f"<url><loc>{url}</loc><lastmod>2024-01-0{i % 9 + 1}</lastmod></url>"
+        for i, url in enumerate(urls)
+    )
+    return f'<?xml version="1.0" encoding="UTF-8"?><urlset {NS}>{entries}</urlset>'.encode()
+
+
+def _index(locs):
+    entries = ''.join(f"<sitemap><loc>{loc}</loc></sitemap>" for loc in locs)
+    return f'<?xml version="1.0" encoding="UTF-8"?><sitemapindex {NS}>{entries}</sitemapindex>'.encode()
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def _serve(directory):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), partial(_QuietHandler, directory=directory))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def test_iter_entries_plain_and_gzip():
+    """Entries and lastmod are parsed from plain and gzipped sitemaps."""
+    print("Testing sitemap entry parsing...")
+    data = _urlset(["https://example.com/a", "https://example.com/b"])
+
+    plain = list(iter_sitemap_entries(io.BytesIO(data)))
+    packed = list(iter_sitemap_entries(io.BytesIO(gzip.compress(data))))
+
+    assert plain == packed
+    assert plain[0] == ('url', "https://example.com/a", "2024-01-01")
+    assert [kind for kind, _, _ in plain] == ['url', 'url']
+    print("✓ Plain and gzipped sitemaps parsed identically")
+    return True
+
+
+def test_streamer_follows_nested_index():
+    """All URLs of an index, its gzipped and nested sub-sitemaps are streamed."""
+    print("Testing sitemap index streaming...")
+    with tempfile.TemporaryDirectory() as site:
+        server, base = _serve(site)
+        try:
+            part_a = [f"https://example.com/a/{i}" for i in range(50)]
+            part_b = [f"https://example.com/b/{i}" for i in range(50)]
+            part_c = [f"https://example.com/c/{i}" for i in range(10)]
+            Path(site, "a.xml").write_bytes(_urlset(part_a))
+            Path(site, "b.xml.gz").write_bytes(gzip.compress(_urlset(part_b)))
+            Path(site, "c.xml").write_bytes(_urlset(part_c))
+            Path(site, "nested.xml").write_bytes(_index([f"{base}/c.xml"]))
+            Path(site, "sitemap.xml").write_bytes(_index([
+                f"{base}/a.xml", f"{base}/b.xml.gz", f"{base}/nested.xml", f"{base}/missing.xml"
+            ]))
+
+            streamer = SitemapStreamer(max_workers=3)
+            try:
+                found = [loc for loc, _ in streamer.iter_urls(f"{base}/sitemap.xml")]
+            finally:
+                streamer.close()
+
+            assert sorted(found) == sorted(part_a + part_b + part_c)
+            print(f"✓ {len(found)} URLs streamed; missing sub-sitemap skipped")
+            return True
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+def test_streamer_raises_for_missing_top_level():
+    """A top-level sitemap that cannot be fetched is reported to the caller."""
+    print("Testing top-level sitemap failure...")
+    with tempfile.TemporaryDirectory() as site:
+        server, base = _serve(site)
+        try:
+            streamer = SitemapStreamer(max_workers=1)
+            try:
+                list(streamer.iter_urls(f"{base}/sitemap.xml"))
+            except Exception as e:
+                print(f"✓ Failure raised: {type(e).__name__}")
+                return True
+            finally:
+                streamer.close()
+            raise AssertionError("expected an exception for a missing sitemap")
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+def main():
+    """Run all sitemap streaming tests."""
+    tests = [
+        test_iter_entries_plain_and_gzip,
+        test_streamer_follows_nested_index,
+        test_streamer_raises_for_missing_top_level,
+    ]
+
+    passed = 0
+    for test_func in tests:
+        try:
+            if test_func():
+                passed += 1
+        except AssertionError as e:
+            print(f"✗ {test_func.__name__} failed: {e}")
+        print()
+
+    print(f"Test Results: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
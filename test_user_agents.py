@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Test script for the bundled user-agent pool.
+
+Checks that rotation is deterministic per worker and that a worker's HTTP
+requests present the same user agent as its browser session.
+"""
+
+import logging
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+# Add the current directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from http_fetcher import DEFAULT_HEADERS, HttpFetchResult
+from sitemap_stream import SITEMAP_HEADERS
+from ue5_docs_scraper import UE5DocsScraper
+from user_agents import DEFAULT_USER_AGENT, USER_AGENT_POOL_VERSION, USER_AGENTS, user_agent_for
+
+
+class FakeDriver:
+    pass
+
+
+class RecordingFetcher:
+    """Stands in for AsyncHttpFetcher and records the headers of each request."""
+
+    def __init__(self):
+        self.headers = []
+
+    def fetch(self, url, headers=None):
+        self.headers.append(headers)
+        return HttpFetchResult(url=url, status=200, text="<html></html>")
+
+    def close(self):
+        pass
+
+
+def _make_scraper(out_dir):
+    scraper = UE5DocsScraper(
+        output_dir=str(Path(out_dir) / "out"),
+        fetch_mode='http',
+        render_workers=0,
+        resume=False,
+        log_file=str(Path(out_dir) / "log.txt")
+    )
+    scraper.logger.set_console_level(logging.ERROR)
+    return scraper
+
+
+def test_pool_rotation():
+    """Workers get pool entries in a fixed order; all entries are Firefox."""
+    print("Testing user agent rotation...")
+    assert USER_AGENT_POOL_VERSION
+    assert len(set(USER_AGENTS)) == len(USER_AGENTS)
+    assert all('Gecko/20100101 Firefox/' in agent for agent in USER_AGENTS)
+    assert [user_agent_for(i) for i in range(len(USER_AGENTS))] == list(USER_AGENTS)
+    assert user_agent_for(len(USER_AGENTS) + 2) == user_agent_for(2)
+    assert user_agent_for(0) == DEFAULT_USER_AGENT
+    assert DEFAULT_HEADERS['User-Agent'] == DEFAULT_USER_AGENT
+    assert SITEMAP_HEADERS['User-Agent'] == DEFAULT_USER_AGENT
+    print(f"✓ {len(USER_AGENTS)} user agents, pool version {USER_AGENT_POOL_VERSION}")
+    return True
+
+
+def test_http_requests_match_worker_identity():
+    """HTTP requests send the worker's user agent, or its session's once one runs."""
+    print("Testing HTTP and browser identity...")
+    with tempfile.TemporaryDirectory() as out_dir:
+        scraper = _make_scraper(out_dir)
+        try:
+            scraper.http_fetcher.close()
+            scraper.http_fetcher = fetcher = RecordingFetcher()
+            scraper._fetch_paced("https://example.com/main")
+
+            def worker(worker_id, session_agent=None):
+                scraper._bind_worker_identity(worker_id)
+                if session_agent is not None:
+                    driver = FakeDriver()
+                    scraper._session_agents[driver] = session_agent
+                    scraper._bind_worker_driver(driver)
+                scraper._fetch_paced(f"https://example.com/{worker_id}",
+                                     headers={'If-None-Match': '"etag"'})
+
+            # Worker 2 runs a replacement session launched with worker 0's identity
+            for args in ((1,), (2, user_agent_for(0))):
+                thread = threading.Thread(target=worker, args=args)
+                thread.start()
+                thread.join()
+
+            sent = [headers['User-Agent'] for headers in fetcher.headers]
+            assert sent == [user_agent_for(0), user_agent_for(1), user_agent_for(0)], sent
+            assert fetcher.headers[1]['If-None-Match'] == '"etag"'
+        finally:
+            scraper.close()
+        print("✓ HTTP requests present the worker's browser identity")
+        return True
+
+
+def main():
+    """Run all user agent tests."""
+    tests = [
+        test_pool_rotation,
+        test_http_requests_match_worker_identity,
+    ]
+
+    passed = 0
+    for test_func in tests:
+        try:
+            if test_func():
+                passed += 1
+        except AssertionError as e:
+            print(f"✗ {test_func.__name__} failed: {e}")
+        print()
+
+    print(f"Test Results: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
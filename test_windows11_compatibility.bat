@@ -127,7 +127,7 @@ if exist "%VENV_DIR%" (
         
         REM Check key dependencies
         echo   Checking dependencies...
-        python -c "import requests, bs4, selenium, fake_useragent" >nul 2>&1
+        python -c "import requests, bs4, selenium" >nul 2>&1
         if errorlevel 1 (
             echo ✗ Some required dependencies are missing
             echo [%date% %time%] ERROR: Dependencies missing >> "%LOG_FILE%"
@@ -4,40 +4,199 @@ Unreal Engine 5 Documentation Scraper
 
 This script scrapes all documentation from the UE5 website and saves individual pages
 as PDFs in a directory structure mirroring the sitemap.
+
+Selenium's browser bindings, BeautifulSoup, aiohttp and requests are imported
+when they are first needed, and browser sessions are launched when the first page needs one, so
+--help, --status and --dry-run start without loading them.
 """
 
 import os
 import sys
-import asyncio
-import aiohttp
 import time
+import threading
 import logging
 import platform
 import datetime
 from pathlib import Path
-from urllib.parse import urljoin, urlparse, unquote
-from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.firefox.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, WebDriverException, NoSuchElementException
-from fake_useragent import UserAgent
+from concurrent.futures import Future
+from importlib.util import find_spec
+from urllib.parse import urljoin, urlparse
 import xml.etree.ElementTree as ET
-import re
+from selenium.common.exceptions import TimeoutException, WebDriverException, NoSuchElementException
 import html
-import unicodedata
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+import hashlib
+import json
+import weakref
 
 # Import enhanced logging
 from enhanced_logger import CrossPlatformLogger, error_handler
+from crawl_pool import CrawlWorkerPool
+from http_fetcher import AsyncHttpFetcher
+from crawl_state import CrawlStateStore, STATUS_DONE, read_status
+from sitemap_stream import SitemapStreamer
+from pdf_renderer import PdfRenderPool, render_pdf, get_weasyprint_capability
+from crawl_metrics import CrawlMetrics, PAGES_COUNTER
+from rate_limiter import AdaptiveRateLimiter, THROTTLE_STATUSES, parse_retry_after
+from retry_queue import DeferredRetry, RetryLedger
+from page_dedup import ContentIndex, canonical_url
+from output_planner import FilenameRegistry, OutputPathPlanner
+from filename_sanitizer import sanitize_directory_name, sanitize_filename
+from user_agents import USER_AGENT_POOL_VERSION, user_agent_for
+from browser_profile import BROWSER_PROFILES, DEFAULT_BROWSER_PROFILE, lean_profile_prefs
+from html_backend import (PARSER_BACKENDS, DEFAULT_PARSER_BACKEND, CONTENT_SELECTORS, MIN_CONTENT_TEXT_LENGTH,
+                          CleaningRules, create_html_backend)
+
+# Page fetch strategies: HTTP first with browser fallback, browser only, HTTP only
+FETCH_MODES = ('auto', 'browser', 'http')
+
+# Markers of bot-protection interstitials that only a real browser can pass
+CHALLENGE_MARKERS = (
+    '<title>Just a moment...</title>',
+    'cf-browser-verification',
+    'challenge-platform',
+    'cf_chl_opt'
+)
+
+# HTTP fetch outcomes meaning the server wants fewer requests (retried, never escalated)
+THROTTLED_REASONS = tuple(f'http_{status}' for status in THROTTLE_STATUSES)
+
+# Retry class of each HTTP-path failure reason when no browser fallback is available;
+# other http_<status> reasons are retried as server errors when 5xx. Challenge
+# pages are not retried: without a browser they cannot be cleared
+HTTP_RETRY_CLASSES = {
+    'network_error': 'network',
+    'validation_failed': 'error_page',
+    'no_main_content': 'empty_content',
+    'http_path_error': 'parse_error',
+}
+
+# Page source markers of error pages and of real content, checked before extraction
+PAGE_ERROR_INDICATORS = (
+    "Access Denied", "403 Forbidden", "404 Not Found", "500 Internal Server Error",
+    "Service Unavailable", "Bad Gateway", "Gateway Timeout",
+    "This page can't be displayed", "Page not found",
+    "<title>Just a moment...</title>"  # Cloudflare protection
+)
+PAGE_CONTENT_INDICATORS = (
+    "<main", "<article", "class=\"content\"", "class=\"documentation\"",
+    "<h1", "<h2", "<p", "<div"
+)
+
+# Page extraction strategies: parse the full page source in Python, or run one script in the browser
+EXTRACTION_MODES = ('python', 'browser')
+
+# Combined selector for the main documentation content (one DOM query instead of one wait per selector)
+CONTENT_READY_SELECTOR = (
+    "main, .main-content, .content, #content, .documentation, .docs, .page-content, article"
+)
+
+# Injected readiness probe: resolves once the content selector matches and the DOM and
+# resource list have been quiet for quiet_ms, or when the hard deadline expires.
+PAGE_READY_SCRIPT = """
+var selector = arguments[0], quietMs = arguments[1], deadlineMs = arguments[2];
+var done = arguments[arguments.length - 1];
+var start = performance.now(), lastActivity = start;
+var resourceCount = performance.getEntriesByType('resource').length;
+var observer = new MutationObserver(function () { lastActivity = performance.now(); });
+observer.observe(document.documentElement || document, {childList: true, subtree: true, characterData: true});
+var timer = setInterval(function () {
+    var now = performance.now();
+    var resources = performance.getEntriesByType('resource').length;
+    if (resources !== resourceCount) { resourceCount = resources; lastActivity = now; }
+    var matched = document.readyState !== 'loading' && document.querySelector(selector) !== null;
+    var status = null;
+    if (matched && now - lastActivity >= quietMs) { status = 'settled'; }
+    else if (now - start >= deadlineMs) { status = matched ? 'deadline_with_content' : 'deadline'; }
+    if (status) {
+        clearInterval(timer);
+        observer.disconnect();
+        done({status: status, matched: matched, elapsed_ms: now - start, ready_state: document.readyState});
+    }
+}, 50);
+"""
+
+# Injected extraction: checks the page indicators, strips a clone of the document with the cleaning
+# rules, then picks the main content with the same selector priority and minimum text length as
+# _extract_main_content. Returns only the content's outerHTML and the page title.
+PAGE_EXTRACT_SCRIPT = """
+var contentSelectors = arguments[0], minTextLength = arguments[1], removalSelectors = arguments[2];
+var errorIndicators = arguments[3], contentIndicators = arguments[4];
+var source = document.documentElement ? document.documentElement.outerHTML : '';
+var result = {source_length: source.length, error_indicator: null, has_content: false,
+              html: null, selector: null, text_length: 0, title: null, removed: {}};
+var i, j;
+for (i = 0; i < errorIndicators.length; i++) {
+    if (source.indexOf(errorIndicators[i]) !== -1) { result.error_indicator = errorIndicators[i]; break; }
+}
+for (i = 0; i < contentIndicators.length; i++) {
+    if (source.indexOf(contentIndicators[i]) !== -1) { result.has_content = true; break; }
+}
+if (result.error_indicator || !result.has_content) { return result; }
+
+var root = document.documentElement.cloneNode(true);
+var matches = root.querySelectorAll(removalSelectors.join(', '));
+for (i = 0; i < matches.length; i++) {
+    var node = matches[i];
+    if (!root.contains(node)) { continue; }  // inside an already removed subtree
+    for (j = 0; j < removalSelectors.length; j++) {
+        if (node.matches(removalSelectors[j])) {
+            result.removed[removalSelectors[j]] = (result.removed[removalSelectors[j]] || 0) + 1;
+            break;
+        }
+    }
+    node.parentNode.removeChild(node);
+}
+
+function textLength(node) {
+    var walker = document.createTreeWalker(node, NodeFilter.SHOW_TEXT), total = 0;
+    while (walker.nextNode()) { total += walker.currentNode.nodeValue.trim().length; }
+    return total;
+}
+for (i = 0; i < contentSelectors.length; i++) {
+    var candidate = root.querySelector(contentSelectors[i]);
+    if (!candidate) { continue; }
+    var length = textLength(candidate);
+    if (length > minTextLength) {
+        result.html = candidate.outerHTML;
+        result.selector = contentSelectors[i];
+        result.text_length = length;
+        break;
+    }
+}
+
+var titleElement = root.querySelector('title') || root.querySelector('h1') || root.querySelector('h2');
+if (titleElement) {
+    result.title = titleElement.textContent;
+} else {
+    var meta = root.querySelector('meta[property="og:title"]');
+    if (meta) { result.title = meta.getAttribute('content') || ''; }
+}
+return result;
+"""
+
+# Selenium names bound by _import_selenium() before they are used: importing
+# selenium.webdriver loads every browser binding, so it waits until a session is
+# launched or a page uses one of these. The exceptions are light and imported
+# eagerly, so sessions that did not come from _create_driver are handled too
+webdriver = Options = By = WebDriverWait = EC = None
+
+_selenium_lock = threading.Lock()
+_selenium_imported = False
+
+
+def _import_selenium():
+    """Import Selenium (once) and bind its names in this module"""
+    global webdriver, Options, By, WebDriverWait, EC, _selenium_imported
+    with _selenium_lock:
+        if _selenium_imported:
+            return
+        from selenium import webdriver
+        from selenium.webdriver.firefox.options import Options
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        _selenium_imported = True
 
-# Global variables for dependency management
-_weasyprint_module = None
-_weasyprint_checked = False
 
 # Enhanced dependency checking
 def check_system_dependencies():
@@ -52,12 +211,10 @@ def check_system_dependencies():
         issues.append(f"Python {sys.version} is too old")
         suggestions.append("Upgrade to Python 3.8 or later")
     
-    # Check required modules
-    required_modules = ['requests', 'bs4', 'selenium', 'fake_useragent']
+    # Check required modules (located, not imported)
+    required_modules = ['requests', 'bs4', 'selenium']
     for module in required_modules:
-        try:
-            __import__(module)
-        except ImportError:
+        if find_spec(module) is None:
             issues.append(f"Missing required module: {module}")
             suggestions.append(f"Install missing module: pip install {module}")
     
@@ -78,9 +235,54 @@ def check_system_dependencies():
 
 
 class UE5DocsScraper:
-    def __init__(self, base_url="https://docs.unrealengine.com", output_dir="ue5_docs"):
+    def __init__(self, base_url="https://docs.unrealengine.com", output_dir="ue5_docs", workers=1,
+                 fetch_mode="auto", readiness_timeout=15, state_db=None, resume=True,
+                 incremental=False, render_workers=None, metrics_file=None, log_file="log.txt",
+                 parser_backend=DEFAULT_PARSER_BACKEND, extraction_mode="python",
+                 browser_profile=DEFAULT_BROWSER_PROFILE, allowed_hosts=(),
+                 driver_max_pages=500, driver_max_rss_mb=1500, driver_standby=1,
+                 initial_rate=2.0, max_rate=16.0, manifest_file=None, state_read_only=False):
+        if fetch_mode not in FETCH_MODES:
+            raise ValueError(f"fetch_mode must be one of {FETCH_MODES}, got {fetch_mode!r}")
+        if parser_backend not in PARSER_BACKENDS:
+            raise ValueError(f"parser_backend must be one of {PARSER_BACKENDS}, got {parser_backend!r}")
+        if extraction_mode not in EXTRACTION_MODES:
+            raise ValueError(f"extraction_mode must be one of {EXTRACTION_MODES}, got {extraction_mode!r}")
+        if browser_profile not in BROWSER_PROFILES:
+            raise ValueError(f"browser_profile must be one of {BROWSER_PROFILES}, got {browser_profile!r}")
+        
         self.base_url = base_url
         self.output_dir = Path(output_dir)
+        self.workers = max(1, int(workers))
+        self.fetch_mode = fetch_mode
+        self.extraction_mode = extraction_mode
+        self.browser_profile = browser_profile
+        self.allowed_hosts = tuple(allowed_hosts or ())
+        # Browser sessions are recycled after this many pages / above this RSS (0 = never)
+        self.driver_max_pages = max(0, int(driver_max_pages or 0))
+        self.driver_max_rss_mb = max(0, float(driver_max_rss_mb or 0))
+        # Replacement sessions kept launched in the background by the worker pool
+        self.driver_standby = max(0, int(driver_standby or 0))
+        self.readiness_timeout = readiness_timeout
+        self.readiness_quiet_ms = 300
+        self.incremental = incremental
+        
+        # PDF rendering processes (0 renders on the crawl thread); the pool is created
+        # on the first render so HTML-only runs never start it
+        if render_workers is None:
+            render_workers = min(4, os.cpu_count() or 1)
+        self.render_workers = max(0, int(render_workers))
+        self._render_pool = None
+        self._render_pool_checked = False
+        self._render_lock = threading.Lock()
+        
+        # Per-thread driver binding used by the crawl worker pool; sessions are
+        # launched the first time a page needs the browser
+        self._local = threading.local()
+        self._driver = None
+        self._driver_lock = threading.Lock()
+        # User agent each session was launched with; a worker's HTTP requests send its session's
+        self._session_agents = weakref.WeakKeyDictionary()
         
         # Enhanced output directory creation with Windows support
         try:
@@ -103,31 +305,223 @@ class UE5DocsScraper:
         
         self.scraped_urls = set()
         self.failed_urls = set()
+        self._url_lock = threading.Lock()
+        
+        # HTTP fast path shared by all workers; per-URL record of which path served the page
+        self.http_fetcher = AsyncHttpFetcher()
+        self.fetch_decisions = {}
         self.start_time = datetime.datetime.now()
         
+        # Change tracking for incremental re-crawls: sitemap <lastmod> per URL,
+        # HTTP validators of pages fetched this run, and changed/unchanged/removed counts
+        self.sitemap_lastmod = {}
+        self._page_validators = {}
+        self.incremental_counts = {'new': 0, 'changed': 0, 'unchanged': 0, 'removed': 0}
+        
+        # Per-stage latency histograms and counters, dumped at the end of the crawl
+        self.metrics = CrawlMetrics()
+        self.metrics_file = Path(metrics_file) if metrics_file else self.output_dir / "crawl_metrics.json"
+        
+        # Persistent per-URL crawl state so interrupted runs can resume; read-only
+        # (and not created when missing) for runs that must not record progress
+        self.state = CrawlStateStore(state_db or self.output_dir / ".crawl_state.sqlite",
+                                     read_only=state_read_only)
+        
+        # Output file names per directory; seeded before a --restart reset so every URL
+        # keeps writing to the file it was saved as before. A page saved by the HTML
+        # fallback keeps its .pdf name, so a rerun with WeasyPrint renders the PDF there
+        self.filename_registry = FilenameRegistry(self.output_dir)
+        self.filename_registry.seed(
+            dict(record, output_path=str(Path(record['output_path']).with_suffix('.pdf')))
+            if record.get('output_path') else record
+            for record in self.state.completed_records()
+        )
+        if not resume:
+            self.state.reset()
+        
+        # Duplicate detection: sitemap URL variants with the same canonical form are crawled
+        # once, and pages whose extracted content is already saved become alias records
+        self.content_index = ContentIndex()
+        self.content_index.seed(self.state.completed_records())
+        self.url_aliases = {}
+        self.dedup_counts = {'url_variants': 0, 'duplicate_content': 0}
+        self.manifest_file = Path(manifest_file) if manifest_file else self.output_dir / "manifest.json"
+        
         # Setup enhanced cross-platform logging
         self.logger = CrossPlatformLogger(
-            log_file="log.txt",
+            log_file=log_file,
             log_level=logging.INFO,
             enable_console=True,
-            enable_json=False
+            enable_json=False,
+            async_logging=True,
+            background_system_info=True
+        )
+        
+        # Output directory of every URL, computed once per URL path as URLs are queued;
+        # Windows gets conservative limits to stay clear of MAX_PATH
+        windows = platform.system() == "Windows"
+        self.output_planner = OutputPathPlanner(
+            self.output_dir,
+            self._clean_directory_name_enhanced,
+            max_path_length=200 if windows else 240,
+            max_part_length=50 if windows else 100,
+            logger=self.logger
         )
         
         # Log startup configuration
         startup_config = {
             'base_url': base_url,
             'output_dir': str(output_dir),
+            'workers': self.workers,
+            'render_workers': self.render_workers,
+            'fetch_mode': self.fetch_mode,
+            'parser_backend': parser_backend,
+            'extraction_mode': extraction_mode,
+            'browser_profile': browser_profile,
+            'user_agent_pool': USER_AGENT_POOL_VERSION,
+            'driver_max_pages': self.driver_max_pages,
+            'driver_max_rss_mb': self.driver_max_rss_mb,
+            'driver_standby': self.driver_standby,
+            'initial_rate': initial_rate,
+            'max_rate': max_rate,
+            'state_db': str(self.state.db_path),
+            'resume': resume,
+            'incremental': incremental,
             'platform': platform.system(),
             'python_version': platform.python_version(),
             'working_directory': str(Path.cwd())
         }
         self.logger.log_startup_summary(startup_config)
         
-        # Setup selenium driver
-        self.setup_driver()
+        # HTML parser used for cleaning, extraction and title lookup (created on first use)
+        self.parser_backend = parser_backend
+        self._html_backend = None
+        self._html_backend_lock = threading.Lock()
+        self.cleaning_rules = CleaningRules()
+        
+        # WeasyPrint is probed once (import, fonts, test render) before the first PDF;
+        # Windows prints PDFs through the browser session instead
+        self._pdf_capability = None
+        self._pdf_probe_lock = threading.Lock()
+        
+        # Adaptive per-host request pacing shared by every fetch path: speeds up while
+        # responses are fast and clean, backs off on throttling and honors Retry-After
+        self.rate_limiter = AdaptiveRateLimiter(
+            initial_rate=initial_rate,
+            max_rate=max_rate,
+            max_concurrency=self.workers,
+            metrics=self.metrics,
+            logger=self.logger
+        )
+        
+        # Per-URL attempt counts and per-error-class retry policies; failed page
+        # attempts are retried by the worker pool after their backoff
+        self.retry_ledger = RetryLedger(metrics=self.metrics)
+        
+        # Pooled, concurrent sitemap fetching
+        self.sitemap_streamer = SitemapStreamer(logger=self.logger, metrics=self.metrics,
+                                                rate_limiter=self.rate_limiter)
+
+    @property
+    def driver(self):
+        """WebDriver for the current thread (worker-bound session or the primary one)
+        
+        Sessions start on first access: a worker's through the source bound by the
+        crawl pool, otherwise the primary session. None when no browser is used.
+        """
+        driver = getattr(self._local, 'driver', None)
+        if driver is not None:
+            return driver
+        source = getattr(self._local, 'driver_source', None)
+        if source is not None:
+            driver = self._local.driver = source()
+            return driver
+        if self._driver is None and self.uses_browser:
+            with self._driver_lock:
+                if self._driver is None:
+                    self.setup_driver()
+        return self._driver
+
+    @driver.setter
+    def driver(self, value):
+        self._driver = value
+
+    @property
+    def user_agent(self):
+        """User agent for the calling thread's requests
+        
+        The user agent of the thread's running browser session, else the worker's
+        own from the bundled pool (worker 0's outside the crawl pool).
+        """
+        driver = getattr(self._local, 'driver', None)
+        if driver is None and getattr(self._local, 'worker_id', None) is None:
+            driver = self._driver
+        agent = self._session_agents.get(driver) if driver is not None else None
+        return agent or user_agent_for(getattr(self._local, 'worker_id', None) or 0)
+
+    @property
+    def primary_driver(self):
+        """The primary session if it has been launched (never launches one)"""
+        return self._driver
+
+    @property
+    def html_backend(self):
+        """HTML parser backend, created (and its parser imported) on first use"""
+        if self._html_backend is None:
+            with self._html_backend_lock:
+                if self._html_backend is None:
+                    try:
+                        self._html_backend = create_html_backend(self.parser_backend)
+                    except ImportError as e:
+                        self.logger.log_warning(
+                            f"Parser backend '{self.parser_backend}' unavailable, falling back to html.parser",
+                            context={'error': str(e), 'suggestion': 'pip install lxml'}
+                        )
+                        self._html_backend = create_html_backend('html.parser')
+        return self._html_backend
+
+    @property
+    def pdf_capability(self):
+        """WeasyPrint capability, probed on first use (None on Windows)"""
+        if self._pdf_capability is None and platform.system() != "Windows":
+            with self._pdf_probe_lock:
+                if self._pdf_capability is None:
+                    self._pdf_capability = self._probe_pdf_capability()
+        return self._pdf_capability
+
+    @property
+    def uses_browser(self):
+        """Whether this scraper may need a Selenium session to fetch pages"""
+        return self.fetch_mode != 'http'
+
+    def _bind_worker_driver(self, driver):
+        """Bind a WebDriver session to the calling thread (None to unbind)"""
+        self._local.driver = driver
+
+    def _bind_driver_source(self, source):
+        """Bind a callable launching the calling thread's session on first use (None to unbind)"""
+        self._local.driver_source = source
+
+    def _bind_worker_identity(self, worker_id):
+        """Bind the crawl worker id of the calling thread (None to unbind)"""
+        self._local.worker_id = worker_id
 
     def setup_driver(self):
-        """Setup Selenium Firefox driver with enhanced Windows 11 compatibility"""
+        """Setup the primary Selenium Firefox driver"""
+        with self.metrics.time_stage('driver_start'):
+            self.driver = self._create_driver()
+
+    def _create_driver(self, worker_id=None):
+        """Create a Selenium Firefox driver with enhanced Windows 11 compatibility
+        
+        Args:
+            worker_id: Crawl worker the session is for (default: the calling thread's
+                worker, 0 outside the crawl pool); selects its user agent
+        """
+        _import_selenium()
+        if worker_id is None:
+            worker_id = getattr(self._local, 'worker_id', None) or 0
+        user_agent = user_agent_for(worker_id)
         max_retries = 3
         retry_delay = 2
         
@@ -135,80 +529,39 @@ class UE5DocsScraper:
             try:
                 self.logger.log_info(f"Setting up Selenium Firefox driver (attempt {attempt + 1}/{max_retries})")
                 
-                firefox_options = Options()
-                firefox_options.add_argument("--headless")
-                firefox_options.add_argument("--no-sandbox")
-                
-                # Windows 11 specific options
-                if platform.system() == "Windows":
-                    firefox_options.add_argument("--disable-blink-features=AutomationControlled")
-                    firefox_options.add_argument("--disable-extensions")
-                    firefox_options.add_argument("--disable-plugins")
-                    firefox_options.add_argument("--disable-web-security")
-                    firefox_options.add_argument("--allow-running-insecure-content")
-                    firefox_options.add_argument("--ignore-certificate-errors")
-                    
-                    # Set Windows-specific paths if needed
-                    firefox_options.set_preference("browser.download.folderList", 2)
-                    firefox_options.set_preference("browser.download.manager.showWhenStarting", False)
-                    firefox_options.set_preference("browser.helperApps.neverAsk.saveToDisk", "application/pdf")
-                
-                # Set user agent with retry mechanism
-                try:
-                    ua = UserAgent()
-                    user_agent = ua.random
-                    firefox_options.set_preference("general.useragent.override", user_agent)
-                    self.logger.log_info(f"Set user agent: {user_agent[:50]}...")
-                except Exception as e:
-                    self.logger.log_warning("Could not set random user agent, using default", context={'error': str(e)})
-                    # Fallback to a known working user agent
-                    fallback_ua = "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:91.0) Gecko/20100101 Firefox/91.0"
-                    firefox_options.set_preference("general.useragent.override", fallback_ua)
-                
-                # Disable automation indicators
-                firefox_options.set_preference("dom.webdriver.enabled", False)
-                firefox_options.set_preference("useAutomationExtension", False)
-                
-                # Enhanced stability options for cross-platform compatibility
-                firefox_options.add_argument("--disable-dev-shm-usage")
-                firefox_options.add_argument("--disable-gpu")
-                firefox_options.add_argument("--window-size=1920,1080")
-                firefox_options.add_argument("--no-first-run")
-                firefox_options.add_argument("--disable-default-apps")
-                
-                # Set longer timeouts for Windows 11
-                firefox_options.set_preference("network.http.connection-timeout", 30)
-                firefox_options.set_preference("network.http.response.timeout", 30)
+                firefox_options = self._firefox_options(user_agent)
                 
                 # Try to create the driver
-                self.driver = webdriver.Firefox(options=firefox_options)
+                driver = webdriver.Firefox(options=firefox_options)
                 
                 # Set enhanced timeouts for Windows 11 compatibility
                 base_timeout = 30
                 if platform.system() == "Windows":
                     base_timeout = 45  # Longer timeouts for Windows
                 
-                # Set implicit wait for better element detection
-                self.driver.implicitly_wait(15)
+                # No implicit wait: page readiness is detected explicitly by the injected
+                # readiness probe, and implicit waits stall every lookup that finds nothing
+                driver.implicitly_wait(0)
                 
                 # Set page load timeout
-                self.driver.set_page_load_timeout(base_timeout)
+                driver.set_page_load_timeout(base_timeout)
                 
                 # Set script timeout
-                self.driver.set_script_timeout(base_timeout)
+                driver.set_script_timeout(base_timeout)
                 
                 # Execute anti-detection script
                 try:
-                    self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+                    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
                 except Exception as js_e:
                     self.logger.log_warning(f"Could not execute anti-detection script: {js_e}")
                 
                 # Test the driver with a simple navigation
                 test_url = "data:text/html,<html><body><h1>Test</h1></body></html>"
-                self.driver.get(test_url)
+                driver.get(test_url)
                 
                 self.logger.log_success("Selenium Firefox driver setup completed successfully")
-                return  # Success, exit retry loop
+                self._session_agents[driver] = user_agent
+                return driver  # Success, exit retry loop
                 
             except WebDriverException as e:
                 self.logger.log_error(
@@ -253,80 +606,123 @@ class UE5DocsScraper:
                 if attempt == max_retries - 1:
                     raise
 
+    def _firefox_options(self, user_agent=None):
+        """Firefox options for crawl sessions (headless, stability, user agent, browser profile)
+        
+        Args:
+            user_agent: User agent to present (default: worker 0's from the bundled pool)
+        """
+        _import_selenium()
+        firefox_options = Options()
+        firefox_options.add_argument("--headless")
+        firefox_options.add_argument("--no-sandbox")
+        
+        # Windows 11 specific options
+        if platform.system() == "Windows":
+            firefox_options.add_argument("--disable-blink-features=AutomationControlled")
+            firefox_options.add_argument("--disable-extensions")
+            firefox_options.add_argument("--disable-plugins")
+            firefox_options.add_argument("--disable-web-security")
+            firefox_options.add_argument("--allow-running-insecure-content")
+            firefox_options.add_argument("--ignore-certificate-errors")
+            
+            # Set Windows-specific paths if needed
+            firefox_options.set_preference("browser.download.folderList", 2)
+            firefox_options.set_preference("browser.download.manager.showWhenStarting", False)
+            firefox_options.set_preference("browser.helperApps.neverAsk.saveToDisk", "application/pdf")
+        
+        # User agent from the bundled pool, the same one the worker's HTTP requests send
+        user_agent = user_agent or user_agent_for(0)
+        firefox_options.set_preference("general.useragent.override", user_agent)
+        self.logger.log_info(f"Set user agent: {user_agent[:50]}...")
+        
+        # Disable automation indicators
+        firefox_options.set_preference("dom.webdriver.enabled", False)
+        firefox_options.set_preference("useAutomationExtension", False)
+        
+        # Enhanced stability options for cross-platform compatibility
+        firefox_options.add_argument("--disable-dev-shm-usage")
+        firefox_options.add_argument("--disable-gpu")
+        firefox_options.add_argument("--window-size=1920,1080")
+        firefox_options.add_argument("--no-first-run")
+        firefox_options.add_argument("--disable-default-apps")
+        
+        # Set longer timeouts for Windows 11
+        firefox_options.set_preference("network.http.connection-timeout", 30)
+        firefox_options.set_preference("network.http.response.timeout", 30)
+        
+        # Lean profile: no images, fonts, media, trackers or third-party hosts, and return
+        # from get() at DOMContentLoaded; the readiness probe waits for the content itself
+        if self.browser_profile == 'lean':
+            firefox_options.page_load_strategy = 'eager'
+            prefs = lean_profile_prefs(
+                self.base_url,
+                extra_allowed_hosts=self.allowed_hosts,
+                block_images=platform.system() != "Windows"  # Windows prints PDFs in this session
+            )
+            for name, value in prefs.items():
+                firefox_options.set_preference(name, value)
+        
+        return firefox_options
+
     def clean_filename(self, name, max_length=50):
         """Clean a string to be safe for use as a filename"""
-        if not name or not name.strip():
-            return "unnamed"
-        
-        # Normalize unicode and decode HTML entities
-        name = unicodedata.normalize('NFKD', name)
-        name = html.unescape(name)
-        
-        # Replace problematic characters
-        forbidden_chars = '<>:"|?*\\/\r\n\t'
-        for char in forbidden_chars:
-            name = name.replace(char, '_')
-        
-        # Remove control characters (ASCII 0-31)
-        name = ''.join(char for char in name if ord(char) >= 32)
-        
-        # Collapse multiple spaces/underscores
-        name = re.sub(r'[_\s]+', '_', name)
-        
-        # Remove leading/trailing dots, spaces, underscores
-        name = name.strip('._\t\n\r ')
-        name = name.strip('._')
-        
-        # Handle Windows reserved names
-        windows_reserved = {
-            'CON', 'PRN', 'AUX', 'NUL',
-            'COM1', 'COM2', 'COM3', 'COM4', 'COM5', 'COM6', 'COM7', 'COM8', 'COM9',
-            'LPT1', 'LPT2', 'LPT3', 'LPT4', 'LPT5', 'LPT6', 'LPT7', 'LPT8', 'LPT9'
-        }
-        
-        if name.upper() in windows_reserved:
-            name = f"_{name}"
-        
-        # Limit length
-        if len(name) > max_length:
-            name = name[:max_length]
-        
-        # Ensure we don't end with a dot (Windows issue)
-        name = name.rstrip('.')
-        
-        # Final fallback
-        return name if name else "unnamed"
+        return sanitize_filename(name, max_length)
 
     def clean_directory_name(self, name):
         """Clean a string to be safe for use as a directory name"""
-        if not name or not name.strip():
-            return "unnamed_dir"
-        
-        # Apply same cleaning as filename but allow longer names
-        clean_name = self.clean_filename(name, max_length=100)
-        
-        # Remove trailing dots (Windows doesn't allow directories ending with dots)
-        clean_name = clean_name.rstrip('.')
-        
-        return clean_name or "unnamed_dir"
+        return sanitize_directory_name(name)
 
     def get_sitemap_urls(self):
         """Extract URLs from sitemap with enhanced error handling and retry mechanism"""
-        sitemap_urls = []
+        return list(self.iter_sitemap_urls())
+    
+    def iter_sitemap_urls(self):
+        """Stream documentation URLs from the sitemap as they are parsed
+        
+        Sub-sitemaps of an index are fetched concurrently over one pooled session and
+        parsed incrementally, so URLs are yielded (and can be crawled) before the whole
+        index has been resolved. Falls back to Selenium retrieval and then navigation
+        discovery when the direct request yields nothing.
+        """
         sitemap_url = f"{self.base_url}/sitemap.xml"
+        start_time = datetime.datetime.now()
+        seen = set()
         
-        # First, try direct HTTP request with retry mechanism
+        # First, stream the sitemap over plain HTTP
         try:
             self.logger.log_info(f"Attempting direct HTTP request to sitemap: {sitemap_url}")
-            sitemap_urls = self._try_direct_sitemap_request(sitemap_url)
-            if sitemap_urls:
-                return sitemap_urls
+            for loc, lastmod in self.sitemap_streamer.iter_urls(sitemap_url):
+                if lastmod:
+                    self.sitemap_lastmod[loc] = lastmod
+                if loc not in seen:
+                    seen.add(loc)
+                    yield loc
         except Exception as e:
             self.logger.log_warning(f"Direct HTTP request failed: {e}")
         
+        if seen:
+            duration = (datetime.datetime.now() - start_time).total_seconds()
+            self.logger.log_success(f"Direct HTTP request successful: {len(seen)} URLs found", url=sitemap_url)
+            self.logger.log_performance("sitemap_parsing", duration, {'url_count': len(seen)})
+            return
+        
+        yield from self._get_sitemap_urls_via_browser(sitemap_url)
+    
+    def _get_sitemap_urls_via_browser(self, sitemap_url):
+        """Retrieve the sitemap through Selenium, falling back to navigation discovery"""
+        sitemap_urls = []
+        
+        if self.driver is None:
+            self.logger.log_warning(
+                "No browser session available for sitemap fallback",
+                context={'fetch_mode': self.fetch_mode}
+            )
+            return sitemap_urls
+        _import_selenium()
+        
         # Fallback to Selenium-based retrieval with retry
         max_retries = 3
-        retry_delay = 5
         
         for attempt in range(max_retries):
             try:
@@ -336,7 +732,8 @@ class UE5DocsScraper:
                 
                 # Use enhanced page loading with timeout handling
                 try:
-                    self.driver.get(sitemap_url)
+                    with self.rate_limiter.request(sitemap_url, kind='browser'):
+                        self.driver.get(sitemap_url)
                     
                     # Wait for page to load with explicit timeout
                     WebDriverWait(self.driver, 15).until(
@@ -373,9 +770,8 @@ class UE5DocsScraper:
                         return self.discover_urls_through_navigation()
                     else:
                         # Wait before retry
-                        self.logger.log_info(f"Retrying in {retry_delay} seconds...")
-                        time.sleep(retry_delay)
-                        retry_delay *= 1.5  # Increase delay
+                        self.logger.log_info("Retrying sitemap access after backoff...")
+                        self.rate_limiter.backoff(sitemap_url, attempt, 'error_page')
                         continue
                 
                 # Try to parse XML content
@@ -384,6 +780,7 @@ class UE5DocsScraper:
                     xml_content = page_source
                     if '<?xml' not in xml_content:
                         # Try to extract XML from HTML
+                        from bs4 import BeautifulSoup
                         soup = BeautifulSoup(page_source, 'html.parser')
                         pre_tags = soup.find_all('pre')
                         for pre in pre_tags:
@@ -394,18 +791,15 @@ class UE5DocsScraper:
                     root = ET.fromstring(xml_content)
                     
                     # Extract URLs from sitemap
-                    for url_elem in root.findall('.//{http://www.sitemaps.org/schemas/sitemap/0.9}url'):
-                        loc_elem = url_elem.find('{http://www.sitemaps.org/schemas/sitemap/0.9}loc')
-                        if loc_elem is not None and loc_elem.text:
-                            sitemap_urls.append(loc_elem.text.strip())
+                    sitemap_urls.extend(self._extract_sitemap_url_entries(root))
                     
-                    # Also check for sitemap index files
+                    # Also check for sitemap index files (sub-sitemaps are fetched concurrently)
+                    sub_sitemaps = []
                     for sitemap_elem in root.findall('.//{http://www.sitemaps.org/schemas/sitemap/0.9}sitemap'):
                         loc_elem = sitemap_elem.find('{http://www.sitemaps.org/schemas/sitemap/0.9}loc')
                         if loc_elem is not None and loc_elem.text:
-                            # Recursively process sub-sitemaps
-                            sub_urls = self._process_sub_sitemap(loc_elem.text.strip())
-                            sitemap_urls.extend(sub_urls)
+                            sub_sitemaps.append(loc_elem.text.strip())
+                    sitemap_urls.extend(self._process_sub_sitemaps(sub_sitemaps))
                             
                     if sitemap_urls:
                         duration = (datetime.datetime.now() - start_time).total_seconds()
@@ -436,9 +830,8 @@ class UE5DocsScraper:
                     break
                     
                 # Wait before retry
-                self.logger.log_info(f"Retrying sitemap access in {retry_delay} seconds...")
-                time.sleep(retry_delay)
-                retry_delay *= 1.5
+                self.logger.log_info("Retrying sitemap access after backoff...")
+                self.rate_limiter.backoff(sitemap_url, attempt, 'no_urls')
                 
             except Exception as e:
                 self.logger.log_error(
@@ -453,117 +846,56 @@ class UE5DocsScraper:
                     break
                     
                 # Wait before retry
-                time.sleep(retry_delay)
-                retry_delay *= 1.5
+                self.rate_limiter.backoff(sitemap_url, attempt)
 
         # Final fallback: discover URLs through navigation
         self.logger.log_info("All sitemap attempts failed, falling back to URL discovery through navigation")
         return self.discover_urls_through_navigation()
     
-    def _try_direct_sitemap_request(self, sitemap_url):
-        """Try to fetch sitemap directly with HTTP requests and retry logic"""
-        sitemap_urls = []
-        
-        # Create session with retry strategy
-        session = requests.Session()
-        
-        # Define retry strategy with exponential backoff
-        retry_strategy = Retry(
-            total=3,
-            backoff_factor=2,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["HEAD", "GET", "OPTIONS"]
-        )
-        
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
-        
-        # Set headers to mimic a real browser
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:91.0) Gecko/20100101 Firefox/91.0',
-            'Accept': 'application/xml,text/xml,*/*',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1'
-        }
-        
-        try:
-            response = session.get(sitemap_url, headers=headers, timeout=30)
-            response.raise_for_status()
-            
-            # Parse the XML content
-            root = ET.fromstring(response.content)
-            
-            # Extract URLs
-            for url_elem in root.findall('.//{http://www.sitemaps.org/schemas/sitemap/0.9}url'):
-                loc_elem = url_elem.find('{http://www.sitemaps.org/schemas/sitemap/0.9}loc')
-                if loc_elem is not None and loc_elem.text:
-                    sitemap_urls.append(loc_elem.text.strip())
-            
-            # Check for sitemap index
-            for sitemap_elem in root.findall('.//{http://www.sitemaps.org/schemas/sitemap/0.9}sitemap'):
-                loc_elem = sitemap_elem.find('{http://www.sitemaps.org/schemas/sitemap/0.9}loc')
-                if loc_elem is not None and loc_elem.text:
-                    sub_urls = self._process_sub_sitemap(loc_elem.text.strip())
-                    sitemap_urls.extend(sub_urls)
-            
-            if sitemap_urls:
-                self.logger.log_success(f"Direct HTTP request successful: {len(sitemap_urls)} URLs found")
-                
-        except requests.exceptions.RequestException as e:
-            self.logger.log_warning(f"Direct HTTP request failed: {e}")
-            raise
-        except ET.ParseError as e:
-            self.logger.log_warning(f"XML parsing failed in direct request: {e}")
-            raise
-        finally:
-            session.close()
-            
-        return sitemap_urls
+    def _extract_sitemap_url_entries(self, root):
+        """Return the <loc> URLs of a parsed <urlset>, remembering each <lastmod>"""
+        urls = []
+        for url_elem in root.findall('.//{http://www.sitemaps.org/schemas/sitemap/0.9}url'):
+            loc_elem = url_elem.find('{http://www.sitemaps.org/schemas/sitemap/0.9}loc')
+            if loc_elem is not None and loc_elem.text:
+                loc = loc_elem.text.strip()
+                urls.append(loc)
+                lastmod_elem = url_elem.find('{http://www.sitemaps.org/schemas/sitemap/0.9}lastmod')
+                if lastmod_elem is not None and lastmod_elem.text:
+                    self.sitemap_lastmod[loc] = lastmod_elem.text.strip()
+        return urls
     
-    def _process_sub_sitemap(self, sub_sitemap_url):
-        """Process a sub-sitemap URL and extract its URLs"""
+    def _process_sub_sitemaps(self, sub_sitemap_urls):
+        """Fetch sub-sitemaps concurrently over the pooled session and collect their URLs"""
         sub_urls = []
+        if not sub_sitemap_urls:
+            return sub_urls
+        
         try:
-            self.logger.log_info(f"Processing sub-sitemap: {sub_sitemap_url}")
-            
-            # Use the same direct request method for sub-sitemaps
-            session = requests.Session()
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:91.0) Gecko/20100101 Firefox/91.0'
-            }
-            
-            response = session.get(sub_sitemap_url, headers=headers, timeout=15)
-            response.raise_for_status()
-            
-            root = ET.fromstring(response.content)
-            
-            for url_elem in root.findall('.//{http://www.sitemaps.org/schemas/sitemap/0.9}url'):
-                loc_elem = url_elem.find('{http://www.sitemaps.org/schemas/sitemap/0.9}loc')
-                if loc_elem is not None and loc_elem.text:
-                    sub_urls.append(loc_elem.text.strip())
-            
-            self.logger.log_info(f"Sub-sitemap processed: {len(sub_urls)} URLs found")
-            
+            for loc, lastmod in self.sitemap_streamer.iter_urls(*sub_sitemap_urls):
+                if lastmod:
+                    self.sitemap_lastmod[loc] = lastmod
+                sub_urls.append(loc)
         except Exception as e:
-            self.logger.log_warning(f"Failed to process sub-sitemap {sub_sitemap_url}: {e}")
-            
+            self.logger.log_warning(f"Failed to process sub-sitemaps: {e}", context={'count': len(sub_sitemap_urls)})
+        
         return sub_urls
 
     def discover_urls_through_navigation(self):
         """Discover documentation URLs by crawling the navigation structure"""
         discovered_urls = set()
         main_docs_url = f"{self.base_url}/5.3/en-US/"
+        _import_selenium()
         
         try:
             self.logger.log_info(f"Starting URL discovery through navigation from: {main_docs_url}")
             start_time = datetime.datetime.now()
             
-            # Start from the main docs page
-            self.driver.get(main_docs_url)
-            time.sleep(3)
+            # Start from the main docs page (the session is started outside the timed request)
+            driver = self.driver
+            with self.rate_limiter.request(main_docs_url, kind='browser'):
+                driver.get(main_docs_url)
+            self._wait_for_page_ready(main_docs_url, 0, selector="a[href*='/5.3/en-US/']")
             
             # Look for navigation elements and links
             nav_selectors = [
@@ -629,101 +961,31 @@ class UE5DocsScraper:
             return []
 
     def create_directory_structure(self, url):
-        """Create directory structure with enhanced Windows 11 permission handling"""
+        """Create directory structure with enhanced Windows 11 permission handling
+        
+        The directory comes from the output path planner (memoized per URL path) and
+        is only created the first time a page is saved into it.
+        """
         max_retries = 3
         retry_delay = 1
         
         for attempt in range(max_retries):
             try:
-                parsed_url = urlparse(url)
-                path_parts = [part for part in parsed_url.path.split('/') if part]
-                
-                # Remove filename if it exists (has extension)
-                if path_parts and '.' in path_parts[-1]:
-                    path_parts = path_parts[:-1]
-                
-                # Start from base directory
-                current_path = self.output_dir
-                created_parts = []
-                
-                # Windows-specific path handling
-                if platform.system() == "Windows":
-                    # Ensure we're not hitting Windows path limitations
-                    max_path_length = 200  # Conservative limit for Windows
-                    max_part_length = 50   # Conservative limit for directory names
-                else:
-                    max_path_length = 240
-                    max_part_length = 100
-                
-                for part in path_parts:
-                    # URL decode the part
-                    try:
-                        decoded_part = unquote(part)
-                    except Exception as decode_e:
-                        self.logger.log_warning(f"URL decode error for part: {part}", context={'error': str(decode_e)})
-                        decoded_part = part  # Use original if decode fails
-                    
-                    # Clean the directory name with platform-specific rules
-                    clean_part = self._clean_directory_name_enhanced(decoded_part, max_part_length)
-                    
-                    # Prevent path traversal
-                    if '..' in clean_part or clean_part.startswith('.'):
-                        original_part = clean_part
-                        clean_part = clean_part.replace('..', '_').lstrip('.')
-                        self.logger.log_warning(
-                            f"Path traversal attempt detected and sanitized",
-                            context={'original': original_part, 'sanitized': clean_part, 'url': url}
-                        )
-                    
-                    # Build path safely
-                    proposed_path = current_path / clean_part
-                    
-                    # Check for path length limits
-                    if len(str(proposed_path)) > max_path_length:
-                        # Implement intelligent truncation
-                        remaining_length = max_path_length - len(str(current_path)) - 1  # -1 for separator
-                        if remaining_length > 10:  # Minimum meaningful length
-                            truncated = clean_part[:remaining_length]
-                            # Ensure truncated name doesn't end with dot (Windows issue)
-                            truncated = truncated.rstrip('.')
-                            if not truncated:  # If truncation results in empty string
-                                truncated = "dir"
-                            proposed_path = current_path / truncated
-                            created_parts.append(truncated)
-                            
-                            self.logger.log_warning(
-                                f"Path length exceeded, truncated directory name",
-                                context={
-                                    'original': clean_part,
-                                    'truncated': truncated,
-                                    'original_length': len(str(current_path / clean_part)),
-                                    'truncated_length': len(str(proposed_path)),
-                                    'url': url
-                                }
-                            )
-                        else:
-                            # Path is too long, stop here
-                            self.logger.log_warning(
-                                f"Path too long, stopping directory creation at current level",
-                                context={'current_path': str(current_path), 'url': url}
-                            )
-                            break
-                    else:
-                        created_parts.append(clean_part)
-                    
-                    current_path = proposed_path
+                current_path = self.output_planner.directory_for(url)
                 
                 # Create the directory structure with enhanced error handling
-                self._create_directory_with_windows_handling(current_path, attempt)
+                created = self.output_planner.ensure_directory(
+                    current_path,
+                    lambda path: self._create_directory_with_windows_handling(path, attempt)
+                )
                 
-                # Log successful directory creation
-                if created_parts:
+                # Log each directory once, when it is created
+                if created and current_path != self.output_dir:
                     self.logger.log_success(
                         f"Directory structure created",
                         context={
                             'path': str(current_path),
-                            'depth': len(created_parts),
-                            'parts': created_parts,
+                            'depth': len(current_path.relative_to(self.output_dir).parts),
                             'attempt': attempt + 1 if attempt > 0 else None
                         }
                     )
@@ -807,38 +1069,8 @@ class UE5DocsScraper:
         return self._create_fallback_directory(url, "max_retries_exceeded")
     
     def _clean_directory_name_enhanced(self, name, max_length):
-        """Enhanced directory name cleaning with platform-specific rules"""
-        if not name or not name.strip():
-            return "unnamed_dir"
-        
-        # Apply the existing cleaning logic
-        clean_name = self.clean_directory_name(name)
-        
-        # Additional Windows-specific cleaning
-        if platform.system() == "Windows":
-            # Windows doesn't allow certain characters in paths
-            additional_forbidden = ['<', '>', ':', '"', '|', '?', '*']
-            for char in additional_forbidden:
-                clean_name = clean_name.replace(char, '_')
-            
-            # Windows doesn't allow paths ending with space or dot
-            clean_name = clean_name.rstrip(' .')
-            
-            # Windows reserved device names (case insensitive)
-            windows_reserved = {
-                'CON', 'PRN', 'AUX', 'NUL', 'COM1', 'COM2', 'COM3', 'COM4', 'COM5',
-                'COM6', 'COM7', 'COM8', 'COM9', 'LPT1', 'LPT2', 'LPT3', 'LPT4',
-                'LPT5', 'LPT6', 'LPT7', 'LPT8', 'LPT9'
-            }
-            
-            if clean_name.upper() in windows_reserved:
-                clean_name = f"_{clean_name}"
-        
-        # Limit length
-        if len(clean_name) > max_length:
-            clean_name = clean_name[:max_length].rstrip(' .')
-        
-        return clean_name or "dir"
+        """Directory name cleaning for the output planner (safe on every platform)"""
+        return sanitize_directory_name(name, max_length)
     
     def _create_directory_with_windows_handling(self, path, attempt):
         """Create directory with Windows-specific handling"""
@@ -882,7 +1114,6 @@ class UE5DocsScraper:
         """Create a fallback directory when normal creation fails"""
         try:
             # Create a safe fallback path
-            import hashlib
             url_hash = hashlib.md5(url.encode()).hexdigest()[:8]
             fallback_name = f"{error_type}_fallback_{url_hash}"
             
@@ -922,22 +1153,11 @@ class UE5DocsScraper:
         filename = "page"  # Default fallback
         
         try:
-            # Try to extract title from various sources
-            title_elem = (
-                soup.find('title') or 
-                soup.find('h1') or 
-                soup.find('h2') or
-                soup.find('meta', {'property': 'og:title'})
-            )
+            # Try to extract title from <title>, <h1>, <h2> or og:title
+            title = self.html_backend.title(soup)
             
-            if title_elem:
-                if title_elem.name == 'meta':
-                    title = title_elem.get('content', '')
-                else:
-                    title = title_elem.get_text()
-                
-                if title and title.strip():
-                    filename = self.clean_filename(title.strip(), max_length=50)
+            if title and title.strip():
+                filename = self.clean_filename(title.strip(), max_length=50)
         
         except Exception:
             # If anything fails, use URL-based name
@@ -952,113 +1172,190 @@ class UE5DocsScraper:
         
         return filename
 
-    def scrape_page_content(self, url):
-        """Scrape content from a single page with enhanced timeout handling"""
+    def scrape_page_content(self, url, prefetched=None, defer_retries=False):
+        """Scrape content from a single page with enhanced timeout handling
+        
+        prefetched is an optional HttpFetchResult already retrieved for this URL
+        (e.g. by an incremental conditional request) to reuse on the HTTP path.
+        
+        Failed attempts are retried according to their error class (see
+        retry_queue.py). With defer_retries a retry raises DeferredRetry, so the
+        worker pool can run it after its backoff; otherwise this call sleeps
+        through the backoff.
+        """
+        html_content, soup = self._scrape_page_attempts(url, prefetched, defer_retries)
+        self.retry_ledger.resolve(url, bool(html_content))
+        return html_content, soup
+    
+    def _scrape_page_attempts(self, url, prefetched, defer_retries):
+        """Fetch and extract a page, retrying failed attempts (see scrape_page_content)"""
         start_time = datetime.datetime.now()
-        max_retries = 3
-        retry_delay = 5
+        attempt = self.retry_ledger.attempt(url)
+        
+        # A retry of a page that already had to be escalated goes straight to the browser
+        with self._url_lock:
+            escalated = attempt > 0 and self.fetch_decisions.get(url, {}).get('path') == 'browser'
+        
+        # Fast path: plain HTTP fetch, escalating to the browser only when needed
+        if self.fetch_mode != 'browser' and not escalated:
+            html_content, soup, reason, result = self._scrape_via_http(url, result=prefetched)
+            if html_content:
+                self._record_fetch_decision(url, 'http')
+                return html_content, soup
+            
+            # The server asked to slow down: retry after its Retry-After instead of
+            # escalating, as the browser would be throttled just the same
+            if reason in THROTTLED_REASONS:
+                self._record_fetch_decision(url, 'failed', reason)
+                retry_after = parse_retry_after(result.header('retry-after')) or 0.0
+                retry_after = min(retry_after, self.rate_limiter.max_retry_after)
+                if self._retry_page(url, 'server_error', defer_retries, min_delay=retry_after):
+                    return self._scrape_page_attempts(url, None, defer_retries)
+                return self._log_scrape_failed(url, start_time, attempt)
+            
+            if self.fetch_mode == 'http' or self.driver is None:
+                self._record_fetch_decision(url, 'failed', reason)
+                self.logger.log_warning(
+                    "HTTP fetch did not yield usable content and no browser fallback is available",
+                    url=url,
+                    context={'reason': reason, 'fetch_mode': self.fetch_mode}
+                )
+                retry_class = HTTP_RETRY_CLASSES.get(reason)
+                if retry_class is None and reason and reason.startswith('http_'):
+                    status = int(reason[5:])
+                    retry_class = 'server_error' if status >= 500 else None
+                if retry_class and self._retry_page(url, retry_class, defer_retries):
+                    return self._scrape_page_attempts(url, None, defer_retries)
+                return self._log_scrape_failed(url, start_time, attempt)
+            
+            self._record_fetch_decision(url, 'browser', reason)
+            self.logger.log_info(
+                "Escalating page fetch to browser",
+                context={'url': url, 'reason': reason}
+            )
         
-        for attempt in range(max_retries):
+        while True:
+            attempt = self.retry_ledger.attempt(url)
             try:
                 self.logger.log_info(
-                    f"Starting to scrape page content (attempt {attempt + 1}/{max_retries})", 
+                    f"Starting to scrape page content (attempt {attempt + 1})", 
                     context={'url': url}
                 )
                 
                 # Navigate to the page with enhanced error handling
                 try:
-                    self.driver.get(url)
-                except TimeoutException as nav_timeout:
+                    # Start the session (if needed) before the timed request
+                    driver = self.driver
+                    with self.rate_limiter.request(url, kind='browser'), self.metrics.time_stage('navigation'):
+                        driver.get(url)
+                except TimeoutException:
                     self.logger.log_warning(
                         f"Navigation timeout on attempt {attempt + 1}",
                         context={'url': url, 'timeout': self.driver.timeouts.page_load}
                     )
-                    if attempt < max_retries - 1:
-                        time.sleep(retry_delay)
+                    if self._retry_page(url, 'timeout', defer_retries):
                         continue
-                    else:
-                        raise
-                
-                # Progressive wait strategy for content loading
-                self._wait_for_page_content(url, attempt)
+                    return self._log_scrape_failed(url, start_time, attempt)
                 
-                # Additional wait for dynamic content
-                time.sleep(2 + attempt)  # Increase wait time with each retry
+                # Event-driven wait: returns as soon as main content has settled
+                self._wait_for_page_ready(url, attempt)
             
-                # Get page source with validation
-                page_source = self.driver.page_source
+                # In-browser extraction transfers only the cleaned main content; otherwise the
+                # full page source is transferred and processed in Python
+                extraction = self._extract_in_browser(url) if self.extraction_mode == 'browser' else None
+                
+                if extraction is not None:
+                    page_ok = self._check_page_quality(
+                        extraction['source_length'], extraction['error_indicator'],
+                        extraction['has_content'], url, attempt
+                    )
+                else:
+                    with self.metrics.time_stage('page_source'):
+                        page_source = self.driver.page_source
+                    page_ok = self._validate_page_source(page_source, url, attempt)
                 
                 # Enhanced page source validation
-                if not self._validate_page_source(page_source, url, attempt):
-                    if attempt < max_retries - 1:
-                        self.logger.log_info(f"Retrying page scraping in {retry_delay} seconds...")
-                        time.sleep(retry_delay)
-                        retry_delay *= 1.5
-                        continue
+                if not page_ok:
+                    if extraction is not None:
+                        challenge = extraction['error_indicator'] in CHALLENGE_MARKERS
                     else:
-                        return None, None
-            
-                # Parse with BeautifulSoup
-                try:
-                    soup = BeautifulSoup(page_source, 'html.parser')
-                except Exception as parse_e:
-                    self.logger.log_error(
-                        f"BeautifulSoup parsing error on attempt {attempt + 1}",
-                        exception=parse_e,
-                        operation="scrape_page_content",
-                        url=url,
-                        context={
-                            'page_source_length': len(page_source),
-                            'attempt': attempt + 1,
-                            'contains_html': '<html' in page_source.lower()
-                        }
-                    )
-                    if attempt < max_retries - 1:
-                        time.sleep(retry_delay)
+                        challenge = self._is_challenge_page(page_source or '')
+                    if self._retry_page(url, 'challenge' if challenge else 'error_page', defer_retries):
                         continue
-                    else:
-                        return None, None
-            
-                # Remove navigation and unnecessary elements
-                elements_removed = self._clean_page_content(soup)
-                    
-                # Extract main content with enhanced detection
-                main_content = self._extract_main_content(soup, url)
-                
-                if not main_content:
-                    if attempt < max_retries - 1:
-                        self.logger.log_warning(
-                            f"No main content found on attempt {attempt + 1}, retrying...",
-                            url=url
+                    return self._log_scrape_failed(url, start_time, attempt)
+            
+                if extraction is not None:
+                    html_content = extraction['html']
+                    elements_removed = self._record_cleaning(extraction['removed'])
+                    soup = self._title_document(extraction['title'])
+                    if html_content:
+                        self.logger.log_info(
+                            f"Main content extracted in browser using selector: {extraction['selector']}",
+                            context={'text_length': extraction['text_length'],
+                                     'page_source_length': extraction['source_length']}
                         )
-                        time.sleep(retry_delay)
-                        continue
-                    else:
-                        self.logger.log_warning(
-                            "No main content found after all attempts",
+                else:
+                    # Parse with the configured parser backend
+                    try:
+                        with self.metrics.time_stage('parse'):
+                            soup = self.html_backend.parse(page_source)
+                    except Exception as parse_e:
+                        self.logger.log_error(
+                            f"HTML parsing error on attempt {attempt + 1} ({self.html_backend.name})",
+                            exception=parse_e,
+                            operation="scrape_page_content",
                             url=url,
                             context={
-                                'elements_removed': elements_removed,
-                                'available_tags': [tag.name for tag in soup.find_all()[:10]]  # First 10 tags
+                                'page_source_length': len(page_source),
+                                'attempt': attempt + 1,
+                                'contains_html': '<html' in page_source.lower()
                             }
                         )
-                        return None, None
+                        if self._retry_page(url, 'parse_error', defer_retries):
+                            continue
+                        return self._log_scrape_failed(url, start_time, attempt)
+                
+                    # Remove navigation and unnecessary elements
+                    with self.metrics.time_stage('clean'):
+                        elements_removed = self._clean_page_content(soup)
+                        
+                    # Extract main content with enhanced detection
+                    with self.metrics.time_stage('extract'):
+                        main_content = self._extract_main_content(soup, url)
+                    html_content = self.html_backend.to_html(main_content) if main_content is not None else None
+                
+                if not html_content:
+                    self.logger.log_warning(
+                        f"No main content found on attempt {attempt + 1}",
+                        url=url,
+                        context={
+                            'elements_removed': elements_removed,
+                            'extraction_mode': self.extraction_mode if extraction is not None else 'python',
+                            'available_tags': (self.html_backend.describe(soup)['available_tags']
+                                               if extraction is None else None)
+                        }
+                    )
+                    if self._retry_page(url, 'empty_content', defer_retries):
+                        continue
+                    return self._log_scrape_failed(url, start_time, attempt)
                 
-                content_length = len(str(main_content))
                 duration = (datetime.datetime.now() - start_time).total_seconds()
                 
                 self.logger.log_success(
                     "Page content scraped successfully",
                     url=url,
                     context={
-                        'content_length': content_length,
+                        'content_length': len(html_content),
                         'elements_removed': elements_removed,
                         'duration_seconds': duration,
                         'attempt': attempt + 1 if attempt > 0 else None
                     }
                 )
                 
-                return str(main_content), soup
+                return html_content, soup
+            
+            except DeferredRetry:
+                raise
             
             except Exception as e:
                 self.logger.log_error(
@@ -1068,130 +1365,277 @@ class UE5DocsScraper:
                     url=url,
                     context={
                         'attempt': attempt + 1,
-                        'max_retries': max_retries,
                         'error_type': type(e).__name__
                     }
                 )
                 
-                if attempt < max_retries - 1:
-                    time.sleep(retry_delay)
-                    retry_delay *= 2
-                else:
-                    duration = (datetime.datetime.now() - start_time).total_seconds()
-                    self.logger.log_error(
-                        "All page scraping attempts failed",
-                        operation="scrape_page_content",
-                        url=url,
-                        context={'duration_seconds': duration, 'total_attempts': max_retries}
-                    )
-                    return None, None
-        
-        # Should never reach here
+                if self._retry_page(url, 'timeout' if isinstance(e, TimeoutException) else 'error',
+                                    defer_retries):
+                    continue
+                return self._log_scrape_failed(url, start_time, attempt)
+    
+    def _retry_page(self, url, error_class, defer_retries, min_delay=0.0):
+        """Schedule another attempt after a failed one
+        
+        Returns False when the error class's attempts are used up. Otherwise the host
+        is backed off and, with defer_retries, DeferredRetry is raised for the worker
+        pool; without it the backoff is slept through here and True is returned.
+        min_delay (e.g. a Retry-After pause) lengthens the class's backoff.
+        """
+        delay = self.retry_ledger.schedule(url, error_class, min_delay)
+        if delay is None:
+            return False
+        # A page that fails to parse says nothing about the server's load
+        if error_class != 'parse_error':
+            self.rate_limiter.report_failure(url, error_class)
+        if defer_retries:
+            raise DeferredRetry(url, error_class, delay)
+        self.logger.log_info(
+            f"Retrying page scraping in {delay:.1f} seconds ({error_class})",
+            context={'url': url}
+        )
+        time.sleep(delay)
+        return True
+    
+    def _log_scrape_failed(self, url, start_time, attempt):
+        """Log that a page could not be scraped in any attempt; returns (None, None)"""
+        duration = (datetime.datetime.now() - start_time).total_seconds()
+        self.logger.log_error(
+            "All page scraping attempts failed",
+            operation="scrape_page_content",
+            url=url,
+            context={'duration_seconds': duration, 'total_attempts': attempt + 1}
+        )
         return None, None
     
-    def _wait_for_page_content(self, url, attempt):
-        """Enhanced page content waiting with progressive timeouts"""
-        base_timeout = 15
-        timeout = base_timeout + (attempt * 5)  # Increase timeout with each retry
+    def _scrape_via_http(self, url, result=None):
+        """Fetch and extract a page over HTTP without a browser
         
+        Returns (html_content, soup, reason, result); reason is None on success,
+        otherwise it names why the page has to be escalated to the browser. result
+        is the HttpFetchResult (None if the fetch itself raised).
+        """
         try:
-            # Wait for basic page structure
-            WebDriverWait(self.driver, timeout).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
+            if result is None:
+                result = self._fetch_paced(url)
             
-            # Wait for page to be fully loaded
-            WebDriverWait(self.driver, timeout).until(
-                lambda driver: driver.execute_script("return document.readyState") == "complete"
-            )
+            if result.error:
+                self.logger.log_warning(
+                    "HTTP fetch failed",
+                    url=url,
+                    context={'error': result.error}
+                )
+                return None, None, 'network_error', result
             
-            # Additional checks for content-specific elements
-            content_selectors = [
-                "main", ".content", ".main-content", "article", 
-                ".documentation", ".docs", "#content", ".page-content"
-            ]
+            page_source = result.text
             
-            content_found = False
-            for selector in content_selectors:
-                try:
-                    WebDriverWait(self.driver, 5).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                    )
-                    content_found = True
-                    self.logger.log_info(f"Content found using selector: {selector}")
-                    break
-                except TimeoutException:
-                    continue
+            if self._is_challenge_page(page_source, result.status):
+                return None, None, 'challenge', result
             
-            if not content_found:
-                self.logger.log_warning(
-                    f"No specific content selectors found, proceeding with body content",
-                    context={'url': url, 'attempt': attempt + 1}
-                )
+            if not result.ok:
+                return None, None, f'http_{result.status}', result
             
-        except TimeoutException as timeout_e:
-            self.logger.log_error(
-                f"Timeout waiting for page content (attempt {attempt + 1})",
-                exception=timeout_e,
-                operation="_wait_for_page_content",
+            if not self._validate_page_source(page_source, url, 0):
+                return None, None, 'validation_failed', result
+            
+            with self.metrics.time_stage('parse'):
+                soup = self.html_backend.parse(page_source)
+            with self.metrics.time_stage('clean'):
+                elements_removed = self._clean_page_content(soup)
+            with self.metrics.time_stage('extract'):
+                main_content = self._extract_main_content(soup, url)
+            
+            if main_content is None:
+                return None, None, 'no_main_content', result
+            html_content = self.html_backend.to_html(main_content)
+            
+            # Keep the validators so a later incremental run can send a conditional request
+            with self._url_lock:
+                self._page_validators[url] = {
+                    'etag': result.header('etag'),
+                    'last_modified': result.header('last-modified')
+                }
+            
+            self.logger.log_success(
+                "Page content fetched over HTTP",
                 url=url,
                 context={
-                    'timeout_seconds': timeout,
-                    'attempt': attempt + 1,
-                    'page_title': self.driver.title if hasattr(self.driver, 'title') else 'Unknown'
+                    'content_length': len(html_content),
+                    'elements_removed': elements_removed,
+                    'duration_seconds': round(result.elapsed, 3),
+                    'status': result.status
                 }
             )
-            raise
+            
+            return html_content, soup, None, result
+            
+        except Exception as e:
+            self.logger.log_error(
+                "Unexpected error on HTTP fetch path",
+                exception=e,
+                operation="_scrape_via_http",
+                url=url
+            )
+            return None, None, 'http_path_error', result
+    
+    def _fetch_paced(self, url, headers=None):
+        """HTTP fetch paced by the rate limiter
+        
+        A 429/503 response is returned as it is: the limiter backs off the host and
+        the caller schedules the retry, so no worker sleeps through the backoff here.
+        """
+        # Present the same identity as this worker's browser session
+        headers = {'User-Agent': self.user_agent, **(headers or {})}
+        with self.rate_limiter.request(url) as permit:
+            result = self.http_fetcher.fetch(url, headers=headers)
+            permit.record(
+                status=result.status,
+                error=result.error is not None,
+                throttled=self._is_challenge_page(result.text, result.status),
+                retry_after=result.header('retry-after')
+            )
+        self.metrics.observe('http_fetch', result.elapsed)
+        return result
+    
+    def _is_challenge_page(self, page_source, status=None):
+        """Detect bot-protection interstitials (e.g. Cloudflare 'Just a moment...')"""
+        if any(marker in page_source for marker in CHALLENGE_MARKERS):
+            return True
+        return status in (403, 503) and 'cloudflare' in page_source.lower()
+    
+    def _record_fetch_decision(self, url, path, reason=None):
+        """Remember which fetch path served a URL ('http', 'browser' or 'failed')"""
+        with self._url_lock:
+            self.fetch_decisions[url] = {'path': path, 'reason': reason}
+        self.metrics.increment(f'fetch_{path}')
+    
+    def _log_fetch_path_summary(self):
+        """Log how many pages were served over HTTP versus escalated to the browser"""
+        with self._url_lock:
+            decisions = list(self.fetch_decisions.values())
+        
+        if not decisions:
+            return
+        
+        paths = {}
+        reasons = {}
+        for decision in decisions:
+            paths[decision['path']] = paths.get(decision['path'], 0) + 1
+            if decision['reason']:
+                reasons[decision['reason']] = reasons.get(decision['reason'], 0) + 1
+        
+        browser_share = paths.get('browser', 0) / len(decisions) * 100
+        self.logger.log_info(
+            f"Fetch path summary: {browser_share:.1f}% of pages needed the browser",
+            context={
+                'pages': len(decisions),
+                'paths': paths,
+                'escalation_reasons': reasons
+            }
+        )
+    
+    def _log_retry_summary(self):
+        """Log retried, recovered and exhausted page attempts per error class"""
+        summary = self.retry_ledger.summary()
+        if not summary:
+            return
+        retried = sum(counts['retried'] for counts in summary.values())
+        recovered = sum(counts['recovered'] for counts in summary.values())
+        self.logger.log_info(
+            f"Retry summary: {retried} deferred retries, {recovered} pages recovered",
+            context={'by_error_class': summary}
+        )
+    
+    def _wait_for_page_ready(self, url, attempt, selector=CONTENT_READY_SELECTOR):
+        """Wait until main content is present and the page has stopped changing
+        
+        Runs a single injected script that watches DOM mutations and resource loads and
+        resolves once the combined content selector matches and the page has been quiet for
+        readiness_quiet_ms, or when the hard readiness_timeout deadline is reached.
+        Returns the readiness result dict (status, matched, elapsed_ms, ready_state).
+        """
+        deadline_ms = int(self.readiness_timeout * 1000)
+        wait_start = time.monotonic()
+        
+        try:
+            result = self.driver.execute_async_script(
+                PAGE_READY_SCRIPT, selector, self.readiness_quiet_ms, deadline_ms
+            ) or {}
+        except TimeoutException:
+            result = {'status': 'script_timeout', 'matched': False}
         except WebDriverException as web_e:
             self.logger.log_error(
-                f"WebDriver error during content wait (attempt {attempt + 1})",
+                f"WebDriver error during readiness wait (attempt {attempt + 1})",
                 exception=web_e,
-                operation="_wait_for_page_content",
+                operation="_wait_for_page_ready",
                 url=url,
                 context={'attempt': attempt + 1}
             )
             raise
-    
-    def _validate_page_source(self, page_source, url, attempt):
-        """Validate page source quality and content"""
-        if not page_source:
-            self.logger.log_warning(
-                f"Page source is empty (attempt {attempt + 1})",
-                url=url
+        
+        readiness_seconds = time.monotonic() - wait_start
+        result['readiness_seconds'] = round(readiness_seconds, 3)
+        self.metrics.observe('readiness_wait', readiness_seconds)
+        self.metrics.increment(f"readiness_{result.get('status')}")
+        
+        if result.get('status') == 'settled':
+            self.logger.log_info(
+                f"Page ready in {readiness_seconds:.2f}s",
+                context={'url': url, 'attempt': attempt + 1 if attempt > 0 else None}
+            )
+        else:
+            self.logger.log_warning(
+                f"Page readiness deadline reached, proceeding with current DOM",
+                context={
+                    'url': url,
+                    'attempt': attempt + 1,
+                    'status': result.get('status'),
+                    'content_matched': result.get('matched'),
+                    'readiness_seconds': result['readiness_seconds'],
+                    'deadline_seconds': self.readiness_timeout
+                }
+            )
+        
+        return result
+    
+    def _validate_page_source(self, page_source, url, attempt):
+        """Validate page source quality and content"""
+        page_source = page_source or ''
+        error_indicator = next(
+            (indicator for indicator in PAGE_ERROR_INDICATORS if indicator in page_source), None
+        )
+        content_found = any(indicator in page_source for indicator in PAGE_CONTENT_INDICATORS)
+        return self._check_page_quality(len(page_source), error_indicator, content_found, url, attempt)
+    
+    def _check_page_quality(self, source_length, error_indicator, content_found, url, attempt):
+        """Judge a page from its source length, first error indicator and content indicators
+        
+        Shared by the Python path and in-browser extraction, which evaluates the indicators in the page.
+        """
+        if not source_length:
+            self.logger.log_warning(
+                f"Page source is empty (attempt {attempt + 1})",
+                url=url
             )
             return False
         
-        if len(page_source) < 100:
+        if source_length < 100:
             self.logger.log_warning(
                 f"Page source is too short (attempt {attempt + 1})",
                 url=url,
-                context={'page_source_length': len(page_source)}
+                context={'page_source_length': source_length}
             )
             return False
         
         # Check for error pages
-        error_indicators = [
-            "Access Denied", "403 Forbidden", "404 Not Found", "500 Internal Server Error",
-            "Service Unavailable", "Bad Gateway", "Gateway Timeout",
-            "This page can't be displayed", "Page not found",
-            "<title>Just a moment...</title>"  # Cloudflare protection
-        ]
-        
-        for indicator in error_indicators:
-            if indicator in page_source:
-                self.logger.log_warning(
-                    f"Error page detected: {indicator} (attempt {attempt + 1})",
-                    url=url
-                )
-                return False
+        if error_indicator:
+            self.logger.log_warning(
+                f"Error page detected: {error_indicator} (attempt {attempt + 1})",
+                url=url
+            )
+            return False
         
         # Check for actual content
-        content_indicators = [
-            "<main", "<article", "class=\"content\"", "class=\"documentation\"",
-            "<h1", "<h2", "<p", "<div"
-        ]
-        
-        content_found = any(indicator in page_source for indicator in content_indicators)
         if not content_found:
             self.logger.log_warning(
                 f"No content indicators found in page source (attempt {attempt + 1})",
@@ -1202,51 +1646,70 @@ class UE5DocsScraper:
         return True
     
     def _clean_page_content(self, soup):
-        """Remove navigation and unnecessary elements"""
-        elements_removed = 0
-        
-        # Extended list of elements to remove
-        removal_selectors = [
-            'nav', 'header', 'footer', '.navigation', '.sidebar', '.nav',
-            '.header', '.footer', '.menu', '.breadcrumb', '.breadcrumbs',
-            '.social-share', '.comments', '.related-posts', '.ads',
-            '.advertisement', '.banner', '.popup', '.modal',
-            'script', 'style', 'noscript'
-        ]
+        """Remove navigation and unnecessary elements in a single pass over the tree
         
-        for selector in removal_selectors:
-            elements = soup.find_all(selector)
-            for element in elements:
-                element.decompose()
-                elements_removed += 1
+        Removals are counted per rule in the crawl metrics (counters 'clean <selector>').
+        """
+        return self._record_cleaning(self.html_backend.clean(soup, self.cleaning_rules))
+    
+    def _record_cleaning(self, removed):
+        """Add per-rule removal counts to the crawl metrics and return the total"""
+        for selector, count in removed.items():
+            self.metrics.increment(f"clean {selector}", count)
+        return sum(removed.values())
+    
+    def _extract_in_browser(self, url):
+        """Run the extraction script in the loaded page
         
-        return elements_removed
+        Returns the script result, or None when the script failed and the caller
+        should fall back to transferring the full page source.
+        """
+        try:
+            with self.metrics.time_stage('browser_extract'):
+                result = self.driver.execute_script(
+                    PAGE_EXTRACT_SCRIPT,
+                    list(CONTENT_SELECTORS),
+                    MIN_CONTENT_TEXT_LENGTH,
+                    list(self.cleaning_rules.selectors),
+                    list(PAGE_ERROR_INDICATORS),
+                    list(PAGE_CONTENT_INDICATORS)
+                )
+        except WebDriverException as e:
+            self.metrics.increment('browser_extract_fallback')
+            self.logger.log_warning(
+                "In-browser extraction failed, falling back to page source",
+                url=url,
+                context={'error': str(e).splitlines()[0] if str(e) else type(e).__name__}
+            )
+            return None
+        
+        if not isinstance(result, dict) or 'source_length' not in result:
+            self.metrics.increment('browser_extract_fallback')
+            return None
+        result['removed'] = result.get('removed') or {}
+        return result
+    
+    def _title_document(self, title):
+        """Minimal parsed document carrying only the page title (for get_page_title)"""
+        if title is None:
+            return self.html_backend.parse("<html><head></head><body></body></html>")
+        return self.html_backend.parse(
+            f"<html><head><title>{html.escape(title)}</title></head><body></body></html>"
+        )
     
     def _extract_main_content(self, soup, url):
         """Extract main content with enhanced detection"""
         # Try multiple selectors in order of preference
-        content_selectors = [
-            'main',
-            '.main-content',
-            '.content',
-            '#content',
-            '.documentation',
-            '.docs',
-            '.page-content',
-            'article',
-            '.entry-content',
-            '.post-content',
-            '[role="main"]',
-            'body'  # Fallback
-        ]
-        
-        for selector in content_selectors:
+        for selector in CONTENT_SELECTORS:
             try:
-                content = soup.select_one(selector)
-                if content and len(content.get_text(strip=True)) > 50:
+                content = self.html_backend.select_one(soup, selector)
+                if content is None:
+                    continue
+                text_length = self.html_backend.text_length(content)
+                if text_length > MIN_CONTENT_TEXT_LENGTH:
                     self.logger.log_info(
                         f"Main content extracted using selector: {selector}",
-                        context={'content_length': len(str(content))}
+                        context={'text_length': text_length}
                     )
                     return content
             except Exception as e:
@@ -1257,19 +1720,24 @@ class UE5DocsScraper:
                 continue
         
         # If no good content found, log available structure
+        structure = self.html_backend.describe(soup)
         self.logger.log_warning(
             "Could not find main content with any selector",
             context={
                 'url': url,
-                'available_ids': [tag.get('id') for tag in soup.find_all(id=True)][:10],
-                'available_classes': [cls for tag in soup.find_all(class_=True) for cls in tag.get('class')][:20]
+                'available_ids': structure['available_ids'],
+                'available_classes': structure['available_classes']
             }
         )
         
         return None
 
     def save_as_pdf(self, html_content, output_path):
-        """Convert HTML content to PDF with cross-platform support"""
+        """Convert HTML content to PDF with cross-platform support
+        
+        Returns the path of the file actually written: output_path, or the .html file
+        of the HTML fallback when no PDF could be made. Returns None if nothing was saved.
+        """
         current_platform = platform.system()
         
         try:
@@ -1306,6 +1774,7 @@ class UE5DocsScraper:
         
         try:
             import shutil
+            _import_selenium()
             
             self.logger.log_info(f"Starting Windows PDF generation for {output_path.name}")
             
@@ -1398,21 +1867,27 @@ class UE5DocsScraper:
                 # Navigate to the HTML file and print to PDF
                 self.driver.get(f"file:///{temp_html.absolute().as_posix()}")
                 
-                # Wait for page to load
+                # Wait for page to load, including images (get() returns early with the
+                # eager page load strategy of the lean profile)
                 WebDriverWait(self.driver, 10).until(
                     EC.presence_of_element_located((By.TAG_NAME, "body"))
                 )
+                WebDriverWait(self.driver, 10).until(
+                    lambda driver: driver.execute_script("return document.readyState") == "complete"
+                )
                 
                 # Print to PDF
-                pdf_data = self.driver.print_page(print_options)
+                with self.metrics.time_stage('pdf_render'):
+                    pdf_data = self.driver.print_page(print_options)
                 
                 # Save PDF data to file
                 import base64
-                with open(temp_path, 'wb') as f:
-                    f.write(base64.b64decode(pdf_data))
-                
-                # If successful, rename to final filename
-                temp_path.rename(output_path)
+                with self.metrics.time_stage('write'):
+                    with open(temp_path, 'wb') as f:
+                        f.write(base64.b64decode(pdf_data))
+                    
+                    # If successful, rename to final filename
+                    temp_path.rename(output_path)
                 
                 # Clean up temp HTML file
                 temp_html.unlink()
@@ -1430,7 +1905,7 @@ class UE5DocsScraper:
                     }
                 )
                 
-                return True
+                return output_path
                 
             except Exception as e:
                 # Clean up temp files if they exist
@@ -1474,14 +1949,14 @@ class UE5DocsScraper:
         try:
             self.logger.log_info(f"Starting Unix/Linux PDF generation for {output_path.name}")
             
-            # Try to import WeasyPrint with enhanced error handling
-            weasyprint = self._import_weasyprint_with_fallbacks()
-            if not weasyprint:
+            # WeasyPrint capability was probed once at startup
+            if not self.pdf_capability.available:
                 self.logger.log_warning(
                     "WeasyPrint not available, falling back to HTML generation",
                     context={
                         'platform': platform.system(),
-                        'suggestion': 'Install WeasyPrint: pip install weasyprint'
+                        'reason': self.pdf_capability.error,
+                        'suggestion': 'Install WeasyPrint and its system dependencies'
                     }
                 )
                 return self._save_as_html_fallback(html_content, output_path)
@@ -1491,17 +1966,6 @@ class UE5DocsScraper:
             # Ensure parent directory exists
             output_path.parent.mkdir(parents=True, exist_ok=True)
             
-            # Check for WeasyPrint dependencies on Unix/Linux
-            if not self._check_weasyprint_dependencies():
-                self.logger.log_warning(
-                    "WeasyPrint dependencies missing, falling back to HTML",
-                    context={
-                        'platform': platform.system(),
-                        'suggestion': 'Install system dependencies for WeasyPrint'
-                    }
-                )
-                return self._save_as_html_fallback(html_content, output_path)
-            
             # Check available disk space (rough estimate)
             try:
                 disk_usage = shutil.disk_usage(output_path.parent)
@@ -1536,40 +2000,10 @@ class UE5DocsScraper:
                     context={'error': str(e)}
                 )
             
-            # Create a full HTML document
-            full_html = f"""
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <meta charset="UTF-8">
-                <style>
-                    body {{ font-family: Arial, sans-serif; margin: 20px; line-height: 1.6; }}
-                    img {{ max-width: 100%; height: auto; }}
-                    pre {{ background: #f5f5f5; padding: 10px; border-radius: 5px; }}
-                    code {{ background: #f5f5f5; padding: 2px 4px; border-radius: 3px; }}
-                    table {{ border-collapse: collapse; width: 100%; }}
-                    th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
-                    th {{ background-color: #f2f2f2; }}
-                    @page {{ margin: 1in; }}
-                </style>
-            </head>
-            <body>
-                {html_content}
-            </body>
-            </html>
-            """
-            
-            # Write to temporary file first, then rename (atomic operation)
-            temp_path = output_path.with_suffix(output_path.suffix + '.tmp')
-            
             try:
-                # Use WeasyPrint to create PDF
+                # Use WeasyPrint to create PDF (render_pdf writes a .tmp file and renames it)
                 self.logger.log_info("Creating PDF with WeasyPrint")
-                html_doc = weasyprint.HTML(string=full_html)
-                html_doc.write_pdf(str(temp_path))
-                
-                # If successful, rename to final filename
-                temp_path.rename(output_path)
+                self._observe_render(render_pdf(html_content, output_path))
                 
                 duration = (datetime.datetime.now() - start_time).total_seconds()
                 file_size = output_path.stat().st_size
@@ -1584,19 +2018,14 @@ class UE5DocsScraper:
                     }
                 )
                 
-                return True
+                return output_path
                 
             except Exception as e:
-                # Clean up temp file if it exists
-                if temp_path.exists():
-                    temp_path.unlink()
-                    
                 self.logger.log_error(
                     "Error in Unix PDF generation process",
                     exception=e,
                     operation="_save_as_pdf_unix",
                     context={
-                        'temp_pdf_path': str(temp_path),
                         'output_path': str(output_path),
                         'weasyprint_available': True
                     }
@@ -1620,7 +2049,7 @@ class UE5DocsScraper:
             return self._save_as_html_fallback(html_content, output_path)
     
     def _save_as_html_fallback(self, html_content, output_path):
-        """Fallback method to save as HTML if PDF generation fails"""
+        """Fallback method to save as HTML if PDF generation fails; returns the .html path or None"""
         start_time = datetime.datetime.now()
         
         try:
@@ -1658,11 +2087,12 @@ class UE5DocsScraper:
             temp_path = html_path.with_suffix(html_path.suffix + '.tmp')
             
             try:
-                with open(temp_path, 'w', encoding='utf-8') as f:
-                    f.write(full_html)
-                
-                # If successful, rename to final filename
-                temp_path.rename(html_path)
+                with self.metrics.time_stage('write'):
+                    with open(temp_path, 'w', encoding='utf-8') as f:
+                        f.write(full_html)
+                    
+                    # If successful, rename to final filename
+                    temp_path.rename(html_path)
                 
                 duration = (datetime.datetime.now() - start_time).total_seconds()
                 file_size = html_path.stat().st_size
@@ -1678,7 +2108,7 @@ class UE5DocsScraper:
                     }
                 )
                 
-                return True
+                return html_path
                 
             except Exception as write_e:
                 # Clean up temp file if it exists
@@ -1697,7 +2127,7 @@ class UE5DocsScraper:
                     'duration_seconds': duration
                 }
             )
-            return False
+            return None
 
     def scrape_all_docs(self):
         """Main method to scrape all documentation"""
@@ -1706,105 +2136,63 @@ class UE5DocsScraper:
         self.logger.log_info("Starting UE5 documentation scraping session")
         
         try:
-            # Get all URLs to scrape
-            urls = self.get_sitemap_urls()
+            feed_counts = {'queued': 0, 'skipped': 0}
             
-            if not urls:
-                self.logger.log_error(
-                    "No URLs found to scrape - stopping execution",
-                    operation="scrape_all_docs",
-                    context={'base_url': self.base_url}
-                )
-                return
+            if self.incremental:
+                # Incremental runs need the full URL set to detect removed pages
+                urls = self.get_sitemap_urls()
                 
-            total_urls = len(urls)
-            self.logger.log_info(f"Starting to process {total_urls} URLs")
+                if not urls:
+                    self.logger.log_error(
+                        "No URLs found to scrape - stopping execution",
+                        operation="scrape_all_docs",
+                        context={'base_url': self.base_url}
+                    )
+                    return
+                
+                # Only pages that may have changed since the last run
+                urls = self._plan_incremental_crawl(urls)
+                total_urls = len(urls)
+                directories = self.output_planner.plan(urls)
+                self.logger.log_info(f"Planned {directories} output directories for {total_urls} URLs")
+                self.logger.log_info(f"Starting to process {total_urls} URLs with {self.workers} worker(s)")
+            else:
+                # Stream URLs from the sitemap straight into the workers, so crawling starts
+                # before the whole sitemap index has been resolved
+                urls = self._iter_pending_urls(feed_counts)
+                total_urls = None
+                self.logger.log_info(f"Streaming sitemap URLs to {self.workers} worker(s)")
+            
+            # Process URLs across the worker pool (one browser session per worker)
+            pool = CrawlWorkerPool(self, worker_count=self.workers)
+            try:
+                pool.run(urls, total=total_urls)
+            finally:
+                self._wait_for_renders()
+                self.state.flush()
             
-            # Process each URL
-            for i, url in enumerate(urls, 1):
-                if url in self.scraped_urls:
-                    self.logger.log_info(f"Skipping already processed URL ({i}/{total_urls}): {url}")
-                    continue
-                    
-                url_start_time = datetime.datetime.now()
-                self.logger.log_info(f"Processing URL {i}/{total_urls}: {url}")
-                
-                try:
-                    # Scrape the page
-                    html_content, soup = self.scrape_page_content(url)
-                    
-                    if not html_content:
-                        self.logger.log_warning(f"No content retrieved for URL", url=url)
-                        self.failed_urls.add(url)
-                        continue
-                    
-                    # Create directory structure
-                    dir_path = self.create_directory_structure(url)
-                    
-                    # Generate filename
-                    title = self.get_page_title(soup, url)
-                    filename = f"{title}.pdf"
-                    
-                    # Handle duplicate filenames
-                    counter = 1
-                    original_filename = filename
-                    while (dir_path / filename).exists():
-                        name_part = original_filename[:-4]  # Remove .pdf
-                        filename = f"{name_part}_{counter}.pdf"
-                        counter += 1
-                        
-                        if counter > 10:  # Prevent infinite loop
-                            self.logger.log_warning(
-                                f"Too many duplicate filenames, using timestamp",
-                                context={'original_filename': original_filename, 'url': url}
-                            )
-                            timestamp = int(datetime.datetime.now().timestamp())
-                            filename = f"{name_part}_{timestamp}.pdf"
-                            break
-                    
-                    output_path = dir_path / filename
-                    
-                    # Save as PDF
-                    if self.save_as_pdf(html_content, output_path):
-                        url_duration = (datetime.datetime.now() - url_start_time).total_seconds()
-                        self.scraped_urls.add(url)
-                        
-                        self.logger.log_success(
-                            f"Successfully processed URL {i}/{total_urls}",
-                            url=url,
-                            file_path=str(output_path),
-                            context={
-                                'processing_time_seconds': url_duration,
-                                'title': title,
-                                'directory': str(dir_path)
-                            }
-                        )
-                    else:
-                        self.logger.log_error(
-                            f"Failed to save content for URL {i}/{total_urls}",
-                            operation="scrape_all_docs",
-                            url=url,
-                            context={'title': title, 'output_path': str(output_path)}
-                        )
-                        self.failed_urls.add(url)
-                        
-                    # Small delay to be respectful
-                    time.sleep(1)
-                    
-                except KeyboardInterrupt:
-                    self.logger.log_warning("Scraping interrupted by user")
-                    raise
-                    
-                except Exception as e:
-                    url_duration = (datetime.datetime.now() - url_start_time).total_seconds()
+            if not self.incremental:
+                if feed_counts['skipped']:
+                    self.logger.log_info(
+                        f"Resumed crawl: {feed_counts['skipped']} URLs were already completed",
+                        context={'state_db': str(self.state.db_path)}
+                    )
+                if not feed_counts['queued'] and not feed_counts['skipped']:
                     self.logger.log_error(
-                        f"Unexpected error processing URL {i}/{total_urls}",
-                        exception=e,
+                        "No URLs found to scrape - stopping execution",
                         operation="scrape_all_docs",
-                        url=url,
-                        context={'processing_time_seconds': url_duration}
+                        context={'base_url': self.base_url}
                     )
-                    self.failed_urls.add(url)
+                    return
+                total_urls = feed_counts['queued']
+            
+            self._record_url_aliases()
+            self._log_fetch_path_summary()
+            self._log_retry_summary()
+            self._log_dedup_summary()
+            self.logger.log_info("Request pacing at end of crawl", context={'hosts': self.rate_limiter.snapshot()})
+            if self.incremental:
+                self._log_incremental_summary()
             
             # Log completion summary
             total_duration = (datetime.datetime.now() - scraping_start_time).total_seconds()
@@ -1812,8 +2200,15 @@ class UE5DocsScraper:
                 total_processed=total_urls,
                 successful=len(self.scraped_urls),
                 failed=len(self.failed_urls),
-                duration=total_duration
+                duration=total_duration,
+                stage_metrics=self.metrics.snapshot()
             )
+            self._write_metrics()
+            self._write_manifest()
+            
+        except KeyboardInterrupt:
+            self.logger.log_warning("Scraping interrupted by user")
+            raise
             
         except Exception as e:
             total_duration = (datetime.datetime.now() - scraping_start_time).total_seconds()
@@ -1829,48 +2224,546 @@ class UE5DocsScraper:
             )
             raise
 
-    def _import_weasyprint_with_fallbacks(self):
-        """Import WeasyPrint with enhanced error handling and suggestions"""
-        global _weasyprint_module, _weasyprint_checked
+    def dry_run(self, show=20):
+        """List the URLs a crawl would process, without fetching pages or writing state
+        
+        The sitemap is read as usual; no page is fetched and no PDF is written. Construct
+        the scraper with state_read_only=True so that the crawl state database is only
+        read (and not created when there is none), and with fetch_mode='http' so that a
+        failing sitemap cannot launch a browser either. The run is still logged to the
+        scraper's log file.
+        
+        Args:
+            show: Number of URLs to print with their output directory
+        
+        Returns:
+            Dict with the number of URLs to crawl, already done, and URL variants
+        """
+        counts = {'to_crawl': 0, 'done': 0}
+        for url in self._dedupe_urls(self.iter_sitemap_urls()):
+            record = self.state.get(url)
+            if record and record['status'] == STATUS_DONE:
+                lastmod = self.sitemap_lastmod.get(url)
+                # Incremental runs re-check saved pages unless their <lastmod> is unchanged
+                if not self.incremental or (lastmod and record.get('lastmod') == lastmod):
+                    counts['done'] += 1
+                    continue
+            counts['to_crawl'] += 1
+            if counts['to_crawl'] <= show:
+                print(f"  {url} -> {self.output_planner.directory_for(url)}")
+        if counts['to_crawl'] > show:
+            print(f"  ... and {counts['to_crawl'] - show} more")
+        counts['url_variants'] = self.dedup_counts['url_variants']
+        print(f"Dry run: {counts['to_crawl']} URL(s) to crawl, {counts['done']} already done, "
+              f"{counts['url_variants']} URL variant(s) of other pages")
+        return counts
+
+    def _write_metrics(self):
+        """Write the stage metrics snapshot to metrics_file"""
+        try:
+            path = self.metrics.write_json(self.metrics_file)
+            self.logger.log_info(f"Stage metrics written to {path}")
+        except OSError as e:
+            self.logger.log_warning(
+                f"Could not write stage metrics: {e}",
+                context={'metrics_file': str(self.metrics_file)}
+            )
+
+    def _iter_pending_urls(self, counts):
+        """Yield sitemap URLs that still need processing
+        
+        URLs the state store already has as done are skipped with O(1) lookups (no
+        filesystem access); counts['queued'] and counts['skipped'] are updated as it goes.
+        Variants of an already yielded URL are recorded as its aliases instead.
+        """
+        for url in self._dedupe_urls(self.iter_sitemap_urls()):
+            if self.state.is_completed(url):
+                counts['skipped'] += 1
+                continue
+            counts['queued'] += 1
+            # Plan the output directory before a worker picks the URL up
+            self.output_planner.directory_for(url)
+            yield url
+    
+    def _dedupe_urls(self, urls):
+        """Yield the first URL of every canonical form; later variants become aliases"""
+        primaries = {}
+        for url in urls:
+            primary = primaries.setdefault(canonical_url(url), url)
+            if primary == url:
+                yield url
+            elif url not in self.url_aliases:
+                self.url_aliases[url] = primary
+                with self._url_lock:
+                    self.dedup_counts['url_variants'] += 1
+    
+    def _record_url_aliases(self):
+        """Record URL variants as aliases of their primary URL once it has been saved"""
+        for url, primary in self.url_aliases.items():
+            record = self.state.get(primary)
+            if record is None or record['status'] != STATUS_DONE:
+                continue
+            self.state.record_alias(
+                url,
+                record.get('canonical_url') or primary,
+                output_path=record.get('output_path'),
+                content_hash=record.get('content_hash'),
+                lastmod=self.sitemap_lastmod.get(url)
+            )
+        self.state.flush()
+    
+    def _record_duplicate(self, url, owner, content_hash, page_started, progress):
+        """Record a page whose content is already saved under owner as an alias (no render)"""
+        duration = (datetime.datetime.now() - page_started).total_seconds()
+        owner_record = self.state.get(owner) or {}
+        with self._url_lock:
+            self.scraped_urls.add(url)
+            self.failed_urls.discard(url)
+            validators = self._page_validators.pop(url, {})
+            self.dedup_counts['duplicate_content'] += 1
+        self.state.record_alias(
+            url,
+            owner,
+            output_path=owner_record.get('output_path'),
+            content_hash=content_hash,
+            duration_seconds=duration,
+            lastmod=self.sitemap_lastmod.get(url),
+            etag=validators.get('etag'),
+            last_modified=validators.get('last_modified')
+        )
+        self.metrics.increment('pages_deduplicated')
+        self.logger.log_info(
+            f"Same content as an already saved page, recorded as alias ({progress})",
+            context={'url': url, 'canonical_url': owner}
+        )
+    
+    def _log_dedup_summary(self):
+        """Log how many URLs were recognized as duplicates and not rendered"""
+        with self._url_lock:
+            counts = dict(self.dedup_counts)
+        if any(counts.values()):
+            self.logger.log_info(
+                f"Deduplication: {counts['url_variants']} URL variants and "
+                f"{counts['duplicate_content']} duplicate pages recorded as aliases",
+                context=counts
+            )
+    
+    def _write_manifest(self):
+        """Write the URL -> canonical URL and output file map to manifest_file"""
+        manifest = {
+            'generated_at': datetime.datetime.now().isoformat(timespec='seconds'),
+            'output_dir': str(self.output_dir),
+            'pages': self.state.manifest()
+        }
+        try:
+            self.manifest_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.manifest_file, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, indent=2, sort_keys=True)
+            self.logger.log_info(f"Manifest of {len(manifest['pages'])} URLs written to {self.manifest_file}")
+        except OSError as e:
+            self.logger.log_warning(
+                f"Could not write manifest: {e}",
+                context={'manifest_file': str(self.manifest_file)}
+            )
+
+    def _plan_incremental_crawl(self, urls):
+        """Select the URLs an incremental run has to look at
+        
+        Pages whose sitemap <lastmod> matches the one recorded when they were saved are
+        unchanged and skipped without any request. Saved pages that are no longer in the
+        sitemap are marked removed. Everything else is returned; previously saved pages
+        among them are checked with a conditional request in _process_url.
+        """
+        current = set(urls)
+        removed = self.state.mark_removed(
+            url for url in self.state.completed_urls() if url not in current
+        )
         
-        if _weasyprint_checked:
-            return _weasyprint_module
+        to_check = []
+        unchanged = 0
+        for url in self._dedupe_urls(urls):
+            record = self.state.get(url)
+            lastmod = self.sitemap_lastmod.get(url)
+            if (record and record['status'] == STATUS_DONE and
+                    lastmod and record.get('lastmod') == lastmod):
+                unchanged += 1
+                continue
+            to_check.append(url)
         
-        _weasyprint_checked = True
+        with self._url_lock:
+            self.incremental_counts['removed'] += removed
+            self.incremental_counts['unchanged'] += unchanged
+        
+        self.logger.log_info(
+            "Incremental crawl plan",
+            context={
+                'sitemap_urls': len(current),
+                'unchanged_by_lastmod': unchanged,
+                'removed': removed,
+                'to_check': len(to_check)
+            }
+        )
+        return to_check
+
+    def _check_unchanged(self, url, previous):
+        """Conditional request for a previously saved page
+        
+        Returns (unchanged, prefetched): unchanged is True on 304 Not Modified; on a
+        200 the response is returned as prefetched so the page is not fetched twice.
+        """
+        headers = {}
+        if previous.get('etag'):
+            headers['If-None-Match'] = previous['etag']
+        if previous.get('last_modified'):
+            headers['If-Modified-Since'] = previous['last_modified']
+        
+        if self.fetch_mode == 'browser' or not headers:
+            return False, None
+        
+        result = self._fetch_paced(url, headers=headers)
+        if result.status == 304:
+            self.state.record_unchanged(
+                url,
+                lastmod=self.sitemap_lastmod.get(url),
+                etag=result.header('etag'),
+                last_modified=result.header('last-modified')
+            )
+            return True, None
         
+        # A throttled response is passed on too, so its retry is deferred
+        return False, result if result.ok or result.status in THROTTLE_STATUSES else None
+
+    def _count_incremental(self, outcome):
+        """Count a changed/unchanged/new page in incremental mode"""
+        if self.incremental:
+            with self._url_lock:
+                self.incremental_counts[outcome] += 1
+
+    def _log_incremental_summary(self):
+        """Log how many pages changed since the previous run"""
+        with self._url_lock:
+            counts = dict(self.incremental_counts)
+        self.logger.log_info(
+            f"Incremental crawl summary: {counts['changed']} changed, {counts['unchanged']} unchanged, "
+            f"{counts['removed']} removed, {counts['new']} new",
+            context=counts
+        )
+
+    def _mark_url(self, url, success, output_path=None, content_hash=None, duration=None, error=None):
+        """Record the outcome of a URL in memory and in the crawl state store
+        (safe to call from worker threads)"""
+        with self._url_lock:
+            if success:
+                self.scraped_urls.add(url)
+                self.failed_urls.discard(url)
+            else:
+                self.failed_urls.add(url)
+        
+        if not success:
+            # Give up the content claim so a duplicate URL can render the page instead,
+            # and the file name so another page can use it
+            self.content_index.release(url)
+            self.filename_registry.release(url)
+        
+        if success:
+            with self._url_lock:
+                validators = self._page_validators.pop(url, {})
+            self.state.record_success(
+                url,
+                output_path=self._relative_output_path(output_path),
+                content_hash=content_hash,
+                duration_seconds=duration,
+                lastmod=self.sitemap_lastmod.get(url),
+                etag=validators.get('etag'),
+                last_modified=validators.get('last_modified')
+            )
+        else:
+            self.state.record_failure(url, error=error, duration_seconds=duration)
+
+    def _relative_output_path(self, output_path):
+        """Output path relative to output_dir when possible, for portable state records"""
+        if output_path is None:
+            return None
         try:
-            import weasyprint
-            _weasyprint_module = weasyprint
+            return Path(output_path).relative_to(self.output_dir).as_posix()
+        except ValueError:
+            return str(output_path)
+
+    def _process_url(self, url, index, total):
+        """Scrape a single URL and save it as PDF; returns True on success
+        
+        While the PDF is rendered in a background process, a Future resolving to
+        the outcome is returned instead.
+        
+        Raises DeferredRetry when a failed attempt should be retried after a backoff.
+        """
+        progress = f"{index}/{total if total is not None else '?'}"
+        retrying = self.retry_ledger.attempt(url) > 0
+        
+        previous = self.state.get(url)
+        was_done = previous is not None and previous['status'] == STATUS_DONE
+        
+        if url in self.scraped_urls or (was_done and not self.incremental):
+            self.logger.log_info(f"Skipping already processed URL ({progress}): {url}")
+            return True
+            
+        url_start_time = datetime.datetime.now()
+        self.logger.log_info(f"{'Retrying' if retrying else 'Processing'} URL {progress}: {url}")
+        self.state.record_start(url)
+        if not retrying:
+            self.metrics.increment(PAGES_COUNTER)
+        
+        try:
+            prefetched = None
+            if was_done:
+                # Incremental re-crawl of a saved page: ask the server whether it changed
+                unchanged, prefetched = self._check_unchanged(url, previous)
+                if unchanged:
+                    self._count_incremental('unchanged')
+                    self.logger.log_info(f"Unchanged since last run (304), skipping ({progress}): {url}")
+                    return True
+            
+            # Scrape the page
+            html_content, soup = self.scrape_page_content(url, prefetched=prefetched, defer_retries=True)
+            
+            if not html_content:
+                self.logger.log_warning(f"No content retrieved for URL", url=url)
+                url_duration = (datetime.datetime.now() - url_start_time).total_seconds()
+                self._mark_url(url, False, duration=url_duration, error="no content retrieved")
+                return False
+            
+            content_hash = hashlib.sha256(html_content.encode('utf-8')).hexdigest()
+            if was_done and content_hash == previous.get('content_hash'):
+                # Server said it changed but the extracted content is identical: no re-render
+                with self._url_lock:
+                    validators = self._page_validators.pop(url, {})
+                self.state.record_unchanged(
+                    url,
+                    lastmod=self.sitemap_lastmod.get(url),
+                    etag=validators.get('etag'),
+                    last_modified=validators.get('last_modified')
+                )
+                self._count_incremental('unchanged')
+                self.logger.log_info(f"Content unchanged since last run, skipping render ({progress}): {url}")
+                return True
+            
+            # Same content already saved (or being rendered) under another URL
+            owner = self.content_index.claim(content_hash, url)
+            if owner is not None:
+                self._record_duplicate(url, owner, content_hash, url_start_time, progress)
+                return True
+            
+            # Create directory structure
+            with self.metrics.time_stage('mkdir'):
+                dir_path = self.create_directory_structure(url)
             
-            # Test WeasyPrint functionality
-            test_html = "<html><body>Test</body></html>"
-            test_doc = weasyprint.HTML(string=test_html)
+            # Generate filename
+            title = self.get_page_title(soup, url)
+            filename = f"{title}.pdf"
+            
+            # Unique, stable file name: the URL's previous file or a free name in the directory
+            output_path = self.filename_registry.assign(dir_path, filename, url)
+            
+            page = {
+                'url': url,
+                'progress': progress,
+                'title': title,
+                'directory': str(dir_path),
+                'content_hash': content_hash,
+                'was_done': was_done,
+                'started': url_start_time
+            }
             
-            self.logger.log_success("WeasyPrint imported and tested successfully")
-            return weasyprint
+            render_pool = self._get_render_pool()
+            if render_pool is not None:
+                # Render in a separate process; the outcome is recorded (and resolves the
+                # returned Future) when the job completes. Blocks while the queue is full.
+                success = self._submit_render(render_pool, html_content, output_path, page)
+            else:
+                # Save as PDF
+                saved_path = self.save_as_pdf(html_content, output_path)
+                success = self._finish_page(page, output_path, saved_path)
+            
+            # Pacing between requests is left to the adaptive rate limiter
+            return success
+            
+        except DeferredRetry:
+            raise
+            
+        except KeyboardInterrupt:
+            self.logger.log_warning("Scraping interrupted by user")
+            raise
+            
+        except Exception as e:
+            url_duration = (datetime.datetime.now() - url_start_time).total_seconds()
+            self.logger.log_error(
+                f"Unexpected error processing URL {progress}",
+                exception=e,
+                operation="scrape_all_docs",
+                url=url,
+                context={'processing_time_seconds': url_duration}
+            )
+            self._mark_url(url, False, duration=url_duration, error=f"{type(e).__name__}: {e}")
+            return False
+
+    def _finish_page(self, page, output_path, saved_path):
+        """Record the outcome of saving a page (safe to call from render callbacks)
+        
+        saved_path is the file actually written (the HTML fallback's .html instead of
+        output_path when no PDF could be made), or None when the page was not saved.
+        """
+        url = page['url']
+        url_duration = (datetime.datetime.now() - page['started']).total_seconds()
+        self.metrics.observe('page_total', url_duration)
+        
+        if saved_path:
+            self._count_incremental('changed' if page['was_done'] else 'new')
+            self._mark_url(
+                url, True,
+                output_path=saved_path,
+                content_hash=page['content_hash'],
+                duration=url_duration
+            )
             
-        except ImportError as e:
+            self.logger.log_success(
+                f"Successfully processed URL {page['progress']}",
+                url=url,
+                file_path=str(saved_path),
+                context={
+                    'processing_time_seconds': url_duration,
+                    'title': page['title'],
+                    'directory': page['directory']
+                }
+            )
+            return True
+        
+        self.logger.log_error(
+            f"Failed to save content for URL {page['progress']}",
+            operation="scrape_all_docs",
+            url=url,
+            context={'title': page['title'], 'output_path': str(output_path)}
+        )
+        self._mark_url(url, False, duration=url_duration, error="save failed")
+        return False
+
+    def _get_render_pool(self):
+        """Return the PDF render pool, creating it on first use
+        
+        Returns None when pages should be rendered on the crawl thread: rendering
+        processes are disabled, on Windows (PDFs are printed by the browser session),
+        or when WeasyPrint is unusable (save_as_pdf then falls back to HTML).
+        """
+        with self._render_lock:
+            if self._render_pool_checked:
+                return self._render_pool
+            self._render_pool_checked = True
+            
+            if self.render_workers == 0 or platform.system() == "Windows":
+                return None
+            if not self.pdf_capability or not self.pdf_capability.available:
+                self.logger.log_warning("PDF render pool disabled: WeasyPrint is not usable")
+                return None
+            
+            self._render_pool = PdfRenderPool(
+                max_workers=self.render_workers,
+                logger=self.logger
+            )
+            self.logger.log_info(
+                f"Rendering PDFs in {self.render_workers} worker process(es)",
+                context={'max_pending': self._render_pool.max_pending}
+            )
+            return self._render_pool
+
+    def _submit_render(self, render_pool, html_content, output_path, page):
+        """Queue a PDF render job; falls back to rendering in-thread if the pool is broken
+        
+        Returns a Future resolving to the page's outcome (as returned by _finish_page)
+        once the job has finished, or the outcome itself after an in-thread render.
+        """
+        outcome = Future()
+        
+        def on_done(future):
+            try:
+                result = future.result()
+                self._observe_render(result)
+                self.logger.log_success(
+                    "Unix PDF generation completed successfully",
+                    file_path=result['output_path'],
+                    file_size=result['file_size'],
+                    context={
+                        'duration_seconds': result['duration_seconds'],
+                        'method': 'weasyprint_process_pool'
+                    }
+                )
+                saved_path = output_path
+            except Exception as e:
+                self.logger.log_error(
+                    "Error in PDF render worker",
+                    exception=e,
+                    operation="_submit_render",
+                    url=page['url'],
+                    context={'output_path': str(output_path)}
+                )
+                self.logger.log_info("Attempting HTML fallback after PDF render failure")
+                saved_path = self._save_as_html_fallback(html_content, output_path)
+            try:
+                outcome.set_result(self._finish_page(page, output_path, saved_path))
+            except Exception as e:
+                outcome.set_exception(e)
+                raise
+        
+        try:
+            render_pool.submit(html_content, output_path, callback=on_done)
+        except Exception as e:
+            self.logger.log_warning(
+                f"PDF render pool unavailable, rendering on the crawl thread: {e}",
+                context={'error_type': type(e).__name__}
+            )
+            return self._finish_page(page, output_path, self.save_as_pdf(html_content, output_path))
+        return outcome
+
+    def _observe_render(self, result):
+        """Record render and write timings reported by render_pdf"""
+        if 'render_seconds' in result:
+            self.metrics.observe('pdf_render', result['render_seconds'])
+        if 'write_seconds' in result:
+            self.metrics.observe('write', result['write_seconds'])
+
+    def _wait_for_renders(self):
+        """Block until queued PDF renders have finished and been recorded"""
+        if self._render_pool is None or not self._render_pool.in_flight:
+            return
+        self.logger.log_info(f"Waiting for {self._render_pool.in_flight} PDF render(s) to finish")
+        self._render_pool.wait()
+        self.logger.log_info("PDF render pool drained", context=dict(self._render_pool.stats))
+
+    def _probe_pdf_capability(self):
+        """Probe WeasyPrint once for this process and log the outcome"""
+        capability = get_weasyprint_capability()
+        
+        if capability.available:
+            self.logger.log_success(
+                "WeasyPrint imported and tested successfully",
+                context=capability.as_dict()
+            )
+        elif capability.error_type == 'ImportError':
             self.logger.log_warning(
-                f"WeasyPrint import failed: {e}",
+                f"WeasyPrint import failed: {capability.error}",
                 context={
                     'platform': platform.system(),
                     'suggestions': self._get_weasyprint_install_suggestions()
                 }
             )
-            _weasyprint_module = None
-            return None
-            
-        except Exception as e:
+        else:
             self.logger.log_warning(
-                f"WeasyPrint test failed: {e}",
+                f"WeasyPrint test failed: {capability.error}",
                 context={
                     'platform': platform.system(),
-                    'error_type': type(e).__name__,
+                    'error_type': capability.error_type,
                     'suggestions': self._get_weasyprint_troubleshooting_suggestions()
                 }
             )
-            _weasyprint_module = None
-            return None
+        return capability
     
     def _get_weasyprint_install_suggestions(self):
         """Get platform-specific WeasyPrint installation suggestions"""
@@ -1909,37 +2802,26 @@ class UE5DocsScraper:
             'permission_errors': 'Try running with administrator privileges'
         }
     
-    def _check_weasyprint_dependencies(self):
-        """Check if WeasyPrint dependencies are available"""
+    def close(self):
+        """Release the browser session and HTTP connection pool"""
         try:
-            # Test if we can create a simple PDF
-            import weasyprint
-            test_html = "<html><body><p>Dependency test</p></body></html>"
-            doc = weasyprint.HTML(string=test_html)
-            
-            # Try to render to bytes (this will fail if dependencies are missing)
-            pdf_bytes = doc.write_pdf()
-            
-            if len(pdf_bytes) > 0:
-                self.logger.log_info("WeasyPrint dependencies check passed")
-                return True
-            else:
-                self.logger.log_warning("WeasyPrint produced empty PDF")
-                return False
-                
-        except Exception as e:
-            self.logger.log_warning(
-                f"WeasyPrint dependency check failed: {e}",
-                context={
-                    'error_type': type(e).__name__,
-                    'platform': platform.system()
-                }
-            )
-            return False
-    
+            if self._driver is not None:
+                try:
+                    self._driver.quit()
+                finally:
+                    self._driver = None
+            if self._render_pool is not None:
+                self._render_pool.close()
+            self.http_fetcher.close()
+            self.sitemap_streamer.close()
+        finally:
+            self.state.close()
+            # Write out queued log records; later messages are logged synchronously
+            self.logger.close()
+
     def __del__(self):
         """Cleanup"""
-        if hasattr(self, 'driver'):
+        if getattr(self, '_driver', None) is not None:
             try:
                 self.driver.quit()
                 if hasattr(self, 'logger'):
@@ -1947,10 +2829,146 @@ class UE5DocsScraper:
             except Exception as e:
                 if hasattr(self, 'logger'):
                     self.logger.log_warning(f"Error during driver cleanup: {e}")
+        if getattr(self, 'state', None) is not None:
+            try:
+                self.state.close()
+            except Exception:
+                pass
 
 
-def main():
+def parse_args(argv=None):
+    """Parse command line options"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(
+        description="Scrape the Unreal Engine 5 documentation and save each page as a PDF"
+    )
+    parser.add_argument('--base-url', default="https://docs.unrealengine.com",
+                        help="Documentation site to scrape (default: %(default)s)")
+    parser.add_argument('--output-dir', default="ue5_docs",
+                        help="Directory to write PDFs into (default: %(default)s)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Number of parallel Firefox sessions (default: %(default)s)")
+    parser.add_argument('--render-workers', type=int, default=None,
+                        help="Number of PDF rendering processes; 0 renders on the crawl thread "
+                             "(default: CPU count, at most 4)")
+    parser.add_argument('--readiness-timeout', type=float, default=15,
+                        help="Hard per-page deadline in seconds for browser content readiness "
+                             "(default: %(default)s)")
+    parser.add_argument('--state-db', default=None,
+                        help="Crawl state database used to resume interrupted runs "
+                             "(default: <output-dir>/.crawl_state.sqlite)")
+    parser.add_argument('--restart', action='store_true',
+                        help="Ignore previously recorded progress and crawl every URL again")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Re-crawl only pages that changed since the last run, using sitemap "
+                             "<lastmod> and ETag/Last-Modified conditional requests")
+    parser.add_argument('--metrics-file', default=None,
+                        help="Where to write per-stage timing percentiles as JSON "
+                             "(default: <output-dir>/crawl_metrics.json)")
+    parser.add_argument('--manifest-file', default=None,
+                        help="Where to write the map of every saved URL to its canonical URL and "
+                             "output file as JSON (default: <output-dir>/manifest.json)")
+    parser.add_argument('--parser', choices=PARSER_BACKENDS, default=DEFAULT_PARSER_BACKEND,
+                        help="HTML parser backend: lxml (BeautifulSoup with lxml), html.parser, or "
+                             "lxml-direct (lxml without BeautifulSoup) (default: %(default)s)")
+    parser.add_argument('--extraction', choices=EXTRACTION_MODES, default="python",
+                        help="Where browser-fetched pages are cleaned and extracted: python (transfer the "
+                             "full page source) or browser (one injected script returns only the main "
+                             "content) (default: %(default)s)")
+    parser.add_argument('--browser-profile', choices=BROWSER_PROFILES, default=DEFAULT_BROWSER_PROFILE,
+                        help="standard: load every subresource; lean: block images, web fonts, "
+                             "media, trackers and hosts outside the allow-list, and use the eager "
+                             "page load strategy (default: %(default)s)")
+    parser.add_argument('--allow-host', action='append', default=[], metavar='DOMAIN',
+                        help="Extra domain the lean browser profile may load from (repeatable)")
+    parser.add_argument('--recycle-after', type=int, default=500, metavar='PAGES',
+                        help="Restart each browser session after this many pages; 0 disables "
+                             "(default: %(default)s)")
+    parser.add_argument('--max-browser-rss', type=float, default=1500, metavar='MB',
+                        help="Restart a browser session once its processes use more memory than "
+                             "this; 0 disables (default: %(default)s)")
+    parser.add_argument('--standby-browsers', type=int, default=1, metavar='N',
+                        help="Browser sessions per worker to keep launched in the background so a "
+                             "recycled or crashed session is replaced without waiting; 0 launches "
+                             "replacements on demand (default: %(default)s)")
+    parser.add_argument('--initial-rate', type=float, default=2.0, metavar='REQ_PER_S',
+                        help="Requests per second per host at the start; the rate then adapts to the "
+                             "server's responses (default: %(default)s)")
+    parser.add_argument('--max-rate', type=float, default=16.0, metavar='REQ_PER_S',
+                        help="Upper bound for the adaptive request rate per host (default: %(default)s)")
+    parser.add_argument('--fetch-mode', choices=FETCH_MODES, default="auto",
+                        help="auto: HTTP first, browser only when needed; browser: always use "
+                             "Firefox; http: never launch a browser (default: %(default)s)")
+    parser.add_argument('--status', action='store_true',
+                        help="Print the progress recorded in the crawl state database and exit")
+    parser.add_argument('--dry-run', action='store_true',
+                        help="Read the sitemap and list the URLs that would be crawled, without "
+                             "fetching pages, launching a browser or recording progress")
+    return parser.parse_args(argv)
+
+
+def print_status(state_db):
+    """Print the per-status URL counts of a crawl state database; returns an exit code"""
+    try:
+        status = read_status(state_db)
+    except Exception as e:
+        print(f"Could not read crawl state {state_db}: {e}")
+        return 1
+    if status is None:
+        print(f"No crawl state at {state_db} (nothing crawled yet)")
+        return 0
+    counts = status['counts']
+    print(f"Crawl state: {state_db}")
+    for name in ('done', 'failed', 'pending', 'removed'):
+        print(f"  {name:<8} {counts.pop(name, 0)}")
+    for name, count in sorted(counts.items()):
+        print(f"  {name:<8} {count}")
+    print(f"  duplicates of other pages (included in done): {status['aliases']}")
+    if status['updated_at']:
+        updated = datetime.datetime.fromtimestamp(status['updated_at'])
+        print(f"  last update: {updated:%Y-%m-%d %H:%M:%S}")
+    return 0
+
+
+def dry_run(args):
+    """Run UE5DocsScraper.dry_run with the command line options; returns an exit code"""
+    # HTTP only and no render processes, so nothing but the sitemap is fetched; the
+    # recorded progress is opened read-only and never reset, even with --restart
+    scraper = UE5DocsScraper(
+        base_url=args.base_url,
+        output_dir=args.output_dir,
+        fetch_mode='http',
+        state_db=args.state_db,
+        state_read_only=True,
+        resume=True,
+        incremental=args.incremental,
+        render_workers=0,
+        metrics_file=args.metrics_file,
+        manifest_file=args.manifest_file,
+        parser_backend=args.parser,
+        initial_rate=args.initial_rate,
+        max_rate=args.max_rate
+    )
+    try:
+        scraper.dry_run()
+    except KeyboardInterrupt:
+        print("\nDry run interrupted by user")
+        return 1
+    finally:
+        scraper.close()
+    return 0
+
+
+def main(argv=None):
     """Main entry point with Windows 11 compatibility checking"""
+    args = parse_args(argv)
+    
+    if args.status:
+        return print_status(args.state_db or Path(args.output_dir) / ".crawl_state.sqlite")
+    
+    if args.dry_run:
+        return dry_run(args)
     
     # Run Windows 11 compatibility check if on Windows
     if platform.system() == "Windows":
@@ -1988,7 +3006,28 @@ def main():
             print("Continuing with scraper initialization...")
     
     try:
-        scraper = UE5DocsScraper()
+        scraper = UE5DocsScraper(
+            base_url=args.base_url,
+            output_dir=args.output_dir,
+            workers=args.workers,
+            fetch_mode=args.fetch_mode,
+            readiness_timeout=args.readiness_timeout,
+            state_db=args.state_db,
+            resume=not args.restart,
+            incremental=args.incremental,
+            render_workers=args.render_workers,
+            metrics_file=args.metrics_file,
+            manifest_file=args.manifest_file,
+            parser_backend=args.parser,
+            extraction_mode=args.extraction,
+            browser_profile=args.browser_profile,
+            allowed_hosts=args.allow_host,
+            driver_max_pages=args.recycle_after,
+            driver_max_rss_mb=args.max_browser_rss,
+            driver_standby=args.standby_browsers,
+            initial_rate=args.initial_rate,
+            max_rate=args.max_rate
+        )
         
         try:
             scraper.scrape_all_docs()
@@ -2013,7 +3052,7 @@ def main():
                 
         finally:
             try:
-                scraper.driver.quit()
+                scraper.close()
                 scraper.logger.log_info("Application shutdown completed")
             except Exception as cleanup_e:
                 scraper.logger.log_warning(f"Error during cleanup: {cleanup_e}")
@@ -2037,4 +3076,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Bundled user-agent pool for the UE5 Documentation Scraper
+
+Browser sessions used to get a user agent from fake_useragent at every
+launch. That could download or parse its dataset while the session was
+starting, and when it failed the session fell back to a 2021 Firefox 91
+string that the HTTP clients also hard-coded. The pool here is part of the
+code instead:
+
+- it is versioned (``USER_AGENT_POOL_VERSION``); update the strings and the
+  version together when Firefox releases move on
+- it only holds Firefox user agents, because the crawl browser is Firefox;
+  a Chrome string on a Firefox engine is an easy mismatch to detect
+- rotation is deterministic: worker N always gets ``user_agent_for(N)``, for
+  its browser sessions and for the HTTP requests it makes, so both fetch
+  paths present the same identity and reruns look the same
+
+``DEFAULT_USER_AGENT`` (worker 0's) is the default header of the pooled
+HTTP fetcher and the sitemap session.
+"""
+
+from typing import Tuple
+
+
+USER_AGENT_POOL_VERSION = "2025.07"
+
+USER_AGENTS: Tuple[str, ...] = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:140.0) Gecko/20100101 Firefox/140.0',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:140.0) Gecko/20100101 Firefox/140.0',
+    'Mozilla/5.0 (X11; Linux x86_64; rv:140.0) Gecko/20100101 Firefox/140.0',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:139.0) Gecko/20100101 Firefox/139.0',
+    'Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:139.0) Gecko/20100101 Firefox/139.0',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:139.0) Gecko/20100101 Firefox/139.0',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:128.0) Gecko/20100101 Firefox/128.0',
+    'Mozilla/5.0 (X11; Linux x86_64; rv:128.0) Gecko/20100101 Firefox/128.0',
+)
+
+DEFAULT_USER_AGENT = USER_AGENTS[0]
+
+
+def user_agent_for(worker_id: int) -> str:
+    """User agent of a crawl worker (the same worker always gets the same one)."""
+    return USER_AGENTS[worker_id % len(USER_AGENTS)]
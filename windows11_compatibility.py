@@ -386,7 +386,7 @@ class Windows11CompatibilityChecker:
     def _check_dependencies(self):
         """Check Python dependencies"""
         required_modules = [
-            'requests', 'beautifulsoup4', 'selenium', 'fake_useragent',
+            'requests', 'beautifulsoup4', 'selenium',
             'lxml', 'aiohttp', 'psutil'
         ]
         
@@ -396,8 +396,6 @@ class Windows11CompatibilityChecker:
             try:
                 if module == 'beautifulsoup4':
                     import bs4  # beautifulsoup4 imports as bs4
-                elif module == 'fake_useragent':
-                    import fake_useragent
                 else:
                     __import__(module)
                     